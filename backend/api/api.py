@@ -1,11 +1,10 @@
 from fastapi import FastAPI, UploadFile, File, Form, Request, BackgroundTasks, Header
 # import pandas as pd  # pandas 없이 작동하도록 주석 처리
-import io
-from fastapi.responses import FileResponse, JSONResponse
+import asyncio
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.staticfiles import StaticFiles
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
-import requests
+from typing import List, Dict, Any, Optional
 
 import os
 import re
@@ -16,28 +15,18 @@ import time
 from datetime import datetime
 
 
-from ..utils.config import STATIC_DIR, DOCS_DIR, LOG_DIR, CHROMA_DIR
-from ..data.database import (
-    get_vectordb,
-    index_document,
-    get_indexed_files,
-    remove_document,
-    reset_vectordb,
-    save_feedback_to_file,
-    get_feedback_vectordb,
-    index_json_data
+from ..utils.config import (
+    STATIC_DIR, DOCS_DIR, LOG_DIR, CHROMA_DIR, STARTUP_PROFILE, WARMUP_COMPONENTS,
+    READINESS_RETRY_SECONDS, READINESS_RETRY_MAX_SECONDS,
 )
-# semantic_search 모듈 제거됨
-from ..utils.slack import clean_mention, post_slack_reply, handle_slack_message
+from ..utils.shared_state import SharedStatus, get_lock, atomic_write_json
+from ..utils.startup import readiness, log_import_profile, PROCESS_START
+# 벡터 DB(LangChain/Chroma), QA 체인, 분류기(scikit-learn), Jira, Slack 모듈은
+# 기동 시간 단축을 위해 사용하는 엔드포인트 안에서 import (최초 호출 시 1회 로드)
 from ..utils.utils import format_sources
 
 # qa_utils 모듈 제거됨
-from ..services.category_classifier import auto_classify
-from slack_sdk.web.async_client import AsyncWebClient
 from ..services.effort_estimation import EffortEstimation, effort_manager
-from ..services.effort_qa import run_effort_qa_chain, run_effort_qa_with_feedback, get_effort_statistics, search_similar_features
-from ..data.database import get_vectordb, index_document, index_json_data, index_json_data_incremental
-from ..services.jira_integration import create_jira_integration
 from ..services.mock_qa import mock_qa_response, mock_effort_qa_response
 import sys
 import os
@@ -74,8 +63,8 @@ root_logger.addHandler(console_handler)
 logger = logging.getLogger(__name__)
 logger.info(f"📝 로그 파일 설정 완료: {log_file}")
 
-# 전역 동기화 상태 변수
-sync_status = {
+# 동기화 상태 (워커 간 공유, data/docs/shared_state/sync_status.json)
+sync_status = SharedStatus("sync_status", {
     "is_running": False,
     "progress": 0,
     "total_epics": 0,
@@ -85,7 +74,7 @@ sync_status = {
     "current_epic": "",
     "message": "",
     "failed_list": []
-}
+})
 
 # Create FastAPI app
 app = FastAPI()
@@ -110,44 +99,43 @@ async def static_effort_redirect():
     from fastapi.responses import RedirectResponse
     return RedirectResponse(url="/effort-management/effort-management.html")
 
+# 백그라운드 기동 작업 (태스크 참조 유지용)
+_startup_task = None
+
 @app.on_event("startup")
 async def startup_event():
+    """서버 기동 (요청 수신은 즉시 시작, 무거운 준비 작업은 백그라운드 진행 → /readyz로 확인)"""
+    global _startup_task
     try:
         logger.info("=" * 80)
         logger.info("🚀 서버 시작 중...")
         logger.info("=" * 80)
         
-        # 벡터 DB 색인 스킵 (동기화 시 증분 색인으로 처리)
-        logger.info("📚 [1/3] 벡터 DB 색인 확인...")
-        try:
-            json_file_path = os.path.join(DOCS_DIR, "effort_estimations.json")
-            if os.path.exists(json_file_path):
-                # JSON 파일 정보 확인
-                import json
-                with open(json_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    total_items = len(data)
-                
-                logger.info(f"   📄 effort_estimations.json 파일 확인: {total_items}개 항목")
-                logger.info(f"   ℹ️ 색인은 Epic 동기화 시 자동으로 실행됩니다 (증분 색인)")
-                logger.info(f"   ℹ️ 수동 재색인이 필요하면 웹 UI에서 '데이터 재색인' 버튼 클릭")
-            else:
-                logger.warning("   ⚠️ effort_estimations.json 파일 없음")
-        except Exception as check_error:
-            logger.error(f"   ❌ 파일 확인 실패: {str(check_error)}")
-        
-        # 카테고리 자동 마이그레이션
-        logger.info("📂 [2/3] 카테고리 자동 마이그레이션 중...")
-        await auto_migrate_categories()
-        logger.info("   ✅ 카테고리 마이그레이션 완료")
+        # 공수 산정 데이터는 effort_manager가 이미 로드함 (파일을 다시 읽지 않고 건수만 확인)
+        logger.info("📚 [1/4] 공수 산정 데이터 확인...")
+        total_items = len(effort_manager.get_all_estimations())
+        logger.info(f"   📄 effort_estimations.json: {total_items}개 항목")
+        logger.info(f"   ℹ️ 색인은 Epic 동기화 시 자동으로 실행됩니다 (증분 색인)")
+        logger.info(f"   ℹ️ 수동 재색인이 필요하면 웹 UI에서 '데이터 재색인' 버튼 클릭")
         
         # Epic 자동 동기화 스케줄러 설정
-        logger.info("⏰ [3/3] 스케줄러 설정 중...")
+        logger.info("⏰ [2/4] 스케줄러 설정 중...")
         logger.info("   ✅ Epic 자동 동기화: Linux cron 사용 (매일 새벽 3시)")
         logger.info("   ℹ️ 수동 실행도 가능합니다")
         
+        # 카테고리 마이그레이션, 워밍업(벡터 DB/인덱스/분류 모델 등)은 백그라운드에서 진행
+        if STARTUP_PROFILE:
+            readiness.add("import_profile", "모듈별 import 시간 측정", required=False)
+        readiness.add("category_migration", "카테고리 자동 마이그레이션")
+        for name in WARMUP_COMPONENTS:
+            if name in WARMUP_STEPS:
+                readiness.add(name, WARMUP_STEPS[name][0])
+            else:
+                logger.warning(f"   ⚠️ 알 수 없는 워밍업 구성요소 (무시): {name}")
+        _startup_task = asyncio.create_task(run_deferred_startup())
+        
         logger.info("=" * 80)
-        logger.info("✅ 서버 기동 완료! 🎉")
+        logger.info(f"✅ 서버 기동 완료! 🎉 ({time.time() - PROCESS_START:.2f}초, 준비 작업은 백그라운드 진행: /readyz)")
         logger.info("=" * 80)
         
     except Exception as e:
@@ -155,26 +143,123 @@ async def startup_event():
         traceback.print_exc()
         logger.error(f"❌ Error during startup: {str(e)}")
 
+def _warm_up_vectordb() -> int:
+    """공수 벡터 DB 연결 (공유 인스턴스 생성 + 색인 여부 확인)"""
+    from ..data.database import get_vectordb
+    vectordb = get_vectordb()
+    if vectordb is None:
+        raise RuntimeError("벡터 DB 초기화 실패")
+    return vectordb._collection.count()
+
+def _warm_up_feedback_vectordb() -> int:
+    """피드백 벡터 DB 연결"""
+    from ..data.database import get_feedback_vectordb
+    vectordb = get_feedback_vectordb()
+    if vectordb is None:
+        raise RuntimeError("피드백 벡터 DB 초기화 실패")
+    return vectordb._collection.count()
+
+def _warm_up_query_index() -> int:
+    """공수 목록 조회 인덱스 생성"""
+    from ..services.effort_query import get_query_index
+    return len(get_query_index().rows)
+
+def _warm_up_customer_weights() -> int:
+    """고객사 가중치 로드 (QA 체인 모듈 import 포함)"""
+    from ..services.effort_qa import load_customer_weights
+    return len(load_customer_weights() or {})
+
+def _warm_up_embedding_ping() -> int:
+    """임베딩 API 1회 호출 (HTTP 연결/인증 예열)"""
+    from ..data.database import get_embedding_function
+    return len(get_embedding_function().embed_query("warm-up"))
+
+def _warm_up_classifier() -> bool:
+    """카테고리 분류 모델 로드 (저장된 모델 사용, 데이터가 바뀌었으면 백그라운드 재학습)"""
+    from ..services.category_classifier import classifier
+    if classifier.warm_up():
+        logger.info("   ✅ 저장된 분류 모델 로드 완료")
+        return True
+    logger.info("   ℹ️ 저장된 분류 모델 없음, 백그라운드에서 학습합니다")
+    return False
+
+# 워밍업 구성요소: 이름 → (설명, 준비 함수)
+WARMUP_STEPS = {
+    "vectordb": ("공수 벡터 DB 연결", _warm_up_vectordb),
+    "feedback_vectordb": ("피드백 벡터 DB 연결", _warm_up_feedback_vectordb),
+    "query_index": ("공수 목록 조회 인덱스 생성", _warm_up_query_index),
+    "customer_weights": ("고객사 가중치 로드", _warm_up_customer_weights),
+    "embedding_ping": ("임베딩 API 연결 예열", _warm_up_embedding_ping),
+    "category_classifier": ("카테고리 분류 모델 로드", _warm_up_classifier),
+}
+
+async def run_deferred_startup():
+    """기동 후 백그라운드 준비 작업 (단계별 상태는 readiness에 기록)"""
+    if STARTUP_PROFILE:
+        await readiness.run("import_profile", log_import_profile)
+    
+    logger.info("📂 [3/4] 카테고리 자동 마이그레이션 중... (백그라운드)")
+    await readiness.run("category_migration", auto_migrate_categories)
+    
+    logger.info(f"🔥 [4/4] 워밍업 중... (백그라운드: {', '.join(WARMUP_COMPONENTS) or '생략'})")
+    for name in WARMUP_COMPONENTS:
+        if name in WARMUP_STEPS:
+            result = await readiness.run(name, WARMUP_STEPS[name][1])
+            if result is not None:  # 실패한 단계는 readiness가 오류 로그를 남김
+                logger.info(f"   ✅ {WARMUP_STEPS[name][0]}: {result}")
+    
+    snapshot = readiness.snapshot()
+    if STARTUP_PROFILE:
+        for step in snapshot["steps"]:
+            logger.info(f"⏱️ [STARTUP_PROFILE] {step['name']}: {step['duration_ms']}ms ({step['status']})")
+    logger.info(f"✅ 백그라운드 준비 작업 완료 (기동 후 {snapshot['uptime_seconds']}초, 상태: {snapshot['status']})")
+    
+    # 필수 단계가 실패했으면 /readyz는 503(degraded), 성공할 때까지 간격을 늘려가며 재시도
+    delay = READINESS_RETRY_SECONDS
+    failed = readiness.failed_steps()
+    while failed:
+        logger.warning(f"⚠️ 실패한 기동 단계 {delay:.0f}초 후 재시도: {', '.join(failed)}")
+        await asyncio.sleep(delay)
+        failed = await readiness.retry_failed()
+        delay = min(delay * 2, READINESS_RETRY_MAX_SECONDS)
+    if delay != READINESS_RETRY_SECONDS:
+        logger.info(f"✅ 실패한 기동 단계 복구 완료 (기동 후 {readiness.snapshot()['uptime_seconds']}초)")
+
+@app.get("/healthz")
+async def liveness_probe():
+    """생존 확인 (프로세스가 요청을 받을 수 있으면 항상 200)"""
+    return {"status": "ok", "pid": os.getpid(), "uptime_seconds": round(time.time() - PROCESS_START, 1)}
+
+@app.get("/readyz")
+async def readiness_probe():
+    """준비 상태 확인 (필수 기동/워밍업 단계가 모두 끝나면 200, 진행 중이거나 실패 후 재시도 중(degraded)이면 503, 구성요소별 상태/소요 시간 포함)"""
+    snapshot = readiness.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료"""
     try:
+        from ..utils.slack_client import slack_client
+        from ..utils.slack_queue import slack_job_queue
+        await slack_job_queue.stop()
+        await slack_client.close()
         logger.info("✅ 서버 종료 완료")
     except Exception as e:
         logger.error(f"❌ 서버 종료 오류: {str(e)}")
 
-async def auto_migrate_categories():
-    """카테고리 변경 시 자동 마이그레이션"""
+def auto_migrate_categories():
+    """카테고리 변경 시 자동 마이그레이션 (기동 시 백그라운드 스레드에서 실행, 실패하면 예외를 다시 던져 readiness에 실패로 기록)"""
     try:
         logger.info("📊 카테고리 변경 감지 중...")
         
         # 현재 카테고리 로드
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
-        current_categories = category_manager.get_categories()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
+        category_manager.reload_if_changed()
+        valid_categories = category_manager.valid_triples
         
         # 기존 카테고리 파일 로드 (categories.json)
-        import os
         categories_file = os.path.join(DOCS_DIR, "categories.json")
         
         if not os.path.exists(categories_file):
@@ -185,8 +270,7 @@ async def auto_migrate_categories():
         estimations = effort_manager.get_all_estimations()
         
         # 카테고리 변경 감지 및 자동 마이그레이션
-        updated_count = 0
-        reset_count = 0
+        resets = []
         
         for estimation in estimations:
             if not estimation.major_category or not estimation.minor_category or not estimation.sub_category:
@@ -197,12 +281,8 @@ async def auto_migrate_categories():
             minor = estimation.minor_category
             sub = estimation.sub_category
             
-            # 대중소분류가 모두 정확히 일치하는지 확인
-            is_valid = (
-                major in current_categories and
-                minor in current_categories.get(major, {}) and
-                sub in current_categories.get(major, {}).get(minor, [])
-            )
+            # 대중소분류가 모두 정확히 일치하는지 확인 (유효 조합 set 조회)
+            is_valid = (major, minor, sub) in valid_categories
             
             if is_valid:
                 # 정확히 일치하는 경우: 그대로 유지 (변경 없음)
@@ -210,29 +290,28 @@ async def auto_migrate_categories():
             else:
                 # 하나라도 안 맞는 경우: 카테고리 초기화 (사용자가 다시 선택하도록)
                 logger.info(f"🔄 카테고리 초기화: {major} > {minor} > {sub} -> (초기화됨, 재선택 필요)")
-                estimation.major_category = None
-                estimation.minor_category = None
-                estimation.sub_category = None
-                reset_count += 1
+                resets.append((estimation, None, None, None))
         
-        if reset_count > 0:
-            # 변경사항 저장
-            effort_manager.save_data()
+        if resets:
+            # 변경사항 일괄 저장 (워커 간 단일 작성자 구간에서 1회)
+            reset_count = effort_manager.update_estimation_categories(resets)
             logger.info(f"✅ 카테고리 자동 마이그레이션 완료: {reset_count}개 데이터 카테고리 초기화 (재선택 필요)")
         else:
             logger.info("📊 카테고리 변경 사항 없음 (모든 카테고리가 정확히 일치함)")
         
     except Exception as e:
         logger.error(f"❌ 카테고리 자동 마이그레이션 오류: {str(e)}")
+        raise
 
 @app.post("/upload_pdf/")
 async def upload_pdf(file: UploadFile = File(...)):
     try:
+        from ..data.database import index_document
         file_path = os.path.join(DOCS_DIR, file.filename)
         with open(file_path, "wb") as f:
             shutil.copyfileobj(file.file, f)
             
-        if index_document(file_path, "pdf"):
+        if index_document(file_path, "pdf", family="pdf"):
             return {"message": f"'{file.filename}' indexed successfully"}
         else:
             return JSONResponse(status_code=500, content={"error": "Failed to index document"})
@@ -252,6 +331,7 @@ def extract_questions(text: str) -> set:
 @app.post("/upload_text/")
 async def upload_text(text: str = Form(...), source: str = Form(...)):
     try:
+        from ..data.database import index_document
         # 1. 입력값 검증
         if not text.strip():
             return JSONResponse(status_code=400, content={"error": "텍스트 내용이 비어있습니다."})
@@ -289,7 +369,7 @@ async def upload_text(text: str = Form(...), source: str = Form(...)):
             f.write(text.strip())
 
         # 4. 색인 처리 (database.py의 index_document 호출)
-        if index_document(txt_path, file_type="txt", force=True):
+        if index_document(txt_path, file_type="txt", force=True, family="text"):
             logger.info(f"✅ '{safe_source}' 텍스트 색인 완료")
             return {
                 "message": f"'{safe_source}' 텍스트가 성공적으로 추가되고 재색인되었습니다.",
@@ -306,6 +386,7 @@ async def upload_text(text: str = Form(...), source: str = Form(...)):
 @app.get("/indexed_files/")
 async def get_indexed_files_endpoint():
     try:
+        from ..data.database import get_indexed_files
         files = get_indexed_files()
         # Add download URLs for each file
         files_with_urls = [
@@ -397,6 +478,32 @@ async def slack_test_post(request: Request):
         logger.error(f"❌ 테스트 POST 오류: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+@app.get("/slack/metrics")
+async def slack_metrics():
+    """슬랙 질문 처리 큐 상태 및 메시지 전송 통계"""
+    try:
+        from ..utils.slack_client import slack_client
+        from ..utils.slack_queue import slack_job_queue
+        return {
+            "queue": slack_job_queue.get_metrics(),
+            "client": slack_client.get_stats()
+        }
+    except Exception as e:
+        logger.error(f"❌ 슬랙 통계 조회 오류: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+async def enqueue_slack_question(job_queue, job, event_id: str = None):
+    """슬랙 질문을 처리 큐에 넣고 접수 결과 안내 (즉시 응답 명령어는 안내 생략)"""
+    from ..utils.slack import is_quick_command
+    from ..utils.slack_queue import SUBMIT_QUEUED
+
+    status = job_queue.submit(job, event_id)
+    if status == SUBMIT_QUEUED and is_quick_command(job.text):
+        return status
+    # 안내 메시지는 Slack 3초 응답 제한에 걸리지 않도록 별도 태스크로 전송
+    asyncio.create_task(job_queue.notify(status, job))
+    return status
+
 @app.post("/slack/events")
 async def slack_event_listener(
     request: Request,
@@ -405,16 +512,17 @@ async def slack_event_listener(
     x_slack_retry_reason: str = Header(default=None)
 ):
     try:
+        from ..utils.slack import clean_mention
         # 요청 로깅
         logger.info(f"🔔 Slack 이벤트 수신 - Retry: {x_slack_retry_num}, Reason: {x_slack_retry_reason}")
         
         data = await request.json()
         logger.info(f"📦 수신된 데이터: {data}")
 
-        # 중복 전송 방지
-        if x_slack_retry_num:
-            logger.info("⏭️ 중복 요청으로 인한 스킵")
-            return {"status": "ok"}
+        # 중복 전송 방지는 질문 처리 큐에서 event_id/message_ts로 처리
+        # (재전송 헤더만으로 스킵하면 첫 요청이 실패한 정상 재시도까지 버려짐)
+        from ..utils.slack_queue import slack_job_queue, SlackJob
+        event_id = data.get("event_id")
 
         # Slack URL 인증
         if data.get("type") == "url_verification":
@@ -436,20 +544,23 @@ async def slack_event_listener(
                 thread_ts = event.get("thread_ts", event.get("ts"))
                 text = clean_mention(event.get("text", ""))
                 logger.info(f"📥 채널 수신된 메시지 {user}: {text}")
-                background_tasks.add_task(handle_slack_message, text, channel, thread_ts, event.get("ts"))
+                await enqueue_slack_question(slack_job_queue, SlackJob(text, channel, thread_ts, event.get("ts"), user), event_id)
 
             # DM 메시지
             elif event_type == "message" and event.get("channel_type") == "im" and not event.get("bot_id"):
                 channel = event.get("channel")
                 text = clean_mention(event.get("text", ""))  # 멘션 제거 추가
                 logger.info(f"📥 앱 메세지 탭 수신된 메시지 {user} : {text}")
-                background_tasks.add_task(handle_slack_message, text, channel, None, event.get("ts"))
+                await enqueue_slack_question(slack_job_queue, SlackJob(text, channel, None, event.get("ts"), user), event_id)
             
             # 이모지 리액션 이벤트 (피드백 수집)
             elif event_type == "reaction_added":
                 logger.info(f"👍 reaction_added 이벤트 수신! reaction={event.get('reaction')}, item={event.get('item')}")
                 from ..utils.slack import handle_slack_reaction
-                background_tasks.add_task(handle_slack_reaction, event)
+                if slack_job_queue.mark_seen(event_id):
+                    background_tasks.add_task(handle_slack_reaction, event)
+                else:
+                    logger.info(f"⏭️ 중복 리액션 이벤트 스킵: {event_id}")
             
             else:
                 logger.info(f"ℹ️ 처리되지 않은 이벤트 타입: {event_type}")
@@ -468,6 +579,7 @@ async def slack_event_listener(
 @app.delete("/files/{filename}")
 async def delete_file(filename: str):
     try:
+        from ..data.database import remove_document
         # Validate file extension
         if not filename.endswith((".pdf", ".txt")):
             return JSONResponse(
@@ -495,43 +607,29 @@ async def delete_file(filename: str):
 @app.post("/indexed_files")
 async def reindex_all_files():
     try:
+        from ..data.index_builder import rebuild_vector_index
         logger.info("🔄 Starting complete reindexing process...")
         
-        # First, reset the Chroma DB
-        if not reset_vectordb():
-            return JSONResponse(
-                status_code=500,
-                content={"error": "Failed to reset database"}
-            )
-        
-        logger.info("🗑️ Database reset complete, starting reindexing...")
-        indexed_count = 0
-        error_count = 0
-        
-        # Get list of all files
-        for filename in os.listdir(DOCS_DIR):
+        # 새 빌드 디렉토리에 전체 문서를 색인하고 검증 후 전환 (재색인 중에도 현재 색인으로 질의 가능)
+        files = []
+        for filename in sorted(os.listdir(DOCS_DIR)):
             if filename.endswith((".pdf", ".txt")):
-                file_path = os.path.join(DOCS_DIR, filename)
-                file_type = "pdf" if filename.endswith(".pdf") else "txt"
-                
-                try:
-                    # No need for force=True since DB is fresh
-                    if index_document(file_path, file_type):
-                        indexed_count += 1
-                        logger.info(f"✅ Indexed: {filename}")
-                    else:
-                        error_count += 1
-                        logger.error(f"❌ Failed to index: {filename}")
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"❌ Error indexing {filename}: {str(e)}")
+                files.append((os.path.join(DOCS_DIR, filename), "pdf" if filename.endswith(".pdf") else "txt"))
+        json_file_path = os.path.join(DOCS_DIR, "effort_estimations.json")
+        if os.path.exists(json_file_path):
+            files.append((json_file_path, "json"))
+        
+        result = await asyncio.to_thread(rebuild_vector_index, files, False)
+        if not result["success"]:
+            return JSONResponse(status_code=500, content={"error": result["error"]})
         
-        message = f"전체 재색인 완료: {indexed_count}개 성공"
+        error_count = len(result["load_errors"])
+        message = f"전체 재색인 완료: {len(files) - error_count}개 성공"
         if error_count > 0:
             message += f", {error_count}개 실패"
             
         logger.info(message)
-        return {"message": message}
+        return {"message": message, "build_id": result["build_id"], "documents": result["indexed"]}
         
     except Exception as e:
         error_msg = f"❌ Error during reindexing: {str(e)}"
@@ -541,6 +639,9 @@ async def reindex_all_files():
 @app.post("/index_url/")
 async def upload_url(url: str = Form(...), source: str = Form(default="web")):
     try:
+        import requests
+        from bs4 import BeautifulSoup
+        from ..data.database import index_document
         logger.info(f"🌐 URL 크롤링 요청: {url}")
 
         # ✅ 웹 페이지 요청 및 파싱
@@ -586,7 +687,7 @@ async def upload_url(url: str = Form(...), source: str = Form(default="web")):
             f.write(text)
 
         # ✅ 색인 처리
-        if index_document(txt_path, "txt", force=True):
+        if index_document(txt_path, "txt", force=True, family="web"):
             return {"message": f"'{url}' 크롤링 및 색인 성공", "source": txt_filename}
         else:
             return JSONResponse(status_code=500, content={"error": "문서 색인 실패"})
@@ -595,6 +696,28 @@ async def upload_url(url: str = Form(...), source: str = Form(default="web")):
         logger.error(f"❌ upload_url 오류: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.get("/documents/search/")
+async def search_documents_endpoint(query: str, k: int = 4):
+    """문서 검색 (업로드 PDF/텍스트/크롤링 페이지 컬렉션만, 공수 티켓 제외)"""
+    try:
+        from ..data.database import search_documents
+        results = await asyncio.to_thread(search_documents, query, k)
+        return {
+            "query": query,
+            "results": [
+                {
+                    "source": doc.metadata.get("source", ""),
+                    "family": doc.metadata.get("family", ""),
+                    "content": doc.page_content,
+                    "distance": round(float(distance), 4),
+                }
+                for doc, distance in results
+            ]
+        }
+    except Exception as e:
+        logger.error(f"❌ 문서 검색 오류: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
 # ask_preview 엔드포인트 제거됨
 
 # ==================== 공수 산정 관련 엔드포인트 ====================
@@ -615,6 +738,8 @@ async def add_effort_estimation(
 ):
     """수동으로 공수 산정 데이터 추가 (Story Point 기반)"""
     try:
+        from ..data.database import index_document
+        from ..services.category_classifier import auto_classify
         # 기술 스택 파싱
         tech_stack_list = None
         if tech_stack:
@@ -666,33 +791,10 @@ async def add_effort_estimation(
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 def save_web_qa_mapping(question: str, answer: str, sources: list = None):
-    """웹 QA 매핑 저장"""
+    """웹 QA 매핑 저장 (QA 저장소에 1건 추가)"""
     try:
-        web_mapping_file = os.path.join(DOCS_DIR, "web_qa_mapping.json")
-        
-        # 기존 매핑 로드
-        web_qa_mapping = {}
-        if os.path.exists(web_mapping_file):
-            try:
-                with open(web_mapping_file, 'r', encoding='utf-8') as f:
-                    web_qa_mapping = json.load(f)
-            except (json.JSONDecodeError, Exception) as e:
-                logger.warning(f"⚠️ 웹 QA 매핑 파일 읽기 오류: {e}, 빈 딕셔너리로 시작")
-                web_qa_mapping = {}
-        
-        # 새로운 QA 항목 추가 (타임스탬프를 키로 사용)
-        qa_id = datetime.now().isoformat()
-        web_qa_mapping[qa_id] = {
-            "question": question,
-            "answer": answer,
-            "sources": sources or [],
-            "timestamp": qa_id,
-            "source": "web"
-        }
-        
-        # 파일 저장
-        with open(web_mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(web_qa_mapping, f, ensure_ascii=False, indent=2)
+        from ..data.qa_store import save_web_qa
+        save_web_qa(question, answer, sources)
         
         logger.info(f"💾 웹 QA 매핑 저장: {question[:30]}...")
         return True
@@ -704,6 +806,7 @@ def save_web_qa_mapping(question: str, answer: str, sources: list = None):
 async def ask_effort_question(question: str = Form(...)):
     """공수 산정 관련 질문"""
     try:
+        from ..services.effort_qa import run_effort_qa_chain
         logger.info(f"💬 공수 산정 질문 수신: {question}")
         
         try:
@@ -740,10 +843,46 @@ async def ask_effort_question(question: str = Form(...)):
         logger.error(f"❌ 공수 산정 질문 처리 오류: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.post("/effort/ask/batch")
+async def ask_effort_batch(request: dict):
+    """요구사항 목록 일괄 공수 산정
+
+    요청: {"lines": [...]} 또는 {"text": "줄바꿈으로 구분한 목록"}, "customer": 고객사명(선택), "stream": true(기본)
+    stream이면 줄이 끝나는 순서대로 NDJSON(start → line... → summary), 아니면 전체 결과 JSON
+    """
+    try:
+        from ..services.effort_batch import parse_requirement_lines, stream_effort_batch, run_effort_batch
+        from ..utils.config import EFFORT_BATCH_MAX_LINES
+        lines = parse_requirement_lines(request.get("lines") or request.get("text") or "")
+        customer = request.get("customer") or None
+        if not lines:
+            return JSONResponse(status_code=400, content={"error": "요구사항 목록이 비어 있습니다."})
+        if len(lines) > EFFORT_BATCH_MAX_LINES:
+            return JSONResponse(status_code=400, content={"error": f"요구사항은 최대 {EFFORT_BATCH_MAX_LINES}줄까지 처리할 수 있습니다 (입력: {len(lines)}줄)"})
+        logger.info(f"📋 일괄 공수 산정 요청: {len(lines)}줄 (고객사: {customer})")
+
+        if not request.get("stream", True):
+            return await run_effort_batch(lines, customer)
+
+        async def ndjson():
+            try:
+                async for event in stream_effort_batch(lines, customer):
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+            except Exception as e:
+                logger.error(f"❌ 일괄 공수 산정 스트리밍 오류: {str(e)}")
+                yield json.dumps({"type": "error", "error": str(e)}, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    except Exception as e:
+        logger.error(f"❌ 일괄 공수 산정 오류: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
 @app.post("/effort/ask-feedback/")
 async def ask_effort_question_with_feedback(request: dict):
     """피드백 기반 공수 산정 질문 재검색"""
     try:
+        from ..services.effort_qa import run_effort_qa_with_feedback
         question = request.get("question", "")
         excluded_sources = request.get("excluded_sources", [])
         
@@ -782,12 +921,31 @@ async def ask_effort_question_with_feedback(request: dict):
 async def get_effort_statistics_endpoint():
     """공수 산정 통계 조회"""
     try:
+        from ..services.effort_qa import get_effort_statistics
         stats = get_effort_statistics()
         return stats
     except Exception as e:
         logger.error(f"❌ 공수 산정 통계 조회 오류: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.get("/effort/memory-report/")
+async def get_effort_memory_report():
+    """워커 프로세스별 공수 산정 데이터 메모리 사용량 조회"""
+    try:
+        from ..services.effort_query import get_query_index
+        index = get_query_index()
+        return {
+            **effort_manager.memory_report(),
+            "query_index": {
+                "version": index.version,
+                "row_count": len(index.rows),
+                "bytes": index.memory_usage(),
+            }
+        }
+    except Exception as e:
+        logger.error(f"❌ 메모리 사용량 조회 오류: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
 @app.get("/effort/feedback-statistics/weekly-positive-ratio/")
 async def get_feedback_weekly_positive_ratio_endpoint():
     """주 단위 긍정 피드백 비율 통계 조회"""
@@ -803,12 +961,27 @@ async def get_feedback_weekly_positive_ratio_endpoint():
 async def search_effort_features(feature_name: str):
     """기능명으로 공수 산정 데이터 검색"""
     try:
+        from ..services.effort_qa import search_similar_features
         results = search_similar_features(feature_name)
         return {"feature_name": feature_name, "results": results}
     except Exception as e:
         logger.error(f"❌ 공수 산정 검색 오류: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.get("/effort/estimate/")
+async def estimate_effort_endpoint(query: str, customer: Optional[str] = None, k: int = 12):
+    """유사 작업 Story Points 통계로 예상 공수 추정 (가중 중앙값, p25~p75 범위, 이상치, 고객사 버퍼)"""
+    try:
+        from ..services.effort_estimator import estimate_effort
+        # 임베딩 API 호출/벡터 검색이 있으므로 스레드에서 실행 (이벤트 루프 차단 방지)
+        result = await asyncio.to_thread(estimate_effort, query, customer=customer, k=max(1, min(k, 50)))
+        if "error" in result:
+            return JSONResponse(status_code=500, content={"error": result["error"]})
+        return result
+    except Exception as e:
+        logger.error(f"❌ 공수 추정 오류: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
 @app.get("/effort/debug-search/")
 async def debug_search_effort_features(query: str):
     """디버깅용 공수 산정 데이터 검색"""
@@ -843,25 +1016,30 @@ async def debug_search_effort_features(query: str):
 
 @app.get("/effort/vector-status/")
 async def get_vector_db_status():
-    """벡터 DB 상태 확인"""
+    """벡터 DB 상태 확인 (계열 컬렉션별 문서 수 포함)"""
     try:
+        from ..data.database import get_all_vectordbs
         logger.info("🔍 벡터 DB 상태 확인 시작")
         
-        vectordb = get_vectordb()
-        collection = vectordb.get()
-        
-        # 소스별 문서 수 집계
+        # 컬렉션별/소스별 문서 수 집계
         source_counts = {}
-        for metadata in collection["metadatas"]:
-            if isinstance(metadata, dict):
-                source = metadata.get("source", "unknown")
-                source_counts[source] = source_counts.get(source, 0) + 1
-        
-        logger.info(f"📊 벡터 DB 전체 문서 수: {len(collection['ids'])}")
+        collection_counts = {}
+        for name, vectordb in get_all_vectordbs().items():
+            collection = vectordb.get(include=["metadatas"])
+            collection_counts[name] = len(collection["ids"])
+            for metadata in collection["metadatas"]:
+                if isinstance(metadata, dict):
+                    source = metadata.get("source", "unknown")
+                    source_counts[source] = source_counts.get(source, 0) + 1
+        total_documents = sum(collection_counts.values())
+        
+        logger.info(f"📊 벡터 DB 전체 문서 수: {total_documents}")
+        logger.info(f"📊 컬렉션별 문서 수: {collection_counts}")
         logger.info(f"📊 소스별 문서 수: {source_counts}")
         
         return {
-            "total_documents": len(collection['ids']),
+            "total_documents": total_documents,
+            "collection_counts": collection_counts,
             "source_counts": source_counts,
             "sources": list(source_counts.keys())
         }
@@ -873,9 +1051,10 @@ async def get_vector_db_status():
 async def cleanup_temp_files():
     """TEMP.txt 파일 벡터 DB에서 제거"""
     try:
+        from ..data.database import get_vectordb
         logger.info("🧹 TEMP.txt 파일 정리 시작")
         
-        vectordb = get_vectordb()
+        vectordb = get_vectordb("text")  # upload_text 기본 소스 (붙여넣은 텍스트 컬렉션)
         collection = vectordb.get()
         
         # TEMP.txt 관련 문서 ID 찾기
@@ -905,8 +1084,9 @@ async def cleanup_temp_files():
 
 @app.post("/effort/reindex/")
 async def reindex_effort_data():
-    """공수 산정 데이터 재인덱싱"""
+    """공수 산정 데이터 재인덱싱 (새 색인을 만들어 검증 후 전환, 실패 시 현재 색인 유지)"""
     try:
+        from ..data.index_builder import rebuild_vector_index
         logger.info("🔄 공수 산정 데이터 재인덱싱 시작")
         
         # effort_estimations.txt 파일 재인덱싱
@@ -915,30 +1095,21 @@ async def reindex_effort_data():
         if os.path.exists(effort_file_path):
             logger.info(f"📄 effort_estimations.txt 파일 발견: {effort_file_path}")
             
-            # 강제 재인덱싱
-            if index_document(effort_file_path, file_type="txt", force=True):
+            result = await asyncio.to_thread(rebuild_vector_index, [(effort_file_path, "txt")])
+            if result["success"]:
                 logger.info("✅ effort_estimations.txt 재인덱싱 완료")
-                
-                # 벡터 DB 상태 확인
-                vectordb = get_vectordb()
-                collection = vectordb.get()
-                logger.info(f"📊 벡터 DB 문서 수: {len(collection['ids'])}")
-                
-                # effort_estimations.txt 관련 문서 수 확인
-                effort_docs = 0
-                for metadata in collection["metadatas"]:
-                    if isinstance(metadata, dict) and metadata.get("source") == "effort_estimations.txt":
-                        effort_docs += 1
-                
-                logger.info(f"📊 effort_estimations.txt 문서 수: {effort_docs}")
+                validation = result["validation"]
+                effort_docs = validation["sources"].get("effort_estimations.txt", {}).get("new", 0)
+                logger.info(f"📊 벡터 DB 문서 수: {validation['total']}, effort_estimations.txt 문서 수: {effort_docs}")
                 
                 return {
                     "message": "공수 산정 데이터 재인덱싱 완료",
-                    "total_documents": len(collection['ids']),
-                    "effort_documents": effort_docs
+                    "total_documents": validation["total"],
+                    "effort_documents": effort_docs,
+                    "build_id": result["build_id"],
                 }
             else:
-                return JSONResponse(status_code=500, content={"error": "재인덱싱 실패"})
+                return JSONResponse(status_code=500, content={"error": f"재인덱싱 실패: {result['error']}"})
         else:
             return JSONResponse(status_code=404, content={"error": "effort_estimations.txt 파일을 찾을 수 없습니다"})
             
@@ -946,10 +1117,35 @@ async def reindex_effort_data():
         logger.error(f"❌ 재인덱싱 오류: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.get("/effort/reindex/status")
+async def get_reindex_status():
+    """메인 색인 상태 (현재 색인 경로, 재색인 진행 상태/검증 결과, 남아 있는 빌드)"""
+    try:
+        from ..data.index_builder import get_index_status
+        return get_index_status()
+    except Exception as e:
+        logger.error(f"❌ 색인 상태 조회 오류: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/effort/reindex/rollback")
+async def rollback_reindex():
+    """직전 색인으로 되돌리기"""
+    try:
+        from ..data.index_builder import rollback_vector_index
+        result = rollback_vector_index()
+        if not result["success"]:
+            return JSONResponse(status_code=400, content={"error": result["error"]})
+        return result
+    except Exception as e:
+        logger.error(f"❌ 색인 롤백 오류: {str(e)}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
 @app.post("/effort/sync-jira/")
 async def sync_jira_data(request: Request):
     """Jira 티켓 데이터 동기화"""
     try:
+        from ..data.database import index_document
+        from ..services.jira_integration import create_jira_integration
         # 요청 데이터 로깅
         logger.info(f"🔄 Jira 동기화 요청 수신 시작")
         
@@ -1019,53 +1215,41 @@ async def list_effort_estimations(
     minor_category: str = None,
     sub_category: str = None,
     search: str = None,
+    sort_by: str = None,
+    sort_order: str = "asc",
     page: int = 1,
-    page_size: int = 100
+    page_size: int = 100,
+    cursor: str = None
 ):
-    """공수 산정 데이터 목록 조회 (카테고리 필터링 지원)"""
+    """공수 산정 데이터 목록 조회 (카테고리 필터, 검색, 정렬, 페이지/커서 페이지네이션 지원)"""
     try:
-        estimations = effort_manager.get_all_estimations()
+        from ..services.effort_query import get_query_index
         
-        # 검색 적용 (제목 또는 Jira 티켓)
-        if search:
-            search_term = search.lower().strip()
-            filtered_estimations = []
-            for estimation in estimations:
-                # 제목에서 검색
-                if search_term in estimation.title.lower():
-                    filtered_estimations.append(estimation)
-                # Jira 티켓에서 검색
-                elif estimation.jira_ticket and search_term in estimation.jira_ticket.lower():
-                    filtered_estimations.append(estimation)
-            estimations = filtered_estimations
+        try:
+            result = get_query_index().query(
+                major_category=major_category,
+                minor_category=minor_category,
+                sub_category=sub_category,
+                search=search,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                page=page,
+                page_size=page_size,
+                cursor=cursor
+            )
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
         
         # 페이징 처리
-        total_count = len(estimations)
+        total_count = result["total_count"]
+        page_size = max(1, page_size)
         total_pages = (total_count + page_size - 1) // page_size  # 올림 계산
-        
-        # 페이지 범위 계산
-        start_index = (page - 1) * page_size
-        end_index = start_index + page_size
-        
-        # 현재 페이지 데이터 추출
-        paginated_estimations = estimations[start_index:end_index]
-        
-        # 넘버링 추가 (전체 데이터 기준)
-        for i, estimation in enumerate(paginated_estimations):
-            estimation.sequence_number = start_index + i + 1
-        
-        # 데이터 목록용: description과 comments 제외 (응답 크기 축소)
-        estimations_data = []
-        for estimation in paginated_estimations:
-            est_dict = estimation.__dict__.copy()
-            # description과 comments 제외 (긴 텍스트)
-            est_dict.pop('description', None)
-            est_dict.pop('comments', None)
-            estimations_data.append(est_dict)
+        if cursor:
+            page = result["start_index"] // page_size + 1
         
         jira_url = os.getenv('JIRA_URL', 'https://enomix.atlassian.net')
         return {
-            "estimations": estimations_data,
+            "estimations": result["estimations"],
             "jira_url": jira_url,
             "pagination": {
                 "current_page": page,
@@ -1073,7 +1257,8 @@ async def list_effort_estimations(
                 "total_count": total_count,
                 "total_pages": total_pages,
                 "has_previous": page > 1,
-                "has_next": page < total_pages
+                "has_next": page < total_pages,
+                "next_cursor": result["next_cursor"]
             }
         }
     except Exception as e:
@@ -1082,9 +1267,15 @@ async def list_effort_estimations(
 
 # 카테고리 관리 API
 @app.post("/effort/auto-classify/")
-async def auto_classify_estimations():
-    """미분류 데이터 자동 분류"""
+async def auto_classify_estimations(top_k: int = 1):
+    """미분류 데이터 자동 분류 (전체 미분류 데이터를 한 번에 예측, 저장 1회)
+    
+    Args:
+        top_k: 결과 예시에 함께 보여줄 후보 카테고리 수 (1이면 최상위만)
+    """
     try:
+        from ..services.category_classifier import auto_classify_batch
+        
         estimations = effort_manager.get_all_estimations()
         
         # 미분류 데이터 필터링 (카테고리가 없는 경우)
@@ -1095,59 +1286,57 @@ async def auto_classify_estimations():
         
         logger.info(f"미분류 데이터: {len(unclassified)}개")
         
+        # 제목과 비고를 함께 사용하여 한 번에 분류
+        texts = [est.title + (" " + est.notes if est.notes else "") for est in unclassified]
+        tickets = [est.jira_ticket for est in unclassified]
+        labels, confidences = auto_classify_batch(texts, top_k=max(1, top_k), tickets=tickets) if texts else (None, None)
+        
         # 자동 분류 실행
         classified_count = 0
         total_confidence = 0
+        updates = []
         
         # 신뢰도별 카테고리 분류
         low_confidence = []  # 0.1 ~ 0.3
         medium_confidence = []  # 0.3 ~ 0.5
         high_confidence = []  # 0.5 이상
-        
-        for estimation in unclassified:
-            # 제목과 설명을 모두 사용하여 분류
-            classification_text = estimation.title
-            if estimation.notes:
-                classification_text += " " + estimation.notes
-            
-            predicted_category, confidence = auto_classify(classification_text)
-            
-            # confidence를 명시적으로 float로 변환
-            try:
-                conf_float = float(confidence) if confidence is not None else 0.0
-                conf_str = f"{conf_float:.2f}"
-            except Exception as e:
-                logger.error(f"❌ confidence 변환 오류: {e}, confidence={confidence}, type={type(confidence)}")
-                conf_float = 0.0
-                conf_str = "0.00"
+        alternatives = {}  # 제목 → 후보 카테고리 (top_k > 1)
+        
+        for i, estimation in enumerate(unclassified):
+            if labels is None:
+                break
+            predicted_category = str(labels[i][0])
+            conf_float = float(confidences[i][0])
+            if top_k > 1:
+                alternatives[estimation.title] = [
+                    {"category": str(label), "confidence": round(float(conf), 2)}
+                    for label, conf in zip(labels[i], confidences[i])
+                ]
             
-            if predicted_category and conf_float >= 0.5:
+            if conf_float >= 0.5:
                 # 높은 신뢰도: 자동 적용
                 category_parts = predicted_category.split(' > ')
                 if len(category_parts) >= 3:
-                    estimation.major_category = category_parts[0]
-                    estimation.minor_category = category_parts[1]
-                    estimation.sub_category = category_parts[2]
+                    updates.append((estimation, category_parts[0], category_parts[1], category_parts[2]))
                     classified_count += 1
                     total_confidence += conf_float
                     high_confidence.append((estimation.title, predicted_category, conf_float))
-                    logger.info(f"✅ 자동 분류 (높음): {estimation.title} -> {predicted_category} (신뢰도: {conf_str})")
-            elif predicted_category and conf_float >= 0.3:
+            elif conf_float >= 0.3:
                 # 중간 신뢰도: 사용자 확인 후 적용
                 medium_confidence.append((estimation.title, predicted_category, conf_float))
-                logger.info(f"⚠️ 신뢰도 중간: {estimation.title} -> {predicted_category} (신뢰도: {conf_str})")
-            elif predicted_category and conf_float >= 0.1:
+            elif conf_float >= 0.1:
                 # 낮은 신뢰도: 제안만
                 low_confidence.append((estimation.title, predicted_category, conf_float))
-                logger.info(f"📝 신뢰도 낮음: {estimation.title} -> {predicted_category} (신뢰도: {conf_str})")
-            else:
-                logger.info(f"❌ 분류 실패: {estimation.title} (신뢰도: {conf_str if conf_float else 'N/A'})")
+        
+        logger.info(f"✅ 자동 분류 결과: 높음 {len(high_confidence)}개, 중간 {len(medium_confidence)}개, "
+                    f"낮음 {len(low_confidence)}개, 실패 {len(unclassified) - len(high_confidence) - len(medium_confidence) - len(low_confidence)}개")
         
         # 평균 신뢰도 계산
         avg_confidence = total_confidence / classified_count if classified_count > 0 else 0
         
-        # 변경사항 저장
-        effort_manager.save_data()
+        # 변경사항 일괄 저장 (높은 신뢰도 결과만 적용)
+        if updates:
+            effort_manager.update_estimation_categories(updates)
         
         # 튜플을 딕셔너리로 변환 (JSON 직렬화 가능하도록)
         def tuple_to_dict(tup_list):
@@ -1155,7 +1344,8 @@ async def auto_classify_estimations():
                 {
                     "title": str(tup[0]),
                     "category": str(tup[1]),
-                    "confidence": round(float(tup[2]), 2)
+                    "confidence": round(float(tup[2]), 2),
+                    **({"alternatives": alternatives[tup[0]]} if tup[0] in alternatives else {})
                 }
                 for tup in tup_list
             ]
@@ -1181,8 +1371,8 @@ async def auto_classify_estimations():
 async def get_categories():
     """카테고리 구조 조회"""
     try:
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
         return category_manager.get_categories()
     except Exception as e:
         logger.error(f"❌ 카테고리 조회 오류: {str(e)}")
@@ -1192,8 +1382,8 @@ async def get_categories():
 async def get_major_categories():
     """대분류 목록 조회"""
     try:
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
         return {"categories": category_manager.get_major_categories()}
     except Exception as e:
         logger.error(f"❌ 대분류 조회 오류: {str(e)}")
@@ -1203,8 +1393,8 @@ async def get_major_categories():
 async def get_minor_categories(major: str):
     """중분류 목록 조회"""
     try:
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
         return {"categories": category_manager.get_minor_categories(major)}
     except Exception as e:
         logger.error(f"❌ 중분류 조회 오류: {str(e)}")
@@ -1214,8 +1404,8 @@ async def get_minor_categories(major: str):
 async def get_sub_categories(major: str, minor: str):
     """소분류 목록 조회"""
     try:
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
         return {"categories": category_manager.get_sub_categories(major, minor)}
     except Exception as e:
         logger.error(f"❌ 소분류 조회 오류: {str(e)}")
@@ -1233,8 +1423,8 @@ async def add_category(request: Request):
         if not all([major, minor, sub]):
             return JSONResponse(status_code=400, content={"error": "대분류, 중분류, 소분류가 모두 필요합니다"})
         
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
         category_manager.add_category(major, minor, sub)
         
         return {"message": "카테고리가 추가되었습니다"}
@@ -1257,8 +1447,8 @@ async def update_category(request: Request):
         if not all([old_major, old_minor, old_sub, new_major, new_minor, new_sub]):
             return JSONResponse(status_code=400, content={"error": "모든 필드가 필요합니다"})
         
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
         category_manager.update_category(old_major, old_minor, old_sub, new_major, new_minor, new_sub)
         
         return {"message": "카테고리가 수정되었습니다"}
@@ -1278,8 +1468,8 @@ async def delete_category(request: Request):
         if not all([major, minor, sub]):
             return JSONResponse(status_code=400, content={"error": "대분류, 중분류, 소분류가 모두 필요합니다"})
         
-        from ..services.effort_estimation import CategoryManager
-        category_manager = CategoryManager()
+        from ..services.effort_estimation import get_category_manager
+        category_manager = get_category_manager()
         category_manager.delete_category(major, minor, sub)
         
         return {"message": "카테고리가 삭제되었습니다"}
@@ -1345,6 +1535,7 @@ async def delete_effort_estimation(jira_ticket: str):
 async def sync_epic_data(request: Request):
     """Epic 하위 작업 동기화"""
     try:
+        from ..services.jira_integration import create_jira_integration
         # 요청 데이터 로깅
         logger.info(f"🔄 Epic 동기화 요청 수신 시작")
         
@@ -1505,27 +1696,28 @@ def save_scheduler_history(scheduler_name: str, status: str, details: dict, star
         
         history_file = os.path.join(DOCS_DIR, "scheduler_history.json")
         
-        # 기존 이력 로드
-        history = []
-        if os.path.exists(history_file):
-            with open(history_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-        
-        # 새 이력 추가
-        history.append({
-            "scheduler_name": scheduler_name,
-            "status": status,  # "success" or "failed"
-            "start_time": start_time.isoformat() if start_time else datetime.now().isoformat(),
-            "end_time": end_time.isoformat() if end_time else datetime.now().isoformat(),
-            "details": details
-        })
-        
-        # 최근 100개만 유지
-        history = history[-100:]
-        
-        # 저장
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
+        # 워커 간 읽기-수정-쓰기 직렬화
+        with get_lock("scheduler_history"):
+            # 기존 이력 로드
+            history = []
+            if os.path.exists(history_file):
+                with open(history_file, 'r', encoding='utf-8') as f:
+                    history = json.load(f)
+            
+            # 새 이력 추가
+            history.append({
+                "scheduler_name": scheduler_name,
+                "status": status,  # "success" or "failed"
+                "start_time": start_time.isoformat() if start_time else datetime.now().isoformat(),
+                "end_time": end_time.isoformat() if end_time else datetime.now().isoformat(),
+                "details": details
+            })
+            
+            # 최근 100개만 유지
+            history = history[-100:]
+            
+            # 저장 (원자적 교체)
+            atomic_write_json(history_file, history, indent=2)
         
         logger.info(f"✅ 스케줄러 이력 저장: {scheduler_name} - {status}")
         
@@ -1535,6 +1727,7 @@ def save_scheduler_history(scheduler_name: str, status: str, details: dict, star
 def sync_completed_epics_background():
     """완료된 Epic 자동 동기화 백그라운드 작업 (ENOMIX 프로젝트만)"""
     global sync_status
+    from ..services.jira_integration import create_jira_integration
     
     start_time = datetime.now()
     
@@ -1546,20 +1739,23 @@ def sync_completed_epics_background():
         logger.info("💾 동기화 시작 전 데이터 백업 중...")
         effort_manager.backup_data()
         
-        # 상태 초기화
-        sync_status["is_running"] = True
-        sync_status["progress"] = 0
-        sync_status["completed_epics"] = 0
-        sync_status["failed_epics"] = 0
-        sync_status["skipped_epics"] = 0
-        sync_status["current_epic"] = ""
-        sync_status["message"] = f"Jira에서 완료된 Epic 검색 중 (ENOMIX 프로젝트)..."
-        sync_status["failed_list"] = []
+        # 상태 초기화 (한 번에 기록)
+        sync_status.update(
+            is_running=True,
+            owner_pid=os.getpid(),
+            progress=0,
+            total_epics=0,
+            completed_epics=0,
+            failed_epics=0,
+            skipped_epics=0,
+            current_epic="",
+            message=f"Jira에서 완료된 Epic 검색 중 (ENOMIX 프로젝트)...",
+            failed_list=[]
+        )
         
         jira = create_jira_integration()
         if not jira:
-            sync_status["is_running"] = False
-            sync_status["message"] = "Jira 설정이 없습니다"
+            sync_status.update(is_running=False, message="Jira 설정이 없습니다")
             logger.error("❌ Jira 설정이 없습니다")
             return
         
@@ -1570,14 +1766,11 @@ def sync_completed_epics_background():
         completed_epics = jira.search_completed_epics()
         
         if not completed_epics:
-            sync_status["is_running"] = False
-            sync_status["message"] = "완료된 Epic이 없습니다"
-            sync_status["progress"] = 100
+            sync_status.update(is_running=False, message="완료된 Epic이 없습니다", progress=100)
             logger.info("ℹ️ 완료된 Epic이 없습니다")
             return
         
-        sync_status["total_epics"] = len(completed_epics)
-        sync_status["message"] = f"{len(completed_epics)}개 Epic 동기화 시작"
+        sync_status.update(total_epics=len(completed_epics), message=f"{len(completed_epics)}개 Epic 동기화 시작")
         logger.info(f"🔍 완료된 Epic {len(completed_epics)}개 발견")
         
         # 2. 각 Epic 동기화
@@ -1590,18 +1783,20 @@ def sync_completed_epics_background():
                 from ..services.effort_estimation import effort_manager
                 already_synced = any(
                     est.epic_key == epic_key 
-                    for est in effort_manager.estimations
+                    for est in effort_manager.get_all_estimations()
                 )
                 
                 if already_synced:
                     logger.info(f"⏭️ Epic 스킵 (이미 동기화됨): {epic_key} - {epic['summary'][:50]}...")
                     skipped_epics += 1
                     sync_status["skipped_epics"] = skipped_epics  # 전역 상태에 저장
-                    sync_status["completed_epics"] += 1  # 스킵도 완료로 카운트
+                    sync_status.increment("completed_epics")  # 스킵도 완료로 카운트
                     continue
                 
-                sync_status["current_epic"] = f"{epic_key} - {epic['summary'][:30]}..."
-                sync_status["message"] = f"동기화 중: {epic_key} ({idx}/{len(completed_epics)})"
+                sync_status.update(
+                    current_epic=f"{epic_key} - {epic['summary'][:30]}...",
+                    message=f"동기화 중: {epic_key} ({idx}/{len(completed_epics)})"
+                )
                 logger.info(f"🔄 Epic 동기화 중: {epic_key} - {epic['summary'][:50]}...")
                 
                 # Epic 정보 조회
@@ -1615,8 +1810,8 @@ def sync_completed_epics_background():
                 subtasks_result = jira.test_epic_subtasks(epic_key, include_details=include_details)
                 if not subtasks_result or not subtasks_result.get("success"):
                     logger.warning(f"⚠️ Epic {epic_key} 하위 작업 없음")
-                    sync_status["failed_epics"] += 1
-                    sync_status["failed_list"].append(f"{epic_key} (하위 작업 없음)")
+                    sync_status.increment("failed_epics")
+                    sync_status.append("failed_list", f"{epic_key} (하위 작업 없음)")
                     continue
                 
                 # 작업 타입 필터링 (Epic만 제외하고 모든 타입 허용)
@@ -1626,8 +1821,8 @@ def sync_completed_epics_background():
                 
                 if not filtered_tasks:
                     logger.warning(f"⚠️ Epic {epic_key} 하위 작업 없음 (Epic 타입만 있음)")
-                    sync_status["failed_epics"] += 1
-                    sync_status["failed_list"].append(f"{epic_key} (하위 작업 없음)")
+                    sync_status.increment("failed_epics")
+                    sync_status.append("failed_list", f"{epic_key} (하위 작업 없음)")
                     continue
                 
                 # 각 작업을 공수 산정 데이터로 변환
@@ -1681,21 +1876,19 @@ def sync_completed_epics_background():
                 #     except Exception as index_error:
                 #         logger.warning(f"   ⚠️ 증분 색인 실패 (무시하고 계속): {str(index_error)}")
                 
-                sync_status["completed_epics"] += 1
+                sync_status.increment("completed_epics")
                 
             except Exception as epic_error:
                 logger.error(f"❌ Epic {epic_key} 동기화 실패: {str(epic_error)}")
-                sync_status["failed_epics"] += 1
-                sync_status["failed_list"].append(f"{epic_key} ({str(epic_error)})")
+                sync_status.increment("failed_epics")
+                sync_status.append("failed_list", f"{epic_key} ({str(epic_error)})")
                 continue
             
             # 진행률 업데이트
             sync_status["progress"] = int((idx / len(completed_epics)) * 100)
         
         # 완료 - 색인은 별도 배치 작업으로 실행
-        sync_status["is_running"] = False
-        sync_status["progress"] = 100
-        sync_status["current_epic"] = ""
+        sync_status.update(is_running=False, progress=100, current_epic="")
         
         # 결과 메시지 생성
         result_parts = [f"{sync_status['completed_epics']}개 처리"]
@@ -1731,8 +1924,7 @@ def sync_completed_epics_background():
         
     except Exception as e:
         logger.error(f"❌ 완료된 Epic 자동 동기화 오류: {str(e)}")
-        sync_status["is_running"] = False
-        sync_status["message"] = f"오류 발생: {str(e)}"
+        sync_status.update(is_running=False, message=f"오류 발생: {str(e)}")
         
         # 실패 이력 저장
         end_time = datetime.now()
@@ -1753,9 +1945,11 @@ def sync_completed_epics_background():
 async def auto_sync_completed_epics(background_tasks: BackgroundTasks):
     """완료된 Epic 자동 동기화 시작 (백그라운드, ENOMIX 프로젝트만)"""
     global sync_status
+    from ..services.jira_integration import create_jira_integration
     
-    # 이미 실행 중인지 확인
-    if sync_status["is_running"]:
+    # 이미 실행 중인지 확인 (실행하던 워커가 종료된 경우는 실행 중이 아님)
+    state = sync_status.snapshot()
+    if state["is_running"] and _is_process_alive(state.get("owner_pid")):
         return {
             "success": False,
             "message": "이미 동기화가 진행 중입니다",
@@ -1767,6 +1961,15 @@ async def auto_sync_completed_epics(background_tasks: BackgroundTasks):
     if not jira:
         return JSONResponse(status_code=400, content={"error": "Jira 설정이 필요합니다"})
     
+    # 실행 권한 선점 (여러 워커에 동시에 요청이 들어와도 하나만 시작)
+    if not sync_status.try_set("is_running", state["is_running"], True,
+                               owner_pid=os.getpid(), message="동기화 준비 중..."):
+        return {
+            "success": False,
+            "message": "이미 동기화가 진행 중입니다",
+            "is_running": True
+        }
+    
     logger.info(f"🔄 완료된 Epic 자동 동기화 시작: ENOMIX 프로젝트")
     
     # 백그라운드 작업 등록
@@ -1778,10 +1981,22 @@ async def auto_sync_completed_epics(background_tasks: BackgroundTasks):
         "is_running": True
     }
 
+def _is_process_alive(pid) -> bool:
+    """프로세스 생존 여부 (pid 정보가 없으면 실행 중으로 간주)"""
+    if not pid:
+        return True
+    try:
+        os.kill(int(pid), 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError, OSError):
+        return True
+
 @app.get("/effort/sync-status/")
 async def get_sync_status():
-    """동기화 상태 조회"""
-    return sync_status
+    """동기화 상태 조회 (모든 워커에서 같은 값)"""
+    return sync_status.snapshot()
 
 @app.get("/effort/scheduler-history/")
 async def get_scheduler_history():
@@ -1887,6 +2102,7 @@ async def test_simple():
 async def test_epic_list():
     """사용 가능한 Epic 목록 조회"""
     try:
+        from ..services.jira_integration import create_jira_integration
         jira = create_jira_integration()
         
         # JQL로 Epic 타입 이슈 조회 (API v3) - 페이징 처리로 더 많은 Epic 조회
@@ -2008,6 +2224,7 @@ async def test_epic_list():
 async def test_jira_connection():
     """Jira 연결 테스트"""
     try:
+        from ..services.jira_integration import create_jira_integration
         jira = create_jira_integration()
         connection_result = jira.test_connection()
         
@@ -2028,6 +2245,7 @@ async def test_jira_connection():
 async def test_issue_all_fields(ticket_key: str):
     """티켓의 모든 필드 조회 (디버깅용)"""
     try:
+        from ..services.jira_integration import create_jira_integration
         logger.info(f"🔍 티켓 전체 필드 조회: {ticket_key}")
         
         jira = create_jira_integration()
@@ -2075,6 +2293,7 @@ async def test_issue_all_fields(ticket_key: str):
 async def test_epic_subtasks(epic_key: str):
     """Epic 하위 Task 조회 테스트"""
     try:
+        from ..services.jira_integration import create_jira_integration
         logger.info(f"🔍 Epic 하위 Task 조회 시도: {epic_key}")
         
         jira = create_jira_integration()
@@ -2096,6 +2315,7 @@ async def test_epic_subtasks(epic_key: str):
 async def test_jql_query(jql_query: str):
     """JQL 쿼리 직접 테스트"""
     try:
+        from ..services.jira_integration import create_jira_integration
         jira = create_jira_integration()
         if not jira:
             return JSONResponse(status_code=400, content={"error": "Jira 설정이 필요합니다"})
@@ -2133,6 +2353,7 @@ async def test_jql_query(jql_query: str):
 async def test_issue_id(issue_id: str):
     """이슈 ID로 조회 테스트"""
     try:
+        from ..services.jira_integration import create_jira_integration
         jira = create_jira_integration()
         if not jira:
             return JSONResponse(status_code=400, content={"error": "Jira 설정이 필요합니다"})
@@ -2170,6 +2391,7 @@ async def test_issue_id(issue_id: str):
 async def test_permissions():
     """현재 계정의 권한 확인"""
     try:
+        from ..services.jira_integration import create_jira_integration
         jira = create_jira_integration()
         if not jira:
             return JSONResponse(status_code=400, content={"error": "Jira 설정이 필요합니다"})
@@ -2202,6 +2424,7 @@ async def test_permissions():
 async def test_epic_info(epic_key: str):
     """Epic 기본 정보 조회 테스트"""
     try:
+        from ..services.jira_integration import create_jira_integration
         logger.info(f"🔍 Epic 정보 조회 시도: {epic_key}")
         
         # Jira 연결 테스트
@@ -2292,6 +2515,7 @@ async def test_epic_info(epic_key: str):
 async def test_epic_full_details(epic_key: str):
     """Epic의 모든 필드와 링크 정보 조회 (상세 디버깅용)"""
     try:
+        from ..services.jira_integration import create_jira_integration
         jira = create_jira_integration()
         if not jira:
             return JSONResponse(status_code=400, content={"error": "Jira 설정이 필요합니다"})
@@ -2455,22 +2679,23 @@ async def migrate_categories(request: Request):
         old_major, old_minor, old_sub = old_parts
         new_major, new_minor, new_sub = new_parts
         
-        # 해당 카테고리의 모든 데이터 업데이트
-        estimations = effort_manager.get_all_estimations()
-        updated_count = 0
-        
-        for estimation in estimations:
-            if (estimation.major_category == old_major and 
-                estimation.minor_category == old_minor and 
-                estimation.sub_category == old_sub):
-                
-                estimation.major_category = new_major
-                estimation.minor_category = new_minor
-                estimation.sub_category = new_sub
-                updated_count += 1
-        
-        # 변경사항 저장
-        effort_manager.save_data()
+        # 해당 카테고리의 모든 데이터 업데이트 (워커 간 단일 작성자 구간)
+        with effort_manager.write_lock():
+            estimations = effort_manager.get_all_estimations()
+            updated_count = 0
+            
+            for estimation in estimations:
+                if (estimation.major_category == old_major and 
+                    estimation.minor_category == old_minor and 
+                    estimation.sub_category == old_sub):
+                    
+                    estimation.major_category = new_major
+                    estimation.minor_category = new_minor
+                    estimation.sub_category = new_sub
+                    updated_count += 1
+            
+            # 변경사항 저장
+            effort_manager.save_data()
         
         return {
             "message": f"{updated_count}개 데이터가 마이그레이션되었습니다",
@@ -2482,61 +2707,59 @@ async def migrate_categories(request: Request):
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 @app.post("/effort/categories/upload-excel")
-async def upload_categories_excel(file: UploadFile = File(...)):
-    """엑셀 파일로 카테고리 업데이트"""
+async def upload_categories_excel(file: UploadFile = File(...), dry_run: bool = False):
+    """엑셀 파일로 카테고리 업데이트
+    
+    행 단위로 읽어 현재 카테고리와 비교한 뒤 변경분만 반영하고,
+    삭제된 카테고리를 쓰던 공수 산정 데이터만 카테고리를 초기화 (저장 1회)
+    
+    Args:
+        dry_run: True면 적용하지 않고 변경 내역(diff)만 반환
+    """
     try:
-        # 엑셀 파일 읽기 (openpyxl로 병합된 셀 처리)
-        contents = await file.read()
-        from openpyxl import load_workbook
-        
-        # openpyxl로 워크북 로드
-        wb = load_workbook(io.BytesIO(contents))
-        ws = wb.active
-        
-        # JSON 구조로 변환
-        categories = {}
-        
-        # 병합된 셀 정보 수집
-        merged_ranges = list(ws.merged_cells.ranges)
-        
-        for row in ws.iter_rows(min_row=2, values_only=True):  # 헤더 제외
-            if not any(row):  # 빈 행 건너뛰기
-                continue
-                
-            # 병합된 셀 값 처리
-            major = str(row[0]).strip() if row[0] and str(row[0]).strip() != 'None' else ""
-            minor = str(row[1]).strip() if row[1] and str(row[1]).strip() != 'None' else ""
-            sub = str(row[2]).strip() if row[2] and str(row[2]).strip() != 'None' else ""
+        from ..services.category_excel import iter_category_rows, build_category_tree, diff_categories, format_diff
+        from ..services.effort_estimation import get_category_manager
+        
+        def import_categories():
+            # 업로드 파일(임시 파일)을 메모리에 올리지 않고 행 단위로 파싱
+            file.file.seek(0)
+            categories = build_category_tree(iter_category_rows(file.file))
+            if not categories:
+                return {"success": False, "error": "엑셀 파일에서 카테고리를 찾을 수 없습니다"}
+            
+            category_manager = get_category_manager()
+            diff = diff_categories(category_manager.get_categories(), categories)
+            result = {"success": True, "dry_run": dry_run, "diff": format_diff(diff)}
             
-            # 병합된 셀에서 값이 비어있으면 이전 행의 값 사용
-            if not major and categories:
-                # 이전 대분류 값 사용
-                major = list(categories.keys())[-1] if categories else ""
+            # 삭제된 조합을 쓰고 있는 데이터 (초기화 대상)
+            removed = set(diff["removed"])
+            affected = [
+                est for est in effort_manager.get_all_estimations()
+                if (est.major_category, est.minor_category, est.sub_category) in removed
+            ] if removed else []
+            result["affected_estimations"] = len(affected)
             
-            if not minor and major in categories and categories[major]:
-                # 이전 중분류 값 사용
-                minor = list(categories[major].keys())[-1] if categories[major] else ""
+            if dry_run:
+                result["message"] = "변경 내역 미리보기 (적용되지 않음)"
+                return result
             
-            if major and major != 'nan':
-                if major not in categories:
-                    categories[major] = {}
-                if minor and minor != 'nan':
-                    if minor not in categories[major]:
-                        categories[major][minor] = []
-                    if sub and sub != 'nan':
-                        categories[major][minor].append(sub)
-        
-        # 기존 파일 백업
-        categories_file = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'docs', 'categories.json')
-        backup_file = f"{categories_file}.backup"
-        if os.path.exists(categories_file):
-            shutil.copy2(categories_file, backup_file)
-        
-        # 새 카테고리 저장
-        with open(categories_file, 'w', encoding='utf-8') as f:
-            json.dump(categories, f, ensure_ascii=False, indent=2)
-        
-        return {"success": True, "message": "엑셀 파일로 카테고리 업데이트 완료", "categories": categories}
+            if diff["tree_changed"]:
+                category_manager.replace_categories(categories)
+            reset_count = effort_manager.update_estimation_categories(
+                [(est, None, None, None) for est in affected]
+            ) if affected else 0
+            
+            logger.info(f"✅ 엑셀 카테고리 가져오기: 추가 {len(diff['added'])}개, 삭제 {len(diff['removed'])}개, "
+                        f"카테고리 초기화 {reset_count}개")
+            result.update({
+                "message": "엑셀 파일로 카테고리 업데이트 완료",
+                "reset_count": reset_count,
+                "categories": categories,
+            })
+            return result
+        
+        # 파싱/비교/저장은 스레드에서 실행 (대용량 시트 처리 중에도 다른 요청 처리)
+        return await asyncio.to_thread(import_categories)
     except Exception as e:
         logger.error(f"❌ 엑셀 파일 업로드 오류: {str(e)}")
         return {"success": False, "error": str(e)}
@@ -2545,102 +2768,29 @@ async def upload_categories_excel(file: UploadFile = File(...)):
 async def download_categories_excel():
     """현재 카테고리를 엑셀 파일로 다운로드"""
     try:
-        # 현재 카테고리 로드
-        categories_file = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'docs', 'categories.json')
+        from ..services.category_excel import write_categories_xlsx
+        from ..services.effort_estimation import get_category_manager
         
-        if not os.path.exists(categories_file):
+        category_manager = get_category_manager()
+        if not os.path.exists(category_manager.categories_file):
             return JSONResponse(status_code=404, content={"error": "카테고리 파일을 찾을 수 없습니다"})
-        
-        with open(categories_file, 'r', encoding='utf-8') as f:
-            categories = json.load(f)
-        
-        # openpyxl로 워크북 생성
-        from openpyxl import Workbook
-        from openpyxl.styles import Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "카테고리"
-        
-        # 헤더 설정
-        headers = ['대분류', '중분류', '소분류']
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=1, column=col, value=header)
-        
-        # 데이터 입력 및 병합 처리
-        current_row = 2
-        major_start_row = 2
-        minor_start_row = 2
-        
-        for major, minor_categories in categories.items():
-            major_start_row = current_row
-            
-            for minor, sub_categories in minor_categories.items():
-                minor_start_row = current_row
-                
-                for sub in sub_categories:
-                    ws.cell(row=current_row, column=1, value=major)
-                    ws.cell(row=current_row, column=2, value=minor)
-                    ws.cell(row=current_row, column=3, value=sub)
-                    current_row += 1
-                
-                # 중분류 병합 (소분류가 여러 개인 경우)
-                if current_row - minor_start_row > 1:
-                    ws.merge_cells(f'B{minor_start_row}:B{current_row - 1}')
-            
-            # 대분류 병합 (중분류가 여러 개인 경우)
-            if current_row - major_start_row > 1:
-                ws.merge_cells(f'A{major_start_row}:A{current_row - 1}')
-        
-        # 스타일 적용
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        # 모든 셀에 테두리 적용
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.border = thin_border
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # 컬럼 너비 자동 조정
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # 메모리에서 파일 생성
-        from io import BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        categories = category_manager.get_categories()
         
         # 파일명 생성 (현재 날짜/시간 포함)
-        from datetime import datetime
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"categories_{timestamp}.xlsx"
         
-        # 임시 파일로 저장 후 FileResponse 반환
+        # 임시 파일에 바로 스트리밍 기록 후 FileResponse 반환
         import tempfile
         with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            tmp_file.write(output.getvalue())
             tmp_file_path = tmp_file.name
+        await asyncio.to_thread(write_categories_xlsx, categories, tmp_file_path)
         
         return FileResponse(
             path=tmp_file_path,
             filename=filename,
-            media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            background=BackgroundTask(os.remove, tmp_file_path)
         )
         
     except Exception as e:
@@ -2651,6 +2801,7 @@ async def download_categories_excel():
 async def save_positive_feedback(request: Request):
     """피드백 데이터 저장 (긍정/부정 모두 지원)"""
     try:
+        from ..data.database import save_feedback_to_file
         data = await request.json()
         question = data.get("question", "")
         answer = data.get("answer", "")
@@ -2726,16 +2877,18 @@ async def reindex_json_data(background_tasks: BackgroundTasks):
 def reindex_json_background(json_file_path: str):
     """재인덱싱 백그라운드 작업"""
     try:
+        from ..data.index_builder import rebuild_vector_index
         logger.info("📚 백그라운드 재인덱싱 시작...")
         start_time = time.time()
         
-        result = index_json_data(json_file_path, force=True)
+        # 새 색인에 만들고 검증 후 전환 (진행 중에도 질의는 현재 색인 사용)
+        result = rebuild_vector_index([(json_file_path, "json")])
         
         elapsed = time.time() - start_time
-        if result:
+        if result["success"]:
             logger.info(f"✅ 백그라운드 재인덱싱 완료 (소요 시간: {elapsed:.1f}초)")
         else:
-            logger.error(f"❌ 백그라운드 재인덱싱 실패 (소요 시간: {elapsed:.1f}초)")
+            logger.error(f"❌ 백그라운드 재인덱싱 실패, 현재 색인 유지 (소요 시간: {elapsed:.1f}초): {result['error']}")
             
     except Exception as e:
         logger.error(f"❌ 백그라운드 재인덱싱 오류: {str(e)}")
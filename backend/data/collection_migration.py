@@ -0,0 +1,94 @@
+"""
+벡터 DB 컬렉션 이전 모듈
+기본 컬렉션(langchain) 하나에 섞여 있던 공수 티켓/PDF/텍스트/크롤링 페이지 문서를
+소스 계열별 컬렉션으로 이동 (임베딩째 복사하므로 임베딩 API 호출 없음)
+- 계열 컬렉션에 쓰고 문서 수를 확인한 뒤에만 기본 컬렉션에서 삭제 (같은 id로 upsert하므로 중단 후 재실행 가능)
+- VECTOR_COLLECTION_LAYOUT=family로 처음 기동할 때 자동 실행, 수동 실행:
+    python -m backend.data.collection_migration [--dir 경로] [--keep-source]
+"""
+
+import argparse
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..utils.config import VECTOR_COLLECTION_LAYOUT
+from ..utils.shared_state import get_lock
+from .database import (
+    DEFAULT_COLLECTION, INDEX_WRITE_LOCK, collection_name, get_active_index_dir, open_vector_store, source_family,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def migrate_to_family_collections(persist_directory: Optional[str] = None, delete_source: bool = True) -> Dict[str, Any]:
+    """기본 컬렉션 문서를 계열별 컬렉션으로 이동
+
+    Args:
+        persist_directory: 기본 컬렉션 경로 (없으면 현재 색인 경로)
+        delete_source: 이동 확인 후 기본 컬렉션에서 삭제
+
+    Returns:
+        dict: {"moved": 이동 문서 수, "collections": {컬렉션명: 문서 수}}
+    """
+    if VECTOR_COLLECTION_LAYOUT != "family":
+        return {"moved": 0, "collections": {}, "skipped": "VECTOR_COLLECTION_LAYOUT=single"}
+
+    directory = persist_directory or get_active_index_dir(DEFAULT_COLLECTION)
+    legacy = open_vector_store(directory, DEFAULT_COLLECTION)
+    if legacy._collection.count() == 0:
+        return {"moved": 0, "collections": {}}
+
+    with get_lock(INDEX_WRITE_LOCK):
+        data = legacy._collection.get(include=["documents", "metadatas", "embeddings"])
+        ids = data.get("ids") or []
+        if not ids:
+            return {"moved": 0, "collections": {}}
+        metadatas = data.get("metadatas") or [None] * len(ids)
+        documents = data.get("documents") or [""] * len(ids)
+        embeddings = data.get("embeddings")
+
+        grouped: Dict[str, List[int]] = {}
+        for row, metadata in enumerate(metadatas):
+            metadata = metadata if isinstance(metadata, dict) else {}
+            family = source_family(metadata.get("source", ""), metadata)
+            grouped.setdefault(family, []).append(row)
+
+        logger.info(f"📦 계열별 컬렉션 이전 시작: {len(ids)}개 ({directory} [{DEFAULT_COLLECTION}])")
+        moved: Dict[str, int] = {}
+        for family, rows in grouped.items():
+            collection = collection_name(family)
+            target = open_vector_store(get_active_index_dir(collection), collection)
+            for i in range(0, len(rows), BATCH_SIZE):
+                batch = rows[i:i + BATCH_SIZE]
+                batch_ids = [ids[row] for row in batch]
+                target._collection.upsert(
+                    ids=batch_ids,
+                    embeddings=np.asarray([embeddings[row] for row in batch], dtype=np.float32).tolist(),
+                    documents=[documents[row] for row in batch],
+                    metadatas=[{**(metadatas[row] or {}), "family": family} for row in batch],
+                )
+                found = target._collection.get(ids=batch_ids, include=[]).get("ids") or []
+                if len(found) != len(batch_ids):
+                    raise RuntimeError(f"{collection}: 이전 확인 실패 (예상 {len(batch_ids)}, 실제 {len(found)})")
+                if delete_source:
+                    legacy._collection.delete(ids=batch_ids)
+            moved[collection] = moved.get(collection, 0) + len(rows)
+            logger.info(f"   ✅ {family} → {collection}: {len(rows)}개")
+
+        logger.info(f"✅ 계열별 컬렉션 이전 완료: {sum(moved.values())}개")
+        return {"moved": sum(moved.values()), "collections": moved}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="기본 컬렉션 문서를 소스 계열별 컬렉션으로 이동")
+    parser.add_argument("--dir", default=None, help="기본 컬렉션 경로 (기본값: 현재 색인 경로)")
+    parser.add_argument("--keep-source", action="store_true", help="이동 후 기본 컬렉션에서 삭제하지 않음")
+    args = parser.parse_args()
+    print(json.dumps(migrate_to_family_collections(args.dir, delete_source=not args.keep_source),
+                     ensure_ascii=False, indent=2))
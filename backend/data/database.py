@@ -1,47 +1,265 @@
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
-from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_text_splitters import CharacterTextSplitter
 from langchain_core.documents import Document
 import os
 import re
 import logging
 import json
+import threading
+import functools
+import time
 from datetime import datetime
-from ..utils.config import CHROMA_DIR, DOCS_DIR
+from ..utils.config import (
+    CHROMA_DIR, DOCS_DIR, VECTOR_BACKEND, VECTOR_QUANTIZE, VECTOR_INDEX_BUILDS_DIR, VECTOR_COLLECTION_LAYOUT,
+)
+from ..utils.shared_state import get_lock, file_stamp
+from .embedding_cache import CachedEmbeddings
+from .qa_store import upsert_feedback, get_feedbacks, count_feedbacks, make_qa_hash
 
 logger = logging.getLogger(__name__)
 
-def get_vectordb():
+# 프로세스 공유 임베딩/벡터 DB 인스턴스 (요청마다 벡터 DB 클라이언트와 HTTP 연결을 새로 만들지 않음)
+_embedding_function = None
+_vectordb_instances = {}
+_vectordb_lock = threading.Lock()
+# effort_estimations.json 색인 여부 확인 완료 (프로세스당 1회)
+_effort_data_checked = False
+# 현재 사용 중인 메인 색인 포인터 (재색인은 새 빌드 디렉토리에 만든 뒤 이 파일만 교체)
+ACTIVE_INDEX_FILE = os.path.join(VECTOR_INDEX_BUILDS_DIR, "active.json")
+_active_index_cache = {"stamp": None, "pointer": {}}
+# 메인 색인 쓰기 잠금 이름 (문서 색인/삭제와 재색인 전환이 섞이지 않도록 워커 간 직렬화)
+INDEX_WRITE_LOCK = "vector_index_write"
+
+# 소스 계열별 컬렉션 (공수 질문은 공수 티켓 컬렉션만, 문서 질문은 문서 컬렉션만 검색)
+DEFAULT_COLLECTION = "langchain"  # LangChain Chroma 기본 컬렉션 (단일 컬렉션 구성, 계열 분리 이전 데이터)
+FAMILY_COLLECTIONS = {
+    "effort": "effort_tickets",   # effort_estimations.json / effort_estimations.txt
+    "pdf": "documents_pdf",       # upload_pdf
+    "text": "documents_text",     # upload_text
+    "web": "documents_web",       # index_url
+}
+DOCUMENT_FAMILIES = ("pdf", "text", "web")
+EFFORT_SOURCES = ("effort_estimations.json", "effort_estimations.txt")
+# 기본 컬렉션 → 계열 컬렉션 이전 완료 여부 (프로세스당, 성공한 뒤에만 True)
+_family_collections_ready = False
+_family_migration_lock = threading.Lock()
+# 이전 실패 시 다음 재시도 시각 (실패 직후 매 요청마다 재시도하지 않도록)
+_family_migration_retry_at = 0.0
+FAMILY_MIGRATION_RETRY_SECONDS = 60
+
+def get_embedding_function() -> CachedEmbeddings:
+    """공유 임베딩 함수 (OpenAI HTTP 연결 재사용, 질문 임베딩 LRU 캐시)"""
+    global _embedding_function
+    if _embedding_function is None:
+        with _vectordb_lock:
+            if _embedding_function is None:
+                _embedding_function = CachedEmbeddings(OpenAIEmbeddings())
+    return _embedding_function
+
+def prefetch_query_embeddings(texts) -> int:
+    """검색에 쓸 질문 변형들 중 캐시에 없는 것만 한 번의 요청으로 임베딩"""
     try:
-        embedding = OpenAIEmbeddings()
-        vectordb = Chroma(persist_directory=CHROMA_DIR, embedding_function=embedding)
-        
-        # effort_estimations.json이 벡터 DB에 있는지 확인
+        return get_embedding_function().prefetch_queries(texts)
+    except Exception as e:
+        # 실패해도 검색 시 개별 임베딩으로 진행
+        logger.warning(f"⚠️ 질문 임베딩 일괄 준비 실패 (개별 임베딩으로 진행): {e}")
+        return 0
+
+def _create_vector_store(persist_directory: str, embedding, collection: str = DEFAULT_COLLECTION):
+    """설정된 엔진(VECTOR_BACKEND)으로 벡터 저장소 생성"""
+    if VECTOR_BACKEND != "numpy":
+        return Chroma(collection_name=collection, persist_directory=persist_directory, embedding_function=embedding)
+    
+    from .vector_store import NumpyVectorStore, import_from_chroma
+    store_dir = "numpy_store" if collection == DEFAULT_COLLECTION else f"numpy_store_{collection}"
+    store = NumpyVectorStore(os.path.join(persist_directory, store_dir), embedding, quantize=VECTOR_QUANTIZE)
+    # 처음 사용하는 경우 같은 경로의 기존 Chroma 데이터를 복사 (임베딩 재호출 없음)
+    if store.count() == 0 and os.path.exists(os.path.join(persist_directory, "chroma.sqlite3")):
+        with get_lock("vector_store_import"):
+            if store.count() == 0:
+                try:
+                    import_from_chroma(store, persist_directory, collection)
+                except Exception as e:
+                    logger.warning(f"⚠️ Chroma 데이터 복사 실패 (빈 저장소로 시작): {e}")
+    return store
+
+def open_vector_store(persist_directory: str, collection: str = DEFAULT_COLLECTION):
+    """저장 경로/컬렉션별 벡터 저장소 (최초 1회 생성 후 재사용, VECTOR_BACKEND에 따라 Chroma 또는 NumPy)"""
+    key = (persist_directory, collection)
+    vectordb = _vectordb_instances.get(key)
+    if vectordb is None:
+        embedding = get_embedding_function()
+        with _vectordb_lock:
+            vectordb = _vectordb_instances.get(key)
+            if vectordb is None:
+                vectordb = _create_vector_store(persist_directory, embedding, collection)
+                _vectordb_instances[key] = vectordb
+                logger.info(f"📦 벡터 저장소 열기: {persist_directory} [{collection}] ({VECTOR_BACKEND})")
+    return vectordb
+
+def close_vector_store(persist_directory: str):
+    """저장 경로의 공유 인스턴스 해제 (정리된 재색인 빌드용, 사용 중인 요청은 기존 참조로 계속 동작)"""
+    with _vectordb_lock:
+        for key in [key for key in _vectordb_instances if key[0] == persist_directory]:
+            _vectordb_instances.pop(key, None)
+
+def source_family(source: str, metadata: dict = None) -> str:
+    """문서 소스의 계열 (effort: 공수 티켓, pdf: 업로드 PDF, text: 붙여넣은 텍스트, web: 크롤링 페이지)
+
+    메타데이터에 family가 있으면 그 값을 사용, 없으면 파일명으로 판단 (이전 데이터의 크롤링 페이지는 text로 분류됨)
+    """
+    if source in EFFORT_SOURCES:
+        return "effort"
+    family = (metadata or {}).get("family")
+    if family in FAMILY_COLLECTIONS:
+        return family
+    return "pdf" if (source or "").lower().endswith(".pdf") else "text"
+
+def collection_name(family: str) -> str:
+    """계열별 컬렉션 이름 (VECTOR_COLLECTION_LAYOUT=single이면 모든 계열이 기본 컬렉션 공유)"""
+    if VECTOR_COLLECTION_LAYOUT != "family":
+        return DEFAULT_COLLECTION
+    return FAMILY_COLLECTIONS[family]
+
+def read_active_index_pointer() -> dict:
+    """현재 색인 포인터 내용 (없으면 빈 dict → CHROMA_DIR 사용)
+
+    {"collections": {컬렉션명: {"path", "previous", "build_id", "switched_at"}}}
+    """
+    try:
+        with open(ACTIVE_INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def get_active_index_dir(collection: str = DEFAULT_COLLECTION) -> str:
+    """컬렉션이 현재 질의에 사용하는 색인 경로 (포인터 파일이 바뀌면 다른 워커도 다음 요청부터 새 경로 사용)"""
+    stamp = file_stamp(ACTIVE_INDEX_FILE)
+    if stamp != _active_index_cache["stamp"]:
+        pointer = {}
+        if stamp is not None:
+            try:
+                pointer = read_active_index_pointer()
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ 색인 포인터 읽기 실패 (이전 경로 유지): {e}")
+                pointer = _active_index_cache["pointer"]
+                stamp = _active_index_cache["stamp"]
+        if pointer != _active_index_cache["pointer"]:
+            logger.info(f"🔀 메인 색인 포인터 갱신: {json.dumps(pointer.get('collections', {}), ensure_ascii=False)}")
+        _active_index_cache.update(stamp=stamp, pointer=pointer)
+    pointer = _active_index_cache["pointer"]
+    entry = pointer.get("collections", {}).get(collection) or {}
+    # 컬렉션별 항목이 없으면 전체 경로(path, 이전 형식) → CHROMA_DIR
+    return entry.get("path") or pointer.get("path") or CHROMA_DIR
+
+def _ensure_family_collections() -> bool:
+    """계열별 컬렉션 구성에서 기본 컬렉션에 남은 이전 데이터를 계열 컬렉션으로 이동
+
+    Returns:
+        bool: 계열 컬렉션 사용 가능 여부 (이전이 끝나지 않았으면 False → 기본 컬렉션 사용, 일정 시간 후 재시도)
+    """
+    global _family_collections_ready, _family_migration_retry_at
+    if _family_collections_ready or VECTOR_COLLECTION_LAYOUT != "family":
+        return True
+    if time.monotonic() < _family_migration_retry_at:
+        return False
+    with _family_migration_lock:
+        if _family_collections_ready:
+            return True
         try:
-            collection = vectordb.get()
-            has_effort_data = False
-            
-            if collection and "metadatas" in collection:
-                for metadata in collection["metadatas"]:
-                    if isinstance(metadata, dict) and metadata.get("source") == "effort_estimations.json":
-                        has_effort_data = True
-                        break
-            
-            # effort_estimations.json이 없으면 자동으로 인덱싱
-            if not has_effort_data:
-                json_file_path = os.path.join(DOCS_DIR, "effort_estimations.json")
-                if os.path.exists(json_file_path):
-                    logger.info("🔄 effort_estimations.json 자동 인덱싱 시작")
-                    try:
-                        if index_json_data(json_file_path, force=True):
-                            logger.info("✅ effort_estimations.json 자동 인덱싱 완료")
-                        else:
-                            logger.error("❌ effort_estimations.json 자동 인덱싱 실패")
-                    except Exception as idx_error:
-                        logger.error(f"❌ effort_estimations.json 자동 인덱싱 중 오류: {idx_error}")
-        except Exception as coll_error:
-            logger.warning(f"⚠️ 벡터 DB 컬렉션 확인 중 오류 (무시하고 계속): {coll_error}")
+            from .collection_migration import migrate_to_family_collections
+            migrate_to_family_collections()
+            _family_collections_ready = True
+        except Exception as e:
+            _family_migration_retry_at = time.monotonic() + FAMILY_MIGRATION_RETRY_SECONDS
+            logger.warning(f"⚠️ 계열별 컬렉션 이전 실패 (기본 컬렉션 사용, {FAMILY_MIGRATION_RETRY_SECONDS}초 후 재시도): {e}")
+    return _family_collections_ready
+
+def active_collection_name(family: str) -> str:
+    """계열이 현재 사용하는 컬렉션 이름 (계열 컬렉션 이전이 끝나지 않았으면 기본 컬렉션)"""
+    return collection_name(family) if _ensure_family_collections() else DEFAULT_COLLECTION
+
+def get_family_vectordb(family: str):
+    """소스 계열별 벡터 저장소 (현재 색인 경로의 계열 컬렉션, 이전이 끝나지 않았으면 기본 컬렉션)"""
+    collection = active_collection_name(family)
+    return open_vector_store(get_active_index_dir(collection), collection)
+
+def get_all_vectordbs() -> dict:
+    """모든 계열 저장소 {컬렉션명: 저장소} (단일 컬렉션 구성이면 1개)"""
+    stores = {}
+    for family in FAMILY_COLLECTIONS:
+        collection = active_collection_name(family)
+        if collection not in stores:
+            stores[collection] = get_family_vectordb(family)
+    return stores
+
+def find_source_family(source: str):
+    """이미 색인된 문서 소스의 계열 (색인되지 않은 소스면 None)"""
+    if source in EFFORT_SOURCES:
+        return "effort"
+    for family in DOCUMENT_FAMILIES:
+        try:
+            found = get_family_vectordb(family)._collection.get(where={"source": source}, limit=1, include=["metadatas"])
+        except Exception:
+            continue
+        if found and found.get("ids"):
+            return source_family(source, (found.get("metadatas") or [None])[0])
+    return None
+
+def search_documents(query: str, k: int = 4, families=DOCUMENT_FAMILIES):
+    """문서 질문 검색 (업로드 PDF/텍스트/크롤링 페이지 컬렉션만, 공수 티켓 제외)
+
+    Returns:
+        list: [(Document, 거리)] 거리 오름차순 k개 (같은 임베딩 모델이므로 컬렉션 간 점수 비교 가능)
+    """
+    stores = {}
+    for family in families:
+        collection = active_collection_name(family)
+        stores.setdefault(collection, open_vector_store(get_active_index_dir(collection), collection))
+    # 기본 컬렉션을 쓰는 경우(단일 컬렉션 구성 / 계열 컬렉션 이전 전)에는 공수 티켓 문서를 필터로 제외
+    where = {"source": {"$nin": list(EFFORT_SOURCES)}} if DEFAULT_COLLECTION in stores else None
+    results = []
+    for store in stores.values():
+        if store._collection.count() > 0:
+            results.extend(store.similarity_search_with_score(query, k=k, filter=where))
+    return sorted(results, key=lambda item: item[1])[:k]
+
+def serialize_index_writes(func):
+    """메인 색인 쓰기 함수를 워커 간 잠금 안에서 실행 (재색인 전환 중 쓰기가 유실되지 않도록)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_lock(INDEX_WRITE_LOCK):
+            return func(*args, **kwargs)
+    return wrapper
+
+def get_vectordb(family: str = "effort"):
+    """계열별 메인 벡터 DB (기본: 공수 티켓 컬렉션)"""
+    global _effort_data_checked
+    try:
+        vectordb = get_family_vectordb(family)
+        
+        # effort_estimations.json이 벡터 DB에 있는지 확인 (전체 컬렉션 조회 없이 1건만, 프로세스당 1회)
+        if family == "effort" and not _effort_data_checked:
+            try:
+                found = vectordb._collection.get(where={"source": "effort_estimations.json"}, limit=1, include=[])
+                has_effort_data = bool(found and found.get("ids"))
+                
+                # effort_estimations.json이 없으면 자동으로 인덱싱
+                if not has_effort_data:
+                    json_file_path = os.path.join(DOCS_DIR, "effort_estimations.json")
+                    if os.path.exists(json_file_path):
+                        logger.info("🔄 effort_estimations.json 자동 인덱싱 시작")
+                        try:
+                            if index_json_data(json_file_path, force=True):
+                                logger.info("✅ effort_estimations.json 자동 인덱싱 완료")
+                            else:
+                                logger.error("❌ effort_estimations.json 자동 인덱싱 실패")
+                        except Exception as idx_error:
+                            logger.error(f"❌ effort_estimations.json 자동 인덱싱 중 오류: {idx_error}")
+                _effort_data_checked = True
+            except Exception as coll_error:
+                logger.warning(f"⚠️ 벡터 DB 컬렉션 확인 중 오류 (무시하고 계속): {coll_error}")
         
         return vectordb
     except Exception as e:
@@ -77,9 +295,62 @@ def is_file_modified(file_path: str, vectordb) -> bool:
         logger.error(f"Error checking file modification: {str(e)}")
         return True
 
-def index_document(file_path: str, file_type: str = "pdf", force: bool = False):
+def load_document_chunks(file_path: str, file_type: str = "pdf", family: str = None):
+    """파일을 색인용 문서 조각으로 변환 (effort_estimations.txt는 티켓별, 그 외는 1200자 단위)
+
+    family: 소스 계열 (없으면 파일명으로 판단, 메타데이터 family로 저장)
+    """
+    # Load and process the document
+    if file_type == "pdf":
+        from langchain_community.document_loaders import PyMuPDFLoader
+        loader = PyMuPDFLoader(file_path)
+        documents = loader.load()
+    else:  # txt
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        documents = [Document(page_content=content)]
+
+    # Add metadata to all documents
+    file_metadata = get_file_metadata(file_path)
+    file_metadata["family"] = source_family(file_metadata["source"], {"family": family})
+    for doc in documents:
+        doc.metadata.update(file_metadata)
+
+    # effort_estimations.txt의 경우 티켓별로 분할
+    if os.path.basename(file_path) == "effort_estimations.txt":
+        # 티켓별로 분할
+        docs = []
+        content = documents[0].page_content
+        tickets = content.split('---\n\n')
+        
+        for i, ticket in enumerate(tickets):
+            if ticket.strip():  # 빈 티켓 제외
+                # 각 티켓을 별도 문서로 생성
+                doc = Document(
+                    page_content=ticket.strip(),
+                    metadata=documents[0].metadata.copy()
+                )
+                doc.metadata["ticket_index"] = i
+                docs.append(doc)
+    else:
+        # 다른 파일은 기존 방식 사용
+        splitter = CharacterTextSplitter(chunk_size=1200, chunk_overlap=120)
+        docs = splitter.split_documents(documents)
+
+    # ✅ 전처리 함수 적용
+    for idx, doc in enumerate(docs):
+        doc.page_content = doc.page_content  # <-- 이 부분!
+        doc.metadata["chunk_index"] = idx
+
+    return docs
+
+@serialize_index_writes
+def index_document(file_path: str, file_type: str = "pdf", force: bool = False, family: str = None):
+    """문서 색인 (family: pdf/text/web, 없으면 기존 색인 계열 → 파일명 기준으로 판단)"""
     try:
-        vectordb = get_vectordb()
+        family = family or find_source_family(os.path.basename(file_path))
+        family = source_family(os.path.basename(file_path), {"family": family})
+        vectordb = get_vectordb(family)
         
         # Skip if file is already indexed and hasn't been modified
         if not force and not is_file_modified(file_path, vectordb):
@@ -97,45 +368,7 @@ def index_document(file_path: str, file_type: str = "pdf", force: bool = False):
             vectordb._collection.delete(docs_to_remove)
             logger.info(f"🗑️ Removed old version of: {file_path}")
 
-        # Load and process the document
-        if file_type == "pdf":
-            loader = PyMuPDFLoader(file_path)
-            documents = loader.load()
-        else:  # txt
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            documents = [Document(page_content=content)]
-
-        # Add metadata to all documents
-        file_metadata = get_file_metadata(file_path)
-        for doc in documents:
-            doc.metadata.update(file_metadata)
-
-        # effort_estimations.txt의 경우 티켓별로 분할
-        if os.path.basename(file_path) == "effort_estimations.txt":
-            # 티켓별로 분할
-            docs = []
-            content = documents[0].page_content
-            tickets = content.split('---\n\n')
-            
-            for i, ticket in enumerate(tickets):
-                if ticket.strip():  # 빈 티켓 제외
-                    # 각 티켓을 별도 문서로 생성
-                    doc = Document(
-                        page_content=ticket.strip(),
-                        metadata=documents[0].metadata.copy()
-                    )
-                    doc.metadata["ticket_index"] = i
-                    docs.append(doc)
-        else:
-            # 다른 파일은 기존 방식 사용
-            splitter = CharacterTextSplitter(chunk_size=1200, chunk_overlap=120)
-            docs = splitter.split_documents(documents)
-
-        # ✅ 전처리 함수 적용
-        for idx, doc in enumerate(docs):
-            doc.page_content = doc.page_content  # <-- 이 부분!
-            doc.metadata["chunk_index"] = idx
+        docs = load_document_chunks(file_path, file_type, family)
 
         logger.info(f"📊 총 {len(docs)}개 문서를 처리합니다")
         
@@ -157,36 +390,31 @@ def index_document(file_path: str, file_type: str = "pdf", force: bool = False):
 
 def get_indexed_files():
     try:
-        vectordb = get_vectordb()
-        collection = vectordb.get()
         sources = set()
-        
-        for metadata in collection["metadatas"]:
-            if isinstance(metadata, dict) and "source" in metadata:
-                sources.add(metadata["source"])
+        for vectordb in get_all_vectordbs().values():
+            collection = vectordb.get(include=["metadatas"])
+            for metadata in collection["metadatas"]:
+                if isinstance(metadata, dict) and "source" in metadata:
+                    sources.add(metadata["source"])
                 
         return list(sources)
     except Exception as e:
         logger.error(f"❌ Error getting indexed files: {str(e)}")
         return []
 
+@serialize_index_writes
 def remove_document(file_path: str):
     """Remove document from Chroma DB and delete the file"""
     try:
-        vectordb = get_vectordb()
         filename = os.path.basename(file_path)
         
-        # Remove from Chroma DB
-        collection = vectordb.get()
-        docs_to_remove = []
-        for i, metadata in enumerate(collection["metadatas"]):
-            if isinstance(metadata, dict) and metadata.get("source") == filename:
-                docs_to_remove.append(collection["ids"][i])
-        
-        if docs_to_remove:
-            vectordb._collection.delete(docs_to_remove)
-            vectordb.persist()
-            logger.info(f"🗑️ Removed document from Chroma DB: {filename}")
+        # Remove from Chroma DB (어느 계열 컬렉션에 있든 소스 기준으로 삭제)
+        for vectordb in get_all_vectordbs().values():
+            docs_to_remove = vectordb._collection.get(where={"source": filename}, include=[]).get("ids") or []
+            if docs_to_remove:
+                vectordb._collection.delete(docs_to_remove)
+                vectordb.persist()
+                logger.info(f"🗑️ Removed document from Chroma DB: {filename}")
         
         # Delete the file
         if os.path.exists(file_path):
@@ -201,23 +429,28 @@ def remove_document(file_path: str):
         logger.error(f"❌ Error removing document: {str(e)}")
         return False
 
+@serialize_index_writes
 def reset_vectordb():
     """
-    ✅ Chroma DB의 모든 문서를 안전하게 제거합니다.
+    ✅ Chroma DB의 모든 문서(모든 계열 컬렉션)를 안전하게 제거합니다.
     ✅ embedding 호출 없이, 단순히 저장된 문서 ID 기준으로 삭제합니다.
     """
+    global _effort_data_checked
     try:
-        vectordb = get_vectordb()
-        collection = vectordb.get()
-
-        all_ids = collection.get("ids", [])
-        if all_ids:
+        removed = 0
+        for vectordb in get_all_vectordbs().values():
+            all_ids = vectordb.get(include=[]).get("ids", [])
             BATCH_SIZE = 100  # 안전을 위해 삭제도 batch 처리 가능
             for i in range(0, len(all_ids), BATCH_SIZE):
                 batch_ids = all_ids[i:i + BATCH_SIZE]
                 vectordb._collection.delete(batch_ids)
-            vectordb.persist()
-            logger.info(f"✅ Successfully reset Chroma DB - {len(all_ids)}개 문서 삭제 완료")
+            if all_ids:
+                vectordb.persist()
+            removed += len(all_ids)
+        if removed:
+            logger.info(f"✅ Successfully reset Chroma DB - {removed}개 문서 삭제 완료")
+            # 다음 get_vectordb() 호출 시 effort_estimations.json 색인 여부를 다시 확인
+            _effort_data_checked = False
         else:
             logger.info("ℹ️ Chroma DB에 삭제할 문서가 없습니다.")
         return True
@@ -239,7 +472,9 @@ def clean_chunk_text(text: str) -> str:
     return text.strip()
 
 def save_feedback_to_file(feedback_data):
-    """피드백 데이터를 파일에 저장 (긍정/부정 모두 지원)
+    """피드백 데이터 저장 (긍정/부정 모두 지원)
+    
+    QA 저장소(qa_store)의 feedback 테이블에 qa_hash 기본키로 원자적으로 upsert
     
     중복 체크 로직:
     - 질문-답변 해시로 동일 세트 판별
@@ -252,323 +487,30 @@ def save_feedback_to_file(feedback_data):
             - is_new: 새로운 질문-답변 세트인지
             - feedback_count: 해당 질문-답변 세트의 총 피드백 수
     """
-    import hashlib
-    
     try:
         feedback_type = feedback_data.get("feedback_type", "positive")
-        
-        # 피드백 타입에 따라 파일 선택
-        if feedback_type == "positive":
-            feedback_file = os.path.join(DOCS_DIR, "positive_feedback.json")
-            opposite_file = os.path.join(DOCS_DIR, "negative_feedback.json")
-        else:
-            feedback_file = os.path.join(DOCS_DIR, "negative_feedback.json")
-            opposite_file = os.path.join(DOCS_DIR, "positive_feedback.json")
-        
-        # DOCS_DIR 디렉토리가 없으면 생성
-        os.makedirs(DOCS_DIR, exist_ok=True)
-        logger.info(f"📁 DOCS_DIR 확인: {DOCS_DIR} (존재: {os.path.exists(DOCS_DIR)})")
-        
-        # 기존 데이터 로드 (파일이 없으면 빈 리스트로 시작)
-        logger.info(f"📄 피드백 파일 확인: {feedback_file} (존재: {os.path.exists(feedback_file)})")
-        if os.path.exists(feedback_file):
-            try:
-                with open(feedback_file, 'r', encoding='utf-8') as f:
-                    feedbacks = json.load(f)
-                # 파일이 비어있거나 리스트가 아닌 경우 빈 리스트로 초기화
-                if not isinstance(feedbacks, list):
-                    logger.warning(f"⚠️ 피드백 파일이 리스트 형식이 아님, 빈 리스트로 초기화")
-                    feedbacks = []
-                logger.info(f"📊 기존 피드백 로드: {len(feedbacks)}개")
-            except (json.JSONDecodeError, Exception) as e:
-                logger.warning(f"⚠️ 피드백 파일 읽기 오류: {e}, 빈 리스트로 시작")
-                feedbacks = []
-        else:
-            feedbacks = []
-            logger.info(f"📝 새로운 피드백 파일 생성 예정: {feedback_file}")
-        
         question = feedback_data["question"]
-        answer = feedback_data.get("answer", "")
-        
-        # 질문-답변 해시 생성 (중복 체크용)
-        qa_hash = hashlib.md5(f"{question}|||{answer}".encode('utf-8')).hexdigest()
-        
-        # 부정 피드백 저장 시: 항상 긍정 피드백 파일 확인 및 제거 (opposite_index에 의존하지 않음)
-        if feedback_type == "negative":
-            positive_file_path = os.path.join(DOCS_DIR, "positive_feedback.json")
-            if os.path.exists(positive_file_path):
-                try:
-                    with open(positive_file_path, 'r', encoding='utf-8') as f:
-                        positive_feedbacks = json.load(f)
-                    
-                    # qa_hash로 직접 검색하여 제거
-                    positive_removed = False
-                    positive_removed_feedback = None
-                    for i, existing in enumerate(positive_feedbacks):
-                        existing_qa_hash = existing.get("qa_hash")
-                        if existing_qa_hash == qa_hash:
-                            positive_removed_feedback = positive_feedbacks.pop(i)
-                            positive_removed = True
-                            logger.info(f"🗑️ 부정 피드백 저장: 긍정 피드백 파일에서 제거 - {question[:30]}...")
-                            break
-                    
-                    # 제거된 항목이 있으면 파일 저장
-                    if positive_removed:
-                        with open(positive_file_path, 'w', encoding='utf-8') as f:
-                            json.dump(positive_feedbacks, f, ensure_ascii=False, indent=2)
-                        logger.info(f"✅ 긍정 피드백 파일에서 제거 완료: {positive_file_path}")
-                        
-                        # 벡터 DB에서도 제거
-                        try:
-                            feedback_vectordb = get_feedback_vectordb()
-                            if feedback_vectordb:
-                                collection = feedback_vectordb.get()
-                                if collection and "ids" in collection and "metadatas" in collection:
-                                    ids_to_remove = []
-                                    documents = collection.get("documents", [])
-                                    for i, metadata in enumerate(collection["metadatas"]):
-                                        if isinstance(metadata, dict) and metadata.get("source") == "positive_feedback":
-                                            metadata_question = documents[i] if i < len(documents) else ""
-                                            metadata_answer = metadata.get("answer", "")
-                                            metadata_qa_hash = hashlib.md5(f"{metadata_question}|||{metadata_answer}".encode('utf-8')).hexdigest()
-                                            if metadata_qa_hash == qa_hash and i < len(collection["ids"]):
-                                                ids_to_remove.append(collection["ids"][i])
-                                    
-                                    if ids_to_remove:
-                                        feedback_vectordb._collection.delete(ids_to_remove)
-                                        try:
-                                            feedback_vectordb.persist()
-                                        except Exception:
-                                            pass
-                                        logger.info(f"🗑️ 벡터 DB에서 피드백 제거: {len(ids_to_remove)}개")
-                        except Exception as del_error:
-                            logger.warning(f"⚠️ 벡터 DB에서 피드백 제거 중 오류 (무시하고 계속): {del_error}")
-                except Exception as e:
-                    logger.warning(f"⚠️ 긍정 피드백 파일 확인 중 오류 (무시하고 계속): {e}")
         
-        # 반대 타입 파일에서 같은 질문-답변 세트 찾기 (피드백 타입 변경 처리)
-        opposite_feedbacks = []
-        opposite_index = None
-        if os.path.exists(opposite_file):
-            try:
-                with open(opposite_file, 'r', encoding='utf-8') as f:
-                    opposite_feedbacks = json.load(f)
-                
-                for i, existing in enumerate(opposite_feedbacks):
-                    existing_qa_hash = existing.get("qa_hash")
-                    if existing_qa_hash == qa_hash:
-                        opposite_index = i
-                        break
-            except Exception as e:
-                logger.warning(f"⚠️ 반대 타입 피드백 파일 읽기 오류: {e}")
+        result = upsert_feedback(feedback_data)
+        logger.info(f"✅ 피드백 저장 완료: {feedback_type} - {question[:30]}... (피드백 수: {result['feedback_count']})")
         
-        # 반대 타입에 같은 질문-답변 세트가 있으면 제거 (피드백 타입 변경)
-        if opposite_index is not None:
-            opposite_feedback = opposite_feedbacks[opposite_index]
-            logger.info(f"🔄 피드백 타입 변경: {question[:30]}... ({'긍정' if feedback_type == 'positive' else '부정'}으로 변경)")
-            
-            # 반대 타입 파일에서 제거
-            opposite_feedbacks.pop(opposite_index)
-            try:
-                # DOCS_DIR 디렉토리가 없으면 생성
-                os.makedirs(DOCS_DIR, exist_ok=True)
-                with open(opposite_file, 'w', encoding='utf-8') as f:
-                    json.dump(opposite_feedbacks, f, ensure_ascii=False, indent=2)
-                logger.info(f"✅ 반대 타입 피드백 파일 저장 완료: {opposite_file}")
-            except Exception as save_error:
-                logger.error(f"❌ 반대 타입 피드백 파일 저장 실패: {save_error}")
-                raise
-            
-            # 기존 피드백 정보 보존 (카운트, 사용자 등)
-            feedback_count = opposite_feedback.get("feedback_count", 1)
-            feedback_users = opposite_feedback.get("feedback_users", [])
-            
-            # 새 타입으로 저장 (기존 정보 보존)
-            feedback_data["qa_hash"] = qa_hash
-            feedback_data["feedback_count"] = feedback_count
-            feedback_data["first_feedback_time"] = opposite_feedback.get("first_feedback_time", opposite_feedback.get("timestamp"))
-            feedback_data["last_feedback_time"] = feedback_data.get("timestamp", datetime.now().isoformat())
-            feedback_data["feedback_users"] = feedback_users
-            
-            # 사용자 정보 추가
-            user = feedback_data.get("user")
-            if user and user not in feedback_users:
-                feedback_data["feedback_users"].append(user)
-            
-            feedbacks.append(feedback_data)
-            
-            # 파일에 저장
-            try:
-                with open(feedback_file, 'w', encoding='utf-8') as f:
-                    json.dump(feedbacks, f, ensure_ascii=False, indent=2)
-                logger.info(f"✅ 피드백 파일 저장 완료: {feedback_file}")
-            except Exception as save_error:
-                logger.error(f"❌ 피드백 파일 저장 실패: {save_error}")
-                raise  # 저장 실패 시 예외를 다시 발생시켜 상위에서 처리
-            
-            # 긍정 피드백으로 변경된 경우 벡터 DB 재인덱싱
-            if feedback_type == "positive":
-                index_feedback_data(feedback_file)
-            # 부정 피드백으로 변경된 경우 벡터 DB에서 제거 (긍정 피드백만 인덱싱하므로)
-            else:
-                # 긍정 피드백 벡터 DB에서 해당 항목 제거
-                try:
-                    feedback_vectordb = get_feedback_vectordb()
-                    if feedback_vectordb:
-                        collection = feedback_vectordb.get()
-                        if collection and "ids" in collection and "metadatas" in collection:
-                            ids_to_remove = []
-                            documents = collection.get("documents", [])
-                            for i, metadata in enumerate(collection["metadatas"]):
-                                if isinstance(metadata, dict) and metadata.get("source") == "positive_feedback":
-                                    # 벡터 DB에는 질문이 documents[i]로, 답변이 metadata["answer"]로 저장됨
-                                    metadata_question = documents[i] if i < len(documents) else ""
-                                    metadata_answer = metadata.get("answer", "")
-                                    metadata_qa_hash = hashlib.md5(f"{metadata_question}|||{metadata_answer}".encode('utf-8')).hexdigest()
-                                    if metadata_qa_hash == qa_hash and i < len(collection["ids"]):
-                                        ids_to_remove.append(collection["ids"][i])
-                            
-                            if ids_to_remove:
-                                feedback_vectordb._collection.delete(ids_to_remove)
-                                try:
-                                    feedback_vectordb.persist()
-                                except Exception:
-                                    pass
-                                logger.info(f"🗑️ 벡터 DB에서 피드백 제거: {len(ids_to_remove)}개")
-                except Exception as del_error:
-                    logger.warning(f"⚠️ 벡터 DB에서 피드백 제거 중 오류 (무시하고 계속): {del_error}")
-            
-            return {
-                "saved": True,
-                "is_new": False,
-                "feedback_count": feedback_count,
-                "type_changed": True
-            }
-        
-        # 기존 피드백에서 동일한 질문-답변 세트 찾기
-        existing_index = None
-        same_question_index = None
-        
-        for i, existing in enumerate(feedbacks):
-            existing_qa_hash = existing.get("qa_hash")
-            if existing_qa_hash == qa_hash:
-                existing_index = i
-                break
-            # 같은 질문이지만 답변이 다른 경우도 추적 (최신 답변으로 업데이트용)
-            if existing.get("question") == question and same_question_index is None:
-                same_question_index = i
-        
-        if existing_index is not None:
-            # 동일한 질문-답변 세트가 이미 존재 → 피드백 카운트만 증가
-            existing_feedback = feedbacks[existing_index]
-            existing_feedback["feedback_count"] = existing_feedback.get("feedback_count", 1) + 1
-            existing_feedback["last_feedback_time"] = feedback_data.get("timestamp", datetime.now().isoformat())
-            existing_feedback["feedback_users"] = existing_feedback.get("feedback_users", [])
-            
-            # 사용자 정보 추가 (중복 제거)
-            user = feedback_data.get("user")
-            if user and user not in existing_feedback["feedback_users"]:
-                existing_feedback["feedback_users"].append(user)
-            
-            logger.info(f"📊 피드백 카운트 증가: {question[:30]}... (총 {existing_feedback['feedback_count']}회)")
-            
-            # 파일에 저장
-            try:
-                with open(feedback_file, 'w', encoding='utf-8') as f:
-                    json.dump(feedbacks, f, ensure_ascii=False, indent=2)
-                logger.info(f"✅ 피드백 파일 저장 완료: {feedback_file}")
-            except Exception as save_error:
-                logger.error(f"❌ 피드백 파일 저장 실패: {save_error}")
-                raise  # 저장 실패 시 예외를 다시 발생시켜 상위에서 처리
-            
-            # 긍정 피드백만 벡터 DB 재인덱싱 (카운트 증가해도 인덱싱은 필요 없을 수 있지만, 일관성 유지)
-            if feedback_type == "positive":
-                index_feedback_data(feedback_file)
-            
-            return {
-                "saved": True,
-                "is_new": False,
-                "feedback_count": existing_feedback["feedback_count"]
-            }
-        
-        elif same_question_index is not None:
-            # 같은 질문이지만 답변이 다름 → 최신 답변으로 업데이트
-            logger.info(f"🔄 같은 질문의 최신 답변으로 업데이트: {question[:30]}...")
-            
-            # 기존 피드백 정보 보존 (카운트, 사용자 등)
-            old_feedback = feedbacks[same_question_index]
-            feedback_count = old_feedback.get("feedback_count", 1)
-            feedback_users = old_feedback.get("feedback_users", [])
-            
-            # 새 피드백으로 교체 (기존 정보 보존)
-            feedback_data["qa_hash"] = qa_hash
-            feedback_data["feedback_count"] = feedback_count
-            feedback_data["first_feedback_time"] = old_feedback.get("first_feedback_time", old_feedback.get("timestamp"))
-            feedback_data["last_feedback_time"] = feedback_data.get("timestamp", datetime.now().isoformat())
-            feedback_data["feedback_users"] = feedback_users
-            
-            # 사용자 정보 추가
-            user = feedback_data.get("user")
-            if user and user not in feedback_users:
-                feedback_data["feedback_users"].append(user)
-            
-            feedbacks[same_question_index] = feedback_data
-            
-            logger.info(f"💾 피드백 업데이트: {question[:30]}... (피드백 수: {feedback_count})")
-        else:
-            # 완전히 새로운 질문-답변 세트
-            feedback_data["qa_hash"] = qa_hash
-            feedback_data["feedback_count"] = 1
-            feedback_data["first_feedback_time"] = feedback_data.get("timestamp", datetime.now().isoformat())
-            feedback_data["last_feedback_time"] = feedback_data.get("timestamp", datetime.now().isoformat())
-            feedback_data["feedback_users"] = []
-            
-            # 사용자 정보 추가
-            user = feedback_data.get("user")
-            if user:
-                feedback_data["feedback_users"].append(user)
-            
-            feedbacks.append(feedback_data)
-            logger.info(f"💾 새로운 피드백 저장: {question[:30]}... (총 {len(feedbacks)}개)")
-        
-        # 파일에 저장
-        logger.info(f"💾 피드백 파일 저장 시도: {feedback_file} (데이터 {len(feedbacks)}개)")
-        try:
-            # 파일 저장 전 디렉토리 재확인
-            feedback_dir = os.path.dirname(feedback_file) or DOCS_DIR
-            os.makedirs(feedback_dir, exist_ok=True)
-            
-            # 파일 저장
-            with open(feedback_file, 'w', encoding='utf-8') as f:
-                json.dump(feedbacks, f, ensure_ascii=False, indent=2)
-            
-            # 파일이 제대로 생성되었는지 확인
-            if not os.path.exists(feedback_file):
-                raise FileNotFoundError(f"피드백 파일이 생성되지 않았습니다: {feedback_file}")
-            
-            # 파일 크기 확인
-            file_size = os.path.getsize(feedback_file)
-            logger.info(f"✅ 피드백 파일 저장 완료: {feedback_file} (크기: {file_size} bytes)")
-                
-        except Exception as save_error:
-            logger.error(f"❌ 피드백 파일 저장 실패: {save_error}")
-            logger.error(f"❌ 저장 경로: {feedback_file}")
-            feedback_dir = os.path.dirname(feedback_file) or DOCS_DIR
-            logger.error(f"❌ 디렉토리 존재: {os.path.exists(feedback_dir)}")
-            logger.error(f"❌ 디렉토리 경로: {feedback_dir}")
-            import traceback
-            logger.error(f"❌ 상세 오류: {traceback.format_exc()}")
-            raise  # 저장 실패 시 예외를 다시 발생시켜 상위에서 처리
-        
-        # 긍정 피드백만 벡터 DB 재인덱싱
+        # 긍정 피드백은 해당 세트 1건만 벡터 DB에 upsert
+        # (같은 질문의 이전 답변 세트가 교체된 경우 그 벡터를 재사용하므로 먼저 upsert 후 제거)
         if feedback_type == "positive":
-            index_feedback_data(feedback_file)
+            upsert_feedback_vector(result["record"], reuse_hashes=result["removed_positive_hashes"])
         
-        return {
+        # 긍정 피드백에서 빠진 세트는 벡터 DB에서도 제거
+        for removed_hash in result["removed_positive_hashes"]:
+            remove_feedback_vectors(removed_hash)
+        
+        response = {
             "saved": True,
-            "is_new": (same_question_index is None and existing_index is None),
-            "feedback_count": feedback_data.get("feedback_count", 1)
+            "is_new": result["is_new"],
+            "feedback_count": result["feedback_count"]
         }
+        if result["type_changed"]:
+            response["type_changed"] = True
+        return response
         
     except Exception as e:
         logger.error(f"❌ 피드백 저장 오류: {str(e)}")
@@ -576,12 +518,120 @@ def save_feedback_to_file(feedback_data):
         logger.error(f"❌ 상세 오류: {traceback.format_exc()}")
         return {"saved": False, "is_new": False, "feedback_count": 0}
 
+def feedback_vector_id(qa_hash: str) -> str:
+    """긍정 피드백 벡터 고정 ID (질문-답변 해시 기반, upsert/삭제 대상 지정용)"""
+    return f"feedback-{qa_hash}"
+
+def _feedback_metadata(feedback: dict, qa_hash: str) -> dict:
+    return {
+        "answer": feedback.get("answer", ""),
+        "sources": json.dumps(feedback.get("sources", []), ensure_ascii=False),
+        "timestamp": feedback.get("timestamp", ""),
+        "source": "positive_feedback",
+        "qa_hash": qa_hash,
+    }
+
+def _as_float_list(vector) -> list:
+    """Chroma 조회 임베딩(numpy 배열) → float 리스트 (upsert 입력용)"""
+    return [float(x) for x in vector]
+
+# 고정 ID 이관 확인 완료 (프로세스당 1회)
+_feedback_vectors_migrated = False
+
+def _migrate_legacy_feedback_vectors(vectordb) -> bool:
+    """고정 ID 이전에 저장된 피드백 벡터(임의 ID)를 고정 ID로 1회 이관 (임베딩은 재사용)
+
+    Returns:
+        bool: 이관을 수행했으면 True
+    """
+    global _feedback_vectors_migrated
+    if _feedback_vectors_migrated:
+        return False
+    ids = vectordb._collection.get(where={"source": "positive_feedback"}, include=[]).get("ids") or []
+    legacy_ids = [vector_id for vector_id in ids if not vector_id.startswith("feedback-")]
+    if not legacy_ids:
+        _feedback_vectors_migrated = True
+        return False
+    
+    collection = vectordb._collection.get(ids=legacy_ids, include=["documents", "embeddings"])
+    documents = collection.get("documents") or []
+    embeddings = collection.get("embeddings")
+    cached = {}
+    if embeddings is not None:
+        cached = {document: _as_float_list(embeddings[i]) for i, document in enumerate(documents)}
+    vectordb._collection.delete(ids=legacy_ids)
+    count = 0
+    for feedback in get_feedbacks("positive"):
+        if feedback["question"] in cached:
+            qa_hash = feedback.get("qa_hash") or make_qa_hash(feedback["question"], feedback.get("answer", ""))
+            vectordb._collection.upsert(
+                ids=[feedback_vector_id(qa_hash)], embeddings=[cached[feedback["question"]]],
+                documents=[feedback["question"]], metadatas=[_feedback_metadata(feedback, qa_hash)]
+            )
+            count += 1
+    _feedback_vectors_migrated = True
+    logger.info(f"🔁 기존 피드백 벡터 고정 ID 이관: {len(legacy_ids)}개 → {count}개 (임베딩 재사용)")
+    return True
+
+def upsert_feedback_vector(feedback: dict, reuse_hashes=()) -> bool:
+    """긍정 피드백 1건을 벡터 DB에 upsert (질문 임베딩은 가능하면 재사용)
+
+    - 같은 세트가 이미 있으면 메타데이터만 갱신 (임베딩 호출 없음)
+    - reuse_hashes 중 같은 질문의 벡터가 있으면 그 임베딩 사용 (답변만 바뀐 경우)
+    - 둘 다 없을 때만 질문 1건 임베딩
+    """
+    try:
+        vectordb = get_feedback_vectordb()
+        if not vectordb:
+            return False
+        question = feedback["question"]
+        qa_hash = feedback.get("qa_hash") or make_qa_hash(question, feedback.get("answer", ""))
+        vector_id = feedback_vector_id(qa_hash)
+        
+        with get_lock("feedback_vectors"):
+            _migrate_legacy_feedback_vectors(vectordb)
+            
+            candidate_ids = [vector_id] + [feedback_vector_id(h) for h in reuse_hashes if h != qa_hash]
+            existing = vectordb._collection.get(ids=candidate_ids, include=["documents", "embeddings"])
+            embedding = None
+            found_embeddings = existing.get("embeddings")
+            for i, document in enumerate(existing.get("documents") or []):
+                if document == question and found_embeddings is not None:
+                    embedding = _as_float_list(found_embeddings[i])
+                    break
+            
+            reused = embedding is not None
+            if not reused:
+                embedding = get_embedding_function().embed_documents([question])[0]
+            vectordb._collection.upsert(
+                ids=[vector_id], embeddings=[embedding],
+                documents=[question], metadatas=[_feedback_metadata(feedback, qa_hash)]
+            )
+        logger.info(f"✅ 피드백 벡터 upsert: {vector_id} ({'임베딩 재사용' if reused else '임베딩 1건 생성'})")
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ 피드백 벡터 upsert 오류 (무시하고 계속): {e}")
+        return False
+
+def remove_feedback_vectors(qa_hash):
+    """긍정 피드백 벡터 DB에서 질문-답변 세트 제거 (고정 ID 1건 삭제)"""
+    try:
+        feedback_vectordb = get_feedback_vectordb()
+        if not feedback_vectordb:
+            return
+        with get_lock("feedback_vectors"):
+            _migrate_legacy_feedback_vectors(feedback_vectordb)
+            vector_id = feedback_vector_id(qa_hash)
+            if feedback_vectordb._collection.get(ids=[vector_id], include=[]).get("ids"):
+                feedback_vectordb._collection.delete(ids=[vector_id])
+                logger.info(f"🗑️ 벡터 DB에서 피드백 제거: {vector_id}")
+    except Exception as del_error:
+        logger.warning(f"⚠️ 벡터 DB에서 피드백 제거 중 오류 (무시하고 계속): {del_error}")
+
 def get_feedback_vectordb():
     """긍정 피드백 데이터 전용 벡터 DB"""
     try:
-        embedding = OpenAIEmbeddings()
-        feedback_db_path = os.path.join(DOCS_DIR, "feedback_chroma_db")
-        vectordb = Chroma(persist_directory=feedback_db_path, embedding_function=embedding)
+        vectordb = open_vector_store(os.path.join(DOCS_DIR, "feedback_chroma_db"))
         
         # 자동 인덱싱 로직 제거 (순환 참조 방지)
         # 인덱싱은 save_feedback_to_file()에서만 수행
@@ -591,60 +641,50 @@ def get_feedback_vectordb():
         logger.error(f"❌ 피드백 벡터 DB 초기화 실패: {e}")
         return None
 
-def index_feedback_data(feedback_file):
-    """긍정 피드백 데이터를 벡터 DB에 인덱싱"""
+def index_feedback_data(feedback_file=None):
+    """긍정 피드백 데이터 전체를 벡터 DB와 맞춤 (수동 재색인용)
+
+    고정 ID(feedback-<qa_hash>) 기준으로 없는 세트만 임베딩하고,
+    저장소에 없는 세트의 벡터는 제거 (이미 있는 세트는 임베딩 호출 없음)
+    
+    Args:
+        feedback_file: 지정 시 해당 JSON 파일에서 로드 (기본: QA 저장소의 긍정 피드백)
+    """
     try:
-        with open(feedback_file, 'r', encoding='utf-8') as f:
-            feedbacks = json.load(f)
-        
-        if not feedbacks:
-            logger.info("📝 인덱싱할 피드백 데이터가 없습니다")
-            return
-        
-        docs = []
-        for feedback in feedbacks:
-            doc = Document(
-                page_content=feedback["question"],  # 질문을 벡터화
-                metadata={
-                    "answer": feedback["answer"],
-                    "sources": json.dumps(feedback["sources"], ensure_ascii=False),
-                    "timestamp": feedback["timestamp"],
-                    "source": "positive_feedback"
-                }
-            )
-            docs.append(doc)
+        if feedback_file:
+            with open(feedback_file, 'r', encoding='utf-8') as f:
+                feedbacks = json.load(f)
+        else:
+            feedbacks = get_feedbacks("positive")
         
-        # 순환 참조 방지: get_feedback_vectordb() 대신 직접 벡터 DB 생성
-        embedding = OpenAIEmbeddings()
-        feedback_db_path = os.path.join(DOCS_DIR, "feedback_chroma_db")
-        vectordb = Chroma(persist_directory=feedback_db_path, embedding_function=embedding)
+        # 순환 참조 방지: get_feedback_vectordb() 대신 공유 인스턴스 직접 사용
+        vectordb = open_vector_store(os.path.join(DOCS_DIR, "feedback_chroma_db"))
         
-        if docs:
-            # 기존 피드백 데이터 제거 (전체 재인덱싱)
-            try:
-                collection = vectordb.get()
-                if collection and "ids" in collection and collection["ids"]:
-                    # positive_feedback 소스만 제거
-                    ids_to_remove = []
-                    if "metadatas" in collection:
-                        for i, metadata in enumerate(collection["metadatas"]):
-                            if isinstance(metadata, dict) and metadata.get("source") == "positive_feedback":
-                                if i < len(collection["ids"]):
-                                    ids_to_remove.append(collection["ids"][i])
-                    
-                    if ids_to_remove:
-                        vectordb._collection.delete(ids_to_remove)
-                        logger.info(f"🗑️ 기존 피드백 데이터 제거: {len(ids_to_remove)}개")
-            except Exception as del_error:
-                logger.warning(f"⚠️ 기존 피드백 데이터 삭제 중 오류 (무시하고 계속): {del_error}")
+        with get_lock("feedback_vectors"):
+            _migrate_legacy_feedback_vectors(vectordb)
             
-            # 새 데이터 추가
-            vectordb.add_documents(docs)
-            try:
-                vectordb.persist()
-            except Exception as persist_error:
-                logger.warning(f"⚠️ persist() 중 오류 (무시하고 계속): {persist_error}")
-            logger.info(f"✅ 피드백 데이터 인덱싱 완료: {len(docs)}개")
+            wanted = {}
+            for feedback in feedbacks:
+                qa_hash = feedback.get("qa_hash") or make_qa_hash(feedback["question"], feedback.get("answer", ""))
+                wanted[feedback_vector_id(qa_hash)] = (qa_hash, feedback)
+            
+            stored_ids = set(vectordb._collection.get(where={"source": "positive_feedback"}, include=[]).get("ids") or [])
+            stale_ids = sorted(stored_ids - set(wanted))
+            if stale_ids:
+                vectordb._collection.delete(ids=stale_ids)
+                logger.info(f"🗑️ 저장소에 없는 피드백 벡터 제거: {len(stale_ids)}개")
+            
+            missing = [(vector_id, qa_hash, feedback) for vector_id, (qa_hash, feedback) in wanted.items()
+                       if vector_id not in stored_ids]
+            if missing:
+                embeddings = get_embedding_function().embed_documents([feedback["question"] for _, _, feedback in missing])
+                vectordb._collection.upsert(
+                    ids=[vector_id for vector_id, _, _ in missing],
+                    embeddings=embeddings,
+                    documents=[feedback["question"] for _, _, feedback in missing],
+                    metadatas=[_feedback_metadata(feedback, qa_hash) for _, qa_hash, feedback in missing],
+                )
+        logger.info(f"✅ 피드백 데이터 인덱싱 완료: 전체 {len(wanted)}개, 신규 임베딩 {len(missing)}개")
         
     except Exception as e:
         logger.error(f"❌ 피드백 데이터 인덱싱 오류: {str(e)}")
@@ -654,24 +694,17 @@ def index_feedback_data(feedback_file):
 def search_positive_feedback(question):
     """긍정 피드백 데이터에서 유사 질문 검색
     
-    JSON 파일이 없으면 벡터 DB 검색을 하지 않고 None을 반환하여 메인 DB 검색으로 넘어감
+    긍정 피드백이 없으면 벡터 DB 검색을 하지 않고 None을 반환하여 메인 DB 검색으로 넘어감
     """
     try:
-        # JSON 파일 존재 여부 확인 (파일 기반 검색 보장)
-        positive_file = os.path.join(DOCS_DIR, "positive_feedback.json")
-        if not os.path.exists(positive_file):
-            logger.debug("📝 긍정 피드백 JSON 파일이 없어 벡터 DB 검색을 건너뜁니다 → 메인 DB 검색으로 진행")
-            return None
-        
-        # JSON 파일이 비어있는지 확인 및 로드
+        # 긍정 피드백 로드 (QA 저장소)
         try:
-            with open(positive_file, 'r', encoding='utf-8') as f:
-                feedbacks = json.load(f)
-            if not feedbacks or len(feedbacks) == 0:
-                logger.debug("📝 긍정 피드백 JSON 파일이 비어있어 벡터 DB 검색을 건너뜁니다 → 메인 DB 검색으로 진행")
+            if count_feedbacks("positive") == 0:
+                logger.debug("📝 긍정 피드백이 없어 벡터 DB 검색을 건너뜁니다 → 메인 DB 검색으로 진행")
                 return None
-        except (json.JSONDecodeError, Exception) as e:
-            logger.warning(f"⚠️ 긍정 피드백 JSON 파일 읽기 오류: {e} → 메인 DB 검색으로 진행")
+            feedbacks = get_feedbacks("positive")
+        except Exception as e:
+            logger.warning(f"⚠️ 긍정 피드백 로드 오류: {e} → 메인 DB 검색으로 진행")
             return None
         
         # 1단계: JSON 파일 직접 검색 (벡터 DB 검색 전에 먼저 시도)
@@ -806,11 +839,14 @@ def search_positive_feedback(question):
             # 피드백 데이터는 적으므로 빠른 검색이 중요
             # 띄어쓰기 차이를 고려하여 공백 제거 버전도 검색
             try:
+                # 원본/공백 제거 버전 질문을 한 번에 임베딩 (이후 검색은 캐시 사용)
+                question_no_space = question.replace(" ", "")
+                prefetch_query_embeddings([question, question_no_space])
+                
                 # 원본 질문으로 검색
                 scored_docs = feedback_vectordb.similarity_search_with_score(question, k=5)
                 
                 # 공백 제거 버전으로도 검색 (띄어쓰기 차이 대응)
-                question_no_space = question.replace(" ", "")
                 if question_no_space != question:
                     scored_docs_no_space = feedback_vectordb.similarity_search_with_score(question_no_space, k=5)
                     # 두 결과를 합치고 중복 제거 (거리 기준으로 정렬)
@@ -956,6 +992,60 @@ def search_positive_feedback(question):
         logger.warning(f"⚠️ 피드백 검색 중 예상치 못한 오류: {str(e)} → 메인 DB 검색으로 진행")
         return None
 
+def effort_json_document(item: dict, file_path: str) -> Document:
+    """effort_estimations.json 항목 1건을 검색용 문서로 변환"""
+    # JSON 데이터를 검색 가능한 텍스트로 변환
+    epic_info = ""
+    if item.get('epic_key'):
+        epic_info = f"\nEpic: {item.get('epic_key', '')}"
+        if item.get('epic_name'):
+            epic_info += f" ({item.get('epic_name', '')})"
+    
+    # Story Points 표시 (원본 정보 포함)
+    story_points_display = f"{item.get('story_points', '')} M/D"
+    if item.get('story_points_unit') == 'M/M':
+        story_points_display += f" (원본: {item.get('story_points_original', '')} M/M)"
+    
+    text_content = f"""
+Jira 티켓: {item.get('jira_ticket', '')}
+제목: {item.get('title', '')}{epic_info}
+Story Points: {story_points_display}
+담당자: {item.get('team_member', '')}
+산정 이유: {item.get('estimation_reason', '')}
+설명: {item.get('description', '')}
+댓글: {item.get('comments', '')}
+비고: {item.get('notes', '')}
+등록일: {item.get('created_date', '')}
+"""
+    
+    return Document(
+        page_content=text_content.strip(),
+        metadata={
+            "source": "effort_estimations.json",
+            "family": "effort",
+            "jira_ticket": item.get('jira_ticket', ''),
+            "title": item.get('title', ''),
+            "story_points": item.get('story_points', ''),
+            "story_points_original": item.get('story_points_original', ''),
+            "story_points_unit": item.get('story_points_unit', 'M/D'),
+            "team_member": item.get('team_member', ''),
+            "major_category": item.get('major_category', ''),
+            "minor_category": item.get('minor_category', ''),
+            "sub_category": item.get('sub_category', ''),
+            "epic_key": item.get('epic_key', ''),
+            "epic_name": item.get('epic_name', ''),
+            "last_modified": datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
+            "file_size": os.path.getsize(file_path)
+        }
+    )
+
+def load_effort_json_documents(file_path: str):
+    """effort_estimations.json 전체를 검색용 문서 목록으로 변환"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [effort_json_document(item, file_path) for item in data]
+
+@serialize_index_writes
 def index_json_data_incremental(jira_tickets: list, file_path: str = None):
     """특정 Jira 티켓들만 증분 색인 (추가/수정)"""
     try:
@@ -967,8 +1057,7 @@ def index_json_data_incremental(jira_tickets: list, file_path: str = None):
             return False
         
         # 벡터 DB 생성
-        embedding = OpenAIEmbeddings()
-        vectordb = Chroma(persist_directory=CHROMA_DIR, embedding_function=embedding)
+        vectordb = get_family_vectordb("effort")
         
         # JSON 파일 읽기
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -996,53 +1085,7 @@ def index_json_data_incremental(jira_tickets: list, file_path: str = None):
             logger.warning(f"⚠️ 기존 데이터 제거 중 오류 (무시하고 계속): {del_error}")
         
         # 새 데이터 색인
-        docs = []
-        for item in target_items:
-            # Epic 정보
-            epic_info = ""
-            if item.get('epic_key'):
-                epic_info = f"\nEpic: {item.get('epic_key', '')}"
-                if item.get('epic_name'):
-                    epic_info += f" ({item.get('epic_name', '')})"
-            
-            # Story Points 표시 (원본 정보 포함)
-            story_points_display = f"{item.get('story_points', '')} M/D"
-            if item.get('story_points_unit') == 'M/M':
-                story_points_display += f" (원본: {item.get('story_points_original', '')} M/M)"
-            
-            # 텍스트 생성
-            text_content = f"""
-Jira 티켓: {item.get('jira_ticket', '')}
-제목: {item.get('title', '')}{epic_info}
-Story Points: {story_points_display}
-담당자: {item.get('team_member', '')}
-산정 이유: {item.get('estimation_reason', '')}
-설명: {item.get('description', '')}
-댓글: {item.get('comments', '')}
-비고: {item.get('notes', '')}
-등록일: {item.get('created_date', '')}
-"""
-            
-            doc = Document(
-                page_content=text_content.strip(),
-                metadata={
-                    "source": "effort_estimations.json",
-                    "jira_ticket": item.get('jira_ticket', ''),
-                    "title": item.get('title', ''),
-                    "story_points": item.get('story_points', ''),
-                    "story_points_original": item.get('story_points_original', ''),
-                    "story_points_unit": item.get('story_points_unit', 'M/D'),
-                    "team_member": item.get('team_member', ''),
-                    "major_category": item.get('major_category', ''),
-                    "minor_category": item.get('minor_category', ''),
-                    "sub_category": item.get('sub_category', ''),
-                    "epic_key": item.get('epic_key', ''),
-                    "epic_name": item.get('epic_name', ''),
-                    "last_modified": datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
-                    "file_size": os.path.getsize(file_path)
-                }
-            )
-            docs.append(doc)
+        docs = [effort_json_document(item, file_path) for item in target_items]
         
         # 벡터 DB에 추가
         if docs:
@@ -1061,12 +1104,12 @@ Story Points: {story_points_display}
         logger.error(traceback.format_exc())
         return False
 
+@serialize_index_writes
 def index_json_data(file_path: str, force: bool = False):
     """JSON 파일을 벡터 DB에 인덱싱 (전체 재색인)"""
     try:
         # 직접 벡터 DB 생성 (get_vectordb() 호출하지 않음)
-        embedding = OpenAIEmbeddings()
-        vectordb = Chroma(persist_directory=CHROMA_DIR, embedding_function=embedding)
+        vectordb = get_family_vectordb("effort")
         
         # 기존 JSON 데이터 제거
         try:
@@ -1091,52 +1134,7 @@ def index_json_data(file_path: str, force: bool = False):
         logger.info(f"📊 JSON 파일에서 {len(data)}개 항목을 읽었습니다")
         
         # JSON 데이터를 Document로 변환
-        docs = []
-        for item in data:
-            # JSON 데이터를 검색 가능한 텍스트로 변환
-            epic_info = ""
-            if item.get('epic_key'):
-                epic_info = f"\nEpic: {item.get('epic_key', '')}"
-                if item.get('epic_name'):
-                    epic_info += f" ({item.get('epic_name', '')})"
-            
-            # Story Points 표시 (원본 정보 포함)
-            story_points_display = f"{item.get('story_points', '')} M/D"
-            if item.get('story_points_unit') == 'M/M':
-                story_points_display += f" (원본: {item.get('story_points_original', '')} M/M)"
-            
-            text_content = f"""
-Jira 티켓: {item.get('jira_ticket', '')}
-제목: {item.get('title', '')}{epic_info}
-Story Points: {story_points_display}
-담당자: {item.get('team_member', '')}
-산정 이유: {item.get('estimation_reason', '')}
-설명: {item.get('description', '')}
-댓글: {item.get('comments', '')}
-비고: {item.get('notes', '')}
-등록일: {item.get('created_date', '')}
-"""
-            
-            doc = Document(
-                page_content=text_content.strip(),
-                metadata={
-                    "source": "effort_estimations.json",
-                    "jira_ticket": item.get('jira_ticket', ''),
-                    "title": item.get('title', ''),
-                    "story_points": item.get('story_points', ''),
-                    "story_points_original": item.get('story_points_original', ''),
-                    "story_points_unit": item.get('story_points_unit', 'M/D'),
-                    "team_member": item.get('team_member', ''),
-                    "major_category": item.get('major_category', ''),
-                    "minor_category": item.get('minor_category', ''),
-                    "sub_category": item.get('sub_category', ''),
-                    "epic_key": item.get('epic_key', ''),
-                    "epic_name": item.get('epic_name', ''),
-                    "last_modified": datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
-                    "file_size": os.path.getsize(file_path)
-                }
-            )
-            docs.append(doc)
+        docs = [effort_json_document(item, file_path) for item in data]
         
         logger.info(f"📊 총 {len(docs)}개 문서를 처리합니다")
         
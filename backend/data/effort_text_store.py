@@ -0,0 +1,147 @@
+"""
+공수 산정 긴 텍스트 저장소 모듈
+description/comments 같은 긴 텍스트를 SQLite에 두고 필요할 때만 조회
+(워커 프로세스마다 모든 텍스트를 메모리에 들고 있지 않도록 분리)
+"""
+
+import json
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Tuple
+from ..utils.config import EFFORT_TEXT_STORE_DB
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS effort_texts (
+    jira_ticket TEXT PRIMARY KEY,
+    description TEXT,
+    comments TEXT
+);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 문자열이 아닌 값(Jira ADF description 등 dict/list)은 이 접두어 + JSON으로 저장
+_JSON_MARKER = "\x00json:"
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def get_connection() -> sqlite3.Connection:
+    """스레드별 SQLite 연결 반환 (최초 호출 시 스키마 생성)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    os.makedirs(os.path.dirname(EFFORT_TEXT_STORE_DB) or ".", exist_ok=True)
+    conn = sqlite3.connect(EFFORT_TEXT_STORE_DB, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    _local.conn = conn
+
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                conn.executescript(_SCHEMA)
+                _initialized = True
+    return conn
+
+
+def _encode(value: Any) -> Optional[str]:
+    """저장용 값 변환 (None/문자열은 그대로, 그 밖의 값은 JSON)"""
+    if value is None or isinstance(value, str):
+        return value
+    return _JSON_MARKER + json.dumps(value, ensure_ascii=False)
+
+
+def _decode(value: Optional[str]) -> Any:
+    """저장된 값 복원 (JSON 표시가 있으면 원래 타입으로)"""
+    if isinstance(value, str) and value.startswith(_JSON_MARKER):
+        return json.loads(value[len(_JSON_MARKER):])
+    return value
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    """쓰기 트랜잭션 (BEGIN IMMEDIATE로 프로세스 간 쓰기 직렬화)"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def put_texts(rows: Iterable[Tuple[str, Any, Any]], stamp: str = None) -> int:
+    """(jira_ticket, description, comments) 일괄 저장 (ADF dict 등 문자열이 아닌 값은 JSON으로 저장)
+
+    Args:
+        stamp: 함께 기록할 원본 파일 스탬프 (다음 로드 시 재기록 생략 판단용)
+
+    Returns:
+        int: 저장된 행 수
+    """
+    rows = [(ticket, _encode(description), _encode(comments)) for ticket, description, comments in rows]
+    conn = get_connection()
+    with _transaction(conn):
+        if rows:
+            conn.executemany(
+                "INSERT OR REPLACE INTO effort_texts (jira_ticket, description, comments) VALUES (?, ?, ?)",
+                rows
+            )
+        if stamp is not None:
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('source_stamp', ?)", (stamp,))
+    return len(rows)
+
+
+def set_stamp(stamp: str):
+    """원본 파일 스탬프 기록"""
+    put_texts([], stamp)
+
+
+def get_stamp() -> Optional[str]:
+    """마지막으로 동기화된 원본 파일 스탬프"""
+    row = get_connection().execute("SELECT value FROM store_meta WHERE key = 'source_stamp'").fetchone()
+    return row[0] if row else None
+
+
+def get_texts(jira_ticket: str) -> Tuple[Any, Any]:
+    """티켓 1건의 (description, comments) 조회"""
+    row = get_connection().execute(
+        "SELECT description, comments FROM effort_texts WHERE jira_ticket = ?", (jira_ticket,)
+    ).fetchone()
+    return (_decode(row[0]), _decode(row[1])) if row else (None, None)
+
+
+def get_all_texts() -> Dict[str, Tuple[Any, Any]]:
+    """전체 텍스트 조회 (파일 저장/색인 포맷팅 시 일시적으로 사용)"""
+    rows = get_connection().execute("SELECT jira_ticket, description, comments FROM effort_texts").fetchall()
+    return {ticket: (_decode(description), _decode(comments)) for ticket, description, comments in rows}
+
+
+def delete_texts(jira_ticket: str):
+    """티켓 1건의 텍스트 삭제"""
+    conn = get_connection()
+    with _transaction(conn):
+        conn.execute("DELETE FROM effort_texts WHERE jira_ticket = ?", (jira_ticket,))
+
+
+def get_store_size() -> int:
+    """저장소 파일 크기 (바이트, WAL 포함)"""
+    total = 0
+    for path in (EFFORT_TEXT_STORE_DB, f"{EFFORT_TEXT_STORE_DB}-wal"):
+        if os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
@@ -0,0 +1,87 @@
+"""
+질문 임베딩 캐시 모듈
+벡터 DB 검색 시 같은 질문(원본/공백 제거/키워드 버전)을 여러 번 임베딩하지 않도록
+프로세스 단위 LRU 캐시를 임베딩 함수 앞에 둠 (키: 모델명 + 텍스트)
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from ..utils.config import QUERY_EMBEDDING_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    """질문 임베딩 LRU 캐시 래퍼
+
+    - embed_query: 캐시 조회 후 없을 때만 임베딩
+    - prefetch_queries: 여러 질문 중 캐시에 없는 것만 한 번의 요청으로 임베딩
+    - embed_documents: 색인용 문서는 캐시하지 않고 그대로 전달
+    """
+
+    def __init__(self, base: Embeddings, maxsize: int = QUERY_EMBEDDING_CACHE_SIZE):
+        self.base = base
+        self.maxsize = maxsize
+        self.model = getattr(base, "model", type(base).__name__)
+        self._cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, text: str):
+        key = (self.model, text)
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            return vector
+
+    def _put(self, text: str, vector: List[float]):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._cache[(self.model, text)] = vector
+            self._cache.move_to_end((self.model, text))
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def prefetch_queries(self, texts: Iterable[str]) -> int:
+        """캐시에 없는 질문만 모아 한 번에 임베딩 (검색 전에 변형 질문을 미리 준비)
+
+        Returns:
+            int: 새로 임베딩한 질문 수
+        """
+        missing = []
+        for text in dict.fromkeys(t for t in texts if t):  # 순서 유지 중복 제거
+            if self._get(text) is None:
+                missing.append(text)
+        if not missing:
+            return 0
+        with self._lock:
+            self.misses += len(missing)
+        # OpenAIEmbeddings.embed_query는 embed_documents([text])[0]과 같으므로 배치 결과를 그대로 캐시
+        for text, vector in zip(missing, self.base.embed_documents(missing)):
+            self._put(text, vector)
+        return len(missing)
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self._get(text)
+        if vector is None:
+            with self._lock:
+                self.misses += 1
+            vector = self.base.embed_query(text)
+            self._put(text, vector)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._cache), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
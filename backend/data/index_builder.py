@@ -0,0 +1,388 @@
+"""
+메인 벡터 색인 재구축 모듈 (blue/green, 소스 계열 컬렉션 단위)
+재색인 중에도 질의는 현재 색인을 그대로 사용하고, 새 색인은 빌드 디렉토리에 따로 만든 뒤
+검증(문서 수 비교 + 샘플 검색)을 통과하면 포인터 파일(active.json)만 교체해 전환
+- 임베딩 계산(가장 오래 걸리는 단계)은 잠금 밖에서 수행, 기존 색인에 같은 본문이 있으면 재사용
+- 새 색인 작성/검증/전환은 색인 쓰기 잠금 안에서 수행 (그 사이 들어온 문서 추가/삭제가 유실되지 않음)
+- 재색인 대상 파일이 속한 계열 컬렉션만 새로 만들고 포인터도 컬렉션별로 교체 (다른 계열은 그대로)
+- 직전 색인은 롤백용으로 남기고, 그보다 오래된 빌드는 정리
+"""
+
+import os
+import shutil
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from ..utils.config import VECTOR_INDEX_BUILDS_DIR
+from ..utils.shared_state import SharedStatus, atomic_write_json, file_stamp, get_lock
+from .database import (
+    ACTIVE_INDEX_FILE, FAMILY_COLLECTIONS, INDEX_WRITE_LOCK, close_vector_store, collection_name, find_source_family,
+    get_active_index_dir, get_embedding_function, load_document_chunks, load_effort_json_documents,
+    open_vector_store, read_active_index_pointer, source_family,
+)
+
+logger = logging.getLogger(__name__)
+
+# 새 색인 쓰기/임베딩 배치 크기
+WRITE_BATCH_SIZE = 500
+EMBED_BATCH_SIZE = 100
+# 검증: 자기 임베딩으로 검색해 상위에 자기 자신이 나오는지 확인할 샘플 수
+VALIDATION_SAMPLES = 5
+# 검증: 교체 대상 소스의 문서 수가 기존 대비 이 비율 미만으로 줄면 전환하지 않음
+MIN_COUNT_RATIO = 0.5
+
+# 재색인 진행 상태 (워커 간 공유, /effort/reindex/status 응답)
+rebuild_status = SharedStatus("vector_index_rebuild", {
+    "status": "idle",  # idle | running | done | failed
+    "build_id": None,
+    "sources": [],
+    "started_at": None,
+    "finished_at": None,
+    "duration_seconds": None,
+    "embedded": 0,
+    "reused": 0,
+    "validation": None,
+    "error": None,
+})
+
+
+def _load_documents(files: Sequence[Tuple[str, str]]) -> Tuple[Dict[str, List[Document]], List[str]]:
+    """파일별 색인 문서 생성 (json: effort_estimations.json 형식, txt/pdf: 문서 조각)
+
+    Returns:
+        tuple: ({소스명: 문서 목록}, 실패 메시지 목록) - 읽기에 실패한 파일은 기존 문서를 유지
+    """
+    loaded: Dict[str, List[Document]] = {}
+    errors = []
+    for file_path, file_type in files:
+        try:
+            if file_type == "json":
+                docs = load_effort_json_documents(file_path)
+            else:
+                # 이미 색인된 소스는 기존 계열 유지 (크롤링 페이지 .txt가 text 계열로 바뀌지 않도록)
+                docs = load_document_chunks(file_path, file_type, find_source_family(os.path.basename(file_path)))
+            loaded[os.path.basename(file_path)] = docs
+        except Exception as e:
+            errors.append(f"{os.path.basename(file_path)}: {e}")
+            logger.error(f"❌ 재색인 문서 읽기 실패 ({file_path}): {e}")
+    return loaded, errors
+
+
+def _reusable_embeddings(vectordb, sources: Sequence[str]) -> Dict[str, List[float]]:
+    """기존 색인에서 교체 대상 소스의 본문 → 임베딩 (본문이 같으면 다시 임베딩하지 않음)"""
+    if not sources:
+        return {}
+    collection = vectordb._collection.get(where={"source": {"$in": list(sources)}}, include=["documents", "embeddings"])
+    embeddings = collection.get("embeddings")
+    if embeddings is None or len(embeddings) == 0:
+        return {}
+    return {text: vector for text, vector in zip(collection.get("documents") or [], embeddings) if text}
+
+
+def _embed(documents: Dict[str, List[Document]], reuse: Dict[str, Any]) -> Tuple[Dict[str, Any], int, int]:
+    """색인할 본문의 임베딩 준비 (reuse에 없는 본문만 배치로 임베딩)
+
+    Returns:
+        tuple: (본문 → 임베딩, 새로 임베딩한 수, 재사용한 수)
+    """
+    texts = list(dict.fromkeys(doc.page_content for docs in documents.values() for doc in docs))
+    vectors = {text: reuse[text] for text in texts if text in reuse}
+    missing = [text for text in texts if text not in vectors]
+    embedding = get_embedding_function()
+    for i in range(0, len(missing), EMBED_BATCH_SIZE):
+        batch = missing[i:i + EMBED_BATCH_SIZE]
+        vectors.update(zip(batch, embedding.embed_documents(batch)))
+        logger.info(f"   🧮 임베딩 {min(i + EMBED_BATCH_SIZE, len(missing))}/{len(missing)}")
+    return vectors, len(missing), len(texts) - len(missing)
+
+
+def _upsert(store, ids, embeddings, documents, metadatas):
+    for i in range(0, len(ids), WRITE_BATCH_SIZE):
+        store._collection.upsert(
+            ids=list(ids[i:i + WRITE_BATCH_SIZE]),
+            embeddings=np.asarray(embeddings[i:i + WRITE_BATCH_SIZE], dtype=np.float32).tolist(),
+            documents=list(documents[i:i + WRITE_BATCH_SIZE]),
+            metadatas=[metadata or None for metadata in metadatas[i:i + WRITE_BATCH_SIZE]],  # Chroma는 빈 dict 거부
+        )
+
+
+def _copy_other_sources(live, store, replaced_sources: Sequence[str]) -> int:
+    """교체 대상이 아닌 문서를 임베딩째 복사 (임베딩 API 호출 없음)"""
+    collection = live._collection.get(include=["documents", "metadatas", "embeddings"])
+    ids = collection.get("ids") or []
+    if not ids:
+        return 0
+    metadatas = collection.get("metadatas") or [None] * len(ids)
+    keep = [i for i, metadata in enumerate(metadatas)
+            if not (isinstance(metadata, dict) and metadata.get("source") in replaced_sources)]
+    if keep:
+        documents = collection.get("documents") or [""] * len(ids)
+        embeddings = collection.get("embeddings")
+        _upsert(store, [ids[i] for i in keep], [embeddings[i] for i in keep],
+                [documents[i] for i in keep], [metadatas[i] for i in keep])
+    return len(keep)
+
+
+def _write_documents(store, documents: Dict[str, List[Document]], vectors: Dict[str, Any]) -> List[Tuple[str, Document]]:
+    """새 문서 쓰기 (id, 문서) 목록 반환"""
+    written = [(str(uuid.uuid4()), doc) for docs in documents.values() for doc in docs]
+    if written:
+        _upsert(store, [doc_id for doc_id, _ in written], [vectors[doc.page_content] for _, doc in written],
+                [doc.page_content for _, doc in written], [doc.metadata for _, doc in written])
+    return written
+
+
+def _count_source(vectordb, source: str) -> int:
+    return len(vectordb._collection.get(where={"source": source}, include=[]).get("ids") or [])
+
+
+def validate_index(store, live, documents: Dict[str, List[Document]], written: List[Tuple[str, Document]],
+                   vectors: Dict[str, Any], expected_total: int, min_count_ratio: float = MIN_COUNT_RATIO) -> Dict[str, Any]:
+    """새 색인 검증 (전환 전)
+
+    - 전체 문서 수 = 복사한 문서 + 새 문서
+    - 소스별 문서 수 = 새로 만든 문서 수, 기존 색인 대비 min_count_ratio 이상
+    - 샘플 문서의 임베딩으로 검색하면 상위 3개 안에 자기 자신이 나옴
+    - 샘플 제목으로 실제 질의(임베딩 API)를 했을 때 결과가 비어 있지 않음
+    """
+    errors = []
+    total = store.count()
+    if total != expected_total:
+        errors.append(f"전체 문서 수 불일치 (예상 {expected_total}, 실제 {total})")
+
+    sources = {}
+    for source, docs in documents.items():
+        new_count = _count_source(store, source)
+        live_count = _count_source(live, source)
+        sources[source] = {"live": live_count, "new": new_count}
+        if new_count != len(docs):
+            errors.append(f"{source}: 문서 수 불일치 (예상 {len(docs)}, 실제 {new_count})")
+        if live_count and new_count < live_count * min_count_ratio:
+            errors.append(f"{source}: 문서 수 급감 ({live_count} → {new_count})")
+
+    samples = []
+    if written:
+        step = max(1, len(written) // VALIDATION_SAMPLES)
+        for doc_id, doc in written[::step][:VALIDATION_SAMPLES]:
+            result = store._collection.query(query_embeddings=[np.asarray(vectors[doc.page_content], dtype=np.float32).tolist()],
+                                             n_results=3, include=["distances"])
+            distances = (result.get("distances") or [[]])[0] or []
+            # 같은 본문이 여러 개면 자기 자신 대신 동일 벡터가 먼저 나올 수 있으므로 거리 0도 성공으로 처리
+            hit = doc_id in ((result.get("ids") or [[]])[0] or []) or (len(distances) > 0 and distances[0] <= 1e-4)
+            samples.append({"source": doc.metadata.get("source"), "title": doc.metadata.get("title", ""), "hit": hit})
+            if not hit:
+                errors.append(f"샘플 검색 실패: {doc.metadata.get('title') or doc_id}")
+
+        query = next((doc.metadata.get("title") for _, doc in written if doc.metadata.get("title")), None)
+        if query:
+            if not store.similarity_search(query, k=3):
+                errors.append(f"질의 검색 결과 없음: {query}")
+
+    return {"ok": not errors, "errors": errors, "total": total, "sources": sources, "samples": samples}
+
+
+def _group_by_collection(documents: Dict[str, List[Document]]) -> Dict[str, Dict[str, List[Document]]]:
+    """소스별 문서를 계열 컬렉션별로 묶음 {컬렉션명: {소스명: 문서 목록}}"""
+    grouped: Dict[str, Dict[str, List[Document]]] = {}
+    for source, docs in documents.items():
+        family = source_family(source, docs[0].metadata if docs else None)
+        grouped.setdefault(collection_name(family), {})[source] = docs
+    return grouped
+
+
+def _switch_active_index(paths: Dict[str, str], build_id: str):
+    """포인터 파일의 컬렉션별 경로 교체 (원자적 쓰기, 모든 워커가 다음 요청부터 새 색인 사용)
+
+    교체하지 않은 컬렉션은 기존 경로를 그대로 사용
+    """
+    pointer = read_active_index_pointer()
+    collections = pointer.setdefault("collections", {})
+    switched_at = datetime.now().isoformat()
+    for collection, path in paths.items():
+        previous = get_active_index_dir(collection)
+        collections[collection] = {"path": path, "previous": previous, "build_id": build_id, "switched_at": switched_at}
+        logger.info(f"🔀 색인 전환 [{collection}]: {previous} → {path}")
+    atomic_write_json(ACTIVE_INDEX_FILE, pointer, indent=2)
+
+
+def _new_build_dir() -> Tuple[str, str]:
+    build_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(VECTOR_INDEX_BUILDS_DIR, build_id)
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(VECTOR_INDEX_BUILDS_DIR, f"{build_id}-{suffix}")
+    return os.path.basename(path), path
+
+
+def prune_builds() -> List[str]:
+    """어느 컬렉션도 현재/직전 색인으로 쓰지 않는 빌드 디렉토리 삭제 (CHROMA_DIR은 건드리지 않음)"""
+    pointer = read_active_index_pointer()
+    entries = [pointer] + list(pointer.get("collections", {}).values())
+    keep = {os.path.abspath(p) for entry in entries for p in (entry.get("path"), entry.get("previous")) if p}
+    removed = []
+    if not os.path.isdir(VECTOR_INDEX_BUILDS_DIR):
+        return removed
+    for name in sorted(os.listdir(VECTOR_INDEX_BUILDS_DIR)):
+        path = os.path.join(VECTOR_INDEX_BUILDS_DIR, name)
+        if not os.path.isdir(path) or os.path.abspath(path) in keep:
+            continue
+        close_vector_store(path)
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(name)
+    if removed:
+        logger.info(f"🧹 오래된 색인 빌드 정리: {', '.join(removed)}")
+    return removed
+
+
+def rebuild_vector_index(files: Sequence[Tuple[str, str]], keep_other_sources: bool = True,
+                         min_count_ratio: float = MIN_COUNT_RATIO) -> Dict[str, Any]:
+    """메인 색인 재구축 후 전환 (blue/green, 파일이 속한 계열 컬렉션만 재구축)
+
+    Args:
+        files: [(파일 경로, 형식)] 형식은 json(effort_estimations.json) / txt / pdf
+        keep_other_sources: True면 같은 컬렉션의 다른 소스 문서는 현재 색인에서 임베딩째 복사,
+            False면 모든 컬렉션을 files만으로 새로 구성
+        min_count_ratio: 소스별 문서 수가 기존 대비 이 비율 미만이면 전환하지 않음
+
+    Returns:
+        dict: {"success", "build_id", "path", "collections", "validation", ...} 실패 시 {"success": False, "error"}
+    """
+    with get_lock("vector_index_rebuild"):
+        build_id, build_dir = _new_build_dir()
+        started = time.time()
+        rebuild_status.update(status="running", build_id=build_id, sources=[os.path.basename(p) for p, _ in files],
+                              started_at=datetime.now().isoformat(), finished_at=None, duration_seconds=None,
+                              embedded=0, reused=0, validation=None, error=None)
+        logger.info(f"🏗️ 색인 재구축 시작: {build_id} ({len(files)}개 파일)")
+        try:
+            # 1) 문서/임베딩 준비 (잠금 밖, 질의와 다른 쓰기는 현재 색인으로 계속 진행)
+            stamps = {path: file_stamp(path) for path, _ in files}
+            documents, load_errors = _load_documents(files)
+            if not documents:
+                raise ValueError(f"색인할 문서를 읽지 못했습니다: {'; '.join(load_errors)}")
+            reuse = {}
+            for collection, sources in _group_by_collection(documents).items():
+                live = open_vector_store(get_active_index_dir(collection), collection)
+                reuse.update(_reusable_embeddings(live, list(sources)))
+            vectors, embedded, reused = _embed(documents, reuse)
+            rebuild_status.update(embedded=embedded, reused=reused)
+
+            # 2) 새 색인 작성 → 검증 → 전환 (쓰기 잠금 안)
+            with get_lock(INDEX_WRITE_LOCK):
+                changed = [path for path, _ in files if file_stamp(path) != stamps[path]]
+                if changed:
+                    # 준비하는 동안 원본이 바뀌었으면 다시 읽음 (같은 본문은 이미 준비한 임베딩 재사용)
+                    logger.info(f"🔁 준비 중 원본 변경 감지, 다시 읽음: {', '.join(os.path.basename(p) for p in changed)}")
+                    documents, load_errors = _load_documents(files)
+                    vectors, extra, _ = _embed(documents, vectors)
+                    rebuild_status.update(embedded=embedded + extra)
+
+                grouped = _group_by_collection(documents)
+                if not keep_other_sources:
+                    for family in FAMILY_COLLECTIONS:
+                        grouped.setdefault(collection_name(family), {})
+
+                validation = {"ok": True, "errors": [], "total": 0, "sources": {}, "collections": {}}
+                previous, copied, indexed = {}, 0, 0
+                for collection, collection_documents in grouped.items():
+                    previous[collection] = get_active_index_dir(collection)
+                    live = open_vector_store(previous[collection], collection)
+                    store = open_vector_store(build_dir, collection)
+                    collection_copied = (_copy_other_sources(live, store, list(collection_documents))
+                                         if keep_other_sources else 0)
+                    written = _write_documents(store, collection_documents, vectors)
+                    result = validate_index(store, live, collection_documents, written, vectors,
+                                            collection_copied + len(written), min_count_ratio)
+                    validation["collections"][collection] = result
+                    validation["errors"].extend(f"[{collection}] {error}" for error in result["errors"])
+                    validation["total"] += result["total"]
+                    validation["sources"].update(result["sources"])
+                    copied += collection_copied
+                    indexed += len(written)
+                validation["ok"] = not validation["errors"]
+                rebuild_status.update(validation=validation)
+                if not validation["ok"]:
+                    raise ValueError(f"새 색인 검증 실패: {'; '.join(validation['errors'])}")
+                _switch_active_index({collection: build_dir for collection in grouped}, build_id)
+
+            pruned = prune_builds()
+            duration = round(time.time() - started, 1)
+            rebuild_status.update(status="done", finished_at=datetime.now().isoformat(), duration_seconds=duration,
+                                  error="; ".join(load_errors) or None)
+            logger.info(f"✅ 색인 재구축 완료: {build_id} [{', '.join(grouped)}] (복사 {copied}개, 새 문서 {indexed}개, "
+                        f"임베딩 {embedded}개, 재사용 {reused}개, {duration}초)")
+            return {
+                "success": True,
+                "build_id": build_id,
+                "path": build_dir,
+                "collections": list(grouped),
+                "previous": previous,
+                "copied": copied,
+                "indexed": indexed,
+                "embedded": embedded,
+                "reused": reused,
+                "load_errors": load_errors,
+                "validation": validation,
+                "pruned": pruned,
+                "duration_seconds": duration,
+            }
+        except Exception as e:
+            # 현재 색인은 그대로 유지됨 (실패한 빌드 디렉토리는 다음 정리 때 삭제)
+            rebuild_status.update(status="failed", finished_at=datetime.now().isoformat(),
+                                  duration_seconds=round(time.time() - started, 1), error=str(e))
+            logger.error(f"❌ 색인 재구축 실패 ({build_id}), 현재 색인 유지: {e}")
+            return {"success": False, "build_id": build_id, "error": str(e)}
+
+
+def rollback_vector_index(collections: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """직전 색인으로 되돌림 (collections 미지정 시 직전 색인이 있는 모든 컬렉션)
+
+    전환 이후 현재 색인에 추가된 문서는 직전 색인에 없음
+    """
+    try:
+        with get_lock(INDEX_WRITE_LOCK):
+            pointer = read_active_index_pointer()
+            entries = pointer.get("collections", {})
+            targets = [name for name in (collections or list(entries))
+                       if entries.get(name, {}).get("previous") and os.path.isdir(entries[name]["previous"])]
+            if not targets:
+                return {"success": False, "error": "되돌릴 이전 색인이 없습니다"}
+            rolled_back = {}
+            for name in targets:
+                entry = entries[name]
+                entry.update(path=entry["previous"], previous=entry["path"], rolled_back_at=datetime.now().isoformat())
+                rolled_back[name] = {"path": entry["path"], "previous": entry["previous"]}
+                logger.info(f"↩️ 색인 롤백 [{name}]: {entry['previous']} → {entry['path']}")
+            atomic_write_json(ACTIVE_INDEX_FILE, pointer, indent=2)
+        return {"success": True, "collections": rolled_back}
+    except Exception as e:
+        logger.error(f"❌ 색인 롤백 실패: {e}")
+        return {"success": False, "error": str(e)}
+
+
+def get_index_status() -> Dict[str, Any]:
+    """컬렉션별 현재 색인 경로/문서 수, 재구축 진행 상태, 남아 있는 빌드 목록"""
+    builds = []
+    if os.path.isdir(VECTOR_INDEX_BUILDS_DIR):
+        builds = sorted(name for name in os.listdir(VECTOR_INDEX_BUILDS_DIR)
+                        if os.path.isdir(os.path.join(VECTOR_INDEX_BUILDS_DIR, name)))
+    collections = {}
+    for family in FAMILY_COLLECTIONS:
+        collection = collection_name(family)
+        path = get_active_index_dir(collection)
+        collections.setdefault(collection, {"path": path, "families": [],
+                                            "count": open_vector_store(path, collection)._collection.count()})
+        collections[collection]["families"].append(family)
+    return {
+        "collections": collections,
+        "pointer": read_active_index_pointer(),
+        "rebuild": rebuild_status.snapshot(),
+        "builds": builds,
+    }
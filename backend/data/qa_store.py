@@ -0,0 +1,658 @@
+"""
+QA 이벤트 저장소 모듈
+QA 응답/피드백 이벤트를 append-only 로그(SQLite)로 기록하고 주 단위 집계를 유지
+슬랙 메시지 ↔ 질문-답변 매핑도 같은 DB에 보관 (TTL 기반 정리)
+웹 QA 로그와 긍정/부정 피드백(qa_hash 기본키)도 같은 DB에서 원자적으로 갱신
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Any, Optional
+from ..utils.config import DOCS_DIR, QA_STORE_DB, SLACK_QA_MAPPING_TTL_DAYS
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 타입
+EVENT_QA_RESPONSE = "qa_response"              # QA 응답 1건 (분모)
+EVENT_POSITIVE_FEEDBACK = "positive_feedback"  # 긍정 피드백 1건 (분자)
+EVENT_POSITIVE_RETRACTED = "positive_retracted"  # 부정 전환으로 취소된 긍정 피드백
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS qa_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    source TEXT,
+    qa_hash TEXT,
+    delta INTEGER NOT NULL DEFAULT 1,
+    week_key TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_qa_events_qa_hash ON qa_events (qa_hash);
+CREATE INDEX IF NOT EXISTS idx_qa_events_week ON qa_events (week_key);
+
+CREATE TABLE IF NOT EXISTS weekly_qa_rollup (
+    week_key TEXT PRIMARY KEY,
+    week_display TEXT NOT NULL,
+    qa_responses INTEGER NOT NULL DEFAULT 0,
+    positive_feedback INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS slack_qa_mapping (
+    message_ts TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    sources TEXT,
+    channel TEXT,
+    thread_ts TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_slack_qa_mapping_created_at ON slack_qa_mapping (created_at);
+
+CREATE TABLE IF NOT EXISTS web_qa_mapping (
+    qa_id TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    sources TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_web_qa_mapping_created_at ON web_qa_mapping (created_at);
+
+CREATE TABLE IF NOT EXISTS feedback (
+    qa_hash TEXT PRIMARY KEY,
+    feedback_type TEXT NOT NULL,
+    question TEXT NOT NULL,
+    feedback_count INTEGER NOT NULL DEFAULT 1,
+    first_feedback_time TEXT,
+    last_feedback_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_type_last_time ON feedback (feedback_type, last_feedback_time);
+CREATE INDEX IF NOT EXISTS idx_feedback_type_question ON feedback (feedback_type, question);
+
+CREATE TABLE IF NOT EXISTS slack_event_dedupe (
+    event_key TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_slack_event_dedupe_seen_at ON slack_event_dedupe (seen_at);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 만료 매핑 정리 주기 (초)
+_PURGE_INTERVAL_SECONDS = 3600
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+_last_purge_time = 0.0
+
+
+def get_connection() -> sqlite3.Connection:
+    """스레드별 SQLite 연결 반환 (최초 호출 시 스키마 생성 및 레거시 데이터 이관)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    os.makedirs(os.path.dirname(QA_STORE_DB) or ".", exist_ok=True)
+    # isolation_level=None: 트랜잭션은 _transaction()에서 명시적으로 관리
+    conn = sqlite3.connect(QA_STORE_DB, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    _local.conn = conn
+
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                conn.executescript(_SCHEMA)
+                _backfill_legacy_files(conn)
+                _import_legacy_slack_qa_mapping(conn)
+                _import_legacy_feedback_files(conn)
+                _initialized = True
+    return conn
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    """쓰기 트랜잭션 (BEGIN IMMEDIATE로 프로세스 간 쓰기 직렬화)"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def parse_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
+    """ISO 타임스탬프 파싱 (실패 시 None)"""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
+
+def week_key_of(dt: datetime) -> str:
+    """ISO 주 키 계산 (예: "2025-W48")"""
+    year, week, _ = dt.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_display_of(week_key: str) -> str:
+    """ISO 주 키를 "월(N주차)" 표기로 변환 (예: "2025-W48" → "11(5W)")
+
+    해당 ISO 주의 월요일이 속한 월을 기준으로,
+    그 월 1일이 포함된 주의 월요일부터 몇 번째 주인지 계산
+    """
+    try:
+        year, week_num = week_key.split('-W')
+        target_monday = date.fromisocalendar(int(year), int(week_num), 1)
+        month_start = target_monday.replace(day=1)
+        month_first_monday = month_start - timedelta(days=month_start.weekday())
+        week_in_month = (target_monday - month_first_monday).days // 7 + 1
+        return f"{target_monday.month}({week_in_month}W)"
+    except Exception as e:
+        logger.warning(f"⚠️ 주 표기 형식 변환 오류: {week_key} - {e}")
+        return week_key
+
+
+def _append_event(conn: sqlite3.Connection, event_type: str, dt: datetime, delta: int = 1,
+                  source: str = None, qa_hash: str = None, week_key: str = None):
+    """이벤트 1건 추가 + 주간 집계 갱신 (호출자가 트랜잭션 관리)"""
+    week_key = week_key or week_key_of(dt)
+    now = datetime.now().isoformat()
+
+    conn.execute(
+        "INSERT INTO qa_events (event_type, source, qa_hash, delta, week_key, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (event_type, source, qa_hash, delta, week_key, dt.isoformat())
+    )
+
+    qa_delta = delta if event_type == EVENT_QA_RESPONSE else 0
+    positive_delta = 0 if event_type == EVENT_QA_RESPONSE else delta
+    conn.execute(
+        """
+        INSERT INTO weekly_qa_rollup (week_key, week_display, qa_responses, positive_feedback, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(week_key) DO UPDATE SET
+            qa_responses = qa_responses + excluded.qa_responses,
+            positive_feedback = positive_feedback + excluded.positive_feedback,
+            updated_at = excluded.updated_at
+        """,
+        (week_key, week_display_of(week_key), qa_delta, positive_delta, now)
+    )
+
+
+def _retract_positive_events(conn: sqlite3.Connection, qa_hash: str, dt: datetime, source: str = None) -> int:
+    """부정 전환된 질문-답변 세트의 긍정 피드백 취소 (호출자가 트랜잭션 관리)
+
+    해당 qa_hash로 기록된 주별 순 긍정 수만큼 상쇄 이벤트를 추가하여
+    원래 집계된 주에서 차감
+
+    Returns:
+        int: 취소된 긍정 피드백 수
+    """
+    rows = conn.execute(
+        """
+        SELECT week_key, SUM(delta) AS net
+        FROM qa_events
+        WHERE qa_hash = ? AND event_type IN (?, ?)
+        GROUP BY week_key
+        HAVING net > 0
+        """,
+        (qa_hash, EVENT_POSITIVE_FEEDBACK, EVENT_POSITIVE_RETRACTED)
+    ).fetchall()
+    retracted = 0
+    for row in rows:
+        _append_event(conn, EVENT_POSITIVE_RETRACTED, dt, delta=-row["net"],
+                      source=source, qa_hash=qa_hash, week_key=row["week_key"])
+        retracted += row["net"]
+    if retracted:
+        logger.info(f"🔄 긍정 피드백 이벤트 취소: {qa_hash[:8]}... ({retracted}건)")
+    return retracted
+
+
+def get_weekly_rollups() -> List[Dict[str, Any]]:
+    """주간 집계 조회 (주 키 오름차순)"""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT week_key, week_display, qa_responses, positive_feedback FROM weekly_qa_rollup ORDER BY week_key"
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def _slack_qa_cutoff() -> str:
+    """보관 기간이 지난 슬랙 QA 매핑 판별 기준 시각"""
+    return (datetime.now() - timedelta(days=SLACK_QA_MAPPING_TTL_DAYS)).isoformat()
+
+
+def save_slack_qa(message_ts: str, question: str, answer: str, sources: list = None,
+                  channel: str = None, thread_ts: str = None, timestamp: str = None) -> bool:
+    """슬랙 메시지 ↔ 질문-답변 매핑 1건 저장 + QA 응답 이벤트 기록 (단일 트랜잭션)"""
+    try:
+        dt = parse_timestamp(timestamp) or datetime.now()
+        conn = get_connection()
+        with _transaction(conn):
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO slack_qa_mapping
+                    (message_ts, question, answer, sources, channel, thread_ts, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (message_ts, question, answer, json.dumps(sources or [], ensure_ascii=False),
+                 channel, thread_ts, dt.isoformat())
+            )
+            _append_event(conn, EVENT_QA_RESPONSE, dt, source="slack")
+        _maybe_purge_expired_slack_qa()
+        return True
+    except Exception as e:
+        logger.error(f"❌ 슬랙 QA 매핑 저장 오류: {str(e)}")
+        return False
+
+
+def get_slack_qa(message_ts: str) -> Optional[Dict[str, Any]]:
+    """메시지 타임스탬프로 슬랙 QA 매핑 조회 (보관 기간이 지난 매핑은 None)"""
+    if not message_ts:
+        return None
+    conn = get_connection()
+    row = conn.execute(
+        """
+        SELECT question, answer, sources, channel, thread_ts, created_at
+        FROM slack_qa_mapping
+        WHERE message_ts = ? AND created_at >= ?
+        """,
+        (message_ts, _slack_qa_cutoff())
+    ).fetchone()
+    if not row:
+        return None
+    return {
+        "question": row["question"],
+        "answer": row["answer"],
+        "sources": json.loads(row["sources"]) if row["sources"] else [],
+        "channel": row["channel"],
+        "thread_ts": row["thread_ts"],
+        "timestamp": row["created_at"]
+    }
+
+
+def purge_expired_slack_qa() -> int:
+    """보관 기간이 지난 슬랙 QA 매핑 삭제
+
+    Returns:
+        int: 삭제된 매핑 수
+    """
+    try:
+        conn = get_connection()
+        with _transaction(conn):
+            cursor = conn.execute("DELETE FROM slack_qa_mapping WHERE created_at < ?", (_slack_qa_cutoff(),))
+        if cursor.rowcount:
+            logger.info(f"🧹 만료된 슬랙 QA 매핑 정리: {cursor.rowcount}개 (보관 기간 {SLACK_QA_MAPPING_TTL_DAYS}일)")
+        return cursor.rowcount
+    except Exception as e:
+        logger.error(f"❌ 슬랙 QA 매핑 정리 오류: {str(e)}")
+        return 0
+
+
+def claim_slack_event_keys(keys: List[str], ttl_seconds: int) -> bool:
+    """슬랙 이벤트 키 선점 (워커 간 중복 이벤트 제거)
+
+    Slack 재전송이 다른 워커로 들어와도 한 워커만 처리하도록
+    키 중 하나라도 보관 시간 안에 기록되어 있으면 False
+
+    Returns:
+        bool: 처음 본 이벤트면 True
+    """
+    if not keys:
+        return True
+    now = time.time()
+    conn = get_connection()
+    with _transaction(conn):
+        conn.execute("DELETE FROM slack_event_dedupe WHERE seen_at < ?", (now - ttl_seconds,))
+        placeholders = ",".join("?" for _ in keys)
+        if conn.execute(f"SELECT 1 FROM slack_event_dedupe WHERE event_key IN ({placeholders}) LIMIT 1", keys).fetchone():
+            return False
+        conn.executemany("INSERT OR REPLACE INTO slack_event_dedupe (event_key, seen_at) VALUES (?, ?)",
+                         [(key, now) for key in keys])
+    return True
+
+
+def _maybe_purge_expired_slack_qa():
+    """정리 주기가 지났으면 만료 매핑 삭제 (저장 경로에서 호출)"""
+    global _last_purge_time
+    now = time.monotonic()
+    if now - _last_purge_time < _PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge_time = now
+    purge_expired_slack_qa()
+
+
+def save_web_qa(question: str, answer: str, sources: list = None, timestamp: str = None) -> str:
+    """웹 QA 로그 1건 저장 + QA 응답 이벤트 기록 (단일 트랜잭션)
+
+    Returns:
+        str: QA ID (타임스탬프)
+    """
+    dt = parse_timestamp(timestamp) or datetime.now()
+    qa_id = dt.isoformat()
+    conn = get_connection()
+    with _transaction(conn):
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO web_qa_mapping (qa_id, question, answer, sources, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (qa_id, question, answer, json.dumps(sources or [], ensure_ascii=False), qa_id)
+        )
+        _append_event(conn, EVENT_QA_RESPONSE, dt, source="web")
+    return qa_id
+
+
+def make_qa_hash(question: str, answer: str) -> str:
+    """질문-답변 세트 해시 (피드백 중복 체크용)"""
+    return hashlib.md5(f"{question}|||{answer}".encode('utf-8')).hexdigest()
+
+
+def _feedback_row_values(record: Dict[str, Any]) -> tuple:
+    """피드백 레코드 → feedback 테이블 행 값"""
+    return (
+        record["qa_hash"],
+        record.get("feedback_type", "positive"),
+        record.get("question", ""),
+        record.get("feedback_count", 1),
+        record.get("first_feedback_time"),
+        record.get("last_feedback_time"),
+        json.dumps(record, ensure_ascii=False)
+    )
+
+
+def _insert_feedback(conn: sqlite3.Connection, record: Dict[str, Any]):
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO feedback
+            (qa_hash, feedback_type, question, feedback_count, first_feedback_time, last_feedback_time, data)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        _feedback_row_values(record)
+    )
+
+
+def upsert_feedback(feedback_data: Dict[str, Any]) -> Dict[str, Any]:
+    """피드백 1건 원자적 저장 (긍정/부정 모두 지원)
+
+    중복 체크 로직 (모두 하나의 쓰기 트랜잭션에서 처리):
+    - 부정 피드백이 기존 긍정 세트에 들어오면 긍정 세트 제거 + 긍정 이벤트 취소
+    - 부정 → 긍정 변경이면 기존 카운트/사용자 정보 유지
+    - 같은 질문-답변 세트면 피드백 카운트만 증가
+    - 같은 질문이지만 답변이 다르면 최신 답변으로 교체 (카운트 유지)
+
+    Returns:
+        dict: {"qa_hash", "is_new", "feedback_count", "type_changed",
+               "removed_positive_hashes": 긍정에서 빠진 qa_hash 목록 (벡터 DB 정리용),
+               "record": 저장된 피드백 레코드}
+    """
+    feedback_type = feedback_data.get("feedback_type", "positive")
+    question = feedback_data["question"]
+    answer = feedback_data.get("answer", "")
+    qa_hash = make_qa_hash(question, answer)
+    now = feedback_data.get("timestamp", datetime.now().isoformat())
+    dt = parse_timestamp(now) or datetime.now()
+    user = feedback_data.get("user")
+
+    record = dict(feedback_data)
+    record["qa_hash"] = qa_hash
+    result = {"qa_hash": qa_hash, "is_new": False, "type_changed": False, "removed_positive_hashes": []}
+
+    conn = get_connection()
+    with _transaction(conn):
+        row = conn.execute("SELECT feedback_type, data FROM feedback WHERE qa_hash = ?", (qa_hash,)).fetchone()
+        existing = json.loads(row["data"]) if row else None
+
+        # 부정 피드백 저장 시: 같은 세트의 긍정 피드백 제거
+        if feedback_type == "negative" and existing and row["feedback_type"] == "positive":
+            conn.execute("DELETE FROM feedback WHERE qa_hash = ?", (qa_hash,))
+            _retract_positive_events(conn, qa_hash, dt, feedback_data.get("source"))
+            result["removed_positive_hashes"].append(qa_hash)
+            logger.info(f"🗑️ 부정 피드백 저장: 긍정 피드백에서 제거 - {question[:30]}...")
+            existing = None
+
+        if existing and row["feedback_type"] != feedback_type:
+            # 피드백 타입 변경 (기존 카운트, 사용자 정보 보존)
+            logger.info(f"🔄 피드백 타입 변경: {question[:30]}... ({'긍정' if feedback_type == 'positive' else '부정'}으로 변경)")
+            feedback_users = existing.get("feedback_users", [])
+            record["feedback_count"] = existing.get("feedback_count", 1)
+            record["first_feedback_time"] = existing.get("first_feedback_time", existing.get("timestamp"))
+            record["last_feedback_time"] = now
+            record["feedback_users"] = feedback_users
+            if user and user not in feedback_users:
+                feedback_users.append(user)
+            result["type_changed"] = True
+
+        elif existing:
+            # 동일한 질문-답변 세트가 이미 존재 → 피드백 카운트만 증가
+            record = existing
+            record["feedback_count"] = record.get("feedback_count", 1) + 1
+            record["last_feedback_time"] = now
+            record["feedback_users"] = record.get("feedback_users", [])
+            if user and user not in record["feedback_users"]:
+                record["feedback_users"].append(user)
+            logger.info(f"📊 피드백 카운트 증가: {question[:30]}... (총 {record['feedback_count']}회)")
+
+        else:
+            same_question = conn.execute(
+                "SELECT qa_hash, data FROM feedback WHERE feedback_type = ? AND question = ? ORDER BY rowid LIMIT 1",
+                (feedback_type, question)
+            ).fetchone()
+
+            if same_question:
+                # 같은 질문이지만 답변이 다름 → 최신 답변으로 교체 (기존 정보 보존)
+                logger.info(f"🔄 같은 질문의 최신 답변으로 업데이트: {question[:30]}...")
+                old_feedback = json.loads(same_question["data"])
+                feedback_users = old_feedback.get("feedback_users", [])
+                record["feedback_count"] = old_feedback.get("feedback_count", 1)
+                record["first_feedback_time"] = old_feedback.get("first_feedback_time", old_feedback.get("timestamp"))
+                record["last_feedback_time"] = now
+                record["feedback_users"] = feedback_users
+                if user and user not in feedback_users:
+                    feedback_users.append(user)
+                conn.execute("DELETE FROM feedback WHERE qa_hash = ?", (same_question["qa_hash"],))
+                if feedback_type == "positive":
+                    result["removed_positive_hashes"].append(same_question["qa_hash"])
+            else:
+                # 완전히 새로운 질문-답변 세트
+                record["feedback_count"] = 1
+                record["first_feedback_time"] = now
+                record["last_feedback_time"] = now
+                record["feedback_users"] = [user] if user else []
+                result["is_new"] = True
+                logger.info(f"💾 새로운 피드백 저장: {question[:30]}...")
+
+        _insert_feedback(conn, record)
+
+        # 긍정 피드백은 주간 통계 이벤트도 함께 기록
+        if feedback_type == "positive":
+            _append_event(conn, EVENT_POSITIVE_FEEDBACK, dt, source=feedback_data.get("source"), qa_hash=qa_hash)
+
+    result["feedback_count"] = record.get("feedback_count", 1)
+    result["record"] = record
+    return result
+
+
+def get_feedbacks(feedback_type: str = "positive") -> List[Dict[str, Any]]:
+    """피드백 타입별 전체 레코드 조회 (저장 순서)"""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT data FROM feedback WHERE feedback_type = ? ORDER BY rowid", (feedback_type,)
+    ).fetchall()
+    return [json.loads(row["data"]) for row in rows]
+
+
+def count_feedbacks(feedback_type: str = "positive") -> int:
+    """피드백 타입별 레코드 수"""
+    conn = get_connection()
+    return conn.execute("SELECT COUNT(*) FROM feedback WHERE feedback_type = ?", (feedback_type,)).fetchone()[0]
+
+
+def get_feedback(qa_hash: str) -> Optional[Dict[str, Any]]:
+    """qa_hash로 피드백 레코드 조회"""
+    conn = get_connection()
+    row = conn.execute("SELECT data FROM feedback WHERE qa_hash = ?", (qa_hash,)).fetchone()
+    return json.loads(row["data"]) if row else None
+
+
+def _load_legacy_json(filename: str, default):
+    """레거시 JSON 파일 로드 (없거나 읽기 실패 시 기본값)"""
+    path = os.path.join(DOCS_DIR, filename)
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, Exception) as e:
+        logger.warning(f"⚠️ 레거시 파일 읽기 오류: {filename} - {e}")
+        return default
+
+
+def _backfill_legacy_files(conn: sqlite3.Connection):
+    """기존 JSON 파일(긍정 피드백, 슬랙/웹 QA 매핑)을 이벤트 로그로 1회 이관"""
+    try:
+        qa_count = 0
+        positive_count = 0
+        with _transaction(conn):
+            # 완료 여부 확인과 이관을 같은 쓰기 트랜잭션에서 수행 (여러 워커/프로세스가 동시에 시작해도 1회만 이관)
+            if conn.execute("SELECT value FROM store_meta WHERE key = 'legacy_backfilled'").fetchone():
+                return
+
+            positive_feedbacks = _load_legacy_json("positive_feedback.json", [])
+            slack_qa_mapping = _load_legacy_json("slack_qa_mapping.json", {})
+            web_qa_mapping = _load_legacy_json("web_qa_mapping.json", {})
+            for mapping, source in ((slack_qa_mapping, "slack"), (web_qa_mapping, "web")):
+                for qa_data in mapping.values():
+                    dt = parse_timestamp(qa_data.get("timestamp"))
+                    if dt:
+                        _append_event(conn, EVENT_QA_RESPONSE, dt, source=source)
+                        qa_count += 1
+
+            for feedback in positive_feedbacks:
+                timestamp = feedback.get("timestamp") or feedback.get("first_feedback_time") or feedback.get("last_feedback_time")
+                dt = parse_timestamp(timestamp)
+                if dt:
+                    count = feedback.get("feedback_count", 1)
+                    _append_event(conn, EVENT_POSITIVE_FEEDBACK, dt, delta=count,
+                                  source=feedback.get("source"), qa_hash=feedback.get("qa_hash"))
+                    positive_count += count
+
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('legacy_backfilled', ?)",
+                (datetime.now().isoformat(),)
+            )
+
+        logger.info(f"📦 QA 이벤트 로그 이관 완료: QA 응답 {qa_count}건, 긍정 피드백 {positive_count}건")
+    except Exception as e:
+        logger.error(f"❌ QA 이벤트 로그 이관 오류: {str(e)}")
+
+
+def _import_legacy_slack_qa_mapping(conn: sqlite3.Connection):
+    """기존 slack_qa_mapping.json을 매핑 테이블로 1회 이관 (QA 응답 이벤트는 _backfill_legacy_files에서 처리)"""
+    try:
+        imported = 0
+        with _transaction(conn):
+            # _backfill_legacy_files와 같이 트랜잭션 안에서 완료 여부 확인
+            if conn.execute("SELECT value FROM store_meta WHERE key = 'slack_qa_mapping_imported'").fetchone():
+                return
+
+            slack_qa_mapping = _load_legacy_json("slack_qa_mapping.json", {})
+            cutoff = _slack_qa_cutoff()
+            for message_ts, qa_data in slack_qa_mapping.items():
+                dt = parse_timestamp(qa_data.get("timestamp"))
+                if not dt or dt.isoformat() < cutoff:
+                    continue
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO slack_qa_mapping
+                        (message_ts, question, answer, sources, channel, thread_ts, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (message_ts, qa_data.get("question", ""), qa_data.get("answer", ""),
+                     json.dumps(qa_data.get("sources", []), ensure_ascii=False),
+                     qa_data.get("channel"), qa_data.get("thread_ts"), dt.isoformat())
+                )
+                imported += 1
+
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('slack_qa_mapping_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+
+        logger.info(f"📦 슬랙 QA 매핑 이관 완료: {imported}개 (전체 {len(slack_qa_mapping)}개 중 보관 기간 내)")
+    except Exception as e:
+        logger.error(f"❌ 슬랙 QA 매핑 이관 오류: {str(e)}")
+
+
+def _import_legacy_feedback_files(conn: sqlite3.Connection):
+    """기존 긍정/부정 피드백, 웹 QA 매핑 JSON 파일을 테이블로 1회 이관 (이벤트는 _backfill_legacy_files에서 처리)"""
+    try:
+        imported_feedback = 0
+        imported_web = 0
+        with _transaction(conn):
+            # _backfill_legacy_files와 같이 트랜잭션 안에서 완료 여부 확인
+            if conn.execute("SELECT value FROM store_meta WHERE key = 'feedback_imported'").fetchone():
+                return
+
+            for filename, feedback_type in (("positive_feedback.json", "positive"), ("negative_feedback.json", "negative")):
+                feedbacks = _load_legacy_json(filename, [])
+                if not isinstance(feedbacks, list):
+                    continue
+                for feedback in feedbacks:
+                    if not feedback.get("question"):
+                        continue
+                    record = dict(feedback)
+                    record["feedback_type"] = feedback_type
+                    record["qa_hash"] = record.get("qa_hash") or make_qa_hash(record["question"], record.get("answer", ""))
+                    record.setdefault("feedback_count", 1)
+                    record.setdefault("first_feedback_time", record.get("timestamp"))
+                    record.setdefault("last_feedback_time", record.get("timestamp"))
+                    conn.execute(
+                        """
+                        INSERT OR IGNORE INTO feedback
+                            (qa_hash, feedback_type, question, feedback_count, first_feedback_time, last_feedback_time, data)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        _feedback_row_values(record)
+                    )
+                    imported_feedback += 1
+
+            web_qa_mapping = _load_legacy_json("web_qa_mapping.json", {})
+            for qa_id, qa_data in web_qa_mapping.items():
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO web_qa_mapping (qa_id, question, answer, sources, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (qa_id, qa_data.get("question", ""), qa_data.get("answer", ""),
+                     json.dumps(qa_data.get("sources", []), ensure_ascii=False),
+                     qa_data.get("timestamp", qa_id))
+                )
+                imported_web += 1
+
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('feedback_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+
+        logger.info(f"📦 피드백/웹 QA 이관 완료: 피드백 {imported_feedback}개, 웹 QA {imported_web}개")
+    except Exception as e:
+        logger.error(f"❌ 피드백/웹 QA 이관 오류: {str(e)}")
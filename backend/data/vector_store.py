@@ -0,0 +1,537 @@
+"""
+로컬 NumPy 벡터 저장소 모듈 (VECTOR_BACKEND=numpy)
+- 임베딩: L2 정규화 float32 (VECTOR_QUANTIZE=int8이면 int8 양자화) 행렬을 .npy로 저장,
+  읽기는 memory-map (여러 워커가 같은 페이지 캐시를 읽기 전용으로 공유)
+- 세그먼트: 쓰기마다 추가/교체된 행만 새 세그먼트(segment-N.npy + 문서/메타데이터 segment-N.json)로 저장
+  manifest.json에는 세그먼트 목록과 삭제/교체된 행 번호만 기록 (쓰기 비용이 전체 문서 수가 아니라 변경 행 수에 비례)
+- 압축: 세그먼트가 많아지거나 삭제된 행 비율이 높아지면 살아있는 행만 모아 세그먼트 1개로 다시 저장
+- 검색: 코사인 top-k (세그먼트별 행렬-벡터 곱), 메타데이터 사전 필터 (Chroma where 문법), MMR
+- 쓰기: 프로세스 간 잠금 안에서 세그먼트 파일을 쓰고 manifest를 원자적으로 교체
+  (검색 중인 워커는 이전 세대를 계속 사용, 더 이상 쓰지 않는 파일은 일정 시간이 지난 뒤 삭제)
+
+LangChain VectorStore 인터페이스와 Chroma `_collection` 호환 메서드(get/upsert/delete/count)를
+함께 제공하므로 get_vectordb()를 쓰는 기존 코드는 그대로 동작
+"""
+
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from ..utils.shared_state import atomic_write_bytes, atomic_write_json, file_stamp, get_lock
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST = "manifest.json"
+_INT8_SCALE = 127.0
+# 필터별 후보 행 마스크 캐시 크기 (세대가 바뀌면 초기화)
+_FILTER_CACHE_SIZE = 64
+# 압축 기준: 세그먼트 수 / 삭제·교체된 행 비율
+_MAX_SEGMENTS = 16
+_MAX_DEAD_RATIO = 0.25
+# 더 이상 쓰지 않는 세그먼트 파일 보관 시간 (초, 이전 manifest를 읽은 워커가 파일을 열 수 있도록)
+_RETIRED_FILE_TTL = 300
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (0 벡터는 그대로)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if op == "$in":
+        return value in operand
+    if op == "$nin":
+        return value not in operand
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:  # 값이 없거나 타입이 다르면 불일치
+        return False
+    raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+
+
+def matches_filter(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Chroma where 문법 메타데이터 필터 ($and/$or, $eq/$ne/$in/$nin/$gt/$gte/$lt/$lte)"""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+def mmr_select(query: np.ndarray, candidates: np.ndarray, k: int, lambda_mult: float = 0.5,
+               relevance: Optional[np.ndarray] = None) -> List[int]:
+    """MMR 선택 (정규화된 후보 행렬에서 유사도 행렬을 한 번만 계산)
+
+    Args:
+        relevance: 후보별 관련도 (없으면 질문과의 코사인 유사도, 가중치를 더한 값을 넘길 수 있음)
+
+    Returns:
+        list: 선택된 후보 행 번호 (선택 순서)
+    """
+    n = len(candidates)
+    if n == 0 or k <= 0:
+        return []
+    if relevance is None:
+        relevance = candidates @ query
+    similarity = candidates @ candidates.T
+    selected = [int(np.argmax(relevance))]
+    # 후보별 "이미 선택된 문서와의 최대 유사도"를 누적 갱신
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    while len(selected) < min(k, n):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
+
+
+class _Snapshot:
+    """특정 세대의 읽기 전용 인덱스 (세그먼트 벡터는 memory-map, 행 번호는 세그먼트를 이어 붙인 순서)
+
+    삭제/교체된 행은 live=False로 표시만 하고 압축 전까지 파일에 남음
+    """
+
+    def __init__(self, manifest: Dict[str, Any], segments: List[Tuple[np.ndarray, Dict[str, Any]]]):
+        self.manifest = manifest
+        self.generation = manifest.get("generation", 0)
+        self.dtype = manifest.get("dtype", "float32")
+        self.dim = manifest.get("dim", 0)
+        self.matrices = [matrix for matrix, _ in segments]
+        self.offsets = np.cumsum([0] + [len(matrix) for matrix in self.matrices])
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        for _, table in segments:
+            self.ids.extend(table.get("ids", []))
+            self.documents.extend(table.get("documents", []))
+            self.metadatas.extend(table.get("metadatas", []))
+        self.size = len(self.ids)
+        self.live = np.ones(self.size, dtype=bool)
+        deleted = manifest.get("deleted") or []
+        if deleted:
+            self.live[np.asarray(deleted, dtype=np.int64)] = False
+        self.live_rows = np.flatnonzero(self.live)
+        self.rows: Dict[str, int] = {self.ids[row]: int(row) for row in self.live_rows}
+        self.scale = 1.0 / _INT8_SCALE if self.dtype == "int8" else 1.0
+        self._filter_masks: Dict[str, np.ndarray] = {}
+        self._mask_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.live_rows)
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        return list(self.manifest.get("segments") or [])
+
+    @property
+    def deleted(self) -> List[int]:
+        return list(self.manifest.get("deleted") or [])
+
+    def raw(self, rows) -> np.ndarray:
+        """저장된 형식(float32/int8) 그대로의 행 (여러 세그먼트에 걸친 행 번호 가능)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if not self.matrices:
+            return np.zeros((len(rows), self.dim), dtype=np.float32)
+        if len(self.matrices) == 1:
+            return self.matrices[0][rows]
+        result = np.empty((len(rows), self.dim), dtype=self.matrices[0].dtype)
+        segment_of = np.searchsorted(self.offsets, rows, side="right") - 1
+        for segment in np.unique(segment_of):
+            selected = segment_of == segment
+            result[selected] = self.matrices[segment][rows[selected] - self.offsets[segment]]
+        return result
+
+    def vectors(self, rows=None) -> np.ndarray:
+        """float32 벡터 (int8이면 복원, rows가 없으면 살아있는 행 전체)"""
+        return np.asarray(self.raw(self.live_rows if rows is None else rows), dtype=np.float32) * self.scale
+
+    def filter_mask(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """필터에 맞는 살아있는 행 마스크 (같은 필터는 세대 안에서 캐시)"""
+        if not where:
+            return None
+        key = json.dumps(where, sort_keys=True, ensure_ascii=False)
+        with self._mask_lock:
+            mask = self._filter_masks.get(key)
+        if mask is None:
+            mask = np.fromiter((matches_filter(m or {}, where) for m in self.metadatas), dtype=bool, count=self.size)
+            mask &= self.live
+            with self._mask_lock:
+                if len(self._filter_masks) >= _FILTER_CACHE_SIZE:
+                    self._filter_masks.pop(next(iter(self._filter_masks)))
+                self._filter_masks[key] = mask
+        return mask
+
+    def scores(self, query: np.ndarray, where: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(후보 행 번호, 코사인 유사도) - 필터가 있으면 해당 행만 계산, query가 (차원 × 질문 수) 행렬이면 질문별 열"""
+        mask = self.filter_mask(where)
+        rows = self.live_rows if mask is None else np.flatnonzero(mask)
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float32)
+        if len(rows) == self.size:
+            similarities = np.concatenate([matrix @ query for matrix in self.matrices]) * self.scale
+        else:
+            similarities = (self.raw(rows) @ query) * self.scale
+        return rows, similarities
+
+
+class NumpyVectorStore(VectorStore):
+    """memory-map .npy 기반 로컬 벡터 저장소 (Chroma 대체용)"""
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings, quantize: str = "none"):
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self.quantize = (quantize or "none").lower()
+        self._manifest_path = os.path.join(persist_directory, _MANIFEST)
+        self._lock = get_lock("vector_store_" + os.path.abspath(persist_directory).strip(os.sep).replace(os.sep, "_"))
+        self._snapshot: Optional[_Snapshot] = None
+        self._snapshot_stamp = None
+        self._reload_lock = threading.Lock()
+        # 세그먼트 파일 이름 → (memory-map 벡터, 문서/메타데이터) (세그먼트는 바뀌지 않으므로 세대가 바뀌어도 재사용)
+        self._segment_cache: Dict[str, Tuple[np.ndarray, Dict[str, Any]]] = {}
+        os.makedirs(persist_directory, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # 세대 관리
+    # ------------------------------------------------------------------
+    def _current(self) -> _Snapshot:
+        """현재 세대 스냅샷 (manifest가 바뀌었으면 다시 열기)"""
+        stamp = file_stamp(self._manifest_path)
+        snapshot = self._snapshot
+        if snapshot is not None and stamp == self._snapshot_stamp:
+            return snapshot
+        with self._reload_lock:
+            if self._snapshot is None or stamp != self._snapshot_stamp:
+                manifest = {}
+                if stamp is not None:
+                    with open(self._manifest_path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                self._snapshot = _Snapshot(manifest, self._load_segments(manifest))
+                self._snapshot_stamp = stamp
+            return self._snapshot
+
+    def _load_segments(self, manifest: Dict[str, Any]) -> List[Tuple[np.ndarray, Dict[str, Any]]]:
+        """manifest의 세그먼트 열기 (이미 연 세그먼트는 재사용, 이전 형식은 manifest 자체가 문서 테이블)"""
+        if "segments" not in manifest:
+            if not manifest.get("vectors") or not manifest.get("ids"):
+                return []
+            matrix = np.load(os.path.join(self.persist_directory, manifest["vectors"]), mmap_mode="r")
+            return [(matrix, manifest)]
+
+        cache = {}
+        for segment in manifest["segments"]:
+            name = segment["vectors"]
+            loaded = self._segment_cache.get(name)
+            if loaded is None:
+                matrix = np.load(os.path.join(self.persist_directory, name), mmap_mode="r")
+                with open(os.path.join(self.persist_directory, segment["table"]), "r", encoding="utf-8") as f:
+                    loaded = (matrix, json.load(f))
+            cache[name] = loaded
+        self._segment_cache = cache
+        return list(cache.values())
+
+    def _stored(self, vectors: np.ndarray) -> np.ndarray:
+        """저장 형식으로 변환 (VECTOR_QUANTIZE=int8이면 양자화)"""
+        if self.quantize == "int8":
+            return np.clip(np.rint(vectors * _INT8_SCALE), -_INT8_SCALE, _INT8_SCALE).astype(np.int8)
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def _write_segment(self, generation: int, ids: List[str], documents: List[str],
+                       metadatas: List[Dict[str, Any]], stored: np.ndarray) -> Dict[str, Any]:
+        """세그먼트 파일 저장 (벡터 .npy → 문서/메타데이터 .json, manifest에 넣기 전이므로 읽는 워커와 무관)"""
+        name = f"segment-{generation}"
+        buffer = io.BytesIO()
+        np.save(buffer, stored)
+        atomic_write_bytes(os.path.join(self.persist_directory, name + ".npy"), buffer.getvalue())
+        atomic_write_json(os.path.join(self.persist_directory, name + ".json"),
+                          {"ids": ids, "documents": documents, "metadatas": metadatas})
+        return {"vectors": name + ".npy", "table": name + ".json", "rows": len(ids)}
+
+    def _commit(self, snapshot: _Snapshot, segments: List[Dict[str, Any]], deleted: List[int], dim: int) -> _Snapshot:
+        """새 세대 manifest 원자적 교체 (잠금 안에서 호출)
+
+        이전 세대에서만 쓰던 파일은 retired에 기록해 두고 _RETIRED_FILE_TTL이 지난 뒤 삭제
+        (이전 manifest를 읽은 워커가 아직 파일을 열지 않았을 수 있음, 이미 연 mmap은 삭제 후에도 유효)
+        """
+        now = time.time()
+        referenced = {name for segment in segments for name in (segment["vectors"], segment["table"])}
+        previous = {name for segment in snapshot.segments for name in (segment["vectors"], segment["table"])}
+        if "segments" not in snapshot.manifest and snapshot.manifest.get("vectors"):
+            previous.add(snapshot.manifest["vectors"])
+        retired = [entry for entry in snapshot.manifest.get("retired", []) if entry["name"] not in referenced]
+        retired += [{"name": name, "at": now} for name in sorted(previous - referenced)]
+
+        expired = [entry["name"] for entry in retired if now - entry["at"] >= _RETIRED_FILE_TTL]
+        atomic_write_json(self._manifest_path, {
+            "generation": snapshot.generation + 1,
+            "dtype": "int8" if self.quantize == "int8" else "float32",
+            "dim": int(dim),
+            "segments": segments,
+            "deleted": sorted(deleted),
+            "retired": [entry for entry in retired if entry["name"] not in expired],
+        })
+        for name in expired:
+            try:
+                os.remove(os.path.join(self.persist_directory, name))
+            except FileNotFoundError:
+                pass
+        return self._current()
+
+    def _compact(self, snapshot: _Snapshot) -> _Snapshot:
+        """살아있는 행만 세그먼트 1개로 다시 저장 (이전 형식 manifest도 이 과정에서 세그먼트 형식으로 전환)"""
+        rows = snapshot.live_rows
+        segments = []
+        if len(rows):
+            segments.append(self._write_segment(
+                snapshot.generation + 1, [snapshot.ids[row] for row in rows], [snapshot.documents[row] for row in rows],
+                [snapshot.metadatas[row] for row in rows], np.ascontiguousarray(snapshot.raw(rows)),
+            ))
+        logger.info(f"🗜️ 벡터 저장소 압축: {snapshot.size}행 → {len(rows)}행 ({self.persist_directory})")
+        return self._commit(snapshot, segments, [], snapshot.dim)
+
+    def _writable(self) -> _Snapshot:
+        """쓰기 기준 스냅샷 (잠금 안에서 호출, 이전 형식이거나 압축 기준을 넘었으면 먼저 압축)"""
+        snapshot = self._current()
+        legacy = snapshot.size > 0 and "segments" not in snapshot.manifest
+        dead = snapshot.size - len(snapshot)
+        if legacy or len(snapshot.segments) >= _MAX_SEGMENTS or dead > snapshot.size * _MAX_DEAD_RATIO:
+            snapshot = self._compact(snapshot)
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Chroma `_collection` 호환 메서드
+    # ------------------------------------------------------------------
+    @property
+    def _collection(self) -> "NumpyVectorStore":
+        return self
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def count(self) -> int:
+        return len(self._current())
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None, offset: Optional[int] = None,
+            include: Sequence[str] = ("metadatas", "documents"), **kwargs) -> Dict[str, Any]:
+        """Chroma get()과 같은 형식으로 조회"""
+        snapshot = self._current()
+        if ids is not None:
+            rows = [snapshot.rows[i] for i in ids if i in snapshot.rows]
+        else:
+            rows = snapshot.live_rows.tolist()
+        if where:
+            mask = snapshot.filter_mask(where)
+            rows = [row for row in rows if mask[row]]
+        rows = rows[offset or 0:]
+        if limit is not None:
+            rows = rows[:limit]
+        return {
+            "ids": [snapshot.ids[row] for row in rows],
+            "documents": [snapshot.documents[row] for row in rows] if "documents" in include else None,
+            "metadatas": [snapshot.metadatas[row] for row in rows] if "metadatas" in include else None,
+            "embeddings": snapshot.vectors(rows) if "embeddings" in include else None,
+        }
+
+    def query(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 10,
+              where: Optional[Dict[str, Any]] = None,
+              include: Sequence[str] = ("metadatas", "documents", "distances"), **kwargs) -> Dict[str, Any]:
+        """Chroma query()와 같은 형식의 top-k 검색 (질문별 목록의 목록)"""
+        result = {"ids": [], "documents": [], "metadatas": [], "embeddings": [], "distances": []}
+        if len(query_embeddings) == 0:
+            return result
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32).reshape(len(query_embeddings), -1))
+        # 여러 질문을 한 번의 행렬 곱으로 계산 (후보 수 × 질문 수)
+        snapshot = self._current()
+        candidate_rows, similarity_matrix = snapshot.scores(queries.T, where)
+        for column in range(len(queries)):
+            similarities = similarity_matrix[:, column] if len(candidate_rows) else np.zeros(0, dtype=np.float32)
+            top = self._select_top(similarities, n_results)
+            rows, similarities = candidate_rows[top], similarities[top]
+            result["ids"].append([snapshot.ids[row] for row in rows])
+            result["documents"].append([snapshot.documents[row] for row in rows])
+            result["metadatas"].append([snapshot.metadatas[row] for row in rows])
+            result["embeddings"].append(snapshot.vectors(rows))
+            result["distances"].append([float(2.0 - 2.0 * sim) for sim in similarities])
+        for field in ("documents", "metadatas", "embeddings", "distances"):
+            if field not in include:
+                result[field] = None
+        return result
+
+    def upsert(self, ids: Sequence[str], embeddings: Optional[Sequence[Sequence[float]]] = None,
+               documents: Optional[Sequence[str]] = None, metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+               **kwargs):
+        """ID 기준 추가/교체 (임베딩이 없으면 문서를 한 번에 임베딩)"""
+        ids = list(ids)
+        if not ids:
+            return
+        documents = list(documents) if documents is not None else [""] * len(ids)
+        metadatas = [dict(m or {}) for m in metadatas] if metadatas is not None else [{} for _ in ids]
+        if embeddings is None:
+            embeddings = self.embedding_function.embed_documents(documents)
+        new_vectors = _normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+
+        # 같은 호출 안에서 중복된 ID는 마지막 값 사용
+        latest = sorted({vector_id: i for i, vector_id in enumerate(ids)}.values())
+
+        with self._lock:
+            snapshot = self._writable()
+            if len(snapshot) and snapshot.dim != new_vectors.shape[1]:
+                raise ValueError(f"임베딩 차원 불일치: 저장소 {snapshot.dim}, 입력 {new_vectors.shape[1]}")
+            # 기존 ID는 이전 행을 삭제 표시하고 새 세그먼트에 추가 (기존 세그먼트 파일은 다시 쓰지 않음)
+            replaced = [snapshot.rows[ids[i]] for i in latest if ids[i] in snapshot.rows]
+            segment = self._write_segment(
+                snapshot.generation + 1, [ids[i] for i in latest], [documents[i] for i in latest],
+                [metadatas[i] for i in latest], self._stored(new_vectors[latest]),
+            )
+            self._commit(snapshot, snapshot.segments + [segment], snapshot.deleted + replaced, new_vectors.shape[1])
+
+    def delete(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None, **kwargs):
+        """ID 또는 필터로 삭제 (manifest에 삭제 행 번호만 기록)"""
+        with self._lock:
+            snapshot = self._writable()
+            removed = {snapshot.rows[vector_id] for vector_id in (ids or []) if vector_id in snapshot.rows}
+            if where:
+                removed.update(int(row) for row in np.flatnonzero(snapshot.filter_mask(where)))
+            if not removed:
+                return True
+            self._commit(snapshot, snapshot.segments, snapshot.deleted + sorted(removed), snapshot.dim)
+            return True
+
+    def persist(self):
+        """쓰기마다 이미 파일에 반영되므로 아무것도 하지 않음 (Chroma 호환)"""
+
+    # ------------------------------------------------------------------
+    # LangChain VectorStore 인터페이스
+    # ------------------------------------------------------------------
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs) -> List[str]:
+        texts = list(texts)
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        self.upsert(ids=ids, embeddings=self.embedding_function.embed_documents(texts),
+                    documents=texts, metadatas=metadatas)
+        return ids
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None,
+                   persist_directory: str = None, **kwargs) -> "NumpyVectorStore":
+        store = cls(persist_directory=persist_directory, embedding_function=embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=kwargs.get("ids"))
+        return store
+
+    def _query_vector(self, query: str) -> np.ndarray:
+        return _normalize(np.asarray([self.embedding_function.embed_query(query)], dtype=np.float32))[0]
+
+    def _top_k(self, query: np.ndarray, k: int, where: Optional[Dict[str, Any]]) -> Tuple[_Snapshot, np.ndarray, np.ndarray]:
+        snapshot = self._current()
+        rows, similarities = snapshot.scores(query, where)
+        top = self._select_top(similarities, k)
+        return snapshot, rows[top], similarities[top]
+
+    @staticmethod
+    def _select_top(similarities: np.ndarray, k: int) -> np.ndarray:
+        """유사도 상위 k개 위치 (내림차순)"""
+        if len(similarities) > k:
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(len(similarities))
+        return top[np.argsort(-similarities[top])]
+
+    @staticmethod
+    def _document(snapshot: _Snapshot, row: int) -> Document:
+        return Document(page_content=snapshot.documents[row], metadata=dict(snapshot.metadatas[row] or {}))
+
+    def similarity_search_by_vector_with_score(self, embedding: Sequence[float], k: int = 4,
+                                               filter: Optional[Dict[str, Any]] = None, **kwargs) -> List[Tuple[Document, float]]:
+        """(문서, 거리) 목록 - 거리는 Chroma 기본값과 같은 제곱 L2 (정규화 벡터: 2 - 2·코사인)"""
+        query = _normalize(np.asarray([embedding], dtype=np.float32))[0]
+        snapshot, rows, similarities = self._top_k(query, k, filter)
+        return [(self._document(snapshot, row), float(2.0 - 2.0 * sim)) for row, sim in zip(rows, similarities)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None,
+                                     **kwargs) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._query_vector(query), k=k, filter=filter)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4,
+                                    filter: Optional[Dict[str, Any]] = None, **kwargs) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k, filter=filter)]
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None,
+                          **kwargs) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def max_marginal_relevance_search_by_vector(self, embedding: List[float], k: int = 4, fetch_k: int = 20,
+                                                lambda_mult: float = 0.5, filter: Optional[Dict[str, Any]] = None,
+                                                **kwargs) -> List[Document]:
+        query = _normalize(np.asarray([embedding], dtype=np.float32))[0]
+        snapshot, rows, _ = self._top_k(query, fetch_k, filter)
+        if len(rows) == 0:
+            return []
+        selected = mmr_select(query, snapshot.vectors(rows), k, lambda_mult)
+        return [self._document(snapshot, rows[i]) for i in selected]
+
+    def max_marginal_relevance_search(self, query: str, k: int = 4, fetch_k: int = 20, lambda_mult: float = 0.5,
+                                      filter: Optional[Dict[str, Any]] = None, **kwargs) -> List[Document]:
+        return self.max_marginal_relevance_search_by_vector(
+            self._query_vector(query), k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, filter=filter
+        )
+
+    def _select_relevance_score_fn(self):
+        # 제곱 L2 거리(0~4) → 관련도(1~-1)
+        return lambda distance: 1.0 - distance / 2.0
+
+
+def import_from_chroma(store: NumpyVectorStore, chroma_directory: str, collection_name: str = "langchain") -> int:
+    """기존 Chroma 저장소(컬렉션)의 임베딩/문서/메타데이터를 그대로 복사 (임베딩 API 호출 없음)
+
+    Returns:
+        int: 복사한 문서 수
+    """
+    from langchain_chroma import Chroma
+    chroma = Chroma(collection_name=collection_name, persist_directory=chroma_directory,
+                    embedding_function=store.embedding_function)
+    data = chroma._collection.get(include=["embeddings", "documents", "metadatas"])
+    ids = data.get("ids") or []
+    if ids:
+        store.upsert(ids=ids, embeddings=data["embeddings"], documents=data.get("documents"),
+                     metadatas=data.get("metadatas"))
+        logger.info(f"📦 Chroma → NumPy 벡터 저장소 복사: {len(ids)}개 ({chroma_directory} [{collection_name}])")
+    return len(ids)
@@ -1,16 +1,37 @@
 """
 카테고리 자동 분류 모듈
+- 학습된 모델을 데이터 스탬프와 함께 디스크에 저장 (기동 시 학습 없이 로드)
+- 카테고리/분류된 공수 데이터가 바뀌었을 때만 백그라운드에서 재학습
+- 분류된 데이터가 추가되기만 한 경우 MultinomialNB.partial_fit으로 증분 학습
 """
 import logging
-from typing import Dict, List, Tuple
+import copy
+import hashlib
+import pickle
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.pipeline import Pipeline
 import json
 import os
+from ..utils.config import CATEGORY_MODEL_FILE, CATEGORY_CLASSIFIER_BACKEND
+from ..utils.shared_state import get_lock, atomic_write_bytes, file_stamp
 
 logger = logging.getLogger(__name__)
 
+# 학습 데이터 파일
+CATEGORIES_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'docs', 'categories.json')
+EFFORT_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'docs', 'effort_estimations.json')
+
+# 저장 모델 형식 버전 (구조가 바뀌면 증가 → 기존 파일 무시하고 재학습)
+_MODEL_FORMAT = 1
+# 증분 학습 누적 비율이 이 값을 넘으면 전체 재학습 (TF-IDF 어휘/IDF 갱신)
+_MAX_INCREMENTAL_RATIO = 0.2
+
 class CategoryClassifier:
     """카테고리 자동 분류기"""
     
@@ -19,14 +40,19 @@ class CategoryClassifier:
         self.vectorizer = None
         self.categories = []
         self.is_trained = False
+        # 모델이 반영한 원본 파일 스탬프 / 학습 샘플 키
+        self.source_stamps: Dict[str, Optional[str]] = {}
+        self.sample_keys: Set[str] = set()
+        self.base_sample_count = 0  # 마지막 전체 학습 샘플 수
+        self.model_file_stamp = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
         
     def load_training_data(self) -> List[Tuple[str, str]]:
         """학습 데이터 로드 (기존 카테고리 데이터 사용)"""
         try:
             # 카테고리 파일 로드
-            categories_file = os.path.join(
-                os.path.dirname(__file__), '..', '..', 'data', 'docs', 'categories.json'
-            )
+            categories_file = CATEGORIES_FILE
             
             if not os.path.exists(categories_file):
                 logger.warning("카테고리 파일을 찾을 수 없습니다")
@@ -36,9 +62,7 @@ class CategoryClassifier:
                 categories = json.load(f)
             
             # 공수 산정 데이터 로드
-            effort_file = os.path.join(
-                os.path.dirname(__file__), '..', '..', 'data', 'docs', 'effort_estimations.json'
-            )
+            effort_file = EFFORT_FILE
             
             if not os.path.exists(effort_file):
                 logger.warning("공수 산정 파일을 찾을 수 없습니다")
@@ -120,6 +144,8 @@ class CategoryClassifier:
             ])
             
             self.model.fit(texts, labels)
+            self.sample_keys = {self._sample_key(text, label) for text, label in training_data}
+            self.base_sample_count = len(self.sample_keys)
             self.is_trained = True
             
             logger.info(f"모델 학습 완료: {len(texts)}개 샘플")
@@ -146,6 +172,34 @@ class CategoryClassifier:
             logger.error(f"예측 오류: {e}")
             return None
     
+    def classify_batch(self, texts: List[str], top_k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 텍스트를 한 번에 분류 (TF-IDF 변환/확률 계산 1회)
+        
+        Args:
+            texts: 분류할 텍스트 목록
+            top_k: 텍스트별로 반환할 상위 카테고리 수
+        
+        Returns:
+            (labels, confidences): (len(texts), top_k) 배열, 신뢰도 내림차순
+        """
+        if not self.is_trained or self.model is None:
+            raise RuntimeError("모델이 학습되지 않았습니다")
+        model = self.model
+        classes = model.classes_
+        top_k = max(1, min(top_k, len(classes)))
+        if not texts:
+            return np.empty((0, top_k), dtype=object), np.empty((0, top_k), dtype=float)
+        
+        probabilities = model.predict_proba(list(texts))
+        if top_k == 1:
+            top_indices = probabilities.argmax(axis=1)[:, None]
+        else:
+            # 상위 k개만 부분 정렬 후 k개 안에서 정렬
+            candidates = np.argpartition(-probabilities, top_k - 1, axis=1)[:, :top_k]
+            order = np.argsort(-np.take_along_axis(probabilities, candidates, axis=1), axis=1)
+            top_indices = np.take_along_axis(candidates, order, axis=1)
+        return classes[top_indices], np.take_along_axis(probabilities, top_indices, axis=1)
+    
     def get_confidence(self, text: str) -> float:
         """예측 신뢰도 반환"""
         try:
@@ -159,12 +213,142 @@ class CategoryClassifier:
             logger.error(f"신뢰도 계산 오류: {e}")
             return 0.0
     
-    def initialize(self):
-        """초기화 및 자동 학습"""
+    @staticmethod
+    def _sample_key(text: str, label: str) -> str:
+        return hashlib.md5(f"{label}\x1f{text}".encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _source_stamps() -> Dict[str, Optional[str]]:
+        """학습 데이터 원본 파일 스탬프"""
+        return {"categories": file_stamp(CATEGORIES_FILE), "estimations": file_stamp(EFFORT_FILE)}
+    
+    def is_stale(self) -> bool:
+        """원본 데이터 또는 저장 모델이 바뀌었는지 (stat 2~3회로 확인)"""
+        return (not self.is_trained or
+                self._source_stamps() != self.source_stamps or
+                file_stamp(CATEGORY_MODEL_FILE) != self.model_file_stamp)
+    
+    def load_model(self) -> bool:
+        """저장된 모델 로드 (다른 워커/이전 실행이 학습한 모델)"""
         try:
+            stamp = file_stamp(CATEGORY_MODEL_FILE)
+            if stamp is None:
+                return False
+            if stamp == self.model_file_stamp:
+                return self.is_trained
+            with open(CATEGORY_MODEL_FILE, 'rb') as f:
+                state = pickle.load(f)
+            if state.get("format") != _MODEL_FORMAT or state.get("sklearn_version") != sklearn.__version__:
+                logger.info("저장된 분류 모델 형식/버전 불일치, 재학습 필요")
+                return False
+            self.model = state["model"]
+            self.source_stamps = state["source_stamps"]
+            self.sample_keys = set(state["sample_keys"])
+            self.base_sample_count = state.get("base_sample_count", len(self.sample_keys))
+            self.model_file_stamp = stamp
+            self.is_trained = True
+            logger.info(f"저장된 분류 모델 로드: {len(self.sample_keys)}개 샘플 ({state.get('trained_at')})")
+            return True
+        except Exception as e:
+            logger.warning(f"저장된 분류 모델 로드 실패: {e}")
+            return False
+    
+    def save_model(self):
+        """모델 저장 (원자적 교체, 다른 워커는 스탬프 변경으로 감지)"""
+        state = {
+            "format": _MODEL_FORMAT,
+            "sklearn_version": sklearn.__version__,
+            "model": self.model,
+            "source_stamps": self.source_stamps,
+            "sample_keys": sorted(self.sample_keys),
+            "base_sample_count": self.base_sample_count,
+            "trained_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        atomic_write_bytes(CATEGORY_MODEL_FILE, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+        self.model_file_stamp = file_stamp(CATEGORY_MODEL_FILE)
+    
+    def _partial_fit(self, new_samples: List[Tuple[str, str]]) -> bool:
+        """새로 분류된 데이터만 증분 학습 (TF-IDF 어휘 고정, NB 카운트만 갱신)
+        
+        Returns:
+            bool: 증분 학습했으면 True (전체 재학습이 필요하면 False)
+        """
+        known_labels = set(self.model.classes_)
+        if any(label not in known_labels for _, label in new_samples):
+            return False
+        if len(self.sample_keys) + len(new_samples) > self.base_sample_count * (1 + _MAX_INCREMENTAL_RATIO):
+            return False
+        
+        # 예측 중인 스레드가 있으므로 복사본을 학습한 뒤 교체
+        model = copy.deepcopy(self.model)
+        texts, labels = zip(*new_samples)
+        model.named_steps['clf'].partial_fit(model.named_steps['tfidf'].transform(texts), labels)
+        self.model = model
+        self.sample_keys |= {self._sample_key(text, label) for text, label in new_samples}
+        logger.info(f"분류 모델 증분 학습: {len(new_samples)}개 샘플 추가")
+        return True
+    
+    def refresh(self) -> bool:
+        """원본 데이터가 바뀌었으면 모델 갱신 (변경 없음 → 스탬프만 갱신 / 추가만 → 증분 / 그 외 → 전체 재학습)
+        
+        워커 간 잠금 안에서 실행하므로 한 워커만 학습하고 나머지는 저장된 모델을 로드
+        """
+        with self._refresh_lock, get_lock("category_classifier"):
+            # 다른 워커가 이미 갱신했으면 로드만
+            self.load_model()
+            stamps = self._source_stamps()
+            if self.is_trained and stamps == self.source_stamps:
+                return True
+            
             training_data = self.load_training_data()
-            if training_data:
-                self.train(training_data)
+            if not training_data:
+                logger.warning("학습 데이터가 없어 분류 모델 갱신 생략")
+                return self.is_trained
+            
+            current = {self._sample_key(text, label): (text, label) for text, label in training_data}
+            start = time.perf_counter()
+            if self.is_trained and not (self.sample_keys - current.keys()):
+                new_samples = [current[key] for key in current.keys() - self.sample_keys]
+                if not new_samples:
+                    logger.info("분류 학습 데이터 변경 없음, 모델 재사용")
+                elif not self._partial_fit(new_samples) and not self.train(training_data):
+                    return self.is_trained
+            elif not self.train(training_data):
+                return self.is_trained
+            
+            self.source_stamps = stamps
+            try:
+                self.save_model()
+            except Exception as e:
+                logger.warning(f"분류 모델 저장 실패 (메모리 모델 사용): {e}")
+            logger.info(f"분류 모델 갱신 완료 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+            return True
+    
+    def schedule_refresh(self):
+        """백그라운드 모델 갱신 (이미 실행 중이면 생략)"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"분류 모델 백그라운드 갱신 오류: {e}")
+        
+        self._refresh_thread = threading.Thread(target=run, name="category-classifier-refresh", daemon=True)
+        self._refresh_thread.start()
+    
+    def warm_up(self):
+        """서버 기동 시 호출: 저장된 모델 즉시 로드, 오래된 경우 백그라운드 갱신"""
+        loaded = self.load_model()
+        if not loaded or self.is_stale():
+            self.schedule_refresh()
+        return loaded
+    
+    def initialize(self):
+        """초기화 및 자동 학습 (저장된 모델이 최신이면 로드만)"""
+        try:
+            if self.refresh():
                 logger.info("카테고리 분류기 초기화 완료")
             else:
                 logger.warning("학습 데이터가 없어 초기화 실패")
@@ -175,20 +359,72 @@ class CategoryClassifier:
 # 전역 인스턴스
 classifier = CategoryClassifier()
 
+def _ensure_model() -> bool:
+    """분류 모델 준비 (학습된 모델이 있으면 True)"""
+    if not classifier.is_trained:
+        # 저장된 모델이 없을 때만 요청 안에서 학습 (최초 1회)
+        if not classifier.load_model():
+            classifier.initialize()
+    elif classifier.is_stale():
+        # 현재 모델로 응답하고 갱신은 백그라운드에서
+        classifier.schedule_refresh()
+    return classifier.is_trained
+
+def _classify_with_embeddings(texts: List[str], top_k: int,
+                              tickets: Optional[List[Optional[str]]]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """임베딩 분류기로 분류 (준비 실패/오류 시 (None, None) → TF-IDF로 대체)"""
+    try:
+        from .embedding_classifier import embedding_classifier
+        if not embedding_classifier.build():
+            return None, None
+        return embedding_classifier.classify_batch(texts, top_k, tickets)
+    except Exception as e:
+        logger.warning(f"임베딩 분류기 사용 실패, TF-IDF 분류기로 대체: {e}")
+        return None, None
+
+def auto_classify_batch(texts: List[str], top_k: int = 1,
+                        tickets: Optional[List[Optional[str]]] = None) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """여러 텍스트 일괄 자동 분류 (CATEGORY_CLASSIFIER_BACKEND에 따라 TF-IDF/임베딩)
+    
+    Args:
+        tickets: 텍스트별 Jira 티켓 (임베딩 백엔드에서 Chroma 저장 임베딩 재사용)
+    
+    Returns:
+        (labels, confidences): (len(texts), top_k) 배열 (모델이 없거나 오류 시 (None, None))
+    """
+    try:
+        start = time.perf_counter()
+        labels = confidences = None
+        if CATEGORY_CLASSIFIER_BACKEND == "embedding":
+            labels, confidences = _classify_with_embeddings(texts, top_k, tickets)
+        if labels is None:
+            if not _ensure_model():
+                return None, None
+            labels, confidences = classifier.classify_batch(texts, top_k)
+        logger.info(f"일괄 자동 분류: {len(texts)}개 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        return labels, confidences
+    except Exception as e:
+        logger.error(f"일괄 자동 분류 오류: {e}")
+        return None, None
+
 def auto_classify(text: str) -> Tuple[str, float]:
     """자동 카테고리 분류"""
     try:
-        if not classifier.is_trained:
-            classifier.initialize()
+        if CATEGORY_CLASSIFIER_BACKEND == "embedding":
+            labels, confidences = _classify_with_embeddings([text], 1, None)
+            if labels is not None:
+                logger.info(f"자동 분류 결과 (임베딩): {labels[0][0]} (신뢰도: {float(confidences[0][0]):.2f})")
+                return str(labels[0][0]), float(confidences[0][0])
         
-        if not classifier.is_trained:
+        if not _ensure_model():
             return None, 0.0
         
         # predict_proba를 한 번만 호출하여 예측과 신뢰도를 동시에 가져오기
-        probabilities = classifier.model.predict_proba([text])[0]
+        model = classifier.model
+        probabilities = model.predict_proba([text])[0]
         predicted_index = probabilities.argmax()
         confidence = float(probabilities[predicted_index])
-        category = classifier.model.classes_[predicted_index]
+        category = model.classes_[predicted_index]
         
         logger.info(f"자동 분류 결과: {category} (신뢰도: {confidence:.2f})")
         
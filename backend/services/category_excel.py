@@ -0,0 +1,163 @@
+"""
+카테고리 엑셀 가져오기/내보내기 모듈
+- 가져오기: openpyxl read_only 모드로 행 단위 스트리밍 파싱 (병합 셀은 위 행 값으로 채움)
+- 현재 카테고리 트리와 비교해 추가/삭제 조합(diff) 계산
+- 내보내기: write_only 모드로 행 단위 기록 (대/중분류는 그룹 첫 행에만 기록)
+"""
+
+import logging
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Side
+
+logger = logging.getLogger(__name__)
+
+HEADERS = ('대분류', '중분류', '소분류')
+
+Triple = Tuple[str, str, str]
+
+
+def _cell_text(value: Any) -> str:
+    """셀 값 → 문자열 (None/'None'/'nan'은 빈 값)"""
+    if value is None:
+        return ""
+    text = str(value).strip()
+    return "" if text in ("None", "nan") else text
+
+
+def iter_category_rows(source: BinaryIO) -> Iterator[Tuple[str, str, str]]:
+    """엑셀 행을 (대분류, 중분류, 소분류)로 하나씩 반환 (헤더 제외)
+
+    병합된 셀은 read_only 모드에서 첫 행에만 값이 있으므로
+    대분류/중분류가 비어 있으면 직전 값을 사용 (중분류는 같은 대분류 안에서만)
+    """
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        last_major = ""
+        last_minor_by_major: Dict[str, str] = {}
+        for row in ws.iter_rows(min_row=2, max_col=3, values_only=True):
+            if not row or not any(row):  # 빈 행 건너뛰기
+                continue
+            cells = list(row) + [None] * (3 - len(row))
+            major, minor, sub = (_cell_text(cell) for cell in cells[:3])
+
+            major = major or last_major
+            if not major:
+                continue
+            minor = minor or last_minor_by_major.get(major, "")
+            last_major = major
+            if minor:
+                last_minor_by_major[major] = minor
+            yield major, minor, sub
+    finally:
+        wb.close()
+
+
+def build_category_tree(rows: Iterator[Tuple[str, str, str]]) -> Dict[str, Dict[str, List[str]]]:
+    """행 목록 → 카테고리 트리 (입력 순서 유지, 중복 소분류 제거)"""
+    categories: Dict[str, Dict[str, List[str]]] = {}
+    seen = set()
+    for major, minor, sub in rows:
+        minors = categories.setdefault(major, {})
+        if not minor:
+            continue
+        subs = minors.setdefault(minor, [])
+        if sub and (major, minor, sub) not in seen:
+            seen.add((major, minor, sub))
+            subs.append(sub)
+    return categories
+
+
+def category_triples(categories: Dict[str, Dict[str, List[str]]]) -> List[Triple]:
+    """트리 → (대, 중, 소) 조합 목록 (트리 순서)"""
+    return [
+        (major, minor, sub)
+        for major, minors in categories.items()
+        for minor, subs in minors.items()
+        for sub in subs
+    ]
+
+
+def diff_categories(current: Dict[str, Dict[str, List[str]]], new: Dict[str, Dict[str, List[str]]]) -> Dict[str, Any]:
+    """현재 트리와 새 트리의 차이
+
+    Returns:
+        dict: added/removed 조합 목록, unchanged 수, 구조(대/중분류) 변경 여부
+    """
+    current_triples = category_triples(current)
+    new_triples = category_triples(new)
+    current_set, new_set = set(current_triples), set(new_triples)
+    added = [t for t in new_triples if t not in current_set]
+    removed = [t for t in current_triples if t not in new_set]
+    # 조합은 같아도 빈 대/중분류가 생기거나 순서가 바뀐 경우 파일은 다시 저장
+    return {
+        "added": added,
+        "removed": removed,
+        "unchanged_count": len(new_set & current_set),
+        "tree_changed": current != new,
+    }
+
+
+def format_diff(diff: Dict[str, Any], limit: int = 100) -> Dict[str, Any]:
+    """API 응답용 diff (조합은 '대 > 중 > 소' 문자열, 최대 limit개)"""
+    return {
+        "added_count": len(diff["added"]),
+        "removed_count": len(diff["removed"]),
+        "unchanged_count": diff["unchanged_count"],
+        "tree_changed": diff["tree_changed"],
+        "added": [" > ".join(t) for t in diff["added"][:limit]],
+        "removed": [" > ".join(t) for t in diff["removed"][:limit]],
+    }
+
+
+def write_categories_xlsx(categories: Dict[str, Dict[str, List[str]]], path: str) -> int:
+    """카테고리 트리를 엑셀 파일로 저장 (write_only 스트리밍)
+
+    write_only 모드는 셀 병합을 지원하지 않으므로 대/중분류는 그룹 첫 행에만 기록
+    (가져오기 시 빈 셀은 위 값으로 채워지므로 그대로 다시 업로드 가능)
+
+    Returns:
+        int: 기록한 데이터 행 수
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("카테고리")
+
+    border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                    top=Side(style='thin'), bottom=Side(style='thin'))
+    alignment = Alignment(horizontal='center', vertical='center')
+
+    # 컬럼 너비 (행 기록 전에 설정해야 함)
+    widths = [len(header) for header in HEADERS]
+    for major, minor, sub in category_triples(categories):
+        widths = [max(widths[0], len(major)), max(widths[1], len(minor)), max(widths[2], len(sub))]
+    for letter, width in zip("ABC", widths):
+        ws.column_dimensions[letter].width = min(width + 2, 50)
+
+    def styled_row(values):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = border
+            cell.alignment = alignment
+            cells.append(cell)
+        return cells
+
+    ws.append(styled_row(HEADERS))
+    row_count = 0
+    for major, minors in categories.items():
+        first_in_major = True
+        for minor, subs in minors.items():
+            first_in_minor = True
+            for sub in subs:
+                ws.append(styled_row((
+                    major if first_in_major else None,
+                    minor if first_in_minor else None,
+                    sub,
+                )))
+                first_in_major = first_in_minor = False
+                row_count += 1
+    wb.save(path)
+    return row_count
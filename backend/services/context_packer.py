@@ -0,0 +1,191 @@
+"""
+QA 프롬프트 컨텍스트 구성 모듈
+검색된 공수 문서를 토큰 예산(CONTEXT_TOKEN_BUDGET) 안에 맞춰 프롬프트에 넣을 형태로 압축
+- 필드 우선순위: 티켓/제목/Epic/Story Points/담당자/산정 이유는 유지, 설명/댓글/비고는 문서별 상한까지 자름
+- 빈 필드는 제외, 같은 제목+Story Points 또는 본문이 거의 같은 티켓은 앞 순위 1건만 사용
+- 예산을 넘는 문서는 자를 수 있는 필드를 줄여 넣어 보고, 그래도 안 되면 제외 (검색 순위 유지)
+- 사용한 토큰 수를 통계로 반환 (tiktoken이 있으면 정확히, 없으면 문자 기반 근사)
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from ..utils.config import CONTEXT_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+# 색인 텍스트 필드 (index_json_data / format_for_indexing 형식, 표시 순서)
+FIELD_LABELS = ("Jira 티켓", "제목", "Epic", "Story Points", "담당자", "산정 이유", "기술 스택", "설명", "댓글", "비고", "등록일")
+# 문서별 자를 수 있는 필드와 토큰 상한 (앞에 있을수록 예산이 부족할 때 나중까지 남김)
+TRUNCATABLE_FIELDS = {"설명": 250, "댓글": 120, "비고": 60}
+# 필드 형식이 아닌 문서(PDF/텍스트 등)의 문서별 토큰 상한
+PLAIN_DOCUMENT_TOKENS = 400
+# 예산 부족 시 자를 수 있는 필드를 이 토큰 수 아래로는 줄이지 않음 (너무 짧으면 의미 없음)
+MIN_FIELD_TOKENS = 30
+# 본문 3-gram 자카드 유사도가 이 값 이상이면 거의 같은 티켓으로 보고 제외
+NEAR_DUPLICATE_THRESHOLD = 0.9
+# 문서 사이 구분자 (stuff 체인 기본 구분자와 같음)
+DOCUMENT_SEPARATOR = "\n\n"
+
+_FIELD_PATTERN = re.compile(r"^(" + "|".join(re.escape(label) for label in FIELD_LABELS) + r"):\s?(.*)$")
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken 미설치 환경 (requirements에서 선택 사항)
+    _encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수 (tiktoken 없으면 근사: 한글 등 비ASCII 1자 ≈ 1토큰, ASCII 4자 ≈ 1토큰)"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """토큰 상한까지 자르고 말줄임표 추가 (상한 이하면 그대로)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text)[:max_tokens]).rstrip() + "…"
+    # 근사 모드: 이진 탐색으로 상한에 맞는 가장 긴 앞부분
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + "…"
+
+
+def parse_fields(text: str) -> Optional[List[Tuple[str, str]]]:
+    """색인 텍스트를 [(필드명, 값)]으로 분해 (필드 형식이 아니면 None, 여러 줄 값은 이어 붙임)"""
+    fields: List[Tuple[str, str]] = []
+    for line in text.splitlines():
+        match = _FIELD_PATTERN.match(line)
+        if match:
+            fields.append((match.group(1), match.group(2).strip()))
+        elif fields:
+            label, value = fields[-1]
+            fields[-1] = (label, f"{value}\n{line}".strip())
+    if not fields or fields[0][0] != "Jira 티켓":
+        return None
+    return fields
+
+
+def _render(fields: List[Tuple[str, str]], limits: Dict[str, int]) -> str:
+    lines = []
+    for label, value in fields:
+        if not value:
+            continue
+        if label in limits:
+            value = truncate_to_tokens(value, limits[label])
+        lines.append(f"{label}: {value}")
+    return "\n".join(lines)
+
+
+def _shingles(text: str) -> set:
+    compact = "".join(text.split()).lower()
+    return {compact[i:i + 3] for i in range(max(1, len(compact) - 2))}
+
+
+def _duplicate_key(doc: Document) -> Optional[Tuple[str, str]]:
+    title = "".join(str(doc.metadata.get("title", "")).split()).lower()
+    return (title, str(doc.metadata.get("story_points", ""))) if title else None
+
+
+class _Candidate:
+    def __init__(self, doc: Document):
+        self.doc = doc
+        self.fields = parse_fields(doc.page_content)
+        self.limits = dict(TRUNCATABLE_FIELDS)
+        self.text = self.render()
+
+    def render(self) -> str:
+        if self.fields is None:
+            return truncate_to_tokens(self.doc.page_content.strip(), PLAIN_DOCUMENT_TOKENS)
+        return _render(self.fields, self.limits)
+
+    def shrink_to(self, max_tokens: int) -> bool:
+        """자를 수 있는 필드를 뒤 순위부터 줄여 max_tokens 이하로 맞춤 (불가능하면 False)"""
+        if self.fields is None:
+            if max_tokens < MIN_FIELD_TOKENS:
+                return False
+            self.text = truncate_to_tokens(self.doc.page_content.strip(), max_tokens)
+            return True
+        for label in reversed(list(TRUNCATABLE_FIELDS)):
+            while count_tokens(self.text) > max_tokens and self.limits[label] > MIN_FIELD_TOKENS:
+                self.limits[label] = max(MIN_FIELD_TOKENS, self.limits[label] // 2)
+                self.text = self.render()
+            if count_tokens(self.text) <= max_tokens:
+                return True
+        return count_tokens(self.text) <= max_tokens
+
+
+def pack_documents(documents: List[Document], budget: int = CONTEXT_TOKEN_BUDGET) -> Tuple[List[Document], Dict[str, Any]]:
+    """검색 문서를 토큰 예산 안의 프롬프트용 문서로 압축 (검색 순위 유지, 원본 문서는 변경하지 않음)
+
+    Args:
+        budget: 컨텍스트 전체 토큰 상한 (0 이하면 압축하지 않음)
+
+    Returns:
+        tuple: (압축 문서 목록, 통계 {"budget", "input_tokens", "context_tokens", "documents_in",
+                "documents_out", "duplicates_dropped", "over_budget_dropped", "compressed"})
+    """
+    input_tokens = sum(count_tokens(doc.page_content) for doc in documents)
+    stats = {
+        "budget": budget,
+        "input_tokens": input_tokens,
+        "context_tokens": input_tokens,
+        "documents_in": len(documents),
+        "documents_out": len(documents),
+        "duplicates_dropped": 0,
+        "over_budget_dropped": 0,
+        "compressed": 0,
+    }
+    if budget <= 0 or not documents:
+        return documents, stats
+
+    packed: List[Document] = []
+    seen_keys = set()
+    seen_shingles: List[set] = []
+    used = 0
+    separator_tokens = count_tokens(DOCUMENT_SEPARATOR)
+    for doc in documents:
+        key = _duplicate_key(doc)
+        if key is not None and key in seen_keys:
+            stats["duplicates_dropped"] += 1
+            continue
+        candidate = _Candidate(doc)
+        shingles = _shingles(candidate.text)
+        if any(len(shingles & other) / (len(shingles | other) or 1) >= NEAR_DUPLICATE_THRESHOLD for other in seen_shingles):
+            stats["duplicates_dropped"] += 1
+            continue
+
+        remaining = budget - used - (separator_tokens if packed else 0)
+        tokens = count_tokens(candidate.text)
+        if tokens > remaining:
+            # 첫 문서는 예산을 넘더라도 최대한 줄여서 포함 (컨텍스트가 비지 않도록)
+            if not candidate.shrink_to(remaining) and packed:
+                stats["over_budget_dropped"] += 1
+                continue
+            tokens = count_tokens(candidate.text)
+
+        if candidate.text != doc.page_content:
+            stats["compressed"] += 1
+        packed.append(Document(page_content=candidate.text, metadata=doc.metadata))
+        used += tokens + (separator_tokens if len(packed) > 1 else 0)
+        if key is not None:
+            seen_keys.add(key)
+        seen_shingles.append(shingles)
+
+    stats.update(context_tokens=used, documents_out=len(packed))
+    return packed, stats
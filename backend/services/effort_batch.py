@@ -0,0 +1,196 @@
+"""
+요구사항 목록 일괄 공수 산정 모듈
+RFP 기능 목록(줄 단위)을 한 번에 받아 줄별 예상 공수와 합계를 계산
+- 티켓 번호/제목 완전 일치 줄은 LLM 없이 바로 답변 (answer_structured_question)
+- 나머지 줄은 질문 임베딩 1회 요청 + 벡터 검색 1회(query 일괄)로 후보를 한꺼번에 조회한 뒤 줄별 MMR 재정렬
+- 같은 내용의 줄은 한 번만 처리, 답변 생성은 EFFORT_BATCH_CONCURRENCY개까지 동시 실행
+- 숫자(가중 중앙값/범위)는 effort_estimator로 계산하므로 LLM 호출이 실패해도 줄별 공수는 반환
+- 결과는 줄이 끝나는 순서대로 이벤트로 전달 (NDJSON 스트리밍 / 슬랙 진행 메시지)
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_openai import ChatOpenAI
+
+from ..data.database import get_vectordb, prefetch_query_embeddings
+from ..utils.config import CONTEXT_TOKEN_BUDGET, EFFORT_BATCH_CONCURRENCY, EFFORT_BATCH_MAX_LINES
+from .context_packer import pack_documents
+from .effort_estimator import estimate_from_samples, format_estimate_block, samples_from_documents
+from .effort_qa import analyze_customer_risk, answer_structured_question
+from .effort_retrieval import fetch_candidates_batch, mmr_rerank
+
+logger = logging.getLogger(__name__)
+
+# 줄별 검색 후보 수 / 답변에 사용할 문서 수
+BATCH_FETCH_K = 40
+BATCH_K = 8
+# 목록 기호/번호 ("- ", "• ", "1. ", "1) ", "[ ] ") 제거
+_LINE_PREFIX_PATTERN = re.compile(r"^\s*(?:[-*•·▪◦]|\d+[.)]|\[\s?[xX]?\s?\])\s*")
+
+BATCH_PROMPT = """다음은 공수 산정 이력 데이터입니다:
+---------------------
+{context}
+---------------------
+
+요구사항: {question}
+
+위 데이터에서 요구사항과 가장 유사한 작업을 1~3개 골라 아래 형식으로만 간단히 답변하세요.
+- 제공된 데이터에 없는 티켓이나 숫자를 만들지 마세요.
+- 여러 티켓의 범위/평균은 계산하지 마세요 (통계는 자동으로 추가됩니다).
+- 유사한 작업이 없으면 "유사 작업 없음"이라고만 답변하세요.
+
+형식:
+- [티켓번호] 제목: X일 (담당자)
+"""
+
+
+def parse_requirement_lines(text_or_lines) -> List[str]:
+    """요구사항 목록을 줄 목록으로 변환 (목록 기호/번호 제거, 빈 줄 제외)"""
+    lines = text_or_lines.splitlines() if isinstance(text_or_lines, str) else list(text_or_lines or [])
+    parsed = []
+    for line in lines:
+        line = " ".join(_LINE_PREFIX_PATTERN.sub("", str(line)).split())
+        if line:
+            parsed.append(line)
+    return parsed
+
+
+def _prepare_lines(lines: List[str]) -> Dict[str, Dict[str, Any]]:
+    """줄별 정확 조회 결과 또는 검색 문서 (벡터 검색은 모든 줄을 한 번에)"""
+    prepared: Dict[str, Dict[str, Any]] = {}
+    fuzzy = []
+    for line in lines:
+        structured = answer_structured_question(line)
+        prepared[line] = {"structured": structured, "documents": []}
+        if not structured:
+            fuzzy.append(line)
+
+    if fuzzy:
+        vectordb = get_vectordb()
+        if vectordb._collection.count() > 0:
+            prefetch_query_embeddings(fuzzy)
+            for line, candidates in zip(fuzzy, fetch_candidates_batch(vectordb, fuzzy, fetch_k=BATCH_FETCH_K)):
+                prepared[line]["documents"] = mmr_rerank(candidates, line, k=BATCH_K)
+    logger.info(f"📋 일괄 산정 준비: {len(lines)}줄 (정확 조회 {len(lines) - len(fuzzy)}줄, 일괄 검색 {len(fuzzy)}줄)")
+    return prepared
+
+
+def _answer_line(line: str, prepared: Dict[str, Any], llm, buffer_percent: float) -> Dict[str, Any]:
+    """요구사항 1줄 답변 (정확 조회 결과 재사용 또는 검색 문서로 LLM 답변 + 통계)"""
+    start = time.perf_counter()
+    structured = prepared.get("structured")
+    if structured:
+        estimate = estimate_from_samples(structured["estimate"]["samples"], buffer_percent)
+        return {
+            "line": line,
+            "answer": structured["answer"],
+            "estimate": estimate,
+            "tickets": [source["page"] for source in structured["sources"]],
+            "is_from_structured_lookup": True,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    documents = prepared.get("documents") or []
+    estimate = estimate_from_samples(samples_from_documents(documents), buffer_percent)
+    result = {"line": line, "estimate": estimate, "tickets": [s["jira_ticket"] for s in estimate["samples"]]}
+    if not documents:
+        result["answer"] = "유사 작업 없음"
+    else:
+        packed, _ = pack_documents(documents, CONTEXT_TOKEN_BUDGET)
+        context = "\n\n".join(doc.page_content for doc in packed)
+        try:
+            answer = llm.invoke(BATCH_PROMPT.format(context=context, question=line)).content.strip()
+        except Exception as e:
+            # 숫자는 검색 결과로 계산했으므로 답변 생성 실패 시 통계만 반환
+            logger.warning(f"⚠️ 일괄 산정 답변 생성 실패 ('{line[:30]}'): {str(e)}")
+            answer, result["error"] = "", str(e)
+        block = format_estimate_block(estimate)
+        result["answer"] = "\n\n".join(part for part in (answer, block) if part) or "유사 작업 없음"
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def _summary(results: Dict[int, Dict[str, Any]], line_count: int, shared_tickets: int,
+             buffer_percent: float, started: float) -> Dict[str, Any]:
+    """전체 합계 (추정값이 있는 줄의 중앙값/p25/p75 합)"""
+    estimates = [r["estimate"] for r in results.values() if r.get("estimate", {}).get("used_count")]
+    total = {key: round(sum(e[key] for e in estimates), 2) for key in ("median", "p25", "p75")}
+    summary = {
+        "type": "summary",
+        "lines": line_count,
+        "estimated_lines": len(estimates),
+        "failed_lines": sum(1 for r in results.values() if r.get("error")),
+        "shared_tickets": shared_tickets,
+        "total": total,
+        "buffer_percent": buffer_percent,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    if buffer_percent:
+        summary["total_buffered"] = {key: round(value * (1 + buffer_percent / 100), 2) for key, value in total.items()}
+    return summary
+
+
+async def stream_effort_batch(lines: List[str], customer: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """요구사항 목록 일괄 산정 (이벤트: start → 줄마다 line (끝난 순서) → summary)
+
+    Args:
+        lines: 요구사항 줄 목록 (parse_requirement_lines 결과)
+        customer: 고객사명 (있으면 analyze_customer_risk 버퍼를 줄별/합계에 적용)
+    """
+    started = time.perf_counter()
+    if len(lines) > EFFORT_BATCH_MAX_LINES:
+        raise ValueError(f"요구사항은 최대 {EFFORT_BATCH_MAX_LINES}줄까지 처리할 수 있습니다 (입력: {len(lines)}줄)")
+
+    positions: Dict[str, List[int]] = {}
+    for index, line in enumerate(lines):
+        positions.setdefault(line, []).append(index)
+    unique_lines = list(positions)
+    buffer_percent = analyze_customer_risk(customer, 0)["buffer_percent"] if customer else 0
+    yield {"type": "start", "lines": len(lines), "unique_lines": len(unique_lines), "buffer_percent": buffer_percent}
+
+    prepared = await asyncio.to_thread(_prepare_lines, unique_lines)
+    ticket_usage = Counter(doc.metadata.get("jira_ticket") for item in prepared.values()
+                           for doc in item["documents"] if doc.metadata.get("jira_ticket"))
+    shared_tickets = sum(1 for count in ticket_usage.values() if count > 1)
+
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    semaphore = asyncio.Semaphore(max(1, EFFORT_BATCH_CONCURRENCY))
+
+    async def run(line: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await asyncio.to_thread(_answer_line, line, prepared[line], llm, buffer_percent)
+
+    tasks = [asyncio.create_task(run(line)) for line in unique_lines]
+    results: Dict[int, Dict[str, Any]] = {}
+    try:
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            for index in positions[result["line"]]:
+                results[index] = result
+                yield {"type": "line", "index": index, **result}
+    finally:
+        # 클라이언트가 연결을 끊으면 아직 시작하지 않은 줄은 취소
+        for task in tasks:
+            task.cancel()
+
+    summary = _summary(results, len(lines), shared_tickets, buffer_percent, started)
+    logger.info(f"✅ 일괄 산정 완료: {len(lines)}줄, 합계 {summary['total']['median']}일 ({summary['elapsed_ms']}ms)")
+    yield summary
+
+
+async def run_effort_batch(lines: List[str], customer: Optional[str] = None) -> Dict[str, Any]:
+    """일괄 산정 결과를 한 번에 반환 (줄 순서대로 정렬된 results + summary)"""
+    results = []
+    summary: Dict[str, Any] = {}
+    async for event in stream_effort_batch(lines, customer):
+        if event["type"] == "line":
+            results.append(event)
+        elif event["type"] == "summary":
+            summary = event
+    results.sort(key=lambda event: event["index"])
+    return {"results": results, "summary": summary}
@@ -7,26 +7,71 @@ import os
 import json
 import logging
 import shutil
+import functools
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Any, Tuple, FrozenSet
+from dataclasses import dataclass, asdict, fields
 from ..utils.config import DOCS_DIR
+from ..utils.shared_state import get_lock, get_version, bump_version, atomic_write_json, file_stamp
+from ..data import effort_text_store
 
 logger = logging.getLogger(__name__)
 
+# 공수 산정 데이터 공유 버전 이름 (워커 간 변경 알림)
+ESTIMATIONS_VERSION_KEY = "effort_estimations"
+
 class CategoryManager:
-    """카테고리 관리 클래스"""
+    """카테고리 관리 클래스
+    
+    트리(dict) 외에 유효한 (대, 중, 소) 조합 frozenset과 조합별 정수 ID를 함께 유지
+    - 검증은 set 조회 1회 (O(1))
+    - 파일이 바뀌면(다른 워커/엑셀 업로드) 다음 조회 시 다시 로드
+    공유 인스턴스는 get_category_manager() 사용
+    """
     
     def __init__(self):
         self.categories_file = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'docs', 'categories.json')
+        self.valid_triples: FrozenSet[Tuple[str, str, str]] = frozenset()
+        self.category_ids: Dict[Tuple[str, str, str], int] = {}
+        self._file_stamp = None
+        self._write_lock = get_lock("categories")
         self.categories = self.load_categories()
+        self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """유효 조합 집합 / 조합별 ID 재계산 (트리 순서대로 0부터)"""
+        triples = [
+            (major, minor, sub)
+            for major, minors in self.categories.items() if isinstance(minors, dict)
+            for minor, subs in minors.items() if isinstance(subs, list)
+            for sub in subs
+        ]
+        self.category_ids = {}
+        for triple in triples:
+            self.category_ids.setdefault(triple, len(self.category_ids))
+        self.valid_triples = frozenset(self.category_ids)
+    
+    def reload_if_changed(self) -> bool:
+        """파일이 바뀌었으면 다시 로드 (stat 1회)"""
+        stamp = file_stamp(self.categories_file)
+        if stamp is None or stamp == self._file_stamp:
+            return False
+        self.categories = self.load_categories()
+        self._rebuild_index()
+        logger.info(f"🔄 카테고리 다시 로드: {len(self.valid_triples)}개 조합")
+        return True
     
     def load_categories(self) -> dict:
         """JSON 파일에서 카테고리 로드"""
         try:
             if os.path.exists(self.categories_file):
+                stamp = file_stamp(self.categories_file)
                 with open(self.categories_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                    categories = json.load(f)
+                self._file_stamp = stamp
+                return categories
             else:
                 # 기본 카테고리 생성
                 default_categories = {
@@ -68,60 +113,62 @@ class CategoryManager:
             if categories is None:
                 categories = self.categories
             
-            with open(self.categories_file, "w", encoding="utf-8") as f:
-                json.dump(categories, f, ensure_ascii=False, indent=2)
+            with self._write_lock:
+                atomic_write_json(self.categories_file, categories, indent=2)
+                self._file_stamp = file_stamp(self.categories_file)
+            if categories is self.categories:
+                self._rebuild_index()
             logger.info(f"✅ 카테고리 저장 완료: {self.categories_file}")
         except Exception as e:
             logger.error(f"❌ 카테고리 저장 실패: {str(e)}")
     
     def get_categories(self) -> dict:
         """전체 카테고리 구조 반환"""
+        self.reload_if_changed()
         return self.categories
     
     def get_major_categories(self) -> List[str]:
         """대분류 목록 반환"""
+        self.reload_if_changed()
         return list(self.categories.keys())
     
     def get_minor_categories(self, major: str) -> List[str]:
         """특정 대분류의 중분류 목록 반환"""
+        self.reload_if_changed()
         return list(self.categories.get(major, {}).keys())
     
     def get_sub_categories(self, major: str, minor: str) -> List[str]:
         """특정 중분류의 소분류 목록 반환"""
+        self.reload_if_changed()
         return self.categories.get(major, {}).get(minor, [])
     
+    def get_category_id(self, major: str, minor: str, sub: str) -> Optional[int]:
+        """(대, 중, 소) 조합의 정수 ID (없으면 None)"""
+        self.reload_if_changed()
+        return self.category_ids.get((major, minor, sub))
+    
     def add_category(self, major: str, minor: str, sub: str):
         """새 카테고리 추가"""
-        if major not in self.categories:
-            self.categories[major] = {}
-        if minor not in self.categories[major]:
-            self.categories[major][minor] = []
-        if sub not in self.categories[major][minor]:
-            self.categories[major][minor].append(sub)
-        
-        # JSON 파일에 저장
-        self.save_categories()
+        with self._write_lock:
+            self.reload_if_changed()
+            if (major, minor, sub) in self.valid_triples:
+                return
+            self.categories.setdefault(major, {}).setdefault(minor, []).append(sub)
+            
+            # JSON 파일에 저장
+            self.save_categories()
     
     def update_category(self, old_major: str, old_minor: str, old_sub: str, 
                        new_major: str, new_minor: str, new_sub: str):
         """카테고리 수정"""
-        # 기존 카테고리 삭제
-        if self.validate_category(old_major, old_minor, old_sub):
-            self.categories[old_major][old_minor].remove(old_sub)
+        with self._write_lock:
+            self._remove_category(old_major, old_minor, old_sub)
             
-            # 중분류가 비어있으면 삭제
-            if not self.categories[old_major][old_minor]:
-                del self.categories[old_major][old_minor]
-                
-            # 대분류가 비어있으면 삭제
-            if not self.categories[old_major]:
-                del self.categories[old_major]
-        
-        # 새 카테고리 추가
-        self.add_category(new_major, new_minor, new_sub)
+            # 새 카테고리 추가
+            self.add_category(new_major, new_minor, new_sub)
     
-    def delete_category(self, major: str, minor: str, sub: str):
-        """카테고리 삭제"""
+    def _remove_category(self, major: str, minor: str, sub: str) -> bool:
+        """트리에서 카테고리 제거 (빈 중분류/대분류 정리, 저장은 호출자가)"""
         if self.validate_category(major, minor, sub):
             self.categories[major][minor].remove(sub)
             
@@ -132,23 +179,59 @@ class CategoryManager:
             # 대분류가 비어있으면 삭제
             if not self.categories[major]:
                 del self.categories[major]
-            
-            # JSON 파일에 저장
+            self._rebuild_index()
+            return True
+        return False
+    
+    def delete_category(self, major: str, minor: str, sub: str):
+        """카테고리 삭제"""
+        with self._write_lock:
+            if self._remove_category(major, minor, sub):
+                # JSON 파일에 저장
+                self.save_categories()
+    
+    def replace_categories(self, categories: dict, backup: bool = True):
+        """카테고리 트리 전체 교체 (엑셀 가져오기, 기존 파일은 .backup으로 보관)"""
+        with self._write_lock:
+            if backup and os.path.exists(self.categories_file):
+                shutil.copy2(self.categories_file, f"{self.categories_file}.backup")
+            self.categories = categories
             self.save_categories()
     
     def validate_category(self, major: str, minor: str, sub: str) -> bool:
-        """카테고리 유효성 검증"""
-        if major not in self.categories:
-            return False
-        if minor not in self.categories[major]:
-            return False
-        if sub not in self.categories[major][minor]:
-            return False
-        return True
+        """카테고리 유효성 검증 (유효 조합 set 조회)"""
+        self.reload_if_changed()
+        return (major, minor, sub) in self.valid_triples
+
+_category_manager: Optional[CategoryManager] = None
+_category_manager_lock = threading.Lock()
+
+def get_category_manager() -> CategoryManager:
+    """공유 CategoryManager (최초 1회 생성, 이후 파일 변경 시 자동 다시 로드)"""
+    global _category_manager
+    if _category_manager is None:
+        with _category_manager_lock:
+            if _category_manager is None:
+                _category_manager = CategoryManager()
+    return _category_manager
 
+def _with_slots(cls):
+    """dataclass(slots=True) 대체 (Python 3.9 호환): 필드 이름을 __slots__로 둔 클래스로 다시 생성"""
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+@_with_slots
 @dataclass
 class EffortEstimation:
-    """공수 산정 데이터 모델 (Story Point 기반)"""
+    """공수 산정 데이터 모델 (Story Point 기반)
+
+    __slots__ 사용으로 인스턴스별 __dict__ 제거
+    매니저에 로드된 뒤 description/comments는 텍스트 저장소로 옮겨지고 None으로 비워짐
+    (조회: effort_manager.get_estimation_texts)
+    """
     jira_ticket: str  # Jira 티켓 (ENOMIX-XXX)
     title: str  # 제목
     story_points: float  # Story Point (M/D 단위로 통일)
@@ -175,14 +258,62 @@ class EffortEstimation:
         if self.created_date is None:
             self.created_date = datetime.now().isoformat()
 
+def _single_writer(method):
+    """쓰기 메서드 데코레이터: 워커 간 쓰기 잠금을 잡고 최신 데이터로 갱신한 뒤 실행"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.write_lock():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class EffortEstimationManager:
-    """공수 산정 데이터 관리 클래스"""
+    """공수 산정 데이터 관리 클래스
+    
+    여러 uvicorn 워커가 같은 파일을 공유하므로
+    - 쓰기는 프로세스 간 잠금 안에서 최신 파일을 다시 읽은 뒤 수행 (단일 작성자)
+    - 저장 후 공유 버전을 올리고, 다른 워커는 조회 시 버전을 비교해 다시 로드
+    """
     
     def __init__(self):
         self.data_file = os.path.join(DOCS_DIR, "effort_estimations.json")
         self.estimations: List[EffortEstimation] = []
+        # 데이터 변경 시 증가하는 버전 (조회 인덱스 등 파생 캐시 무효화용, 프로세스 내부)
+        self.data_version = 0
+        # description/comments가 텍스트 저장소로 옮겨진 티켓
+        self._offloaded_tickets = set()
+        # 워커 간 쓰기 잠금 / 마지막으로 반영한 공유 버전
+        self._write_lock = get_lock(ESTIMATIONS_VERSION_KEY)
+        self._shared_version = get_version(ESTIMATIONS_VERSION_KEY)
         self.load_data()
     
+    def refresh(self) -> bool:
+        """다른 워커가 데이터를 변경했으면 파일에서 다시 로드
+        
+        Returns:
+            bool: 다시 로드했으면 True
+        """
+        try:
+            if get_version(ESTIMATIONS_VERSION_KEY) == self._shared_version:
+                return False
+            with self._write_lock:
+                version = get_version(ESTIMATIONS_VERSION_KEY)
+                if version == self._shared_version:
+                    return False
+                logger.info(f"🔄 다른 워커의 공수 산정 데이터 변경 감지 (버전 {self._shared_version} → {version}), 다시 로드")
+                self._shared_version = version
+                self.load_data()
+                return True
+        except Exception as e:
+            logger.warning(f"⚠️ 공유 버전 확인 실패: {e}")
+            return False
+    
+    @contextmanager
+    def write_lock(self):
+        """단일 작성자 구간 (잠금 → 최신 데이터 반영 → 변경 후 save_data 호출)"""
+        with self._write_lock:
+            self.refresh()
+            yield self
+    
     def load_data(self):
         """저장된 공수 산정 데이터 로드"""
         try:
@@ -217,6 +348,9 @@ class EffortEstimationManager:
                         continue
                 
                 self.estimations = [EffortEstimation(**item) for item in migrated_data]
+                self.data_version += 1
+                self._offloaded_tickets = set()
+                self._offload_texts(self._file_stamp())
                 logger.info(f"✅ 공수 산정 데이터 로드 완료: {len(self.estimations)}개")
                 
                 # 마이그레이션이 있었다면 저장
@@ -230,6 +364,83 @@ class EffortEstimationManager:
             logger.error(f"❌ 공수 산정 데이터 로드 실패: {str(e)}")
             self.estimations = []
     
+    def _file_stamp(self) -> Optional[str]:
+        """데이터 파일 스탬프 (inode + 수정 시각 + 크기)"""
+        return file_stamp(self.data_file)
+    
+    def _offload_texts(self, stamp: Optional[str] = None):
+        """메모리에 남아 있는 description/comments를 텍스트 저장소로 옮기고 비움
+        
+        Args:
+            stamp: 로드한 파일 스탬프 (저장소에 기록된 스탬프와 같으면 이미 동기화된 것으로 보고 재기록 생략)
+        """
+        try:
+            already_synced = stamp is not None and effort_text_store.get_stamp() == stamp
+            rows = []
+            for est in self.estimations:
+                if not est.jira_ticket or est.jira_ticket in self._offloaded_tickets:
+                    continue
+                rows.append((est.jira_ticket, est.description, est.comments))
+            
+            if rows and not already_synced:
+                effort_text_store.put_texts(rows, stamp)
+                logger.info(f"📦 긴 텍스트 저장소 동기화: {len(rows)}개")
+            
+            for est in self.estimations:
+                if est.jira_ticket:
+                    est.description = None
+                    est.comments = None
+                    self._offloaded_tickets.add(est.jira_ticket)
+        except Exception as e:
+            # 저장소를 쓸 수 없으면 텍스트를 메모리에 유지 (기능 동작 우선)
+            logger.warning(f"⚠️ 긴 텍스트 저장소 동기화 실패, 메모리에 유지: {e}")
+    
+    def get_estimation_texts(self, estimation: EffortEstimation) -> tuple:
+        """공수 산정 데이터의 (description, comments) 조회 (메모리에 없으면 텍스트 저장소에서 로드)
+        
+        건별 조회용 (검색 결과 등), 전체 저장/색인 포맷팅은 effort_text_store.get_all_texts로 한 번에 조회
+        """
+        if estimation.jira_ticket in self._offloaded_tickets:
+            return effort_text_store.get_texts(estimation.jira_ticket)
+        return estimation.description, estimation.comments
+    
+    def memory_report(self) -> Dict[str, Any]:
+        """워커 프로세스 메모리 사용 리포트"""
+        import sys
+        import resource
+        
+        rss_kb = None
+        try:
+            with open("/proc/self/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        rss_kb = int(line.split()[1])
+                        break
+        except OSError:
+            pass
+        
+        record_bytes = 0
+        resident_text_bytes = 0
+        for est in self.estimations:
+            record_bytes += sys.getsizeof(est)
+            for name in EffortEstimation.__slots__:
+                value = getattr(est, name)
+                if value is not None:
+                    record_bytes += sys.getsizeof(value)
+            resident_text_bytes += sys.getsizeof(est.description or "") + sys.getsizeof(est.comments or "")
+        
+        return {
+            "pid": os.getpid(),
+            "rss_kb": rss_kb,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "estimation_count": len(self.estimations),
+            "record_bytes": record_bytes,
+            "avg_record_bytes": round(record_bytes / len(self.estimations), 1) if self.estimations else 0,
+            "resident_text_bytes": resident_text_bytes,
+            "offloaded_ticket_count": len(self._offloaded_tickets),
+            "text_store_bytes": effort_text_store.get_store_size(),
+        }
+    
     def backup_data(self):
         """데이터 파일 백업 (최신 1개만 유지)"""
         try:
@@ -260,16 +471,39 @@ class EffortEstimationManager:
     
     def save_data(self):
         """공수 산정 데이터 저장"""
+        # 메모리 데이터가 변경된 뒤 호출되므로 파일 저장 성공 여부와 무관하게 버전 증가
+        self.data_version += 1
         try:
             logger.info(f"💾 데이터 저장 시작: {len(self.estimations)}개 항목")
-            data = [asdict(estimation) for estimation in self.estimations]
+            # 새로 들어온 긴 텍스트를 저장소로 옮긴 뒤, 파일에는 저장소 텍스트를 합쳐서 기록
+            self._offload_texts()
+            texts = effort_text_store.get_all_texts() if self._offloaded_tickets else {}
+            data = []
+            for estimation in self.estimations:
+                item = asdict(estimation)
+                if estimation.jira_ticket in self._offloaded_tickets:
+                    item["description"], item["comments"] = texts.get(estimation.jira_ticket, (None, None))
+                data.append(item)
             
             # 파일 경로 확인
             logger.info(f"📁 저장 경로: {self.data_file}")
             
-            # 파일 쓰기
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with self._write_lock:
+                if get_version(ESTIMATIONS_VERSION_KEY) != self._shared_version:
+                    # write_lock() 밖에서 변경한 경우: 다른 워커의 최신 변경을 덮어씀
+                    logger.warning("⚠️ 다른 워커가 먼저 저장한 데이터를 덮어씁니다 (write_lock() 사용 권장)")
+                
+                # 파일 쓰기 (임시 파일 + 교체, 다른 워커가 쓰는 중인 파일을 읽지 않도록)
+                atomic_write_json(self.data_file, data, indent=2)
+                
+                # 저장소가 이 파일 내용과 동기화되었음을 기록 (다른 워커 재로드 시 재기록 생략)
+                try:
+                    effort_text_store.set_stamp(self._file_stamp())
+                except Exception as stamp_error:
+                    logger.warning(f"⚠️ 긴 텍스트 저장소 스탬프 기록 실패: {stamp_error}")
+                
+                # 다른 워커에 변경 알림
+                self._shared_version = bump_version(ESTIMATIONS_VERSION_KEY)
             
             # 저장 후 파일 크기 확인
             file_size = os.path.getsize(self.data_file)
@@ -283,6 +517,7 @@ class EffortEstimationManager:
             logger.error(f"❌ 상세 에러: {traceback.format_exc()}")
             return False
     
+    @_single_writer
     def add_estimation(self, estimation: EffortEstimation) -> bool:
         """새로운 공수 산정 데이터 추가 (중복 체크 및 업데이트)"""
         try:
@@ -352,6 +587,8 @@ class EffortEstimationManager:
                     # 새 데이터 추가
                     logger.info(f"➕ 새 데이터 추가: {estimation.jira_ticket}")
                     self.estimations.append(estimation)
+                # 새 객체의 description/comments가 기준이므로 저장 시 텍스트 저장소에 다시 기록
+                self._offloaded_tickets.discard(estimation.jira_ticket)
             else:
                 # Jira 티켓이 없는 경우 그냥 추가
                 logger.info(f"➕ Jira 티켓 없는 데이터 추가")
@@ -373,14 +610,20 @@ class EffortEstimationManager:
         ]
     
     def get_all_estimations(self) -> List[EffortEstimation]:
-        """모든 공수 산정 데이터 반환"""
+        """모든 공수 산정 데이터 반환 (다른 워커 변경 시 다시 로드)"""
+        self.refresh()
         return self.estimations
     
     def format_for_indexing(self) -> str:
         """색인을 위한 텍스트 포맷팅"""
         formatted_data = []
+        texts = effort_text_store.get_all_texts() if self._offloaded_tickets else {}
         
         for est in self.estimations:
+            if est.jira_ticket in self._offloaded_tickets:
+                description, comments = texts.get(est.jira_ticket, (None, None))
+            else:
+                description, comments = est.description, est.comments
             # 기본 정보
             info = f"Jira 티켓: {est.jira_ticket}\n"
             info += f"제목: {est.title}\n"
@@ -408,11 +651,11 @@ class EffortEstimationManager:
             if est.team_member:
                 info += f"담당자: {est.team_member}\n"
             
-            if est.description:
-                info += f"설명: {est.description}\n"
+            if description:
+                info += f"설명: {description}\n"
             
-            if est.comments:
-                info += f"댓글: {est.comments}\n"
+            if comments:
+                info += f"댓글: {comments}\n"
             
             if est.notes:
                 info += f"비고: {est.notes}\n"
@@ -424,6 +667,7 @@ class EffortEstimationManager:
         
         return "\n".join(formatted_data)
     
+    @_single_writer
     def update_estimation_category(self, jira_ticket: str, major_category: str, minor_category: str, sub_category: str) -> bool:
         """공수 산정 데이터의 카테고리 수정"""
         try:
@@ -445,6 +689,40 @@ class EffortEstimationManager:
             logger.error(f"❌ 카테고리 수정 실패: {str(e)}")
             return False
 
+    @_single_writer
+    def update_estimation_categories(self, updates: List[tuple]) -> int:
+        """여러 공수 산정 데이터의 카테고리를 한 번에 수정 (저장 1회)
+        
+        Args:
+            updates: (estimation, major, minor, sub) 목록
+                     잠금 중 다시 로드되었을 수 있으므로 Jira 티켓으로 현재 객체를 찾아 적용
+        
+        Returns:
+            int: 수정된 데이터 수
+        """
+        try:
+            by_ticket = {est.jira_ticket: est for est in self.estimations if est.jira_ticket}
+            current_ids = {id(est) for est in self.estimations}
+            updated_count = 0
+            for estimation, major_category, minor_category, sub_category in updates:
+                target = by_ticket.get(estimation.jira_ticket) if estimation.jira_ticket else \
+                    (estimation if id(estimation) in current_ids else None)
+                if target is None:
+                    continue
+                target.major_category = major_category
+                target.minor_category = minor_category
+                target.sub_category = sub_category
+                updated_count += 1
+            
+            if updated_count:
+                self.save_data()
+                logger.info(f"✅ 카테고리 일괄 수정 완료: {updated_count}개")
+            return updated_count
+        except Exception as e:
+            logger.error(f"❌ 카테고리 일괄 수정 실패: {str(e)}")
+            return 0
+
+    @_single_writer
     def update_estimation_epic(self, jira_ticket: str, epic_key: str, epic_name: str) -> bool:
         """공수 산정 데이터의 Epic 정보 수정"""
         try:
@@ -468,6 +746,7 @@ class EffortEstimationManager:
     def get_estimation_by_ticket(self, jira_ticket: str) -> Optional[EffortEstimation]:
         """Jira 티켓으로 공수 산정 데이터 조회"""
         try:
+            self.refresh()
             for estimation in self.estimations:
                 if estimation.jira_ticket == jira_ticket:
                     return estimation
@@ -476,6 +755,7 @@ class EffortEstimationManager:
             logger.error(f"❌ 공수 산정 데이터 조회 실패: {str(e)}")
             return None
 
+    @_single_writer
     def delete_estimation(self, jira_ticket: str) -> bool:
         """공수 산정 데이터 삭제"""
         try:
@@ -483,6 +763,9 @@ class EffortEstimationManager:
             self.estimations = [est for est in self.estimations if est.jira_ticket != jira_ticket]
             
             if len(self.estimations) < original_count:
+                if jira_ticket in self._offloaded_tickets:
+                    self._offloaded_tickets.discard(jira_ticket)
+                    effort_text_store.delete_texts(jira_ticket)
                 # 데이터 저장
                 self.save_data()
                 logger.info(f"✅ 공수 산정 데이터 삭제 완료: {jira_ticket}")
@@ -0,0 +1,202 @@
+"""
+공수 통계 추정 모듈
+유사 작업(검색 결과 / 제목 검색 결과)의 Story Points로 예상 공수를 계산 (LLM 계산 없이 NumPy로 재현 가능한 값)
+- 가중 중앙값 / p25~p75 범위 (검색 순위가 높을수록 가중치 큼)
+- IQR 1.5배 밖의 값은 이상치로 표시하고 통계에서 제외 (표본이 적으면 제외하지 않음)
+- 고객사가 주어지면 analyze_customer_risk의 버퍼 비율을 적용한 값도 함께 계산
+"""
+
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .effort_query import get_query_index, normalize_title
+
+logger = logging.getLogger(__name__)
+
+# 이상치 판정 (IQR 배수) / 이상치 판정에 필요한 최소 표본 수
+OUTLIER_IQR_MULTIPLIER = 1.5
+MIN_SAMPLES_FOR_OUTLIERS = 4
+# 추정에 사용할 기본 유사 작업 수
+DEFAULT_SAMPLE_SIZE = 12
+
+
+def _to_points(value: Any) -> Optional[float]:
+    """Story Points 값 변환 (없거나 0 이하/숫자가 아니면 None)"""
+    try:
+        points = float(value)
+    except (TypeError, ValueError):
+        return None
+    return points if points > 0 and not math.isnan(points) else None
+
+
+def weighted_quantiles(values: np.ndarray, weights: np.ndarray, quantiles: List[float]) -> List[float]:
+    """가중 분위수 (누적 가중치 중점 기준 선형 보간, 가중치가 모두 같으면 일반 중앙값과 같음)"""
+    order = np.argsort(values, kind="stable")
+    values, weights = values[order], weights[order]
+    positions = (np.cumsum(weights) - 0.5 * weights) / weights.sum()
+    return [float(np.interp(q, positions, values)) for q in quantiles]
+
+
+def estimate_from_samples(samples: List[Dict[str, Any]], buffer_percent: float = 0) -> Dict[str, Any]:
+    """유사 작업 목록으로 공수 통계 계산
+
+    Args:
+        samples: [{"jira_ticket", "title", "story_points"}] (관련도 순, 앞일수록 가중치 큼)
+        buffer_percent: 고객사 버퍼 비율 (%)
+
+    Returns:
+        dict: {"count", "used_count", "median", "p25", "p75", "min", "max", "mean",
+               "outliers", "samples", "buffer_percent", "buffered"} (유효 표본이 없으면 count=0)
+    """
+    rows, points = [], []
+    seen = set()
+    for sample in samples:
+        value = _to_points(sample.get("story_points"))
+        ticket = sample.get("jira_ticket") or ""
+        if value is None or (ticket and ticket in seen):
+            continue
+        seen.add(ticket)
+        rows.append(sample)
+        points.append(value)
+
+    result: Dict[str, Any] = {"count": len(points), "used_count": 0, "outliers": [], "samples": [],
+                              "buffer_percent": buffer_percent, "buffered": None}
+    if not points:
+        return result
+
+    values = np.asarray(points, dtype=np.float64)
+    # 순위 가중치: 1/√(순위), 1위 1.0 → 4위 0.5
+    weights = 1.0 / np.sqrt(np.arange(1, len(values) + 1, dtype=np.float64))
+
+    inliers = np.ones(len(values), dtype=bool)
+    if len(values) >= MIN_SAMPLES_FOR_OUTLIERS:
+        q1, q3 = np.percentile(values, [25, 75])
+        spread = OUTLIER_IQR_MULTIPLIER * (q3 - q1)
+        inliers = (values >= q1 - spread) & (values <= q3 + spread)
+
+    used_values, used_weights = values[inliers], weights[inliers]
+    p25, median, p75 = weighted_quantiles(used_values, used_weights, [0.25, 0.5, 0.75])
+    result.update(
+        used_count=int(inliers.sum()),
+        median=round(median, 2),
+        p25=round(p25, 2),
+        p75=round(p75, 2),
+        min=round(float(used_values.min()), 2),
+        max=round(float(used_values.max()), 2),
+        mean=round(float(np.average(used_values, weights=used_weights)), 2),
+    )
+    for i, row in enumerate(rows):
+        entry = {
+            "jira_ticket": row.get("jira_ticket", ""),
+            "title": row.get("title", ""),
+            "story_points": float(values[i]),
+            "weight": round(float(weights[i]), 3),
+            "outlier": not bool(inliers[i]),
+        }
+        result["samples"].append(entry)
+        if entry["outlier"]:
+            result["outliers"].append(entry)
+
+    if buffer_percent:
+        factor = 1 + buffer_percent / 100
+        result["buffered"] = {key: round(result[key] * factor, 2) for key in ("median", "p25", "p75")}
+    return result
+
+
+def samples_from_documents(documents) -> List[Dict[str, Any]]:
+    """검색 문서(공수 티켓)의 메타데이터를 추정용 표본으로 변환 (공수 데이터가 아닌 문서는 제외)"""
+    return [
+        {"jira_ticket": doc.metadata.get("jira_ticket", ""), "title": doc.metadata.get("title", ""),
+         "story_points": doc.metadata.get("story_points")}
+        for doc in documents if doc.metadata.get("jira_ticket")
+    ]
+
+
+def format_estimate_block(estimate: Dict[str, Any]) -> str:
+    """답변에 붙일 공수 통계 블록 (유효 표본이 없으면 빈 문자열)"""
+    if not estimate.get("used_count"):
+        return ""
+    lines = [f"📊 유사 작업 공수 통계 (유사 작업 {estimate['count']}건 기준, 자동 계산)"]
+    lines.append(f"   • 예상공수(가중 중앙값): {estimate['median']}일")
+    lines.append(f"   • 일반 범위(p25~p75): {estimate['p25']}~{estimate['p75']}일")
+    lines.append(f"   • 전체 범위: {estimate['min']}~{estimate['max']}일 ({estimate['used_count']}건)")
+    if estimate["outliers"]:
+        outliers = ", ".join(f"{o['jira_ticket']} ({o['story_points']}일)" for o in estimate["outliers"])
+        lines.append(f"   ⚠️ 이상치 제외: {outliers}")
+    if estimate.get("buffered"):
+        buffered = estimate["buffered"]
+        lines.append(f"   🏢 고객사 버퍼 +{estimate['buffer_percent']}% 적용: "
+                     f"{buffered['median']}일 (범위 {buffered['p25']}~{buffered['p75']}일)")
+    return "\n".join(lines)
+
+
+def _customer_buffer(customer: Optional[str]) -> Dict[str, Any]:
+    """고객사 버퍼 비율 / 리스크 (고객사 정보가 없으면 0%)"""
+    if not customer:
+        return {"customer": None, "buffer_percent": 0, "risks": []}
+    from .effort_qa import analyze_customer_risk
+    risk = analyze_customer_risk(customer, 0)
+    return {"customer": customer if risk["customer_data"] else None,
+            "buffer_percent": risk["buffer_percent"], "risks": risk["risks"]}
+
+
+def _bigram_similarity(a: str, b: str) -> float:
+    grams_a = {a[i:i + 2] for i in range(len(a) - 1)} or {a}
+    grams_b = {b[i:i + 2] for i in range(len(b) - 1)} or {b}
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def rank_title_matches(query: str, rows: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    """제목 검색 결과를 관련도 순으로 상위 k개 (제목 완전 일치 → 제목 바이그램 유사도 순, 동률은 기존 순서)"""
+    normalized_query = normalize_title(query)
+
+    def score(row: Dict[str, Any]) -> float:
+        title = normalize_title(row.get("title"))
+        return 2.0 if title == normalized_query else _bigram_similarity(normalized_query, title)
+
+    return sorted(rows, key=score, reverse=True)[:k]
+
+
+def estimate_effort(query: str, customer: Optional[str] = None, k: int = DEFAULT_SAMPLE_SIZE,
+                    use_vector_search: bool = True) -> Dict[str, Any]:
+    """기능 설명으로 예상 공수 추정 (제목 검색 결과 우선, 부족하면 벡터 검색 결과로 채움)
+
+    Args:
+        query: 기능명 또는 기능 설명
+        customer: 고객사명 (customer_weights.json 기준 버퍼 적용)
+        k: 사용할 유사 작업 수
+        use_vector_search: 제목 검색 결과가 k건 미만이면 MMR 검색으로 보충
+
+    Returns:
+        dict: estimate_from_samples 결과 + {"query", "customer", "risks", "sources"}
+    """
+    try:
+        index = get_query_index()
+        # 제목 검색 결과는 등록 순서이므로 전부 받아 관련도 순으로 정렬한 뒤 상위 k개 사용 (순위 가중치와 일치)
+        matches = index.query(search=query, page_size=max(1, len(index.rows)))["estimations"] if query.strip() else []
+        samples = rank_title_matches(query, matches, k)
+        sources = {"lexical": len(samples), "vector": 0}
+
+        if use_vector_search and len(samples) < k:
+            from ..data.database import get_vectordb
+            from .effort_retrieval import mmr_search
+            vectordb = get_vectordb()
+            if vectordb._collection.count() > 0:
+                known = {sample["jira_ticket"] for sample in samples}
+                vector_samples = [s for s in samples_from_documents(mmr_search(vectordb, query, k=k))
+                                  if s["jira_ticket"] not in known]
+                samples += vector_samples[:k - len(samples)]
+                sources["vector"] = min(len(vector_samples), k - sources["lexical"])
+
+        buffer = _customer_buffer(customer)
+        estimate = estimate_from_samples(samples, buffer["buffer_percent"])
+        estimate.update(query=query, customer=buffer["customer"], risks=buffer["risks"], sources=sources)
+        logger.info(f"📊 공수 추정: '{query}' → 중앙값 {estimate.get('median')}일 "
+                    f"({estimate['used_count']}/{estimate['count']}건, 제목 {sources['lexical']} + 검색 {sources['vector']})")
+        return estimate
+    except Exception as e:
+        logger.error(f"❌ 공수 추정 오류: {str(e)}")
+        return {"query": query, "error": f"공수 추정 중 오류가 발생했습니다: {str(e)}"}
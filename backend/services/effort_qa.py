@@ -10,13 +10,19 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 import logging
 import json
 import re
+import time
 from typing import List, Dict, Any, Optional
 from langchain_classic.chains import RetrievalQA
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
-from ..data.database import get_vectordb, search_positive_feedback
+from ..data.database import get_vectordb, search_positive_feedback, prefetch_query_embeddings
 from ..utils.config import DOCS_DIR
+from ..utils.shared_state import file_stamp
 from .effort_estimation import effort_manager
+from .effort_query import get_query_index
+from .effort_retrieval import EffortMMRRetriever
+from .effort_estimator import estimate_from_samples, format_estimate_block, samples_from_documents
+from .context_packer import count_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +32,32 @@ JIRA_BASE_URL = "https://enomix.atlassian.net/browse"
 # 고객사 가중치 데이터 로드
 CUSTOMER_WEIGHTS_FILE = os.path.join(DOCS_DIR, "customer_weights.json")
 _customer_weights_cache = None
+_customer_weights_stamp = None  # 캐시한 파일 스탬프 (다른 워커/배포로 파일이 바뀌면 다시 로드)
 _difficulty_range_cache = None  # 난이도 범위 캐시 (min, max)
 
+# 정확 조회 빠른 경로 (티켓 번호 / 제목 완전 일치 질문은 LLM 없이 공수 데이터로 바로 답변)
+TICKET_KEY_PATTERN = re.compile(r"(?<![A-Za-z0-9])([A-Za-z][A-Za-z0-9]*-\d+)(?!\d)")
+# 티켓 번호 외에 이 단어들만 있으면 정확 조회 질문으로 판단 (그 밖의 단어가 있으면 LLM 검색)
+FAST_PATH_FILLER_WORDS = {
+    "공수", "산정", "산정이유", "story", "points", "point", "sp", "예상", "예상공수", "티켓", "기간", "며칠", "몇일",
+    "얼마", "얼마야", "얼마예요", "얼마에요", "얼마인가요", "얼마나", "알려줘", "알려주세요", "좀", "및", "그리고",
+}
+_FAST_PATH_PARTICLES = "은는이가의와과랑을를도"
+FAST_PATH_MAX_ANSWERS = 5
+
 def load_customer_weights() -> Dict[str, Any]:
-    """고객사 가중치 데이터 로드 (캐싱)"""
-    global _customer_weights_cache, _difficulty_range_cache
+    """고객사 가중치 데이터 로드 (캐싱, 파일 변경 시 다시 로드)"""
+    global _customer_weights_cache, _customer_weights_stamp, _difficulty_range_cache
     
-    if _customer_weights_cache is not None:
+    stamp = file_stamp(CUSTOMER_WEIGHTS_FILE)
+    if _customer_weights_cache is not None and stamp == _customer_weights_stamp:
         return _customer_weights_cache
     
     try:
         if os.path.exists(CUSTOMER_WEIGHTS_FILE):
             with open(CUSTOMER_WEIGHTS_FILE, 'r', encoding='utf-8') as f:
                 _customer_weights_cache = json.load(f)
+                _customer_weights_stamp = stamp
                 logger.info(f"✅ 고객사 가중치 데이터 로드 완료: {len(_customer_weights_cache)}개")
                 
                 # 난이도 범위 계산 (캐싱)
@@ -254,7 +273,7 @@ def aggregate_epic_story_points(epic_keyword: str) -> dict:
         # Epic 키워드를 토큰화 (공백 기준 분리)
         keyword_tokens = epic_keyword_lower.split()
         
-        for estimation in effort_manager.estimations:
+        for estimation in effort_manager.get_all_estimations():
             # Epic 키워드가 epic_key, epic_name, 또는 title에 포함되어 있는지 확인
             is_match = False
             matched_field = ""
@@ -328,11 +347,126 @@ def aggregate_epic_story_points(epic_keyword: str) -> dict:
         logger.error(f"❌ Epic 집계 오류: {str(e)}")
         return None
 
+def _append_effort_estimate(question: str, answer: str, source_docs: list) -> tuple:
+    """검색된 공수 티켓으로 계산한 통계 블록을 답변 뒤에 추가 (LLM이 범위를 계산하지 않도록)
+
+    source_docs는 컨텍스트 압축 전 MMR 결과 (압축 결과를 쓰면 CONTEXT_TOKEN_BUDGET에 따라 표본이 달라짐)
+
+    Returns:
+        tuple: (답변, 통계 dict 또는 None)
+    """
+    try:
+        samples = samples_from_documents(source_docs)
+        if not answer or not samples or "등록되어 있지 않습니다" in answer or "찾을 수 없습니다" in answer:
+            return answer, None
+        customer_name = extract_customer_name(question)
+        buffer_percent = analyze_customer_risk(customer_name, 0)["buffer_percent"] if customer_name else 0
+        estimate = estimate_from_samples(samples, buffer_percent)
+        block = format_estimate_block(estimate)
+        return (f"{answer}\n\n{block}" if block else answer), estimate
+    except Exception as e:
+        logger.warning(f"⚠️ 공수 통계 계산 실패: {str(e)}")
+        return answer, None
+
+def _context_token_report(retriever: EffortMMRRetriever, prompt_template: PromptTemplate) -> Dict[str, Any]:
+    """마지막 QA 체인 실행의 프롬프트 토큰 사용량 (고정 지시문 + 압축된 검색 문서)"""
+    report = dict(retriever.last_context_stats or {})
+    report["instruction_tokens"] = count_tokens(prompt_template.template)
+    report["prompt_tokens"] = report["instruction_tokens"] + report.get("context_tokens", 0)
+    logger.info(f"🧮 프롬프트 토큰: 지시문 {report['instruction_tokens']} + 컨텍스트 {report.get('context_tokens', 0)} "
+                f"= {report['prompt_tokens']} (압축 전 컨텍스트 {report.get('input_tokens', 0)})")
+    return report
+
+def _is_filler_token(token: str) -> bool:
+    token = token.lower()
+    return (not token or token in FAST_PATH_FILLER_WORDS or token in _FAST_PATH_PARTICLES
+            or (token[-1] in _FAST_PATH_PARTICLES and token[:-1] in FAST_PATH_FILLER_WORDS))
+
+
+def _match_structured_question(question: str, index) -> List[Dict[str, Any]]:
+    """티켓 번호 / 제목 완전 일치 질문이면 해당 공수 데이터 목록 (애매한 질문이면 빈 목록)"""
+    tickets = TICKET_KEY_PATTERN.findall(question)
+    if tickets:
+        remainder = TICKET_KEY_PATTERN.sub(" ", question)
+        if not all(_is_filler_token(token) for token in re.split(r"[\s,?？.!/]+", remainder)):
+            return []
+        rows = [index.find_by_ticket(ticket) for ticket in dict.fromkeys(t.upper() for t in tickets)]
+        # 하나라도 없는 티켓이면 LLM 검색으로 (부분 답변 방지)
+        return rows if all(rows) else []
+
+    # 제목 완전 일치: 질문 전체 → 끝의 "공수 알려줘" 등을 뗀 질문 → 마지막 조사를 뗀 질문 순서로 비교
+    words = question.strip().rstrip("?？.!").split()
+    rows = index.find_by_title(" ".join(words))
+    while not rows and len(words) > 1 and _is_filler_token(words[-1]):
+        words = words[:-1]
+        rows = index.find_by_title(" ".join(words))
+    if not rows and words and len(words[-1]) > 1 and words[-1][-1] in _FAST_PATH_PARTICLES:
+        rows = index.find_by_title(" ".join(words[:-1] + [words[-1][:-1]]))
+    return rows
+
+
+def _format_structured_answer(row: Dict[str, Any], index) -> str:
+    """정확 조회 답변 (QA 프롬프트의 답변 형식과 같은 항목 + Epic 정보)"""
+    story_points = row.get("story_points")
+    lines = [f"- Jira 티켓: {row['jira_ticket']}", f"- 제목: {row.get('title', '')}"]
+    if story_points is not None:
+        points_text = f"{round(story_points, 2)} M/D"
+        if row.get("story_points_original") and row.get("story_points_unit") == "M/M":
+            points_text += f" (원본: {row['story_points_original']} M/M)"
+        lines.append(f"- Story Points: {points_text}")
+        lines.append(f"- 예상공수: {round(story_points, 2)}일")
+    if row.get("estimation_reason"):
+        lines.append(f"- 산정이유: {row['estimation_reason']}")
+    if row.get("team_member"):
+        lines.append(f"- 담당자: {row['team_member']}")
+    if row.get("epic_key"):
+        epic = index.epic_summary(row["epic_key"])
+        epic_name = f"{row.get('epic_name')} ({row['epic_key']})" if row.get("epic_name") else row["epic_key"]
+        lines.append(f"- Epic: {epic_name} - 같은 Epic 작업 {epic['task_count']}건, 총 {epic['story_points']}일")
+        lines.append(f"  🔗 {JIRA_BASE_URL}/{row['epic_key']}")
+    lines.append(f"- 🔗 {JIRA_BASE_URL}/{row['jira_ticket']}")
+    return "\n".join(lines)
+
+
+def answer_structured_question(question: str) -> Optional[dict]:
+    """티켓 번호 / 제목 완전 일치 질문을 공수 데이터로 바로 답변 (해당 없으면 None → LLM QA 체인)"""
+    try:
+        start = time.perf_counter()
+        index = get_query_index()
+        rows = _match_structured_question(question, index)
+        if not rows:
+            return None
+        answer = "\n\n".join(_format_structured_answer(row, index) for row in rows[:FAST_PATH_MAX_ANSWERS])
+        if len(rows) > FAST_PATH_MAX_ANSWERS:
+            answer += f"\n\n... 외 {len(rows) - FAST_PATH_MAX_ANSWERS}건"
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(f"⚡ 정확 조회 답변: '{question}' → {[row['jira_ticket'] for row in rows]} ({elapsed_ms}ms)")
+        return {
+            "question": question,
+            "answer": answer,
+            "sources": [
+                {"source": "공수 산정 데이터", "page": row["jira_ticket"], "content": f"{row['jira_ticket']} {row.get('title', '')}"}
+                for row in rows[:FAST_PATH_MAX_ANSWERS]
+            ],
+            "is_from_structured_lookup": True,
+            "feedback_enabled": True,
+            "estimate": estimate_from_samples(rows[:FAST_PATH_MAX_ANSWERS]),
+            "lookup_ms": elapsed_ms,
+        }
+    except Exception as e:
+        logger.warning(f"⚠️ 정확 조회 실패, QA 체인으로 진행: {str(e)}")
+        return None
+
 def run_effort_qa_chain(question: str) -> dict:
     """공수 산정 전용 QA 체인 실행"""
     try:
         logger.info(f"🔍 QA 체인 시작: '{question}'")
         
+        # 0. 티켓 번호 / 제목 완전 일치 질문은 LLM 없이 바로 답변
+        structured_result = answer_structured_question(question)
+        if structured_result:
+            return structured_result
+        
         # 1. Epic 키워드 감지 및 집계 (프로젝트 전체 공수 질의)
         epic_keywords = ['프로젝트', 'epic', '에픽', '전체 공수', '프로젝트 공수']
         question_lower = question.lower()
@@ -751,10 +885,8 @@ def run_effort_qa_chain(question: str) -> dict:
         
         # MMR 검색으로 다양성을 고려하여 관련 문서 검색 품질 향상
         # 핵심 키워드만으로 검색 (stop_words 제거된 질문 사용)
-        retriever = vectordb.as_retriever(
-            search_type="mmr",  # MMR로 복원 (다양성 고려로 검색 품질 향상)
-            search_kwargs=retriever_kwargs
-        )
+        # (NumPy MMR 재정렬 + 같은 Jira 티켓 중복 제거 + 제목 일치 가산, lambda는 MMR_LAMBDA)
+        retriever = EffortMMRRetriever(vectordb=vectordb, **retriever_kwargs)
         
         # gpt-4o-mini로 복원 (프롬프트 이해도 향상)
         llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
@@ -794,10 +926,10 @@ def run_effort_qa_chain(question: str) -> dict:
 
 답변 시 다음 사항을 고려해주세요:
 1. 구체적인 Jira 티켓과 제목을 명시 (반드시 제공된 데이터에서만)
-2. Story Points는 일 단위로 해석하여 표시 (예: Story Points: 5 → "5일", 범위가 있으면 "3~5일")
+2. 각 티켓의 Story Points는 일 단위로 해석하여 표시 (예: Story Points: 5 → "5일"), 여러 티켓의 범위/평균은 직접 계산하지 마세요 (유사 작업 통계는 답변 아래에 자동으로 추가됩니다)
 3. 산정 이유가 있다면 포함
 4. Description은 해당 티켓의 Description만 사용하고, 다른 티켓의 Description은 절대 사용하지 마세요
-5. 여러 프로젝트에서 동일한 기능이 개발된 경우 일 단위 범위로 제시 (예: "3~5일")
+5. 여러 프로젝트에서 동일한 기능이 개발된 경우 티켓별 공수를 나열 (범위는 계산하지 마세요)
 6. **매우 중요**: 제공된 데이터에서 질문의 핵심 키워드가 포함된 제목이나 설명이 있으면 반드시 답변하세요. 키워드가 부분적으로라도 일치하면 관련 데이터로 간주하고 답변하세요.
    - 질문의 핵심 키워드가 모두 포함된 데이터를 최우선으로 선택하세요.
    - 질문의 일부 키워드만 포함된 데이터도 관련 데이터로 간주하세요.
@@ -812,7 +944,7 @@ def run_effort_qa_chain(question: str) -> dict:
 - Jira 티켓: [실제 티켓번호]
 - 제목: [실제 기능명]
 - Story Points: [실제 숫자]
-- 예상공수: [X일] 또는 [X~Y일] (Story Points를 일 단위로 해석)
+- 예상공수: [X일] (해당 티켓의 Story Points를 일 단위로 해석)
 - 산정이유: [실제 이유] (있는 경우)
 - 담당자: [실제 담당자] (있는 경우)
 - 개발 요구사항: [실제 Description 요약] (있는 경우)
@@ -832,6 +964,8 @@ def run_effort_qa_chain(question: str) -> dict:
         
         # 띄어쓰기 차이를 고려하여 원본과 공백 제거 버전 모두 검색
         query_for_search_no_space = query_for_search.replace(" ", "")
+        # 검색에 쓰일 수 있는 질문 변형을 한 번에 임베딩 (MMR 검색은 캐시된 임베딩 사용)
+        prefetch_query_embeddings([query_for_search, query_for_search_no_space, question_clean])
         if query_for_search_no_space != query_for_search:
             logger.info(f"🔍 QA 체인 실행 중: '{query_for_search}' (원본: '{question_clean}')")
             logger.info(f"🔍 QA 체인 실행 중 (공백 제거): '{query_for_search_no_space}' (원본: '{question_clean}')")
@@ -912,12 +1046,18 @@ def run_effort_qa_chain(question: str) -> dict:
                 "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content
             })
         
+        # 통계는 토큰 예산 압축 전 MMR 결과로 계산 (압축 시 제외된 티켓도 표본에 포함)
+        answer, estimate = _append_effort_estimate(
+            question, answer, retriever.retrieved_documents.get(result.get("query"), source_docs))
+        
         return {
             "question": question,
             "answer": answer if answer else "공수 산정 데이터에서 해당 정보를 찾을 수 없습니다.",
             "sources": sources,
             "feedback_enabled": True,
-            "search_session_id": f"qa_{hash(question)}_{len(sources)}"
+            "search_session_id": f"qa_{hash(question)}_{len(sources)}",
+            "estimate": estimate,
+            "context_tokens": _context_token_report(retriever, prompt_template)
         }
         
     except Exception as e:
@@ -957,10 +1097,8 @@ def run_effort_qa_with_feedback(question: str, excluded_sources: List[str] = Non
             logger.info(f"🔍 제외 필터 적용: {exclude_filter}")
         
         # MMR 검색으로 다양성을 고려하여 관련 문서 검색 품질 향상
-        retriever = vectordb.as_retriever(
-            search_type="mmr",  # MMR로 복원 (다양성 고려로 검색 품질 향상)
-            search_kwargs=retriever_kwargs
-        )
+        # (NumPy MMR 재정렬 + 같은 Jira 티켓 중복 제거 + 제목 일치 가산, lambda는 MMR_LAMBDA)
+        retriever = EffortMMRRetriever(vectordb=vectordb, **retriever_kwargs)
         
         # gpt-4o-mini로 복원 (프롬프트 이해도 향상)
         llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
@@ -999,10 +1137,10 @@ def run_effort_qa_with_feedback(question: str, excluded_sources: List[str] = Non
 
 답변 시 다음 사항을 고려해주세요:
 1. 구체적인 Jira 티켓과 제목을 명시 (반드시 제공된 데이터에서만)
-2. Story Points는 일 단위로 해석하여 표시 (예: Story Points: 5 → "5일", 범위가 있으면 "3~5일")
+2. 각 티켓의 Story Points는 일 단위로 해석하여 표시 (예: Story Points: 5 → "5일"), 여러 티켓의 범위/평균은 직접 계산하지 마세요 (유사 작업 통계는 답변 아래에 자동으로 추가됩니다)
 3. 산정 이유가 있다면 포함
 4. Description은 해당 티켓의 Description만 사용하고, 다른 티켓의 Description은 절대 사용하지 마세요
-5. 여러 프로젝트에서 동일한 기능이 개발된 경우 일 단위 범위로 제시 (예: "3~5일")
+5. 여러 프로젝트에서 동일한 기능이 개발된 경우 티켓별 공수를 나열 (범위는 계산하지 마세요)
 6. **매우 중요**: 제공된 데이터에서 질문의 핵심 키워드가 포함된 제목이나 설명이 있으면 반드시 답변하세요. 키워드가 부분적으로라도 일치하면 관련 데이터로 간주하고 답변하세요.
    - 질문의 핵심 키워드가 모두 포함된 데이터를 최우선으로 선택하세요.
    - 질문의 일부 키워드만 포함된 데이터도 관련 데이터로 간주하세요.
@@ -1017,7 +1155,7 @@ def run_effort_qa_with_feedback(question: str, excluded_sources: List[str] = Non
 - Jira 티켓: [실제 티켓번호]
 - 제목: [실제 기능명]
 - Story Points: [실제 숫자]
-- 예상공수: [X일] 또는 [X~Y일] (Story Points를 일 단위로 해석)
+- 예상공수: [X일] (해당 티켓의 Story Points를 일 단위로 해석)
 - 산정이유: [실제 이유] (있는 경우)
 - 담당자: [실제 담당자] (있는 경우)
 - 개발 요구사항: [실제 Description 요약] (있는 경우)
@@ -1050,13 +1188,19 @@ def run_effort_qa_with_feedback(question: str, excluded_sources: List[str] = Non
                 "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content
             })
         
+        # 통계는 토큰 예산 압축 전 MMR 결과로 계산 (압축 시 제외된 티켓도 표본에 포함)
+        answer, estimate = _append_effort_estimate(
+            question, answer, retriever.retrieved_documents.get(result.get("query"), source_docs))
+        
         return {
             "question": question,
             "answer": answer if answer else "공수 산정 데이터에서 해당 정보를 찾을 수 없습니다.",
             "sources": sources,
             "feedback_enabled": True,
             "search_session_id": f"qa_feedback_{hash(question)}_{len(sources)}",
-            "is_feedback_search": True
+            "estimate": estimate,
+            "is_feedback_search": True,
+            "context_tokens": _context_token_report(retriever, prompt_template)
         }
         
     except Exception as e:
@@ -1069,174 +1213,35 @@ def run_effort_qa_with_feedback(question: str, excluded_sources: List[str] = Non
 def get_feedback_weekly_positive_ratio() -> Dict[str, Any]:
     """주 단위 긍정 피드백 비율 통계
     
+    QA 응답/긍정 피드백 이벤트가 기록될 때마다 갱신되는 주간 집계(qa_store)를 조회
+    
     Returns:
         dict: {
             "weekly_trend": [
-                {"week": "2025-W48", "positive_ratio": 85.5},
+                {"week": "11(5W)", "week_key": "2025-W48", "positive_ratio": 85.5},
                 ...
             ]
         }
-        피드백이 없는 주는 제외됨
+        QA 응답이 없는 주는 제외됨
     """
     try:
-        import json
-        from datetime import datetime
-        from collections import defaultdict
-        
-        # 분자: 긍정 피드백 파일
-        positive_file = os.path.join(DOCS_DIR, "positive_feedback.json")
-        
-        # 분모: 슬랙 QA 매핑 파일 + 웹 QA 매핑 파일 (전체 QA 응답 수)
-        slack_mapping_file = os.path.join(DOCS_DIR, "slack_qa_mapping.json")
-        web_mapping_file = os.path.join(DOCS_DIR, "web_qa_mapping.json")
-        
-        # 긍정 피드백 로드
-        positive_feedbacks = []
-        if os.path.exists(positive_file):
-            with open(positive_file, 'r', encoding='utf-8') as f:
-                positive_feedbacks = json.load(f)
-        
-        # 슬랙 QA 매핑 로드 (전체 QA 응답)
-        slack_qa_mapping = {}
-        if os.path.exists(slack_mapping_file):
-            with open(slack_mapping_file, 'r', encoding='utf-8') as f:
-                slack_qa_mapping = json.load(f)
-        
-        # 웹 QA 매핑 로드 (전체 QA 응답)
-        web_qa_mapping = {}
-        if os.path.exists(web_mapping_file):
-            with open(web_mapping_file, 'r', encoding='utf-8') as f:
-                web_qa_mapping = json.load(f)
-        
-        # 주별 긍정 피드백 카운트 집계 (분자)
-        weekly_positive = defaultdict(int)
-        
-        # 긍정 피드백 처리
-        for feedback in positive_feedbacks:
-            timestamp = feedback.get("timestamp") or feedback.get("first_feedback_time") or feedback.get("last_feedback_time")
-            if not timestamp:
-                continue
-            
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                # ISO 주 번호 계산 (년도-주 형식)
-                year, week, _ = dt.isocalendar()
-                week_key = f"{year}-W{week:02d}"
-                
-                # feedback_count가 있으면 그만큼 카운트, 없으면 1
-                count = feedback.get("feedback_count", 1)
-                weekly_positive[week_key] += count
-            except (ValueError, AttributeError) as e:
-                logger.warning(f"⚠️ 피드백 타임스탬프 파싱 오류: {timestamp} - {e}")
-                continue
-        
-        # 주별 전체 QA 응답 카운트 집계 (분모)
-        weekly_total_qa = defaultdict(int)
-        
-        # 슬랙 QA 매핑 처리 (전체 QA 응답 수)
-        for message_ts, qa_data in slack_qa_mapping.items():
-            timestamp = qa_data.get("timestamp")
-            if not timestamp:
-                continue
-            
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                year, week, _ = dt.isocalendar()
-                week_key = f"{year}-W{week:02d}"
-                weekly_total_qa[week_key] += 1
-            except (ValueError, AttributeError) as e:
-                logger.warning(f"⚠️ 슬랙 QA 타임스탬프 파싱 오류: {timestamp} - {e}")
-                continue
-        
-        # 웹 QA 매핑 처리 (전체 QA 응답 수)
-        for qa_id, qa_data in web_qa_mapping.items():
-            timestamp = qa_data.get("timestamp")
-            if not timestamp:
-                continue
-            
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                year, week, _ = dt.isocalendar()
-                week_key = f"{year}-W{week:02d}"
-                weekly_total_qa[week_key] += 1
-            except (ValueError, AttributeError) as e:
-                logger.warning(f"⚠️ 웹 QA 타임스탬프 파싱 오류: {timestamp} - {e}")
-                continue
+        from ..data.qa_store import get_weekly_rollups
         
-        # 주별 긍정 비율 계산
         weekly_trend = []
-        # 긍정 피드백이 있거나 전체 QA 응답이 있는 주만 포함
-        all_weeks = set(list(weekly_positive.keys()) + list(weekly_total_qa.keys()))
-        
-        for week_key in sorted(all_weeks):
-            positive_count = weekly_positive.get(week_key, 0)
-            total_qa_count = weekly_total_qa.get(week_key, 0)
+        for rollup in get_weekly_rollups():
+            total_qa_count = rollup["qa_responses"]
             
             # 전체 QA 응답이 없으면 제외 (피드백만 있어도 의미 없음)
-            if total_qa_count == 0:
+            if total_qa_count <= 0:
                 continue
             
             # 긍정 비율 계산: 긍정 피드백 수 / 전체 QA 응답 수
+            positive_count = max(rollup["positive_feedback"], 0)
             positive_ratio = round((positive_count / total_qa_count) * 100, 1)
             
-            # 주 표기 형식 변경: "2025-W48" → "11(1W)" 형식
-            # week_key는 "2025-W48" 형식
-            try:
-                from datetime import datetime, timedelta
-                
-                year, week_num = week_key.split('-W')
-                week_num = int(week_num)
-                year_int = int(year)
-                
-                # ISO 주 번호로부터 해당 주의 월요일 날짜 계산
-                # ISO 주 1번은 1월 4일이 포함된 주
-                jan4 = datetime(year_int, 1, 4)
-                # 1월 4일이 속한 주의 월요일 찾기
-                # weekday(): 0=월요일, 6=일요일
-                days_to_monday = (jan4.weekday()) % 7
-                iso_week1_monday = jan4 - timedelta(days=days_to_monday)
-                
-                # 해당 ISO 주의 월요일 계산
-                target_monday = iso_week1_monday + timedelta(weeks=week_num - 1)
-                
-                # 해당 주의 월 추출
-                month = target_monday.month
-                
-                # 해당 월의 1일
-                month_start = datetime(year_int, month, 1)
-                
-                # 해당 월의 첫 번째 월요일 찾기
-                days_to_first_monday = (month_start.weekday()) % 7
-                month_first_monday = month_start - timedelta(days=days_to_first_monday)
-                
-                # 해당 주가 해당 월의 몇 번째 주인지 계산
-                if target_monday >= month_first_monday:
-                    week_in_month = ((target_monday - month_first_monday).days // 7) + 1
-                else:
-                    # 이전 달의 마지막 주인 경우
-                    # 이전 달의 첫 번째 월요일 찾기
-                    if month == 1:
-                        prev_month_start = datetime(year_int - 1, 12, 1)
-                    else:
-                        prev_month_start = datetime(year_int, month - 1, 1)
-                    
-                    days_to_first_monday_prev = (prev_month_start.weekday()) % 7
-                    prev_month_first_monday = prev_month_start - timedelta(days=days_to_first_monday_prev)
-                    
-                    week_in_month = ((target_monday - prev_month_first_monday).days // 7) + 1
-                    month = prev_month_start.month  # 이전 달로 표시
-                
-                # 주 표기: "11(1W)" 형식
-                week_display = f"{month}({week_in_month}W)"
-            except Exception as e:
-                logger.warning(f"⚠️ 주 표기 형식 변환 오류: {week_key} - {e}")
-                import traceback
-                logger.warning(f"⚠️ 상세 오류: {traceback.format_exc()}")
-                week_display = week_key  # 변환 실패 시 원본 사용
-            
             weekly_trend.append({
-                "week": week_display,
-                "week_key": week_key,  # 정렬을 위해 원본 키도 유지
+                "week": rollup["week_display"],
+                "week_key": rollup["week_key"],  # 정렬을 위해 원본 키도 유지
                 "positive_ratio": positive_ratio
             })
         
@@ -1260,7 +1265,8 @@ def get_effort_statistics() -> Dict[str, Any]:
         
         # 기본 통계
         total_estimations = len(estimations)
-        total_story_points = sum(est.story_points for est in estimations if est.story_points is not None)
+        from .effort_query import get_query_index
+        total_story_points = get_query_index().column_sum("story_points")
         
         # Jira 티켓별 통계
         tickets = {}
@@ -1323,9 +1329,10 @@ def search_similar_features(feature_name: str) -> List[Dict[str, Any]]:
         if not estimations:
             return []
         
-        # 결과 정리 (Story Points 기반)
+        # 결과 정리 (Story Points 기반, 설명/댓글은 결과 건만 텍스트 저장소에서 조회)
         results = []
         for est in estimations:
+            description, comments = effort_manager.get_estimation_texts(est)
             result = {
                 "jira_ticket": est.jira_ticket,
                 "title": est.title,
@@ -1333,7 +1340,9 @@ def search_similar_features(feature_name: str) -> List[Dict[str, Any]]:
                 "estimation_reason": est.estimation_reason,
                 "tech_stack": est.tech_stack,
                 "team_member": est.team_member,
-                "created_date": est.created_date
+                "created_date": est.created_date,
+                "description": description,
+                "comments": comments
             }
             results.append(result)
         
@@ -0,0 +1,297 @@
+"""
+공수 산정 데이터 조회 모듈
+EffortEstimationManager 위에 카테고리/검색 인덱스, 정렬, 키셋 페이지네이션을 제공
+데이터 버전이 바뀔 때만 인덱스를 다시 만들고, 공유 객체는 변경하지 않음
+"""
+
+import base64
+import json
+import logging
+import math
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import fields
+from typing import List, Dict, Optional, Any, Tuple
+
+from .effort_estimation import EffortEstimation, effort_manager
+
+logger = logging.getLogger(__name__)
+
+# 목록 응답에서 제외하는 긴 텍스트 필드
+LIST_EXCLUDED_FIELDS = ("description", "comments")
+# 목록 응답 필드 (정렬 가능 컬럼)
+LIST_FIELDS = tuple(f.name for f in fields(EffortEstimation) if f.name not in LIST_EXCLUDED_FIELDS)
+# 컬럼형 배열(array('d'))로 보관하는 숫자 필드 (None은 NaN)
+NUMERIC_FIELDS = ("story_points", "story_points_original")
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """정렬 키 (숫자 → 문자열 → None/빈 값 순, 타입이 섞여도 비교 가능)"""
+    if value is None or value == "" or value == []:
+        return (2, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, float(value))
+    if isinstance(value, (list, tuple)):
+        return (1, ", ".join(str(v) for v in value))
+    return (1, str(value))
+
+
+def _bigrams(text: str) -> set:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def normalize_title(text: str) -> str:
+    """제목 비교용 정규화 (공백 제거 + 소문자)"""
+    return "".join((text or "").split()).lower()
+
+
+def encode_cursor(key: Tuple[int, Any], jira_ticket: str, position: int) -> str:
+    """키셋 커서 인코딩 (정렬 값 + 티켓 + 위치)"""
+    payload = json.dumps([key[0], key[1], jira_ticket or "", position], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _valid_cursor_key(key_type: Any, value: Any) -> bool:
+    """정렬 키 형식 확인 (_sort_key 규칙: 0 → 숫자, 1 → 문자열, 2 → 빈 값)"""
+    if type(key_type) is not int:
+        return False
+    if key_type == 0:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if key_type == 1:
+        return isinstance(value, str)
+    return key_type == 2 and value == ""
+
+
+def decode_cursor(cursor: str) -> Tuple[Tuple[int, Any], str, int]:
+    """키셋 커서 디코딩 (형식 오류 또는 정렬 키와 타입이 맞지 않는 값이면 ValueError)"""
+    try:
+        key_type, value, jira_ticket, position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"잘못된 커서: {cursor}") from e
+    if not _valid_cursor_key(key_type, value) or not isinstance(jira_ticket, str) \
+            or type(position) is not int or position < 0:
+        raise ValueError(f"잘못된 커서: {cursor}")
+    return (key_type, value), jira_ticket, position
+
+
+class EffortQueryIndex:
+    """특정 데이터 버전의 공수 산정 목록 조회 인덱스"""
+
+    def __init__(self, estimations: List[EffortEstimation], version: int):
+        self.version = version
+        # 목록용 경량 프로젝션 (긴 텍스트 제외, 공유 객체와 분리)
+        self.rows: List[Dict[str, Any]] = [
+            {name: getattr(est, name) for name in LIST_FIELDS} for est in estimations
+        ]
+        # 숫자 컬럼: 행 위치와 같은 순서의 double 배열 (집계/정렬 시 객체 순회 없이 사용)
+        self.numeric_columns: Dict[str, array] = {
+            name: array('d', (self._to_float(row.get(name)) for row in self.rows)) for name in NUMERIC_FIELDS
+        }
+        self._haystacks: List[str] = []
+        self._bigram_index: Dict[str, set] = {}
+        self._category_index: Dict[tuple, List[int]] = {}
+        # 정확 조회 인덱스: 티켓(대문자) → 위치, 정규화 제목 → 위치 목록, Epic 티켓 → 위치 목록
+        self._ticket_index: Dict[str, int] = {}
+        self._title_index: Dict[str, List[int]] = {}
+        self._epic_index: Dict[str, List[int]] = {}
+        self._sort_orders: Dict[str, List[tuple]] = {}
+        self._ranks: Dict[str, Dict[int, int]] = {}
+        self._build()
+
+    @staticmethod
+    def _to_float(value: Any) -> float:
+        try:
+            return float(value) if value is not None and value != "" else math.nan
+        except (TypeError, ValueError):
+            return math.nan
+
+    def column_sum(self, name: str) -> float:
+        """숫자 컬럼 합계 (NaN 제외)"""
+        return math.fsum(v for v in self.numeric_columns[name] if not math.isnan(v))
+
+    def memory_usage(self) -> Dict[str, int]:
+        """인덱스 메모리 사용량 추정 (바이트)"""
+        return {
+            "rows": sum(sys.getsizeof(row) for row in self.rows),
+            "numeric_columns": sum(col.buffer_info()[1] * col.itemsize for col in self.numeric_columns.values()),
+            "search_index": sum(sys.getsizeof(h) for h in self._haystacks) +
+                            sum(sys.getsizeof(p) for p in self._bigram_index.values()),
+        }
+
+    def _build(self):
+        for position, row in enumerate(self.rows):
+            # 검색 인덱스: 제목 + Jira 티켓 소문자 바이그램
+            haystack = f"{(row.get('title') or '').lower()}\n{(row.get('jira_ticket') or '').lower()}"
+            self._haystacks.append(haystack)
+            for gram in _bigrams(haystack):
+                self._bigram_index.setdefault(gram, set()).add(position)
+
+            # 카테고리 인덱스: 대분류 / 대+중분류 / 대+중+소분류
+            major, minor, sub = row.get("major_category"), row.get("minor_category"), row.get("sub_category")
+            for key in ((major,), (major, minor), (major, minor, sub)):
+                self._category_index.setdefault(key, []).append(position)
+
+            if row.get("jira_ticket"):
+                self._ticket_index.setdefault(row["jira_ticket"].upper(), position)
+            title = normalize_title(row.get("title"))
+            if title:
+                self._title_index.setdefault(title, []).append(position)
+            if row.get("epic_key"):
+                self._epic_index.setdefault(row["epic_key"], []).append(position)
+
+    def find_by_ticket(self, jira_ticket: str) -> Optional[Dict[str, Any]]:
+        """Jira 티켓 정확 조회 (대소문자 무시)"""
+        position = self._ticket_index.get((jira_ticket or "").upper())
+        return self.rows[position] if position is not None else None
+
+    def find_by_title(self, title: str) -> List[Dict[str, Any]]:
+        """제목 정확 조회 (공백/대소문자 무시, 같은 제목이 여러 건이면 등록 순서대로)"""
+        return [self.rows[p] for p in self._title_index.get(normalize_title(title), [])]
+
+    def epic_summary(self, epic_key: str) -> Dict[str, Any]:
+        """Epic 소속 작업 수 / Story Points 합계"""
+        positions = self._epic_index.get(epic_key, [])
+        column = self.numeric_columns["story_points"]
+        story_points = math.fsum(column[p] for p in positions if not math.isnan(column[p]))
+        return {"task_count": len(positions), "story_points": round(story_points, 2)}
+
+    def _search_positions(self, search: str) -> List[int]:
+        """제목/티켓 부분 문자열 검색 (바이그램 후보 → 부분 문자열 확인)"""
+        term = search.lower().strip()
+        if len(term) < 2:
+            candidates = range(len(self.rows))
+        else:
+            posting_lists = sorted((self._bigram_index.get(gram, set()) for gram in _bigrams(term)), key=len)
+            candidates = set.intersection(*posting_lists) if posting_lists and posting_lists[0] else set()
+        return sorted(p for p in candidates if term in self._haystacks[p])
+
+    def _category_positions(self, major: str, minor: str = None, sub: str = None) -> List[int]:
+        if sub and minor:
+            return self._category_index.get((major, minor, sub), [])
+        if minor:
+            return self._category_index.get((major, minor), [])
+        return self._category_index.get((major,), [])
+
+    def _sort_order(self, sort_by: Optional[str]) -> List[tuple]:
+        """컬럼별 안정 정렬 순서 ((정렬 키, 티켓, 위치) 목록) - 컬럼당 1회 계산"""
+        sort_by = sort_by or ""
+        if sort_by not in self._sort_orders:
+            if sort_by in self.numeric_columns:
+                # 숫자 컬럼은 배열 값으로 정렬 (NaN = 값 없음 → 뒤로)
+                column = self.numeric_columns[sort_by]
+                keyed = sorted(
+                    (((2, "") if math.isnan(column[position]) else (0, column[position]),
+                      row.get("jira_ticket") or "", position)
+                     for position, row in enumerate(self.rows))
+                )
+            elif sort_by:
+                keyed = sorted(
+                    ((_sort_key(row.get(sort_by)), row.get("jira_ticket") or "", position)
+                     for position, row in enumerate(self.rows))
+                )
+            else:
+                # 기본 순서: 등록(저장) 순서
+                keyed = [((0, position), row.get("jira_ticket") or "", position) for position, row in enumerate(self.rows)]
+            self._sort_orders[sort_by] = keyed
+        return self._sort_orders[sort_by]
+
+    def query(self, major_category: str = None, minor_category: str = None, sub_category: str = None,
+              search: str = None, sort_by: str = None, sort_order: str = "asc",
+              page: int = 1, page_size: int = 100, cursor: str = None) -> Dict[str, Any]:
+        """필터/정렬/페이지 조회
+
+        cursor가 있으면 키셋 페이지네이션, 없으면 page 기반 페이지네이션
+        - 정렬 컬럼 지정 시: (정렬 값, 티켓) 기준으로 이어서 조회하므로 데이터가 바뀌어도 중복/누락 없음
+        - 기본 순서(등록 순서): 커서 티켓의 현재 위치부터 이어서 조회 (앞쪽 행이 추가/삭제되어도 유지,
+          커서 티켓 자체가 삭제된 경우에만 이전 위치 기준이라 중복/누락이 생길 수 있음)
+        """
+        if sort_by and sort_by not in LIST_FIELDS:
+            raise ValueError(f"정렬할 수 없는 컬럼: {sort_by}")
+        descending = (sort_order or "asc").lower() == "desc"
+        page = max(1, page)
+        page_size = max(1, page_size)
+
+        keyed = self._sort_order(sort_by)
+
+        # 필터 적용 (카테고리 인덱스 ∩ 검색 인덱스)
+        filter_sets = []
+        if major_category:
+            filter_sets.append(self._category_positions(major_category, minor_category, sub_category))
+        if search and search.strip():
+            filter_sets.append(self._search_positions(search))
+
+        if filter_sets:
+            selected = set(filter_sets[0]).intersection(*filter_sets[1:])
+            matched = [k for k in keyed if k[2] in selected] if len(selected) * 8 > len(keyed) else \
+                sorted(keyed[self._rank(sort_by)[p]] for p in selected)
+        else:
+            matched = keyed
+        if descending:
+            matched = matched[::-1]
+
+        total_count = len(matched)
+        if cursor:
+            key, jira_ticket, position = decode_cursor(cursor)
+            if not sort_by:
+                # 등록 순서는 위치가 바뀔 수 있으므로 커서 티켓의 현재 위치 사용
+                position = self._ticket_index.get(jira_ticket.upper(), position) if jira_ticket else position
+                key = (0, position)
+            boundary = (key, jira_ticket, position)
+            start_index = self._resume_index(matched, boundary, descending)
+        else:
+            start_index = (page - 1) * page_size
+
+        page_keys = matched[start_index:start_index + page_size]
+        estimations = [
+            {**self.rows[k[2]], "sequence_number": start_index + i + 1}
+            for i, k in enumerate(page_keys)
+        ]
+
+        next_cursor = None
+        if start_index + page_size < total_count and page_keys:
+            last_key, last_ticket, last_position = page_keys[-1]
+            next_cursor = encode_cursor(last_key, last_ticket, last_position)
+
+        return {
+            "estimations": estimations,
+            "total_count": total_count,
+            "start_index": start_index,
+            "next_cursor": next_cursor,
+        }
+
+    def _rank(self, sort_by: Optional[str]) -> Dict[int, int]:
+        """위치 → 정렬 순번 (선택도가 높은 필터 결과를 정렬할 때 사용)"""
+        sort_by = sort_by or ""
+        if sort_by not in self._ranks:
+            self._ranks[sort_by] = {k[2]: rank for rank, k in enumerate(self._sort_order(sort_by))}
+        return self._ranks[sort_by]
+
+    @staticmethod
+    def _resume_index(matched: List[tuple], boundary: tuple, descending: bool) -> int:
+        """커서 다음 항목의 인덱스 (정렬 키 이진 탐색)"""
+        if descending:
+            # 내림차순 목록은 오름차순의 역순이므로 키를 뒤집어 탐색
+            ascending = matched[::-1]
+            return len(matched) - bisect_left(ascending, boundary)
+        return bisect_right(matched, boundary)
+
+
+_index_lock = threading.Lock()
+_query_index: Optional[EffortQueryIndex] = None
+
+
+def get_query_index() -> EffortQueryIndex:
+    """현재 데이터 버전의 조회 인덱스 반환 (버전이 바뀌었으면 재생성)"""
+    global _query_index
+    effort_manager.refresh()
+    index = _query_index
+    if index is not None and index.version == effort_manager.data_version:
+        return index
+    with _index_lock:
+        if _query_index is None or _query_index.version != effort_manager.data_version:
+            version = effort_manager.data_version
+            _query_index = EffortQueryIndex(list(effort_manager.get_all_estimations()), version)
+            logger.info(f"🗂️ 공수 산정 조회 인덱스 생성: {len(_query_index.rows)}개 (버전 {version})")
+        return _query_index
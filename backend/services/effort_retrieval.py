@@ -0,0 +1,192 @@
+"""
+공수 QA 검색 모듈
+벡터 DB에서 후보(fetch_k)를 임베딩과 함께 한 번에 가져와 NumPy로 MMR 재정렬
+- 후보 임베딩은 정규화 행렬로 한 번만 만들고 유사도 행렬도 1회 계산
+- 같은 Jira 티켓 문서는 가장 관련도 높은 1건만 사용
+- 제목이 질문과 정확히 일치(공백/대소문자 무시)하면 관련도 가산
+- 같은 질문/필터의 후보는 잠시 캐시 (한 질문 처리 중 QA 체인을 여러 번 실행하는 경우)
+- 여러 질문(일괄 산정)은 query() 1회로 후보를 함께 조회
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from ..data.database import get_embedding_function
+from ..data.vector_store import mmr_select
+from ..utils.config import MMR_LAMBDA, CONTEXT_TOKEN_BUDGET
+from .context_packer import pack_documents
+
+logger = logging.getLogger(__name__)
+
+# 제목 완전 일치 / 제목에 질문 전체 포함 시 관련도 가산값
+EXACT_TITLE_BOOST = 0.2
+PARTIAL_TITLE_BOOST = 0.1
+# 후보 캐시 (질문 + 필터 + fetch_k → 후보), 보관 시간/최대 개수
+_CANDIDATE_CACHE_TTL_SECONDS = 60
+_CANDIDATE_CACHE_SIZE = 128
+
+_candidate_cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+_candidate_cache_lock = threading.Lock()
+
+
+def _normalize_title(text: str) -> str:
+    return "".join((text or "").split()).lower()
+
+
+class _Candidates:
+    """검색 후보 (문서, 정규화 임베딩 행렬, 질문 벡터)"""
+
+    def __init__(self, documents: List[Document], matrix: np.ndarray, query: np.ndarray):
+        self.documents = documents
+        self.matrix = matrix
+        self.query = query
+
+
+def _candidate_key(vectordb, query: str, fetch_k: int, where: Optional[Dict[str, Any]], count: int) -> tuple:
+    return (id(vectordb), query, fetch_k, json.dumps(where, sort_keys=True, ensure_ascii=False) if where else "", count)
+
+
+def _cached_candidates(key: tuple, now: float) -> Optional[_Candidates]:
+    with _candidate_cache_lock:
+        cached = _candidate_cache.get(key)
+        if cached and now - cached[0] < _CANDIDATE_CACHE_TTL_SECONDS:
+            _candidate_cache.move_to_end(key)
+            return cached[1]
+    return None
+
+
+def _store_candidates(key: tuple, now: float, candidates: _Candidates):
+    with _candidate_cache_lock:
+        _candidate_cache[key] = (now, candidates)
+        while len(_candidate_cache) > _CANDIDATE_CACHE_SIZE:
+            _candidate_cache.popitem(last=False)
+
+
+def _query_vector(query: str) -> np.ndarray:
+    vector = np.asarray(get_embedding_function().embed_query(query), dtype=np.float32)
+    vector /= (np.linalg.norm(vector) or 1.0)
+    return vector
+
+
+def _build_candidates(result: Dict[str, Any], column: int, query_vector: np.ndarray) -> _Candidates:
+    """query() 결과의 column번째 질문 후보를 정규화 행렬로 변환"""
+    texts = (result.get("documents") or [[]] * (column + 1))[column] or []
+    metadatas = (result.get("metadatas") or [[]] * (column + 1))[column] or []
+    embeddings = result.get("embeddings")  # Chroma는 numpy 배열로 반환할 수 있어 truthiness 검사 금지
+    embeddings = embeddings[column] if embeddings is not None and len(embeddings) > column else []
+    documents = [Document(page_content=text, metadata=dict(metadata or {})) for text, metadata in zip(texts, metadatas)]
+    if documents:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+    else:
+        matrix = np.zeros((0, len(query_vector)), dtype=np.float32)
+    return _Candidates(documents, matrix, query_vector)
+
+
+def _fetch_candidates(vectordb, query: str, fetch_k: int, where: Optional[Dict[str, Any]]) -> _Candidates:
+    """후보 조회 (질문 임베딩은 공유 캐시, 후보 임베딩은 검색 결과에 함께 포함)"""
+    return fetch_candidates_batch(vectordb, [query], fetch_k, where)[0]
+
+
+def fetch_candidates_batch(vectordb, queries: List[str], fetch_k: int = 40,
+                           where: Optional[Dict[str, Any]] = None) -> List[_Candidates]:
+    """여러 질문의 후보를 한 번의 query() 호출로 조회 (캐시에 있는 질문은 제외, 결과는 질문 순서대로)
+
+    질문 임베딩은 캐시를 사용하므로 호출 전에 prefetch_query_embeddings로 한 번에 준비해 두면 API 호출 1회
+    """
+    count = vectordb._collection.count()
+    now = time.monotonic()
+    keys = [_candidate_key(vectordb, query, fetch_k, where, count) for query in queries]
+    results: List[Optional[_Candidates]] = [_cached_candidates(key, now) for key in keys]
+    missing = list(dict.fromkeys(query for query, found in zip(queries, results) if found is None))
+    if missing:
+        query_vectors = [_query_vector(query) for query in missing]
+        result = vectordb._collection.query(
+            query_embeddings=[vector.tolist() for vector in query_vectors], n_results=fetch_k, where=where or None,
+            include=["documents", "metadatas", "embeddings"],
+        )
+        fetched = {}
+        for column, (query, vector) in enumerate(zip(missing, query_vectors)):
+            fetched[query] = _build_candidates(result, column, vector)
+            _store_candidates(_candidate_key(vectordb, query, fetch_k, where, count), now, fetched[query])
+        results = [found if found is not None else fetched[query] for query, found in zip(queries, results)]
+    return results
+
+
+def mmr_rerank(candidates: _Candidates, query: str, k: int = 12, lambda_mult: float = MMR_LAMBDA,
+               title_boost: bool = True) -> List[Document]:
+    """조회된 후보를 MMR로 재정렬 (티켓 중복 제거 + 제목 일치 가산)"""
+    if not candidates.documents:
+        return []
+
+    relevance = candidates.matrix @ candidates.query
+    if title_boost:
+        normalized_query = _normalize_title(query)
+        for i, doc in enumerate(candidates.documents):
+            title = _normalize_title(doc.metadata.get("title", ""))
+            if title and normalized_query:
+                if title == normalized_query:
+                    relevance[i] += EXACT_TITLE_BOOST
+                elif normalized_query in title:
+                    relevance[i] += PARTIAL_TITLE_BOOST
+
+    # 같은 Jira 티켓은 관련도가 가장 높은 문서 1건만 후보로 유지
+    best_by_ticket: Dict[str, int] = {}
+    keep = []
+    for i, doc in enumerate(candidates.documents):
+        ticket = doc.metadata.get("jira_ticket")
+        if not ticket:
+            keep.append(i)
+        elif ticket not in best_by_ticket or relevance[i] > relevance[best_by_ticket[ticket]]:
+            best_by_ticket[ticket] = i
+    keep = sorted(keep + list(best_by_ticket.values()))
+
+    selected = mmr_select(candidates.query, candidates.matrix[keep], k, lambda_mult, relevance=relevance[keep])
+    return [candidates.documents[keep[i]] for i in selected]
+
+
+def mmr_search(vectordb, query: str, k: int = 12, fetch_k: int = 40, lambda_mult: float = MMR_LAMBDA,
+               filter: Optional[Dict[str, Any]] = None, title_boost: bool = True) -> List[Document]:
+    """MMR 검색 (티켓 중복 제거 + 제목 일치 가산 + NumPy 재정렬)"""
+    candidates = _fetch_candidates(vectordb, query, fetch_k, filter)
+    return mmr_rerank(candidates, query, k=k, lambda_mult=lambda_mult, title_boost=title_boost)
+
+
+class EffortMMRRetriever(BaseRetriever):
+    """공수 QA 체인용 MMR 검색기 (vectordb.as_retriever(search_type="mmr") 대체)"""
+
+    vectordb: Any
+    k: int = 12
+    fetch_k: int = 40
+    lambda_mult: float = MMR_LAMBDA
+    filter: Optional[Dict[str, Any]] = None
+    title_boost: bool = True
+    token_budget: int = CONTEXT_TOKEN_BUDGET
+    # 마지막 검색의 컨텍스트 압축 통계 (context_packer.pack_documents)
+    last_context_stats: Optional[Dict[str, Any]] = None
+    # 검색어별 압축 전 MMR 결과 (공수 통계는 토큰 예산과 무관하게 이 문서로 계산)
+    retrieved_documents: Dict[str, List[Document]] = {}
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        start = time.perf_counter()
+        documents = mmr_search(self.vectordb, query, k=self.k, fetch_k=self.fetch_k, lambda_mult=self.lambda_mult,
+                               filter=self.filter, title_boost=self.title_boost)
+        self.retrieved_documents[query] = documents
+        documents, stats = pack_documents(documents, self.token_budget)
+        self.last_context_stats = stats
+        logger.info(f"🔎 MMR 검색: '{query}' → {stats['documents_out']}/{stats['documents_in']}개, "
+                    f"컨텍스트 {stats['input_tokens']} → {stats['context_tokens']}토큰 "
+                    f"(예산 {stats['budget']}, 중복 제외 {stats['duplicates_dropped']}, 예산 초과 제외 {stats['over_budget_dropped']}) "
+                    f"({(time.perf_counter() - start) * 1000:.1f}ms)")
+        return documents
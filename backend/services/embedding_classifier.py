@@ -0,0 +1,159 @@
+"""
+임베딩 기반 카테고리 분류 모듈
+벡터 DB(Chroma 또는 NumPy 저장소)에 이미 저장된 공수 산정 임베딩으로 카테고리별 중심 벡터(centroid)를 만들고
+코사인 유사도로 가장 가까운 카테고리를 선택 (기존 티켓은 임베딩 API 호출 없음)
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..data.database import get_embedding_function, get_family_vectordb, get_active_index_dir, collection_name
+from .effort_estimation import effort_manager
+
+logger = logging.getLogger(__name__)
+
+# 유사도 → 신뢰도 변환 softmax 온도 (작을수록 1위 카테고리에 신뢰도 집중)
+_SOFTMAX_TEMPERATURE = 0.05
+# 중심 벡터 계산에 필요한 카테고리별 최소 티켓 수
+_MIN_SAMPLES_PER_LABEL = 1
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (0 벡터는 그대로)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class EmbeddingCentroidClassifier:
+    """Chroma 저장 임베딩 기반 최근접 중심 벡터 분류기"""
+
+    def __init__(self):
+        self.classes_: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None  # (카테고리 수, 차원), 정규화됨
+        self.ticket_vectors: Dict[str, np.ndarray] = {}  # 티켓 → 정규화 임베딩
+        self._built_key = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None and len(self.classes_) > 0
+
+    def _load_ticket_vectors(self) -> Dict[str, np.ndarray]:
+        """벡터 DB에 저장된 공수 산정 임베딩 로드 (티켓별 정규화 벡터)"""
+        vectordb = get_family_vectordb("effort")
+        collection = vectordb._collection.get(
+            where={"source": "effort_estimations.json"}, include=["embeddings", "metadatas"]
+        )
+        embeddings = collection.get("embeddings")
+        metadatas = collection.get("metadatas") or []
+        if embeddings is None or len(embeddings) == 0:
+            return {}
+
+        matrix = _normalize(np.asarray(embeddings, dtype=np.float32))
+        grouped: Dict[str, List[int]] = {}
+        for row, metadata in enumerate(metadatas):
+            ticket = metadata.get("jira_ticket") if isinstance(metadata, dict) else None
+            if ticket:
+                grouped.setdefault(ticket, []).append(row)
+        # 티켓당 문서가 여러 개면 평균 벡터 사용
+        return {
+            ticket: matrix[rows[0]] if len(rows) == 1 else _normalize(matrix[rows].mean(axis=0, keepdims=True))[0]
+            for ticket, rows in grouped.items()
+        }
+
+    def build(self, force: bool = False) -> bool:
+        """카테고리별 중심 벡터 계산
+
+        카테고리는 현재 공수 산정 데이터 기준 (카테고리 수정 시 재임베딩 없이 반영),
+        벡터는 Chroma 저장값 사용. 데이터 버전이 같으면 다시 계산하지 않음
+        """
+        with self._lock:
+            estimations = effort_manager.get_all_estimations()
+            build_key = (effort_manager.data_version, get_active_index_dir(collection_name("effort")))  # 재색인 전환 시에도 다시 계산
+            if not force and self._built_key == build_key and self.is_trained:
+                return True
+
+            start = time.perf_counter()
+            self.ticket_vectors = self._load_ticket_vectors()
+
+            label_rows: Dict[str, List[np.ndarray]] = {}
+            for est in estimations:
+                if not (est.major_category and est.minor_category and est.sub_category):
+                    continue
+                vector = self.ticket_vectors.get(est.jira_ticket)
+                if vector is None:
+                    continue
+                label = f"{est.major_category} > {est.minor_category} > {est.sub_category}"
+                label_rows.setdefault(label, []).append(vector)
+
+            labels = sorted(label for label, rows in label_rows.items() if len(rows) >= _MIN_SAMPLES_PER_LABEL)
+            if not labels:
+                logger.warning("임베딩 분류기: 카테고리가 지정된 임베딩이 없습니다")
+                self.classes_, self.centroids = np.array([], dtype=object), None
+                self._built_key = build_key
+                return False
+
+            centroids = _normalize(np.stack([np.mean(label_rows[label], axis=0) for label in labels]))
+            self.classes_, self.centroids = np.array(labels, dtype=object), centroids
+            self._built_key = build_key
+            logger.info(f"임베딩 분류기 중심 벡터 계산: 카테고리 {len(labels)}개, 티켓 {len(self.ticket_vectors)}개 "
+                        f"({(time.perf_counter() - start) * 1000:.0f}ms)")
+            return True
+
+    def _query_vectors(self, texts: List[str], tickets: Optional[List[Optional[str]]] = None) -> np.ndarray:
+        """분류 대상 벡터 (저장된 티켓 임베딩 재사용, 없는 것만 한 번에 임베딩)"""
+        vectors: List[Optional[np.ndarray]] = [
+            self.ticket_vectors.get(ticket) if ticket else None
+            for ticket in (tickets or [None] * len(texts))
+        ]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = _normalize(np.asarray(
+                get_embedding_function().embed_documents([texts[i] for i in missing]), dtype=np.float32
+            ))
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+        return np.stack(vectors)
+
+    def classify_batch(self, texts: List[str], top_k: int = 1,
+                       tickets: Optional[List[Optional[str]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 텍스트를 한 번에 분류 (코사인 유사도 행렬 1회 계산)
+
+        Args:
+            texts: 분류할 텍스트 (저장된 임베딩이 없는 경우에만 임베딩)
+            top_k: 텍스트별 상위 카테고리 수
+            tickets: 텍스트별 Jira 티켓 (있으면 Chroma 저장 임베딩 사용)
+
+        Returns:
+            (labels, confidences): (len(texts), top_k) 배열, 신뢰도 내림차순
+        """
+        if not self.is_trained:
+            raise RuntimeError("임베딩 분류기가 준비되지 않았습니다")
+        # 다른 스레드의 build()가 교체해도 같은 버전의 카테고리/중심 벡터를 사용
+        classes, centroids = self.classes_, self.centroids
+        top_k = max(1, min(top_k, len(classes)))
+        if not texts:
+            return np.empty((0, top_k), dtype=object), np.empty((0, top_k), dtype=float)
+
+        similarities = self._query_vectors(texts, tickets) @ centroids.T
+        # 유사도를 확률처럼 쓸 수 있도록 softmax (기존 신뢰도 구간 0.5/0.3/0.1과 호환)
+        logits = similarities / _SOFTMAX_TEMPERATURE
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        if top_k == 1:
+            top_indices = probabilities.argmax(axis=1)[:, None]
+        else:
+            candidates = np.argpartition(-probabilities, top_k - 1, axis=1)[:, :top_k]
+            order = np.argsort(-np.take_along_axis(probabilities, candidates, axis=1), axis=1)
+            top_indices = np.take_along_axis(candidates, order, axis=1)
+        return classes[top_indices], np.take_along_axis(probabilities, top_indices, axis=1)
+
+
+# 전역 인스턴스
+embedding_classifier = EmbeddingCentroidClassifier()
@@ -881,7 +881,7 @@ class JiraIntegration:
                 # 기존 데이터 확인
                 existing = None
                 if estimation.jira_ticket:
-                    for existing_est in effort_manager.estimations:
+                    for existing_est in effort_manager.get_all_estimations():
                         if existing_est.jira_ticket == estimation.jira_ticket:
                             existing = existing_est
                             break
@@ -0,0 +1,12 @@
+"""
+pytest 공통 설정
+백엔드 모듈이 import 시 만드는 공유 상태/SQLite 저장소를 임시 디렉토리로 돌려 저장소 데이터를 건드리지 않음
+"""
+
+import os
+import tempfile
+
+_TEST_STATE_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ.setdefault("SHARED_STATE_DIR", os.path.join(_TEST_STATE_DIR, "shared_state"))
+os.environ.setdefault("EFFORT_TEXT_STORE_DB", os.path.join(_TEST_STATE_DIR, "effort_texts.db"))
+os.environ.setdefault("QA_STORE_DB", os.path.join(_TEST_STATE_DIR, "qa_store.db"))
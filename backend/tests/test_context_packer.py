@@ -0,0 +1,105 @@
+"""
+QA 컨텍스트 압축 테스트 (토큰 예산, 중복 제외, 필드 자르기)
+"""
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_core")
+
+from langchain_core.documents import Document
+
+from backend.services.context_packer import (
+    DOCUMENT_SEPARATOR, MIN_FIELD_TOKENS, TRUNCATABLE_FIELDS, count_tokens, pack_documents,
+)
+
+
+def _effort_doc(ticket, title, story_points, description="", comments="", reason="화면 1개 + API 2개"):
+    text = "\n".join([
+        f"Jira 티켓: {ticket}",
+        f"제목: {title}",
+        f"Story Points: {story_points}",
+        "담당자: 김개발",
+        f"산정 이유: {reason}",
+        f"설명: {description}",
+        f"댓글: {comments}",
+        "비고: ",
+    ])
+    return Document(page_content=text, metadata={"jira_ticket": ticket, "title": title, "story_points": story_points})
+
+
+def _context_tokens(packed):
+    return count_tokens(DOCUMENT_SEPARATOR.join(doc.page_content for doc in packed))
+
+
+def test_budget_zero_returns_documents_unchanged():
+    documents = [_effort_doc("ENOMIX-1", "상담 이력 조회", 3)]
+    packed, stats = pack_documents(documents, budget=0)
+    assert packed is documents
+    assert stats["documents_out"] == 1 and stats["compressed"] == 0
+
+
+def test_same_title_and_points_keeps_first_ranked():
+    """제목+Story Points가 같은 티켓은 앞 순위 1건만 사용 (검색 순위 유지)"""
+    documents = [
+        _effort_doc("ENOMIX-1", "상담 이력 조회", 3, description="목록 화면"),
+        _effort_doc("ENOMIX-2", "채팅 상담 배정", 5, description="배정 규칙"),
+        _effort_doc("ENOMIX-3", "상담 이력  조회", 3, description="다른 설명"),
+    ]
+    packed, stats = pack_documents(documents, budget=2000)
+    assert [doc.metadata["jira_ticket"] for doc in packed] == ["ENOMIX-1", "ENOMIX-2"]
+    assert stats["duplicates_dropped"] == 1
+
+
+def test_near_duplicate_body_is_dropped():
+    """제목이 달라도 본문이 거의 같으면 제외"""
+    description = " ".join(f"조건{i}: 상담 이력 {i}번째 항목 검증" for i in range(12))
+    documents = [
+        _effort_doc("ENOMIX-1", "상담 이력 조회", 3, description=description),
+        _effort_doc("ENOMIX-2", "상담 이력 조회 복사", 3, description=description),
+    ]
+    packed, stats = pack_documents(documents, budget=2000)
+    assert len(packed) == 1
+    assert stats["duplicates_dropped"] == 1
+
+
+def test_empty_fields_removed_and_long_fields_capped():
+    """빈 필드는 빼고 설명은 문서별 상한까지만 남기며 원본 문서는 바꾸지 않음"""
+    document = _effort_doc("ENOMIX-1", "상담 이력 조회", 3, description="설명 " * 2000)
+    original = document.page_content
+    packed, stats = pack_documents([document], budget=5000)
+    text = packed[0].page_content
+    assert "비고:" not in text and "댓글:" not in text
+    assert "Jira 티켓: ENOMIX-1" in text and "산정 이유: 화면 1개 + API 2개" in text
+    description = next(line for line in text.splitlines() if line.startswith("설명: "))
+    assert count_tokens(description[len("설명: "):]) <= TRUNCATABLE_FIELDS["설명"] + 1
+    assert document.page_content == original
+    assert stats["compressed"] == 1
+
+
+def test_context_stays_within_budget():
+    """예산을 넘는 문서는 줄이거나 제외해서 전체 컨텍스트가 예산 이하"""
+    documents = [
+        _effort_doc(f"ENOMIX-{i}", f"기능 {i} 개발", i % 5 + 1, description=f"{i}번 기능 상세 설명 " * 80,
+                    comments=f"{i}번 검토 의견 " * 40)
+        for i in range(12)
+    ]
+    budget = 600
+    packed, stats = pack_documents(documents, budget=budget)
+    assert 0 < len(packed) < len(documents)
+    assert stats["over_budget_dropped"] > 0
+    assert stats["documents_out"] == len(packed)
+    assert stats["context_tokens"] <= budget
+    assert _context_tokens(packed) <= budget + len(packed)
+    # 남은 문서는 검색 순위 그대로
+    tickets = [doc.metadata["jira_ticket"] for doc in packed]
+    assert tickets == sorted(tickets, key=lambda ticket: int(ticket.split("-")[1]))
+
+
+def test_first_document_is_shrunk_instead_of_dropped():
+    """첫 문서는 예산보다 커도 자를 수 있는 필드를 줄여서 포함"""
+    document = _effort_doc("ENOMIX-1", "상담 이력 조회", 3, description="설명 " * 500, comments="댓글 " * 300)
+    packed, stats = pack_documents([document], budget=MIN_FIELD_TOKENS * 4)
+    assert len(packed) == 1
+    assert stats["over_budget_dropped"] == 0
+    assert count_tokens(packed[0].page_content) < count_tokens(document.page_content)
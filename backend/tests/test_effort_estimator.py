@@ -0,0 +1,82 @@
+"""
+공수 통계 추정 테스트 (가중 분위수, 이상치 제외, 제목 검색 결과 순위)
+"""
+
+import pytest
+
+pytest.importorskip("dotenv")
+np = pytest.importorskip("numpy")
+
+from backend.services.effort_estimator import (
+    MIN_SAMPLES_FOR_OUTLIERS, estimate_from_samples, format_estimate_block, rank_title_matches, weighted_quantiles,
+)
+
+
+def _samples(points):
+    return [{"jira_ticket": f"ENOMIX-{i}", "title": f"기능 {i}", "story_points": value} for i, value in enumerate(points)]
+
+
+def test_weighted_quantiles_equal_weights_match_median():
+    values = np.array([5.0, 1.0, 3.0, 2.0, 4.0, 8.0])
+    assert weighted_quantiles(values, np.ones(len(values)), [0.5]) == [pytest.approx(float(np.median(values)))]
+
+
+def test_rank_weights_pull_median_toward_top_results():
+    """1위 2일, 2위 4일 → 가중치 1 : 1/√2 이므로 중앙값은 3보다 2에 가까움"""
+    estimate = estimate_from_samples(_samples([2, 4]))
+    assert estimate["median"] == pytest.approx(2.83, abs=0.01)
+    assert [sample["weight"] for sample in estimate["samples"]] == [1.0, pytest.approx(0.707, abs=0.001)]
+    assert estimate["p25"] <= estimate["median"] <= estimate["p75"]
+    assert (estimate["min"], estimate["max"]) == (2.0, 4.0)
+
+
+def test_iqr_outlier_excluded_from_statistics():
+    """IQR 1.5배 밖의 값은 이상치로 표시하고 통계에서 제외"""
+    estimate = estimate_from_samples(_samples([3, 3, 4, 3, 30]))
+    assert estimate["count"] == 5 and estimate["used_count"] == 4
+    assert [outlier["story_points"] for outlier in estimate["outliers"]] == [30.0]
+    assert estimate["max"] == 4.0
+    assert estimate["median"] == 3.0
+    assert [sample["outlier"] for sample in estimate["samples"]] == [False, False, False, False, True]
+
+
+def test_small_sample_keeps_extreme_values():
+    """표본이 MIN_SAMPLES_FOR_OUTLIERS개 미만이면 이상치를 제외하지 않음"""
+    points = [1, 100, 2][:MIN_SAMPLES_FOR_OUTLIERS - 1]
+    estimate = estimate_from_samples(_samples(points))
+    assert estimate["outliers"] == []
+    assert estimate["used_count"] == len(points)
+    assert estimate["max"] == 100.0
+
+
+def test_invalid_and_duplicate_samples_skipped():
+    samples = _samples([3, None, 0, "abc", -1, 5]) + [{"jira_ticket": "ENOMIX-0", "title": "중복", "story_points": 50}]
+    estimate = estimate_from_samples(samples)
+    assert estimate["count"] == 2
+    assert [sample["jira_ticket"] for sample in estimate["samples"]] == ["ENOMIX-0", "ENOMIX-5"]
+
+
+def test_no_valid_samples():
+    estimate = estimate_from_samples(_samples([None, 0]))
+    assert estimate["count"] == 0 and estimate["used_count"] == 0
+    assert "median" not in estimate
+    assert format_estimate_block(estimate) == ""
+
+
+def test_customer_buffer_applied_to_quantiles():
+    estimate = estimate_from_samples(_samples([2, 3, 4, 5]), buffer_percent=20)
+    for key in ("median", "p25", "p75"):
+        assert estimate["buffered"][key] == pytest.approx(estimate[key] * 1.2, abs=0.01)
+    assert "고객사 버퍼 +20%" in format_estimate_block(estimate)
+
+
+def test_rank_title_matches_orders_by_relevance():
+    """제목 완전 일치 → 바이그램 유사도 순 (저장 순서와 무관), 상위 k개"""
+    rows = [
+        {"jira_ticket": "E-1", "title": "채팅 상담 배정 규칙 관리"},
+        {"jira_ticket": "E-2", "title": "상담 이력 조회 엑셀 다운로드"},
+        {"jira_ticket": "E-3", "title": "상담이력 조회"},
+        {"jira_ticket": "E-4", "title": "상담 이력 조회 화면"},
+    ]
+    ranked = rank_title_matches("상담 이력 조회", rows, k=3)
+    assert [row["jira_ticket"] for row in ranked] == ["E-3", "E-4", "E-2"]
@@ -0,0 +1,129 @@
+"""
+공수 목록 조회 인덱스 테스트 (키셋 커서 / 페이지 기반 페이지네이션 결과 일치)
+"""
+
+import base64
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from backend.services.effort_estimation import EffortEstimation
+from backend.services.effort_query import LIST_FIELDS, EffortQueryIndex, decode_cursor, encode_cursor
+
+PAGE_SIZE = 4
+
+
+def _estimations():
+    """정렬 값이 겹치거나 비어 있는 행을 섞은 테스트 데이터"""
+    rows = []
+    for i in range(23):
+        rows.append(EffortEstimation(
+            jira_ticket=f"ENOMIX-{100 + (i * 7) % 23}",
+            title=f"{'상담' if i % 3 else '채팅'} 기능 {i % 5}",
+            story_points=None if i % 6 == 0 else float(i % 4) + 0.5,
+            estimation_reason="이유" if i % 2 else None,
+            tech_stack=["Java", "Spring"] if i % 4 == 0 else None,
+            team_member=["김", "이", "박", None][i % 4],
+            created_date=f"2026-0{1 + i % 9}-1{i % 10}",
+            major_category=["상담", "채팅"][i % 2],
+            minor_category=["조회", "등록", ""][i % 3],
+            epic_key=f"ENOMIX-{i % 3}" if i % 5 else None,
+            story_points_original=None if i % 4 == 1 else float(i % 3),
+        ))
+    return rows
+
+
+@pytest.fixture(scope="module")
+def index():
+    return EffortQueryIndex(_estimations(), version=1)
+
+
+def _walk_pages(index, **kwargs):
+    tickets, page = [], 1
+    while True:
+        result = index.query(page=page, page_size=PAGE_SIZE, **kwargs)
+        if not result["estimations"]:
+            return tickets
+        tickets += [row["jira_ticket"] for row in result["estimations"]]
+        page += 1
+
+
+def _walk_cursor(index, **kwargs):
+    tickets, cursor = [], None
+    while True:
+        result = index.query(page_size=PAGE_SIZE, cursor=cursor, **kwargs)
+        tickets += [row["jira_ticket"] for row in result["estimations"]]
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return tickets
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", [None, *LIST_FIELDS])
+def test_cursor_pages_match_page_pages(index, sort_by, sort_order):
+    """컬럼/방향별로 커서로 끝까지 넘긴 결과가 페이지 번호로 넘긴 결과와 같고 중복/누락이 없음"""
+    by_page = _walk_pages(index, sort_by=sort_by, sort_order=sort_order)
+    by_cursor = _walk_cursor(index, sort_by=sort_by, sort_order=sort_order)
+    assert by_cursor == by_page
+    assert sorted(by_cursor) == sorted(row["jira_ticket"] for row in index.rows)
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", ["story_points", "title", "team_member"])
+def test_cursor_pages_match_page_pages_with_filters(index, sort_by, sort_order):
+    """카테고리/검색 필터가 있어도 커서와 페이지 결과가 같음"""
+    filters = {"major_category": "상담", "search": "상담", "sort_by": sort_by, "sort_order": sort_order}
+    by_cursor = _walk_cursor(index, **filters)
+    assert by_cursor == _walk_pages(index, **filters)
+    assert by_cursor and len(by_cursor) == index.query(**filters)["total_count"]
+
+
+def test_sequence_numbers_continue_across_cursor_pages(index):
+    """커서 페이지의 순번은 이전 페이지 다음부터 이어짐"""
+    first = index.query(sort_by="story_points", page_size=PAGE_SIZE)
+    second = index.query(sort_by="story_points", page_size=PAGE_SIZE, cursor=first["next_cursor"])
+    assert [row["sequence_number"] for row in second["estimations"]] == list(range(PAGE_SIZE + 1, 2 * PAGE_SIZE + 1))
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor((1, "상담"), "ENOMIX-1", 3)) == ((1, "상담"), "ENOMIX-1", 3)
+
+
+def test_invalid_cursor_and_sort_column(index):
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        index.query(sort_by="description")
+
+
+@pytest.mark.parametrize("payload", [[0, "x", "ENOMIX-1", 0], [1, 3.5, "ENOMIX-1", 0], [2, "x", "ENOMIX-1", 0],
+                                     [True, 1, "ENOMIX-1", 0], [0, 1, None, 0], [0, 1, "ENOMIX-1", -1]])
+def test_cursor_with_mismatched_types_is_rejected(index, payload):
+    """형식은 맞지만 정렬 키 타입이 다른 커서는 정렬 비교 전에 ValueError (API 400)"""
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+    with pytest.raises(ValueError):
+        index.query(sort_by="story_points", cursor=cursor)
+
+
+def _walk_cursor_from(index, cursor, **kwargs):
+    tickets = []
+    while cursor:
+        result = index.query(page_size=PAGE_SIZE, cursor=cursor, **kwargs)
+        tickets += [row["jira_ticket"] for row in result["estimations"]]
+        cursor = result["next_cursor"]
+    return tickets
+
+
+def test_default_order_cursor_survives_rows_added_and_removed():
+    """기본 순서 커서는 앞쪽 행이 추가/삭제되어도 커서 티켓 다음부터 이어서 조회"""
+    estimations = _estimations()
+    first = EffortQueryIndex(estimations, version=1).query(page_size=PAGE_SIZE)
+    seen = [row["jira_ticket"] for row in first["estimations"]]
+
+    # 첫 페이지의 두 행 삭제 + 맨 앞에 한 행 추가 (커서 티켓의 위치가 1칸 앞당겨짐)
+    changed = [EffortEstimation(jira_ticket="ENOMIX-NEW", title="추가", story_points=1.0)] + estimations[2:]
+    rest = _walk_cursor_from(EffortQueryIndex(changed, version=2), first["next_cursor"])
+    assert rest == [est.jira_ticket for est in estimations[PAGE_SIZE:]]
+    assert not set(seen) & set(rest)
@@ -8,9 +8,52 @@ load_dotenv()
 # 환경 변수로 Chroma DB 경로를 설정할 수 있음 (로컬/서버 구분용)
 CHROMA_DIR = os.getenv("CHROMA_DIR", "./data/chroma_db")
 DOCS_DIR = "./data/docs"
+# 메인 벡터 DB 재색인 빌드 디렉토리 (빌드별 하위 디렉토리 + 현재 사용 중인 색인 포인터 active.json)
+# 포인터가 없으면 CHROMA_DIR을 그대로 사용
+VECTOR_INDEX_BUILDS_DIR = os.getenv("VECTOR_INDEX_BUILDS_DIR", os.path.join(os.path.dirname(CHROMA_DIR) or ".", "chroma_builds"))
 STATIC_DIR = "./frontend"
 LOG_DIR = "./logs"
 
+# QA 응답/피드백 이벤트 로그 및 주간 집계 저장소 (SQLite)
+QA_STORE_DB = os.getenv("QA_STORE_DB", os.path.join(DOCS_DIR, "qa_store.db"))
+# 슬랙 메시지 ↔ 질문-답변 매핑 보관 기간 (일, 이후 이모지 피드백 대상에서 제외)
+SLACK_QA_MAPPING_TTL_DAYS = int(os.getenv("SLACK_QA_MAPPING_TTL_DAYS", "90"))
+# 공수 산정 긴 텍스트(description, comments) 저장소 (SQLite, 워커 메모리 절감용)
+EFFORT_TEXT_STORE_DB = os.getenv("EFFORT_TEXT_STORE_DB", os.path.join(DOCS_DIR, "effort_texts.db"))
+# 멀티 워커 공유 상태 디렉토리 (잠금 파일, 공유 버전, 동기화 진행 상태)
+SHARED_STATE_DIR = os.getenv("SHARED_STATE_DIR", os.path.join(DOCS_DIR, "shared_state"))
+# 학습된 카테고리 분류 모델 저장 파일 (기동 시 재학습 없이 로드)
+CATEGORY_MODEL_FILE = os.getenv("CATEGORY_MODEL_FILE", os.path.join(DOCS_DIR, "category_classifier.pkl"))
+# 카테고리 자동 분류 방식 (tfidf: TF-IDF + Naive Bayes, embedding: Chroma 저장 임베딩 최근접 중심 벡터)
+CATEGORY_CLASSIFIER_BACKEND = os.getenv("CATEGORY_CLASSIFIER_BACKEND", "tfidf").strip().lower()
+# 벡터 저장소 엔진 (chroma: Chroma 영구 클라이언트, numpy: 로컬 memory-map .npy 인덱스)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").strip().lower()
+# numpy 엔진 임베딩 저장 형식 (none: float32, int8: int8 양자화로 파일/메모리 1/4)
+VECTOR_QUANTIZE = os.getenv("VECTOR_QUANTIZE", "none").strip().lower()
+# 메인 벡터 DB 컬렉션 구성 (family: 소스 계열별 컬렉션 - 공수 티켓/PDF/텍스트/크롤링 페이지, single: 기존 단일 컬렉션)
+VECTOR_COLLECTION_LAYOUT = os.getenv("VECTOR_COLLECTION_LAYOUT", "family").strip().lower()
+# 공수 QA MMR 재정렬 λ (1: 관련도만, 0: 다양성만, LangChain 기본값 0.5)
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.5"))
+# 공수 QA 프롬프트에 넣을 검색 문서 컨텍스트 토큰 예산 (설명/댓글을 문서별로 자르고 중복 티켓 제외, 0이면 압축 안 함)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+# 일괄 공수 산정 (/effort/ask/batch, 슬랙 "일괄" 명령): 동시에 실행할 답변 생성 수 / 요청당 최대 요구사항 줄 수
+EFFORT_BATCH_CONCURRENCY = int(os.getenv("EFFORT_BATCH_CONCURRENCY", "4"))
+EFFORT_BATCH_MAX_LINES = int(os.getenv("EFFORT_BATCH_MAX_LINES", "100"))
+# 질문 임베딩 LRU 캐시 크기 (프로세스당, 피드백 검색/메인 검색 공유, 0이면 캐시 안 함)
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+# 기동 프로파일 모드 (모듈별 import 시간과 기동 단계별 소요 시간을 로그로 출력)
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+# 기동 시 백그라운드로 미리 준비할 구성요소 (쉼표 구분, 비우면 워밍업 생략)
+# vectordb, feedback_vectordb, query_index, customer_weights, embedding_ping, category_classifier
+WARMUP_COMPONENTS = [
+    name.strip() for name in os.getenv(
+        "WARMUP_COMPONENTS", "vectordb,feedback_vectordb,query_index,customer_weights,embedding_ping,category_classifier"
+    ).split(",") if name.strip()
+]
+# 실패한 기동 단계 재시도 간격 (초, 실패할 때마다 2배씩 최대값까지 늘림)
+READINESS_RETRY_SECONDS = float(os.getenv("READINESS_RETRY_SECONDS", "30"))
+READINESS_RETRY_MAX_SECONDS = float(os.getenv("READINESS_RETRY_MAX_SECONDS", "600"))
+
 # Create directories if they don't exist
 for directory in [CHROMA_DIR, DOCS_DIR, STATIC_DIR, LOG_DIR]:
     os.makedirs(directory, exist_ok=True)
@@ -19,6 +62,16 @@ for directory in [CHROMA_DIR, DOCS_DIR, STATIC_DIR, LOG_DIR]:
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 
+# Slack Web API 클라이언트 설정
+SLACK_HTTP_POOL_SIZE = int(os.getenv("SLACK_HTTP_POOL_SIZE", "10"))  # 공유 세션 최대 연결 수
+SLACK_MAX_RETRIES = int(os.getenv("SLACK_MAX_RETRIES", "3"))  # 429/연결 오류 재시도 횟수
+
+# Slack 질문 처리 큐 설정
+SLACK_WORKER_COUNT = int(os.getenv("SLACK_WORKER_COUNT", "2"))  # 동시에 실행할 QA 체인 수
+SLACK_QUEUE_MAX_SIZE = int(os.getenv("SLACK_QUEUE_MAX_SIZE", "20"))  # 대기 가능한 최대 질문 수
+SLACK_DEDUP_TTL_SECONDS = int(os.getenv("SLACK_DEDUP_TTL_SECONDS", "600"))  # 중복 이벤트 판별 보관 시간
+SLACK_USER_RATE_LIMIT = int(os.getenv("SLACK_USER_RATE_LIMIT", "5"))  # 사용자별 분당 최대 질문 수
+
 # Logging configuration
 # 로그 파일 경로는 api.py에서 동적으로 생성
 # - 기동 로그: app_startup_YYYYMMDD_HHMMSS.log (매번 초기화)
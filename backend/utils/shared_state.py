@@ -0,0 +1,228 @@
+"""
+멀티 워커 공유 상태 모듈
+- 프로세스 간 파일 잠금 (fcntl.flock, 같은 프로세스 안에서는 재진입 가능)
+- 원자적 JSON 쓰기 (임시 파일 + os.replace, 읽는 쪽이 반쯤 쓰인 파일을 보지 않음)
+- 공유 버전 카운터 (한 워커가 데이터를 바꾸면 다른 워커 캐시가 다시 로드하도록 알림)
+- 파일 기반 공유 상태 레코드 (동기화 진행 상태 등)
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from .config import SHARED_STATE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 프로세스 간 잠금 없이 단일 프로세스로 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_VERSIONS_FILE = os.path.join(SHARED_STATE_DIR, "versions.json")
+
+
+class InterProcessLock:
+    """프로세스 간 배타 잠금 (같은 프로세스 안에서는 재진입 가능)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+            self._depth += 1
+        except Exception:
+            if self._depth == 0 and self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        try:
+            self._depth -= 1
+            if self._depth == 0 and self._fd is not None:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+_locks: Dict[str, InterProcessLock] = {}
+_locks_guard = threading.Lock()
+
+
+def get_lock(name: str) -> InterProcessLock:
+    """이름별 공유 잠금 (SHARED_STATE_DIR/<name>.lock)"""
+    with _locks_guard:
+        lock = _locks.get(name)
+        if lock is None:
+            lock = InterProcessLock(os.path.join(SHARED_STATE_DIR, f"{name}.lock"))
+            _locks[name] = lock
+        return lock
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """파일 원자적 쓰기 (같은 디렉토리 임시 파일에 쓰고 os.replace)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs):
+    """JSON 파일 원자적 쓰기"""
+    atomic_write_bytes(path, json.dumps(data, ensure_ascii=False, **dump_kwargs).encode("utf-8"))
+
+
+def file_stamp(path: str) -> Optional[str]:
+    """파일 스탬프 (inode + 수정 시각 + 크기, 파일 없으면 None)
+
+    os.replace로 교체하면 inode가 바뀌므로 같은 시각에 같은 크기로 다시 써도 구분됨
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+# 버전 파일 파싱 캐시 (스탬프가 같으면 다시 읽지 않음)
+_versions_cache: Dict[str, Any] = {"stamp": None, "versions": {}}
+
+
+def _read_versions() -> Dict[str, int]:
+    stamp = file_stamp(_VERSIONS_FILE)
+    if stamp is None:
+        return {}
+    if stamp != _versions_cache["stamp"]:
+        try:
+            with open(_VERSIONS_FILE, 'r', encoding='utf-8') as f:
+                _versions_cache["versions"] = json.load(f)
+            _versions_cache["stamp"] = stamp
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 공유 버전 파일 읽기 실패: {e}")
+    return _versions_cache["versions"]
+
+
+def get_version(name: str) -> int:
+    """공유 버전 조회 (다른 워커가 변경하면 값이 바뀜)"""
+    return int(_read_versions().get(name, 0))
+
+
+def bump_version(name: str) -> int:
+    """공유 버전 증가 (데이터를 바꾼 워커가 호출)
+
+    Returns:
+        int: 증가된 버전
+    """
+    with get_lock("versions"):
+        versions = dict(_read_versions())
+        versions[name] = int(versions.get(name, 0)) + 1
+        atomic_write_json(_VERSIONS_FILE, versions)
+        return versions[name]
+
+
+class SharedStatus:
+    """워커 간 공유되는 상태 레코드 (SHARED_STATE_DIR/<name>.json)
+
+    dict처럼 읽고 쓸 수 있으며, 쓰기는 잠금 안에서 파일 전체를 원자적으로 교체
+    """
+
+    def __init__(self, name: str, defaults: Dict[str, Any]):
+        self.name = name
+        self.defaults = dict(defaults)
+        self.path = os.path.join(SHARED_STATE_DIR, f"{name}.json")
+        self._lock = get_lock(name)
+        self._cache_stamp = None
+        self._cache: Dict[str, Any] = dict(defaults)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 상태 전체 (다른 워커가 쓴 값 포함)"""
+        stamp = file_stamp(self.path)
+        if stamp is not None and stamp != self._cache_stamp:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._cache = {**self.defaults, **json.load(f)}
+                self._cache_stamp = stamp
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ 공유 상태 읽기 실패 ({self.name}): {e}")
+        return dict(self._cache)
+
+    def update(self, **fields) -> Dict[str, Any]:
+        """여러 필드를 한 번에 갱신"""
+        with self._lock:
+            state = self.snapshot()
+            state.update(fields)
+            self._write(state)
+            return state
+
+    def increment(self, field: str, amount: int = 1) -> int:
+        """숫자 필드 증가 (읽기-수정-쓰기를 잠금 안에서 수행)"""
+        with self._lock:
+            state = self.snapshot()
+            state[field] = state.get(field, 0) + amount
+            self._write(state)
+            return state[field]
+
+    def append(self, field: str, value: Any):
+        """목록 필드에 항목 추가"""
+        with self._lock:
+            state = self.snapshot()
+            state[field] = list(state.get(field) or []) + [value]
+            self._write(state)
+
+    def try_set(self, field: str, expected: Any, value: Any, **fields) -> bool:
+        """field가 expected일 때만 value로 바꾸고 나머지 필드도 갱신 (여러 워커 중 하나만 성공)"""
+        with self._lock:
+            state = self.snapshot()
+            if state.get(field) != expected:
+                return False
+            state[field] = value
+            state.update(fields)
+            self._write(state)
+            return True
+
+    def _write(self, state: Dict[str, Any]):
+        atomic_write_json(self.path, state)
+        self._cache = dict(state)
+        self._cache_stamp = file_stamp(self.path)
+
+    def __getitem__(self, field: str) -> Any:
+        return self.snapshot()[field]
+
+    def __setitem__(self, field: str, value: Any):
+        self.update(**{field: value})
+
+    def get(self, field: str, default: Any = None) -> Any:
+        return self.snapshot().get(field, default)
@@ -1,45 +1,28 @@
-import requests
+import asyncio
 import logging
-import json
-import os
 import re
 from datetime import datetime
-from ..utils.config import SLACK_BOT_TOKEN, DOCS_DIR
+from .slack_client import slack_client
 from .utils import format_sources
 from ..services.effort_qa import run_effort_qa_chain
 from ..services.mock_qa import mock_qa_response, mock_effort_qa_response
 from ..data.database import save_feedback_to_file
+from ..data.qa_store import save_slack_qa, get_slack_qa
 
 logger = logging.getLogger(__name__)
 
-# 질문-답변 매핑 저장 (메시지 타임스탬프 기반)
-# 형식: {message_ts: {"question": "...", "answer": "...", "sources": [...]}}
-_slack_qa_mapping = {}
+# 즉시 응답하는 명령어 (RAG 체인을 실행하지 않음)
+HELP_COMMANDS = ['도움말', 'help', 'helpt', '헬프', '가이드', 'guide', '명령어', 'commands']
+STATS_COMMANDS = ['통계', 'stats', '현황']
+# 일괄 산정 명령어 (첫 줄: "일괄 [고객사]", 다음 줄부터 요구사항 목록)
+BATCH_COMMANDS = ['일괄', '일괄산정', 'batch']
+# 일괄 산정 결과를 몇 줄씩 모아 전송할지 (줄마다 메시지를 보내지 않도록)
+BATCH_POST_EVERY = 10
 
-def load_slack_qa_mapping():
-    """슬랙 질문-답변 매핑 로드"""
-    global _slack_qa_mapping
-    try:
-        mapping_file = os.path.join(DOCS_DIR, "slack_qa_mapping.json")
-        if os.path.exists(mapping_file):
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                _slack_qa_mapping = json.load(f)
-            logger.info(f"📂 슬랙 QA 매핑 로드: {len(_slack_qa_mapping)}개")
-    except Exception as e:
-        logger.warning(f"⚠️ 슬랙 QA 매핑 로드 실패: {e}")
-        _slack_qa_mapping = {}
-
-def save_slack_qa_mapping():
-    """슬랙 질문-답변 매핑 저장"""
-    try:
-        mapping_file = os.path.join(DOCS_DIR, "slack_qa_mapping.json")
-        with open(mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(_slack_qa_mapping, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logger.error(f"❌ 슬랙 QA 매핑 저장 오류: {str(e)}")
-
-# 시작 시 매핑 로드
-load_slack_qa_mapping()
+def is_quick_command(text: str) -> bool:
+    """도움말/통계 등 즉시 응답 명령어 여부"""
+    clean_text = text.strip().lower()
+    return clean_text in HELP_COMMANDS or clean_text in STATS_COMMANDS
 
 def clean_mention(text: str) -> str:
     """슬랙 멘션 제거"""
@@ -63,70 +46,84 @@ def clean_slack_text(text: str) -> str:
     text = ' '.join(text.split())
     return text.strip()
 
-def post_slack_reply(channel: str, thread_ts: str, text: str, question: str = None, answer: str = None, sources: list = None):
-    """슬랙 메시지 전송 및 질문-답변 매핑 저장"""
+async def post_slack_reply(channel: str, thread_ts: str, text: str, question: str = None, answer: str = None, sources: list = None):
+    """슬랙 메시지 전송 및 질문-답변 매핑 저장 (공유 비동기 클라이언트, 채널별 순서 보장)"""
     try:
-        headers = {
-            "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-            "Content-Type": "application/json"
-        }
-        
         # 이모지 피드백 안내 추가 (공수 산정 답변인 경우만)
         if question and answer and "공수 산정 답변" in text:
             feedback_hint = "\n\n💡 *피드백*: 이 답변이 도움이 되셨나요? 👍 (thumbsup) = 도움됨, 👎 (thumbsdown) = 도움 안됨"
             text = text + feedback_hint
         
-        data = {
-            "channel": channel,
-            "thread_ts": thread_ts,
-            "text": text
-        }
+        message_ts = await slack_client.post_message(channel, thread_ts, text)  # 메시지 타임스탬프
+        if not message_ts:
+            return False
         
-        response = requests.post(
-            "https://slack.com/api/chat.postMessage",
-            headers=headers,
-            json=data,
-            verify=False  # SSL 검증 비활성화
-        )
+        # 질문-답변 매핑 저장 (공수 산정 답변인 경우만)
+        if question and answer:
+            save_slack_qa(message_ts, question, answer, sources, channel, thread_ts)
+            logger.info(f"💾 슬랙 QA 매핑 저장: {message_ts} -> {question[:30]}...")
         
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("ok"):
-                message_ts = result.get("ts")  # 메시지 타임스탬프
-                
-                # 질문-답변 매핑 저장 (공수 산정 답변인 경우만)
-                if question and answer and message_ts:
-                    _slack_qa_mapping[message_ts] = {
-                        "question": question,
-                        "answer": answer,
-                        "sources": sources or [],
-                        "channel": channel,
-                        "thread_ts": thread_ts,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    save_slack_qa_mapping()
-                    logger.info(f"💾 슬랙 QA 매핑 저장: {message_ts} -> {question[:30]}...")
-                
-                logger.info("✅ Slack message sent successfully")
-                return True
-            else:
-                logger.error(f"❌ Failed to send Slack message: {result.get('error')}")
-                return False
-        else:
-            logger.error(f"❌ Failed to send Slack message: {response.text}")
-            return False
+        logger.info("✅ Slack message sent successfully")
+        return True
             
     except Exception as e:
         logger.error(f"❌ Error sending Slack message: {str(e)}")
         return False 
 
 
+def _format_batch_line(event: dict) -> str:
+    """일괄 산정 결과 1줄 (슬랙 요약 형식)"""
+    estimate = event.get("estimate") or {}
+    prefix = f"{event['index'] + 1}. {event['line']}"
+    if not estimate.get("used_count"):
+        return f"{prefix} → 유사 작업 없음"
+    tickets = ", ".join(event.get("tickets", [])[:2])
+    days = estimate["buffered"]["median"] if estimate.get("buffered") else estimate["median"]
+    return f"{prefix} → *{days}일* ({estimate['p25']}~{estimate['p75']}일, 유사 {estimate['count']}건: {tickets})"
+
+
+async def handle_slack_batch(text: str, channel: str, thread_ts: str, customer: str = None):
+    """요구사항 목록 일괄 산정 (결과를 BATCH_POST_EVERY줄씩 모아 스레드에 전송, 마지막에 합계)"""
+    from ..services.effort_batch import parse_requirement_lines, stream_effort_batch
+    from ..utils.config import EFFORT_BATCH_MAX_LINES
+
+    lines = [line for line in (clean_slack_text(line) for line in parse_requirement_lines(text)) if line]
+    if not lines:
+        await post_slack_reply(channel, thread_ts, "📋 일괄 산정할 기능 목록을 `일괄` 다음 줄부터 한 줄에 하나씩 입력해주세요.")
+        return
+    if len(lines) > EFFORT_BATCH_MAX_LINES:
+        await post_slack_reply(channel, thread_ts, f"⚠️ 일괄 산정은 최대 {EFFORT_BATCH_MAX_LINES}줄까지 가능합니다 (입력: {len(lines)}줄).")
+        return
+
+    pending = []
+    async for event in stream_effort_batch(lines, customer):
+        if event["type"] == "start":
+            message = f"📋 *일괄 공수 산정* {event['lines']}줄 접수, 끝나는 순서대로 결과를 보내드립니다..."
+            if event["buffer_percent"]:
+                message += f" (고객사 {customer} 버퍼 +{event['buffer_percent']}%)"
+            await post_slack_reply(channel, thread_ts, message)
+        elif event["type"] == "line":
+            pending.append(_format_batch_line(event))
+            if len(pending) >= BATCH_POST_EVERY:
+                await post_slack_reply(channel, thread_ts, "\n".join(pending))
+                pending = []
+        elif event["type"] == "summary":
+            if pending:
+                await post_slack_reply(channel, thread_ts, "\n".join(pending))
+            total = event.get("total_buffered") or event["total"]
+            await post_slack_reply(
+                channel, thread_ts,
+                f"✅ *일괄 산정 합계*: {total['median']}일 (범위 {total['p25']}~{total['p75']}일)\n"
+                f"• 추정 {event['estimated_lines']}/{event['lines']}줄, 소요 {event['elapsed_ms'] / 1000:.1f}초"
+            )
+
+
 async def handle_slack_message(text: str, channel: str, thread_ts: str, message_ts: str):
     try:
         clean_text = text.strip().lower()
 
         # 도움말 명령어 처리
-        if clean_text in ['도움말', 'help', 'helpt', '헬프', '가이드', 'guide', '명령어', 'commands']:
+        if clean_text in HELP_COMMANDS:
             help_message = """🤖 *eNomix 공수 관리 봇 사용 가이드*
 
 📊 *프로젝트 전체 공수 조회* (중요!)
@@ -154,6 +151,7 @@ async def handle_slack_message(text: str, channel: str, thread_ts: str, message_
 
 💡 *기타 명령어*
 • `통계` - 전체 공수 데이터 통계 조회
+• `일괄` + 줄바꿈으로 구분한 기능 목록 - 기능별 공수 일괄 산정 (첫 줄에 `일괄 고객사명`으로 고객사 버퍼 적용)
 • `help` / `헬프` / `가이드` - 이 도움말 표시
 
 ━━━━━━━━━━━━━━━━━━━━━━
@@ -162,11 +160,11 @@ async def handle_slack_message(text: str, channel: str, thread_ts: str, message_
 답변이 도움이 되었다면 👍, 도움이 안 되었다면 👎 이모지를 눌러주세요!
 
 더 자세한 내용은 웹 페이지를 참고하세요: http://211.63.24.116:9000"""
-            post_slack_reply(channel, thread_ts, help_message)
+            await post_slack_reply(channel, thread_ts, help_message)
             return
 
         # 통계 조회 명령어 처리
-        if clean_text in ['통계', 'stats', '현황']:
+        if clean_text in STATS_COMMANDS:
             try:
                 from ..services.effort_qa import get_effort_statistics
                 stats = get_effort_statistics()
@@ -175,20 +173,28 @@ async def handle_slack_message(text: str, channel: str, thread_ts: str, message_
 • 총 데이터 수: {stats.get('total_estimations', 0)}개
 • 총 Story Points: {stats.get('total_story_points', 0)}일
 • 평균 Story Points: {stats.get('average_story_points', 0)}일"""
-                post_slack_reply(channel, thread_ts, stats_message)
+                await post_slack_reply(channel, thread_ts, stats_message)
                 return
             except Exception as e:
-                post_slack_reply(channel, thread_ts, "❌ 통계 조회 중 오류가 발생했습니다.")
+                await post_slack_reply(channel, thread_ts, "❌ 통계 조회 중 오류가 발생했습니다.")
                 return
 
+        # 일괄 산정 명령어 처리 (줄바꿈이 필요하므로 정제 전 원문 사용)
+        first_line, _, rest = text.strip().partition("\n")
+        command, _, customer = first_line.strip().partition(" ")
+        # "일괄 발송 공수" 같은 한 줄 질문은 일반 QA로 처리 (목록이 있거나 명령어만 입력한 경우만 일괄 산정)
+        if command.lower() in BATCH_COMMANDS and (rest.strip() or not customer.strip()):
+            await handle_slack_batch(rest, channel, thread_ts, customer.strip() or None)
+            return
+
         # 공수 산정 QA 처리 (키워드 필터링 제거 - run_effort_qa_chain 내부에서 처리)
         # 슬랙에서는 모든 질문을 공수 산정 QA로 처리하고, 내부에서 필터링하도록 변경
         try:
             # 슬랙 텍스트 정제 (멘션, 포맷팅 제거)
             cleaned_text = clean_slack_text(text)
             logger.info(f"🔍 슬랙 텍스트 정제: '{text}' -> '{cleaned_text}'")
-            # 정제된 텍스트 사용
-            result = run_effort_qa_chain(cleaned_text)
+            # 정제된 텍스트 사용 (동기 RAG 체인은 스레드에서 실행하여 이벤트 루프 블로킹 방지)
+            result = await asyncio.to_thread(run_effort_qa_chain, cleaned_text)
         except Exception as e:
             if "quota" in str(e).lower() or "insufficient_quota" in str(e).lower():
                 logger.warning("⚠️ OpenAI API 할당량 초과, 공수 산정 모의 응답 사용")
@@ -209,10 +215,10 @@ async def handle_slack_message(text: str, channel: str, thread_ts: str, message_
                 sources = result.get("sources", [])
                 sources_text = format_sources(sources)
                 final_message = f"{answer}{sources_text}"
-                post_slack_reply(channel, thread_ts, final_message)
+                await post_slack_reply(channel, thread_ts, final_message)
             else:
                 # 실제 오류인 경우
-                post_slack_reply(channel, thread_ts, f"📊 {error_msg}")
+                await post_slack_reply(channel, thread_ts, f"📊 {error_msg}")
             return
         
         # answer에 필터링 메시지가 포함되어 있는지 확인 (키워드 필터링에 걸린 경우)
@@ -224,7 +230,7 @@ async def handle_slack_message(text: str, channel: str, thread_ts: str, message_
             sources = result.get("sources", [])
             sources_text = format_sources(sources)
             final_message = f"{answer}{sources_text}"
-            post_slack_reply(channel, thread_ts, final_message)
+            await post_slack_reply(channel, thread_ts, final_message)
             return
         
         # 정상적인 답변인 경우
@@ -233,13 +239,13 @@ async def handle_slack_message(text: str, channel: str, thread_ts: str, message_
         final_message = f"📊 *공수 산정 답변*\n{answer}{sources_text}"
         
         # 질문-답변 매핑 저장을 위해 정보 전달 (정제된 텍스트 사용)
-        post_slack_reply(channel, thread_ts, final_message, question=cleaned_text, answer=answer, sources=sources)
+        await post_slack_reply(channel, thread_ts, final_message, question=cleaned_text, answer=answer, sources=sources)
 
     except Exception as e:
         logger.error(f"❌ Error handling Slack message: {str(e)}")
-        post_slack_reply(channel, thread_ts, "❌ 오류가 발생했습니다. 다시 시도해주세요.")
+        await post_slack_reply(channel, thread_ts, "❌ 오류가 발생했습니다. 다시 시도해주세요.")
 
-def handle_slack_reaction(event: dict):
+async def handle_slack_reaction(event: dict):
     """슬랙 이모지 리액션 처리 (피드백 수집) - 봇 메시지만 처리"""
     try:
         reaction = event.get("reaction", "")
@@ -263,7 +269,7 @@ def handle_slack_reaction(event: dict):
             return
         
         # 질문-답변 매핑에서 찾기 (봇이 보낸 메시지만 매핑에 있음)
-        qa_data = _slack_qa_mapping.get(item_ts)
+        qa_data = get_slack_qa(item_ts)
         if not qa_data:
             # 매핑이 없으면 봇 메시지가 아니므로 조용히 무시
             logger.info(f"ℹ️ 메시지 {item_ts}는 봇 메시지가 아니거나 피드백 대상이 아닙니다. (무시)")
@@ -297,7 +303,8 @@ def handle_slack_reaction(event: dict):
         }
         
         # 피드백 저장 시도
-        result = save_feedback_to_file(feedback_data)
+        # 피드백 저장 + 벡터 DB 인덱싱은 동기 작업이므로 스레드에서 실행 (이벤트 루프 블로킹 방지)
+        result = await asyncio.to_thread(save_feedback_to_file, feedback_data)
         
         if result.get("saved"):
             feedback_count = result.get("feedback_count", 1)
@@ -307,17 +314,17 @@ def handle_slack_reaction(event: dict):
                 logger.info(f"💾 슬랙 피드백 저장 완료 (새로운 세트): {feedback_type} - {question[:30]}...")
                 if channel:
                     feedback_message = f"{emoji_display} 피드백이 저장되었습니다. 감사합니다!"
-                    post_slack_reply(channel, thread_ts, feedback_message)
+                    await post_slack_reply(channel, thread_ts, feedback_message)
             else:
                 logger.info(f"📊 슬랙 피드백 카운트 증가: {feedback_type} - {question[:30]}... (총 {feedback_count}회)")
                 if channel:
                     feedback_message = f"{emoji_display} 피드백이 반영되었습니다. (총 {feedback_count}회) 감사합니다!"
-                    post_slack_reply(channel, thread_ts, feedback_message)
+                    await post_slack_reply(channel, thread_ts, feedback_message)
         else:
             logger.info(f"ℹ️ 슬랙 피드백 저장 실패: {feedback_type} - {question[:30]}...")
             if channel:
                 feedback_message = f"{emoji_display} 피드백 저장 중 오류가 발생했습니다."
-                post_slack_reply(channel, thread_ts, feedback_message)
+                await post_slack_reply(channel, thread_ts, feedback_message)
         
     except Exception as e:
         logger.error(f"❌ 슬랙 이모지 리액션 처리 오류: {str(e)}")
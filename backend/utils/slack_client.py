@@ -0,0 +1,154 @@
+"""
+슬랙 Web API 비동기 클라이언트
+- aiohttp 세션 공유로 연결 재사용 (매 응답마다 TLS 핸드셰이크 방지)
+- 429 Retry-After / 연결 오류 자동 재시도
+- 채널별 전송 큐로 메시지 순서 보장
+- 호출별 지연 시간 기록
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional, Dict, Any
+
+import aiohttp
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import (
+    AsyncRateLimitErrorRetryHandler,
+    AsyncConnectionErrorRetryHandler,
+)
+
+from .config import SLACK_BOT_TOKEN, SLACK_HTTP_POOL_SIZE, SLACK_MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# 채널 전송 워커가 유휴 상태로 대기하는 최대 시간 (초, 이후 워커 종료)
+_CHANNEL_WORKER_IDLE_SECONDS = 60
+# 지연 시간 통계용 최근 호출 보관 수
+_LATENCY_WINDOW = 500
+
+
+class SlackClient:
+    """공유 세션 기반 슬랙 메시지 전송 클라이언트"""
+
+    def __init__(self, token: str = SLACK_BOT_TOKEN):
+        self.token = token
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._client: Optional[AsyncWebClient] = None
+        self._channel_queues: Dict[str, asyncio.Queue] = {}
+        self._channel_workers: Dict[str, asyncio.Task] = {}
+        self._latencies = deque(maxlen=_LATENCY_WINDOW)
+        self._stats = {
+            "calls": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "max_latency_ms": 0.0,
+        }
+
+    def _get_client(self) -> AsyncWebClient:
+        """AsyncWebClient 지연 생성 (이벤트 루프 안에서 세션 생성)"""
+        if self._client is None or self._session is None or self._session.closed:
+            # 기존 requests 호출과 동일하게 SSL 검증 비활성화 (사내 프록시 환경)
+            connector = aiohttp.TCPConnector(limit=SLACK_HTTP_POOL_SIZE, ssl=False)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._client = AsyncWebClient(token=self.token, session=self._session)
+            self._client.retry_handlers.append(AsyncRateLimitErrorRetryHandler(max_retry_count=SLACK_MAX_RETRIES))
+            self._client.retry_handlers.append(AsyncConnectionErrorRetryHandler(max_retry_count=SLACK_MAX_RETRIES))
+            logger.info(f"✅ 슬랙 비동기 클라이언트 생성 (연결 풀: {SLACK_HTTP_POOL_SIZE}, 재시도: {SLACK_MAX_RETRIES}회)")
+        return self._client
+
+    async def post_message(self, channel: str, thread_ts: Optional[str], text: str) -> Optional[str]:
+        """채널 큐에 메시지를 넣고 전송 완료까지 대기
+
+        Returns:
+            str: 전송된 메시지 타임스탬프 (실패 시 None)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._channel_queues.get(channel)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._channel_queues[channel] = queue
+        await queue.put((thread_ts, text, future))
+
+        worker = self._channel_workers.get(channel)
+        if worker is None or worker.done():
+            self._channel_workers[channel] = asyncio.create_task(self._channel_worker(channel, queue))
+
+        return await future
+
+    async def _channel_worker(self, channel: str, queue: asyncio.Queue):
+        """채널별 순차 전송 워커 (유휴 시간 초과 시 종료)"""
+        while True:
+            try:
+                thread_ts, text, future = await asyncio.wait_for(queue.get(), timeout=_CHANNEL_WORKER_IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    self._channel_workers.pop(channel, None)
+                    self._channel_queues.pop(channel, None)
+                    return
+                continue
+
+            try:
+                ts = await self._send(channel, thread_ts, text)
+                if not future.done():
+                    future.set_result(ts)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                queue.task_done()
+
+    async def _send(self, channel: str, thread_ts: Optional[str], text: str) -> Optional[str]:
+        """chat.postMessage 호출 (지연 시간 기록)"""
+        client = self._get_client()
+        start = time.perf_counter()
+        try:
+            response = await client.chat_postMessage(channel=channel, thread_ts=thread_ts, text=text)
+            return response.get("ts")
+        except SlackApiError as e:
+            self._stats["errors"] += 1
+            if e.response is not None and e.response.status_code == 429:
+                self._stats["rate_limited"] += 1
+            logger.error(f"❌ Failed to send Slack message: {e.response.get('error') if e.response is not None else e}")
+            return None
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self._latencies.append(latency_ms)
+            self._stats["calls"] += 1
+            self._stats["max_latency_ms"] = max(self._stats["max_latency_ms"], latency_ms)
+            logger.debug(f"⏱️ chat.postMessage {latency_ms:.1f}ms (channel={channel})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """전송 통계 (호출 수, 오류 수, 최근 지연 시간 백분위)"""
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 1)
+
+        return {
+            **self._stats,
+            "max_latency_ms": round(self._stats["max_latency_ms"], 1),
+            "p50_latency_ms": percentile(0.5),
+            "p95_latency_ms": percentile(0.95),
+            "pending_by_channel": {channel: queue.qsize() for channel, queue in self._channel_queues.items() if queue.qsize()},
+        }
+
+    async def close(self):
+        """채널 워커 정리 및 세션 종료"""
+        for worker in list(self._channel_workers.values()):
+            worker.cancel()
+        self._channel_workers.clear()
+        self._channel_queues.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._client = None
+
+
+# 전역 인스턴스
+slack_client = SlackClient()
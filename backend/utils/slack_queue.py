@@ -0,0 +1,210 @@
+"""
+슬랙 질문 처리 큐
+- 워커 수 제한으로 동시에 실행되는 QA 체인 수 제한
+- event_id / message_ts 기반 중복 이벤트 제거 (Slack 재전송 대응)
+- 사용자별 분당 질문 수 제한
+- 큐 최대 크기 초과 시 접수 거절 (백프레셔)
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque, defaultdict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any
+
+from .config import SLACK_WORKER_COUNT, SLACK_QUEUE_MAX_SIZE, SLACK_DEDUP_TTL_SECONDS, SLACK_USER_RATE_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# 사용자별 질문 수 제한 구간 (초)
+_RATE_LIMIT_WINDOW_SECONDS = 60
+
+# 접수 결과
+SUBMIT_QUEUED = "queued"
+SUBMIT_DUPLICATE = "duplicate"
+SUBMIT_RATE_LIMITED = "rate_limited"
+SUBMIT_QUEUE_FULL = "queue_full"
+
+
+@dataclass
+class SlackJob:
+    """슬랙 질문 1건"""
+    text: str
+    channel: str
+    thread_ts: Optional[str]
+    message_ts: Optional[str]
+    user: Optional[str] = None
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class SlackJobQueue:
+    """동시 실행 수가 제한된 슬랙 질문 처리 큐"""
+
+    def __init__(self, worker_count: int = SLACK_WORKER_COUNT, max_size: int = SLACK_QUEUE_MAX_SIZE):
+        self.worker_count = max(1, worker_count)
+        self.max_size = max(1, max_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        self._seen_events: "OrderedDict[str, float]" = OrderedDict()
+        self._user_requests: Dict[str, deque] = defaultdict(deque)
+        self._in_flight = 0
+        self._stats = {
+            "queued": 0,
+            "processed": 0,
+            "failed": 0,
+            "duplicates": 0,
+            "rate_limited": 0,
+            "rejected": 0,
+        }
+        self._wait_times = deque(maxlen=200)
+        self._run_times = deque(maxlen=200)
+
+    def start(self):
+        """큐/워커 생성 (이벤트 루프 안에서 1회)"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+        logger.info(f"✅ 슬랙 질문 처리 큐 시작 (워커: {self.worker_count}, 최대 대기: {self.max_size})")
+
+    async def stop(self):
+        """워커 종료"""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queue = None
+
+    def mark_seen(self, *keys: Optional[str]) -> bool:
+        """이벤트 키 기록 (이미 처리한 이벤트면 False)
+
+        Slack은 3초 안에 응답하지 못하면 같은 event_id로 재전송하므로
+        event_id와 message_ts 중 하나라도 본 적 있으면 중복으로 판단
+        """
+        now = time.monotonic()
+        # 보관 시간이 지난 키 정리 (삽입 순서 = 만료 순서)
+        while self._seen_events:
+            _, seen_at = next(iter(self._seen_events.items()))
+            if now - seen_at < SLACK_DEDUP_TTL_SECONDS:
+                break
+            self._seen_events.popitem(last=False)
+
+        keys = [key for key in keys if key]
+        if any(key in self._seen_events for key in keys):
+            self._stats["duplicates"] += 1
+            return False
+        for key in keys:
+            self._seen_events[key] = now
+
+        # 여러 uvicorn 워커 실행 시 재전송이 다른 워커로 갈 수 있으므로 공유 저장소에서도 확인
+        try:
+            from ..data.qa_store import claim_slack_event_keys
+            if not claim_slack_event_keys(keys, SLACK_DEDUP_TTL_SECONDS):
+                self._stats["duplicates"] += 1
+                return False
+        except Exception as e:
+            logger.warning(f"⚠️ 공유 중복 이벤트 확인 실패 (워커 내부 기록만 사용): {e}")
+        return True
+
+    def _allow_user(self, user: Optional[str]) -> bool:
+        """사용자별 분당 질문 수 제한 확인"""
+        if not user or SLACK_USER_RATE_LIMIT <= 0:
+            return True
+        now = time.monotonic()
+        requests = self._user_requests[user]
+        while requests and now - requests[0] >= _RATE_LIMIT_WINDOW_SECONDS:
+            requests.popleft()
+        if len(requests) >= SLACK_USER_RATE_LIMIT:
+            return False
+        requests.append(now)
+        return True
+
+    def submit(self, job: SlackJob, event_id: str = None) -> str:
+        """질문 접수
+
+        Returns:
+            str: SUBMIT_QUEUED / SUBMIT_DUPLICATE / SUBMIT_RATE_LIMITED / SUBMIT_QUEUE_FULL
+        """
+        self.start()
+        message_key = f"{job.channel}:{job.message_ts}" if job.message_ts else None
+        if not self.mark_seen(event_id, message_key):
+            logger.info(f"⏭️ 중복 이벤트 스킵: event_id={event_id}, ts={job.message_ts}")
+            return SUBMIT_DUPLICATE
+
+        if not self._allow_user(job.user):
+            self._stats["rate_limited"] += 1
+            logger.warning(f"⚠️ 사용자 질문 수 제한 초과: {job.user}")
+            return SUBMIT_RATE_LIMITED
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            logger.warning(f"⚠️ 슬랙 질문 큐 가득 참 (최대 {self.max_size}건), 접수 거절")
+            return SUBMIT_QUEUE_FULL
+
+        self._stats["queued"] += 1
+        logger.info(f"📥 슬랙 질문 접수 (대기: {self._queue.qsize()}건, 처리 중: {self._in_flight}건)")
+        return SUBMIT_QUEUED
+
+    async def notify(self, status: str, job: SlackJob):
+        """접수 결과 안내 메시지 전송 (중복 이벤트는 안내하지 않음)"""
+        from .slack import post_slack_reply
+
+        if status == SUBMIT_QUEUED:
+            pending = self.pending_count() + self._in_flight
+            message = "⏳ 질문을 접수했습니다. 답변을 준비 중입니다..."
+            if pending > 1:
+                message += f" (앞선 질문 {pending - 1}건 처리 후 답변드립니다)"
+        elif status == SUBMIT_RATE_LIMITED:
+            message = f"⚠️ 질문이 너무 많습니다. 1분에 최대 {SLACK_USER_RATE_LIMIT}개까지 질문할 수 있습니다. 잠시 후 다시 시도해주세요."
+        elif status == SUBMIT_QUEUE_FULL:
+            message = "⚠️ 현재 처리 중인 질문이 많습니다. 잠시 후 다시 시도해주세요."
+        else:
+            return
+        await post_slack_reply(job.channel, job.thread_ts, message)
+
+    def pending_count(self) -> int:
+        """처리 대기 중인 질문 수"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self, index: int):
+        """큐에서 질문을 꺼내 처리"""
+        from .slack import handle_slack_message
+
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            self._in_flight += 1
+            started = time.monotonic()
+            self._wait_times.append(started - job.queued_at)
+            try:
+                await handle_slack_message(job.text, job.channel, job.thread_ts, job.message_ts)
+                self._stats["processed"] += 1
+            except Exception as e:
+                self._stats["failed"] += 1
+                logger.error(f"❌ 슬랙 질문 처리 워커 {index} 오류: {str(e)}")
+            finally:
+                self._run_times.append(time.monotonic() - started)
+                self._in_flight -= 1
+                queue.task_done()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """큐 상태 지표 (대기/처리 중 수, 누적 카운트, 평균 대기/처리 시간)"""
+
+        def average(values):
+            return round(sum(values) / len(values), 2) if values else 0.0
+
+        return {
+            "queue_depth": self.pending_count(),
+            "in_flight": self._in_flight,
+            "worker_count": self.worker_count,
+            "max_size": self.max_size,
+            **self._stats,
+            "avg_wait_seconds": average(self._wait_times),
+            "avg_run_seconds": average(self._run_times),
+        }
+
+
+# 전역 인스턴스
+slack_job_queue = SlackJobQueue()
@@ -0,0 +1,171 @@
+"""
+서버 기동 관리 모듈
+- 기동 준비 상태 추적 (백그라운드 기동 단계별 상태/소요 시간, 실패 단계 재시도, /readyz 응답용)
+- 기동 프로파일 (STARTUP_PROFILE=true일 때 무거운 모듈별 import 시간 측정)
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 기동 기준 시각 (api.py가 가장 먼저 import하는 모듈 중 하나)
+PROCESS_START = time.time()
+
+_PACKAGE = __name__.split(".")[0]
+
+# 첫 요청 시점으로 import를 미루는 무거운 모듈 (프로파일 측정 대상, 측정 순서대로)
+HEAVY_MODULES = (
+    "bs4",
+    "requests",
+    "numpy",
+    "sklearn.feature_extraction.text",
+    "langchain_openai",
+    "langchain_chroma",
+    "langchain_community.document_loaders",
+    "langchain_classic.chains",
+    "slack_sdk.web.async_client",
+    f"{_PACKAGE}.data.database",
+    f"{_PACKAGE}.services.effort_qa",
+    f"{_PACKAGE}.services.category_classifier",
+    f"{_PACKAGE}.services.jira_integration",
+    f"{_PACKAGE}.utils.slack",
+)
+
+
+def profile_imports(modules: Tuple[str, ...] = HEAVY_MODULES) -> List[Dict[str, Any]]:
+    """모듈별 import 시간 측정 (앞에서 이미 로드된 하위 모듈 시간은 제외됨)
+
+    Returns:
+        list: [{"module", "ms", "new_modules", "error"}] (측정 순서)
+    """
+    results = []
+    for name in modules:
+        already_loaded = name in sys.modules
+        before = len(sys.modules)
+        start = time.perf_counter()
+        error = None
+        try:
+            importlib.import_module(name)
+        except Exception as e:  # 선택 의존성이 없는 환경도 측정은 계속
+            error = str(e)
+        results.append({
+            "module": name,
+            "ms": 0.0 if already_loaded else round((time.perf_counter() - start) * 1000, 1),
+            "new_modules": len(sys.modules) - before,
+            "error": error,
+        })
+    return results
+
+
+def log_import_profile() -> List[Dict[str, Any]]:
+    """모듈별 import 시간을 측정해 로그로 출력 (오래 걸린 순)"""
+    results = profile_imports()
+    logger.info("⏱️ [STARTUP_PROFILE] 모듈별 import 시간")
+    for item in sorted(results, key=lambda r: r["ms"], reverse=True):
+        suffix = f" ⚠️ {item['error']}" if item["error"] else f" (+{item['new_modules']}개 모듈)"
+        logger.info(f"   {item['ms']:>8.1f}ms  {item['module']}{suffix}")
+    logger.info(f"   합계 {sum(r['ms'] for r in results):.1f}ms")
+    return results
+
+
+class ReadinessTracker:
+    """기동 단계별 상태 추적 (pending → running → done/failed, 실패 후 재시도 중이면 retrying)
+
+    필수 단계가 모두 done이어야 준비 완료. 필수 단계가 실패하면 degraded(준비 안 됨)로 표시하고
+    retry_failed()로 같은 함수를 다시 실행 (선택 단계는 실패해도 준비 상태에 영향 없음)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._funcs: Dict[str, Tuple[Callable[..., Any], tuple]] = {}
+
+    @staticmethod
+    def _new_step(name: str, description: str = "", required: bool = True) -> Dict[str, Any]:
+        return {"name": name, "description": description, "required": required, "status": "pending",
+                "attempts": 0, "duration_ms": None, "error": None}
+
+    def add(self, name: str, description: str = "", required: bool = True):
+        """단계 등록 (등록 순서대로 표시, required=False면 실패해도 준비 완료로 판단)"""
+        with self._lock:
+            self._steps[name] = self._new_step(name, description, required)
+
+    def _set(self, name: str, **fields):
+        with self._lock:
+            step = self._steps.setdefault(name, self._new_step(name))
+            step.update(fields)
+
+    async def run(self, name: str, func: Callable[..., Any], *args) -> Optional[Any]:
+        """단계 실행 (동기 함수는 스레드에서 실행, 실패해도 예외를 전파하지 않고 기록)"""
+        with self._lock:
+            self._funcs[name] = (func, args)
+            step = self._steps.setdefault(name, self._new_step(name))
+            step["status"] = "retrying" if step["status"] in ("failed", "retrying") else "running"
+            step["attempts"] += 1
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(func):
+                result = await func(*args)
+            else:
+                result = await asyncio.to_thread(func, *args)
+            self._set(name, status="done", duration_ms=round((time.perf_counter() - start) * 1000, 1), error=None)
+            return result
+        except Exception as e:
+            self._set(name, status="failed", duration_ms=round((time.perf_counter() - start) * 1000, 1),
+                      error=str(e))
+            logger.error(f"❌ 기동 단계 실패 ({name}): {e}")
+            return None
+
+    def failed_steps(self) -> List[str]:
+        """실패한 필수 단계 이름 (등록 순서)"""
+        with self._lock:
+            return [step["name"] for step in self._steps.values()
+                    if step["required"] and step["status"] in ("failed", "retrying")]
+
+    async def retry_failed(self) -> List[str]:
+        """실패한 필수 단계를 순서대로 다시 실행
+
+        Returns:
+            list: 재시도 후에도 실패한 단계 이름
+        """
+        for name in self.failed_steps():
+            func, args = self._funcs[name]
+            await self.run(name, func, *args)
+        return self.failed_steps()
+
+    @staticmethod
+    def _status(steps: List[Dict[str, Any]]) -> str:
+        required = [step for step in steps if step["required"]]
+        if any(step["status"] in ("failed", "retrying") for step in required):
+            return "degraded"
+        if all(step["status"] == "done" for step in required):
+            return "ready"
+        return "starting"
+
+    @property
+    def is_ready(self) -> bool:
+        with self._lock:
+            steps = list(self._steps.values())
+        return self._status(steps) == "ready"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """준비 상태 전체 (/readyz 응답, status: starting → ready, 필수 단계 실패 시 degraded)"""
+        with self._lock:
+            steps = [dict(step) for step in self._steps.values()]
+        status = self._status(steps)
+        return {
+            "ready": status == "ready",
+            "status": status,
+            "uptime_seconds": round(time.time() - PROCESS_START, 1),
+            "steps": steps,
+        }
+
+
+# 전역 인스턴스 (워커 프로세스별)
+readiness = ReadinessTracker()
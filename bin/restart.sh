@@ -3,11 +3,23 @@
 echo "🔄 서버 재시작 중..."
 echo "===================="
 
-# 서버 종료
-./bin/stop.sh
+START_NS=$(date +%s%N)
 
-# 잠시 대기
-sleep 3
+# 서버 종료 (프로세스가 끝나는 즉시 반환)
+./bin/stop.sh
 
 # 서버 시작
 ./bin/run.sh
+
+# 메인 페이지 응답 대기 (최대 30초, 무거운 준비 작업은 백그라운드 진행)
+for _ in $(seq 1 300); do
+  if curl -s -o /dev/null "http://127.0.0.1:9010/"; then
+    ELAPSED_MS=$(( ($(date +%s%N) - START_NS) / 1000000 ))
+    echo "✅ 서버 응답 확인 (${ELAPSED_MS}ms)"
+    echo "ℹ️ 준비 상태 확인: curl http://127.0.0.1:9010/readyz"
+    exit 0
+  fi
+  sleep 0.1
+done
+echo "⚠️ 30초 안에 서버 응답이 없습니다. 로그를 확인하세요."
+exit 1
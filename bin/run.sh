@@ -68,34 +68,37 @@ export ENVIRONMENT=production
 export HOST=0.0.0.0
 export PORT=9010
 export RELOAD=false
+# uvicorn 워커 수 (공유 상태는 data/docs/shared_state 잠금/버전 파일로 동기화)
+WORKERS="${WORKERS:-1}"
 
-# 의존성 확인
+# 의존성 확인 (모듈을 실제로 import하지 않고 설치 여부만 확인 → 재시작 지연 없음)
 echo "📦 의존성 확인 중..."
-python3 -c "import fastapi, uvicorn" 2>/dev/null
+python3 - <<'PYEOF'
+import sys
+from importlib.util import find_spec
+
+def installed(name):
+    try:
+        return find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+missing = []
+if not (installed("fastapi") and installed("uvicorn")):
+    missing.append("fastapi uvicorn")
+# 실제 코드에서 사용하는 langchain_classic을 체크 (없으면 langchain 하위 호환)
+# 최상위 패키지만 확인해야 패키지 __init__이 실행되지 않음
+if not (installed("langchain_classic") or installed("langchain")):
+    missing.append("langchain-classic")
+if not installed("langchain_openai"):
+    missing.append("langchain-openai")
+if missing:
+    print("❌ 필요한 패키지가 설치되지 않았습니다.")
+    print("💡 다음 명령어를 실행하세요: pip install " + " ".join(missing))
+    sys.exit(1)
+print("✅ 의존성 확인 완료")
+PYEOF
 if [ $? -ne 0 ]; then
-    echo "❌ 필요한 패키지가 설치되지 않았습니다."
-    echo "💡 다음 명령어를 실행하세요: pip install fastapi uvicorn"
-    exit 1
-fi
-
-# langchain 패키지 확인
-echo "🔍 langchain 패키지 확인 중..."
-# 실제 코드에서 사용하는 langchain_classic.chains를 체크
-python3 -c "from langchain_classic.chains import RetrievalQA; print('✅ langchain_classic.chains OK')" 2>/dev/null
-if [ $? -ne 0 ]; then
-    # langchain_classic이 없으면 langchain.chains도 체크 (하위 호환성)
-    python3 -c "from langchain.chains import RetrievalQA; print('✅ langchain.chains OK (fallback)')" 2>/dev/null
-    if [ $? -ne 0 ]; then
-        echo "❌ langchain.chains 또는 langchain_classic.chains 모듈을 찾을 수 없습니다."
-        echo "💡 다음 명령어를 실행하세요: pip install langchain-classic 또는 pip install langchain"
-        exit 1
-    fi
-fi
-
-python3 -c "from langchain_openai import ChatOpenAI; print('✅ ChatOpenAI OK')" 2>/dev/null
-if [ $? -ne 0 ]; then
-    echo "❌ ChatOpenAI 모듈을 찾을 수 없습니다."
-    echo "💡 다음 명령어를 실행하세요: pip install langchain-openai"
     exit 1
 fi
 
@@ -114,9 +117,10 @@ echo "📍 Rust 경로: $(which rustc 2>/dev/null || echo 'NOT FOUND')"
 echo "📍 Cargo 경로: $(which cargo 2>/dev/null || echo 'NOT FOUND')"
 echo "📍 Python 경로: $(which python3)"
 echo "📍 PYTHONPATH: $PYTHONPATH"
+echo "📍 워커 수: $WORKERS"
 
 # 서버 시작 (백그라운드 실행, nohup)
-nohup "$PYTHON_BIN" -m uvicorn "$APP_MODULE" --host 0.0.0.0 --port 9010 --log-level info --access-log >> "$LOG_FILE" 2>&1 &
+nohup "$PYTHON_BIN" -m uvicorn "$APP_MODULE" --host 0.0.0.0 --port 9010 --workers "$WORKERS" --log-level info --access-log >> "$LOG_FILE" 2>&1 &
 echo $! > "$PID_FILE"
 
 echo "✅ 서버가 백그라운드로 시작되었습니다."
@@ -18,6 +18,35 @@ if [ -f "$PID_FILE" ]; then
     echo "📁 작업 디렉토리: $APP_DIR"
     echo "📝 일별 로그: $DAILY_LOG_FILE"
     
+    # 준비 상태 확인 (/readyz: 200 준비 완료, 503 백그라운드 준비 중(starting) 또는 필수 단계 실패/재시도 중(degraded))
+    READY_BODY=$(curl -s -w "\n%{http_code}" "http://127.0.0.1:9010/readyz" 2>/dev/null)
+    READY_CODE=$(echo "$READY_BODY" | tail -1)
+    READY_STATUS=$(echo "$READY_BODY" | sed '$d' | python3 -c 'import json, sys; print(json.load(sys.stdin).get("status", ""))' 2>/dev/null)
+    if [ "$READY_CODE" = "200" ]; then
+      echo "🟢 준비 완료 (/readyz 200)"
+    elif [ "$READY_CODE" = "503" ] && [ "$READY_STATUS" = "degraded" ]; then
+      echo "🟠 degraded (/readyz 503, 필수 기동 단계 실패 → 자동 재시도 중)"
+    elif [ "$READY_CODE" = "503" ]; then
+      echo "🟡 준비 중 (/readyz 503, 워밍업 진행 중)"
+    else
+      echo "🔴 응답 없음 (/readyz: ${READY_CODE:-연결 실패})"
+    fi
+    if [ "$READY_CODE" = "200" ] || [ "$READY_CODE" = "503" ]; then
+      echo "$READY_BODY" | sed '$d' | python3 -c '
+import json, sys
+for step in json.load(sys.stdin).get("steps", []):
+    icon = {"done": "✅", "failed": "❌", "running": "⏳", "retrying": "🔁"}.get(step["status"], "⏸️")
+    line = "   %s %s: %s" % (icon, step["name"], step["status"])
+    if step.get("attempts", 0) > 1:
+        line += " (시도 %s회)" % step["attempts"]
+    if step.get("duration_ms") is not None:
+        line += " %sms" % step["duration_ms"]
+    if step.get("error"):
+        line += " (%s)" % step["error"]
+    print(line)
+' 2>/dev/null
+    fi
+    
     # 포트 확인
     if command -v netstat >/dev/null 2>&1; then
       echo "🌐 포트 상태:"
@@ -10,7 +10,11 @@ if [ -f "$PID_FILE" ]; then
   if ps -p "$PID" > /dev/null 2>&1; then
     echo "🛑 서버 종료 중... PID: $PID"
     kill "$PID"
-    sleep 2
+    # 종료될 때까지 최대 10초 대기 (0.1초 간격 확인, 고정 대기 없음)
+    for _ in $(seq 1 100); do
+      ps -p "$PID" > /dev/null 2>&1 || break
+      sleep 0.1
+    done
     
     # 강제 종료 확인
     if ps -p "$PID" > /dev/null 2>&1; then
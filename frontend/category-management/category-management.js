@@ -280,7 +280,8 @@ async function uploadExcelCategories() {
         const result = await response.json();
         
         if (result.success) {
-            showUploadResult('✅ 카테고리 업데이트 완료! 페이지를 새로고침합니다...', 'success');
+            const diff = result.diff || {};
+            showUploadResult(`✅ 카테고리 업데이트 완료! (추가 ${diff.added_count || 0}개, 삭제 ${diff.removed_count || 0}개, 카테고리 초기화 ${result.reset_count || 0}건) 페이지를 새로고침합니다...`, 'success');
             // 2초 후 페이지 새로고침
             setTimeout(() => {
                 location.reload();